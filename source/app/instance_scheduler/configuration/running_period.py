@@ -37,10 +37,6 @@ class RunningPeriod:
                 f"must be before endtime {self.endtime.strftime('%H:%M')}"
             )
 
-    def _log_debug(self, msg: str) -> None:
-        if self._logger is not None:
-            self._logger.debug(msg)
-
     def get_desired_state(
         self, logger: Optional[Logger], current_dt: datetime
     ) -> ScheduleState:
@@ -51,7 +47,8 @@ class RunningPeriod:
         :return: desired state for the instance in the period
         """
         self._logger = logger
-        self._log_debug(f'Checking conditions for period "{self.name}"')
+        if logger is not None:
+            logger.debug(f'Checking conditions for period "{self.name}"')
         if not self.cron_recurrence.contains(current_dt):
             return ScheduleState.STOPPED
         return self.check_time(current_dt)
@@ -64,13 +61,9 @@ class RunningPeriod:
         """
         time_to_check = time(dt.hour, dt.minute, dt.second)
 
-        # debug msg
-        period_type: str
-
         # no start and stop time, means running all day
         if self.begintime is None and self.endtime is None:
             desired_state: ScheduleState = ScheduleState.RUNNING
-            period_type = "all-day"
         elif self.begintime is None and self.endtime is not None:
             # just the end time, stopped if later than that time
             desired_state = (
@@ -78,7 +71,6 @@ class RunningPeriod:
                 if time_to_check >= self.endtime
                 else ScheduleState.ANY
             )
-            period_type = f"1-sided stop ({time_str(self.endtime)})"
         elif self.begintime is not None and self.endtime is None:
             # just the start time, running if later that that time
             desired_state = (
@@ -86,7 +78,6 @@ class RunningPeriod:
                 if time_to_check >= self.begintime
                 else ScheduleState.ANY
             )
-            period_type = f"1-sided start ({time_str(self.begintime)})"
         elif self.begintime is not None and self.endtime is not None:
             # start and stop time, test if time falls in the period defined by these times
             desired_state = (
@@ -94,20 +85,30 @@ class RunningPeriod:
                 if self.begintime <= time_to_check < self.endtime
                 else ScheduleState.STOPPED
             )
-            period_type = f"range ({time_str(self.begintime)}-{time_str(self.endtime)})"
         else:
             assert False, "unreachable"
             # the above defines all 4 possible combinations of none/not_none on begintime and endtime
             # so this should be impossible to reach
 
-        self._log_debug(
-            "Period CheckTime Result:\n"
-            f"  PeriodType: {period_type}\n"
-            f"  timeChecked: {dt.isoformat()} ({time_str(time_to_check)})\n"
-            f"  desiredState: {desired_state}"
-        )
+        if self._logger is not None:
+            # the debug message is only formatted when there is a logger to write it to
+            self._logger.debug(
+                "Period CheckTime Result:\n"
+                f"  PeriodType: {self._period_type_str()}\n"
+                f"  timeChecked: {dt.isoformat()} ({time_str(time_to_check)})\n"
+                f"  desiredState: {desired_state}"
+            )
         return desired_state
 
+    def _period_type_str(self) -> str:
+        if self.begintime is None and self.endtime is None:
+            return "all-day"
+        if self.begintime is None:
+            return f"1-sided stop ({time_str(self.endtime)})"
+        if self.endtime is None:
+            return f"1-sided start ({time_str(self.begintime)})"
+        return f"range ({time_str(self.begintime)}-{time_str(self.endtime)})"
+
 
 # string format helpers for debug messages
 def _not_str(is_not_not: bool) -> str:
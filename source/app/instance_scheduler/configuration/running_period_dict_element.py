@@ -3,8 +3,38 @@
 from typing import NotRequired, Optional, TypedDict
 
 from instance_scheduler.configuration.running_period import RunningPeriod
+from instance_scheduler.scheduling.states import ScheduleState
 
 
 class RunningPeriodDictElement(TypedDict):
     period: RunningPeriod
     instancetype: NotRequired[Optional[str]]
+
+
+class PeriodWithDesiredState(TypedDict):
+    period: RunningPeriod
+    instancetype: Optional[str]
+    state: ScheduleState
+
+
+def get_nearest_running_period(
+    periods: list[PeriodWithDesiredState],
+) -> PeriodWithDesiredState:
+    """given a list of running periods, get "nearest period" which is defined as
+    the running period with the latest start time"""
+
+    if not periods:
+        raise ValueError(
+            "Tried to find the latest start time of an empty list of periods"
+        )
+
+    latest_period = periods[0]
+    for period in periods:
+        if period["period"].begintime is None:
+            continue  # begintime of none cannot possibly be more recent than latest period
+        elif latest_period["period"].begintime is None:
+            latest_period = period
+        elif period["period"].begintime > latest_period["period"].begintime:
+            latest_period = period
+
+    return latest_period
@@ -0,0 +1,632 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+"""
+Running intervals of a schedule computed with interval arithmetic
+
+`InstanceSchedule.get_desired_state` answers whether a schedule is running at a single moment. Questions about a
+span of time (how long will a schedule run this month?) would need to evaluate it at every point where the state
+may change. Instead, each period of a schedule is compiled once into the window of the day in which it is running
+(and the window in which it has no opinion, "any"), and the days on which it is active. The running intervals of a
+schedule on a day are then the merged windows of the periods active on that day.
+
+The same compiled periods answer `InstanceSchedule.get_desired_state`: the desired state of a schedule over a day is
+a short list of segments in which it is constant, so the state at a moment is a single lookup in the segments of its
+day. The boundaries of those segments are also the only moments at which the desired state can change, which answers
+`InstanceSchedule.next_transitions` without evaluating the minutes in between.
+
+Times are measured in whole minutes from local midnight, matching the resolution of period begin and end times. An
+interval that runs to the end of the day ends at `MINUTES_PER_DAY` (local midnight of the next day).
+"""
+
+from bisect import bisect_left, bisect_right
+from collections.abc import Hashable, Iterable, Iterator
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from typing import TYPE_CHECKING, Final, Optional
+
+from instance_scheduler import configuration
+from instance_scheduler.configuration.running_period import RunningPeriod
+from instance_scheduler.configuration.running_period_dict_element import (
+    PeriodWithDesiredState,
+    RunningPeriodDictElement,
+    get_nearest_running_period,
+)
+from instance_scheduler.cron.compiled_recurrence import CompiledRecurrence
+from instance_scheduler.scheduling.states import ScheduleState
+from instance_scheduler.util.time import wall_clock_instant
+
+if TYPE_CHECKING:
+    from instance_scheduler.configuration.instance_schedule import InstanceSchedule
+
+MINUTES_PER_DAY: Final = 24 * 60
+
+Interval = tuple[int, int]
+"""half-open interval [start, end) of minutes from local midnight"""
+
+DesiredState = tuple[ScheduleState, Optional[str], Optional[str]]
+"""desired state, instance type and name of the most authoritative running period"""
+
+_STOPPED: Final[DesiredState] = (ScheduleState.STOPPED, None, None)
+_ANY: Final[DesiredState] = (ScheduleState.ANY, None, None)
+
+DEFAULT_TRANSITION_HORIZON: Final = timedelta(days=366)
+
+_RECENT_ACTIVE_MASKS: Final = 4
+
+
+def merge_intervals(intervals: Iterable[Interval]) -> list[Interval]:
+    """merge overlapping and touching intervals into a sorted list of disjoint intervals"""
+    merged: list[Interval] = []
+    for start, end in sorted(intervals):
+        if start >= end:
+            continue
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _contains(intervals: list[Interval], minute: int) -> bool:
+    index = bisect_left(intervals, (minute + 1,)) - 1
+    return index >= 0 and intervals[index][0] <= minute < intervals[index][1]
+
+
+def _minute_of_day(value: Optional[time]) -> Optional[int]:
+    return None if value is None else value.hour * 60 + value.minute
+
+
+@dataclass(frozen=True)
+class CompiledPeriod:
+    period: RunningPeriod
+    instance_type: Optional[str]
+    recurrence: CompiledRecurrence
+    running: Optional[Interval]
+    """the window in which the period is running on the days it is active"""
+    any: Optional[Interval]
+    """the window in which the period allows any state on the days it is active"""
+
+    @classmethod
+    def compile(cls, element: RunningPeriodDictElement) -> "CompiledPeriod":
+        period: Final = element["period"]
+        begin: Final = _minute_of_day(period.begintime)
+        end: Final = _minute_of_day(period.endtime)
+
+        # mirrors RunningPeriod.check_time
+        running: Optional[Interval]
+        any_state: Optional[Interval]
+        if begin is None and end is None:
+            running, any_state = (0, MINUTES_PER_DAY), None
+        elif begin is None and end is not None:
+            running, any_state = None, (0, end)
+        elif begin is not None and end is None:
+            running, any_state = (begin, MINUTES_PER_DAY), (0, begin)
+        elif begin is not None and end is not None:
+            running, any_state = (begin, end), None
+
+        return CompiledPeriod(
+            period=period,
+            instance_type=element.get("instancetype"),
+            recurrence=period.cron_recurrence.compiled,
+            running=running,
+            any=any_state,
+        )
+
+    def is_active(self, day: date) -> bool:
+        return self.recurrence.contains(day)
+
+    def state_at(self, day: date, minute: int) -> ScheduleState:
+        """mirrors `RunningPeriod.get_desired_state`"""
+        if not self.is_active(day):
+            return ScheduleState.STOPPED
+        if self.running is not None and self.running[0] <= minute < self.running[1]:
+            return ScheduleState.RUNNING
+        if self.any is not None and self.any[0] <= minute < self.any[1]:
+            return ScheduleState.ANY
+        return ScheduleState.STOPPED
+
+
+@dataclass(frozen=True)
+class RunningInterval:
+    period_name: str
+    """the most authoritative period when the interval started"""
+    begin: int
+    end: int
+    """may exceed `MINUTES_PER_DAY` by a minute when an adjacent period starts at the beginning of the next day"""
+    instance_type: Optional[str] = None
+    """the instance type of the most authoritative period when the interval started"""
+
+
+@dataclass(frozen=True)
+class ScheduleTransition:
+    """a change of the desired state of a schedule, as returned by `InstanceSchedule.get_desired_state`"""
+
+    time: datetime
+    """the moment of the change, in the timezone of the schedule"""
+    state: ScheduleState
+    instance_type: Optional[str]
+    period: Optional[str]
+    """the most authoritative running period from this moment"""
+
+
+@dataclass(frozen=True)
+class _ActivePeriods:
+    periods: list[CompiledPeriod]
+    running: list[Interval]
+    held: list[Interval]
+    """intervals in which no active period requires the schedule to be stopped"""
+
+    def desired_state_at(self, minute: int) -> DesiredState:
+        """
+        desired states have a relative priority of running > any > stopped, the desired state is the highest
+        priority state of any active period. The type and name of a running state are those of the most recently
+        started running period
+        """
+        if _contains(self.running, minute):
+            return _running_state(_authoritative_period(self, minute))
+        if any(
+            p.any is not None and p.any[0] <= minute < p.any[1] for p in self.periods
+        ):
+            return _ANY
+        return _STOPPED
+
+
+@dataclass(frozen=True)
+class _Timeline:
+    """the desired state of a schedule over a day, as segments in which it is constant"""
+
+    begins: list[int]
+    """the first minute of each segment, starting with 0"""
+    states: list[DesiredState]
+
+    @classmethod
+    def of(cls, active: _ActivePeriods) -> "_Timeline":
+        # the desired state can only change where an active period starts or stops running or allowing any state
+        boundaries: Final = {0}
+        for period in active.periods:
+            for interval in (period.running, period.any):
+                if interval is not None:
+                    boundaries.update(b for b in interval if b < MINUTES_PER_DAY)
+
+        begins: list[int] = []
+        states: list[DesiredState] = []
+        for begin in sorted(boundaries):
+            state = active.desired_state_at(begin)
+            if not states or states[-1] != state:
+                begins.append(begin)
+                states.append(state)
+        return _Timeline(begins=begins, states=states)
+
+    def at(self, minute: int) -> DesiredState:
+        return self.states[bisect_right(self.begins, minute) - 1]
+
+    def segment(self, minute: int) -> tuple[int, int, DesiredState]:
+        """the first minute, the minute after the last, and the state of the segment that contains `minute`"""
+        index: Final = bisect_right(self.begins, minute) - 1
+        end: Final = (
+            self.begins[index + 1] if index + 1 < len(self.begins) else MINUTES_PER_DAY
+        )
+        return self.begins[index], end, self.states[index]
+
+    def with_adjacent_periods_merged(self) -> "_Timeline":
+        """
+        the timeline in which a single stopped minute between two running segments of the day takes the state of
+        the segment that follows it
+
+        a stopped minute at the start or end of the day depends on the adjacent day, so it is left unchanged
+        """
+        states: Final = list(self.states)
+        for index in range(1, len(states) - 1):
+            if (
+                states[index] == _STOPPED
+                and self.begins[index + 1] - self.begins[index] == 1
+                and states[index - 1][0] == ScheduleState.RUNNING
+                and states[index + 1][0] == ScheduleState.RUNNING
+            ):
+                states[index] = states[index + 1]
+        return _Timeline(begins=self.begins, states=states)
+
+
+@dataclass(frozen=True)
+class _DayStates:
+    timeline: _Timeline
+    merged: _Timeline
+    """the timeline with adjacent running periods merged"""
+
+
+@dataclass(frozen=True)
+class _CachedDesiredState:
+    state: DesiredState
+    day: date
+    begin: int
+    end: int
+    """the minutes of `day` in which the desired state does not change"""
+
+
+class CompiledSchedule:
+    """
+    a schedule compiled for evaluation over spans of time
+
+    the running intervals of a day match the transitions observed by evaluating `InstanceSchedule.get_desired_state`
+    at every minute of the day: an instance starts when any period starts running, keeps running through windows in
+    which every period allows any state, and stops when it is no longer allowed to run. A stop between two adjacent
+    running periods (e.g. 04:00-12:00 and 12:01-17:00) is deferred to the start of the next period.
+
+    the running intervals of a day depend only on which periods are active on that day and the next, so they are
+    computed once for each combination that occurs and reused for every day with the same combination. Likewise, the
+    desired state timeline of a day is computed once for each set of active periods, and the last desired state is
+    reused until the end of the segment of the timeline it was found in.
+    """
+
+    def __init__(self, schedule: "InstanceSchedule") -> None:
+        self.name: Final = schedule.name
+        self.timezone: Final = schedule.timezone
+        self._override_status: Final = schedule.override_status
+        self._periods: Final = [CompiledPeriod.compile(p) for p in schedule.periods]
+        self._check_adjacent_periods: Final = len(self._periods) > 1
+        self._intervals: dict[tuple[int, int], list[RunningInterval]] = {}
+        self._day_states: dict[int, _DayStates] = {}
+        self._cached_states: dict[bool, _CachedDesiredState] = {}
+        self._segments: dict[tuple[int, int, int], list[tuple[int, DesiredState]]] = {}
+        self._recent_active_masks: dict[date, int] = {}
+
+    def local_datetime(self, day: date, minute: int) -> datetime:
+        """the local wall-clock time `minute` minutes after midnight of `day`"""
+        return datetime.combine(day, time(), tzinfo=self.timezone) + timedelta(
+            minutes=minute
+        )
+
+    def elapsed_seconds(self, day: date, interval: RunningInterval) -> float:
+        """the time that elapses during a running interval of `day`, accounting for daylight saving time"""
+        begin: Final = self.local_datetime(day, interval.begin)
+        end: Final = self.local_datetime(day, interval.end)
+        if begin.utcoffset() == end.utcoffset():
+            return (end - begin).total_seconds()
+        return (wall_clock_instant(end) - wall_clock_instant(begin)).total_seconds()
+
+    def desired_state(
+        self, localized_time: datetime, check_adjacent_periods: bool = True
+    ) -> DesiredState:
+        """
+        the desired state of the schedule at a time localized to its timezone, see
+        `InstanceSchedule.get_desired_state`
+        """
+        if self._override_status:
+            if self._override_status == configuration.OVERRIDE_STATUS_RUNNING:
+                return ScheduleState.RUNNING, None, "override_status"
+            return ScheduleState.STOPPED, None, "override_status"
+
+        # the desired state only depends on the wall-clock date and minute
+        day: Final = localized_time.date()
+        minute: Final = localized_time.hour * 60 + localized_time.minute
+        cached = self._cached_states.get(check_adjacent_periods)
+        if cached is None or not (
+            cached.day == day and cached.begin <= minute < cached.end
+        ):
+            cached = self._evaluate_desired_state(day, minute, check_adjacent_periods)
+            self._cached_states[check_adjacent_periods] = cached
+        return cached.state
+
+    def period_states(self, localized_time: datetime) -> list[PeriodWithDesiredState]:
+        """
+        the desired state of each period of the schedule at a time localized to its timezone, without the adjacent
+        period merge or override_status applied to the desired state of the schedule
+        """
+        day: Final = localized_time.date()
+        minute: Final = localized_time.hour * 60 + localized_time.minute
+        return [
+            {
+                "period": p.period,
+                "instancetype": p.instance_type,
+                "state": p.state_at(day, minute),
+            }
+            for p in self._periods
+        ]
+
+    def next_transitions(
+        self,
+        after: datetime,
+        count: int,
+        horizon: timedelta = DEFAULT_TRANSITION_HORIZON,
+    ) -> list[ScheduleTransition]:
+        """
+        the first `count` changes of the desired state of the schedule after the timezone-aware time `after` and no
+        later than `horizon` after it, see `InstanceSchedule.next_transitions`
+        """
+        if count <= 0 or self._override_status:
+            return []
+
+        first: Final = after.astimezone(timezone.utc)
+        last: Final = first + horizon
+        current = self.desired_state(first.astimezone(self.timezone))
+        transitions: list[ScheduleTransition] = []
+        day = first.astimezone(self.timezone).date()
+        day_start = self._utc_midnight(day)
+        while day_start <= last:
+            next_day_start = self._utc_midnight(day + timedelta(days=1))
+            for instant, desired in self._changes_of_day(
+                day, day_start, next_day_start
+            ):
+                if instant <= first or desired == current:
+                    continue
+                if instant > last:
+                    break
+                current = desired
+                transitions.append(
+                    ScheduleTransition(instant.astimezone(self.timezone), *desired)
+                )
+                if len(transitions) == count:
+                    return transitions
+            day, day_start = day + timedelta(days=1), next_day_start
+        return transitions
+
+    def _utc_midnight(self, day: date) -> datetime:
+        return datetime.combine(day, time(), tzinfo=self.timezone).astimezone(
+            timezone.utc
+        )
+
+    def _changes_of_day(
+        self, day: date, start: datetime, end: datetime
+    ) -> Iterator[tuple[datetime, DesiredState]]:
+        """
+        the desired state from each moment (as a UTC time) of `day` at which it may change, in order
+
+        `start` and `end` are the UTC times of the local midnights that begin and end the day. On a day without a
+        daylight saving time change, those moments are the starts of the segments of the day. Otherwise, every
+        wall-clock time at which a segment starts is evaluated at each UTC time it occurs (twice in the hour that is
+        repeated when clocks go back), along with the moment the clock jumps (which is when a segment that starts in
+        the hour skipped when clocks go forward takes effect)
+        """
+        if (end - start) == timedelta(days=1):
+            for minute, desired in self._segments_of_day(day):
+                yield start + timedelta(minutes=minute), desired
+            return
+
+        midnight: Final = datetime.combine(day, time())
+        instants: Final = {
+            (midnight + timedelta(minutes=minute))
+            .replace(tzinfo=self.timezone, fold=fold)
+            .astimezone(timezone.utc)
+            for minute, _ in self._segments_of_day(day)
+            for fold in (0, 1)
+        }
+        instants.add(self._utc_offset_change(start, end))
+        for instant in sorted(instants):
+            if start <= instant < end:
+                yield instant, self.desired_state(instant.astimezone(self.timezone))
+
+    def _utc_offset_change(self, start: datetime, end: datetime) -> datetime:
+        """the first whole minute from `start` (UTC) with the UTC offset of `end`"""
+        offset: Final = end.astimezone(self.timezone).utcoffset()
+        low, high = 0, int((end - start).total_seconds()) // 60
+        while low < high:
+            middle = (low + high) // 2
+            instant = start + timedelta(minutes=middle)
+            if instant.astimezone(self.timezone).utcoffset() == offset:
+                high = middle
+            else:
+                low = middle + 1
+        return start + timedelta(minutes=low)
+
+    def _segments_of_day(self, day: date) -> list[tuple[int, DesiredState]]:
+        """
+        the first minute and desired state of each segment of `day` in which the desired state returned by
+        `desired_state` is constant
+
+        the first and last minutes of a day depend on the periods active on the adjacent days, so the segments are
+        computed once for each combination of the periods active on the previous day, the day, and the next day
+        """
+        key: Final = (
+            self._active_mask(day - timedelta(days=1)),
+            self._active_mask(day),
+            self._active_mask(day + timedelta(days=1)),
+        )
+        segments = self._segments.get(key)
+        if segments is None:
+            segments = []
+            minute = 0
+            while minute < MINUTES_PER_DAY:
+                evaluated = self._evaluate_desired_state(day, minute, True)
+                if not segments or segments[-1][1] != evaluated.state:
+                    segments.append((minute, evaluated.state))
+                minute = evaluated.end
+            self._segments[key] = segments
+        return segments
+
+    def running_intervals(self, day: date) -> list[RunningInterval]:
+        if self._override_status:
+            if self._override_status == configuration.OVERRIDE_STATUS_RUNNING:
+                return [RunningInterval("override_status", 0, MINUTES_PER_DAY)]
+            return []
+
+        key: Final = (
+            self._active_mask(day),
+            self._active_mask(day + timedelta(days=1)),
+        )
+        intervals = self._intervals.get(key)
+        if intervals is None:
+            intervals = self._compute_running_intervals(*key)
+            self._intervals[key] = intervals
+        return intervals
+
+    def iter_running_intervals(
+        self, first_day: date, last_day: date
+    ) -> Iterator[tuple[date, list[RunningInterval]]]:
+        day = first_day
+        while day <= last_day:
+            yield day, self.running_intervals(day)
+            day += timedelta(days=1)
+
+    def _active_mask(self, day: date) -> int:
+        """bitmask of the periods active on `day`, with bit `i` set for period `i`"""
+        # days are usually evaluated in sequence along with the days either side of them, so the masks of the last
+        # few days are kept
+        mask = self._recent_active_masks.get(day)
+        if mask is None:
+            mask = 0
+            for index, period in enumerate(self._periods):
+                if period.is_active(day):
+                    mask |= 1 << index
+            if len(self._recent_active_masks) >= _RECENT_ACTIVE_MASKS:
+                del self._recent_active_masks[next(iter(self._recent_active_masks))]
+            self._recent_active_masks[day] = mask
+        return mask
+
+    def _evaluate_desired_state(
+        self, day: date, minute: int, check_adjacent_periods: bool
+    ) -> _CachedDesiredState:
+        day_states: Final = self._states_of_day(day)
+
+        if not (check_adjacent_periods and self._check_adjacent_periods):
+            begin, end, desired = day_states.timeline.segment(minute)
+            return _CachedDesiredState(state=desired, day=day, begin=begin, end=end)
+
+        begin, end, desired = day_states.merged.segment(minute)
+        if desired != _STOPPED:
+            return _CachedDesiredState(state=desired, day=day, begin=begin, end=end)
+
+        # a stopped first or last minute of the day may be between adjacent periods of two days
+        if minute == 0:
+            desired = self._merge_adjacent(
+                previous=self._states_of_day(day - timedelta(days=1)).timeline.at(
+                    MINUTES_PER_DAY - 1
+                ),
+                following=day_states.timeline.at(1),
+            )
+            return _CachedDesiredState(state=desired, day=day, begin=0, end=1)
+        if minute == MINUTES_PER_DAY - 1:
+            desired = self._merge_adjacent(
+                previous=day_states.timeline.at(MINUTES_PER_DAY - 2),
+                following=self._states_of_day(day + timedelta(days=1)).timeline.at(0),
+            )
+            return _CachedDesiredState(
+                state=desired, day=day, begin=minute, end=MINUTES_PER_DAY
+            )
+        return _CachedDesiredState(
+            state=desired,
+            day=day,
+            begin=max(begin, 1),
+            end=min(end, MINUTES_PER_DAY - 1),
+        )
+
+    def _states_of_day(self, day: date) -> _DayStates:
+        mask: Final = self._active_mask(day)
+        day_states = self._day_states.get(mask)
+        if day_states is None:
+            timeline = _Timeline.of(self._active_periods(mask))
+            day_states = _DayStates(
+                timeline=timeline, merged=timeline.with_adjacent_periods_merged()
+            )
+            self._day_states[mask] = day_states
+        return day_states
+
+    @staticmethod
+    def _merge_adjacent(
+        previous: DesiredState, following: DesiredState
+    ) -> DesiredState:
+        if (
+            previous[0] == ScheduleState.RUNNING
+            and following[0] == ScheduleState.RUNNING
+        ):
+            return following
+        return _STOPPED
+
+    def _active_periods(self, mask: int) -> _ActivePeriods:
+        periods: Final = [p for i, p in enumerate(self._periods) if mask >> i & 1]
+        running: Final = merge_intervals(p.running for p in periods if p.running)
+        held: Final = merge_intervals([*running, *(p.any for p in periods if p.any)])
+        return _ActivePeriods(periods=periods, running=running, held=held)
+
+    def _compute_running_intervals(
+        self, active_mask: int, next_day_active_mask: int
+    ) -> list[RunningInterval]:
+        today: Final = self._active_periods(active_mask)
+        next_day: Final = self._active_periods(next_day_active_mask)
+
+        def running_at(minute: int) -> bool:
+            if minute < MINUTES_PER_DAY:
+                return _contains(today.running, minute)
+            return _contains(next_day.running, minute - MINUTES_PER_DAY)
+
+        intervals: list[RunningInterval] = []
+        for held_start, held_end in today.held:
+            # an instance only starts when a period is running, so a window of "any" state before it is not included
+            index = bisect_left(today.running, (held_start,))
+            if index == len(today.running) or today.running[index][0] >= held_end:
+                continue
+            begin = today.running[index][0]
+            end = held_end
+            if (
+                end < MINUTES_PER_DAY
+                and self._check_adjacent_periods
+                and running_at(end - 1)
+                and running_at(end + 1)
+            ):
+                end += 1
+            period = _authoritative_period(today, begin)
+            intervals.append(
+                RunningInterval(
+                    period_name=period["period"].name,
+                    begin=begin,
+                    end=end,
+                    instance_type=period["instancetype"],
+                )
+            )
+        return intervals
+
+
+_MAX_COMPILED_SCHEDULES: Final = 1024
+_compiled_schedules: dict[Hashable, CompiledSchedule] = {}
+
+
+def compile_schedule(schedule: "InstanceSchedule") -> CompiledSchedule:
+    """
+    the compiled form of a schedule, shared by every schedule with the same name, timezone, override status, and
+    periods for the lifetime of the process
+
+    schedules are rebuilt from their definitions for every instance they are applied to and on every scheduling
+    run, so sharing the compiled form (and the desired state it last evaluated) avoids recompiling and reevaluating
+    the same schedule
+    """
+    key: Final = (
+        schedule.name,
+        schedule.timezone,
+        schedule.override_status,
+        tuple(
+            (
+                p["period"].name,
+                p["period"].begintime,
+                p["period"].endtime,
+                p["period"].cron_recurrence,
+                p.get("instancetype"),
+            )
+            for p in schedule.periods
+        ),
+    )
+    compiled = _compiled_schedules.get(key)
+    if compiled is None:
+        if len(_compiled_schedules) >= _MAX_COMPILED_SCHEDULES:
+            # evict the least recently compiled schedule
+            del _compiled_schedules[next(iter(_compiled_schedules))]
+        compiled = CompiledSchedule(schedule)
+        _compiled_schedules[key] = compiled
+    return compiled
+
+
+def _authoritative_period(
+    active: _ActivePeriods, minute: int
+) -> PeriodWithDesiredState:
+    running_periods: Final[list[PeriodWithDesiredState]] = [
+        {
+            "period": p.period,
+            "instancetype": p.instance_type,
+            "state": ScheduleState.RUNNING,
+        }
+        for p in active.periods
+        if p.running is not None and p.running[0] <= minute < p.running[1]
+    ]
+    return get_nearest_running_period(running_periods)
+
+
+def _running_state(period: PeriodWithDesiredState) -> DesiredState:
+    return ScheduleState.RUNNING, period["instancetype"], period["period"].name
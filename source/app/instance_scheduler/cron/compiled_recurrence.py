@@ -0,0 +1,216 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+"""
+Compiled form of a days/months recurrence expression
+
+Evaluating a recurrence by walking the expression tree on every call (as in `cron_to_running_period`) re-resolves
+ranges and month-dependent wildcards each time. Instead, each field is compiled once into a bitmask of the values it
+contains. Fields that depend on the length or layout of a month (L, nW, n#k, nL) cannot be resolved up front, so the
+combined set of days that satisfy the recurrence is resolved lazily once per (year, month) and cached as a bitmask
+with bit `d` set if day `d` of that month satisfies every field.
+
+Membership of a date is then a single bit test, and the per-month masks can be reused by anything that needs to
+iterate over the days that satisfy a recurrence.
+"""
+
+from calendar import monthrange
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Final
+
+from instance_scheduler.cron.cron_to_running_period import (
+    IntDomain,
+    _range_to_discrete_values,
+    resolve_last_weekday_as_monthday,
+    resolve_nearest_weekday_as_monthday,
+    resolve_nth_weekday_as_monthday,
+)
+from instance_scheduler.cron.expression import (
+    CronAll,
+    CronExpression,
+    CronLastWeekday,
+    CronNearestWeekday,
+    CronNthWeekday,
+    CronRange,
+    CronSingleValueLast,
+    CronSingleValueNumeric,
+    CronUnion,
+)
+
+MONTHS_DOMAIN: Final = IntDomain(1, 12)
+WEEKDAYS_DOMAIN: Final = IntDomain(0, 6)
+ALL_WEEKDAYS: Final = 0b1111111
+
+
+def _mask_of(values: set[int]) -> int:
+    mask = 0
+    for value in values:
+        if value >= 0:
+            mask |= 1 << value
+    return mask
+
+
+def _flatten(expr: CronExpression) -> list[CronExpression]:
+    if isinstance(expr, CronUnion):
+        return [part for sub_expr in expr.exprs for part in _flatten(sub_expr)]
+    return [expr]
+
+
+def _compile_months(expr: CronExpression) -> int:
+    mask = 0
+    for part in _flatten(expr):
+        match part:
+            case CronAll():
+                mask |= _mask_of(set(range(1, 13)))
+            case CronSingleValueNumeric():
+                mask |= _mask_of({part.value})
+            case CronRange():
+                mask |= _mask_of(_range_to_discrete_values(part, MONTHS_DOMAIN))
+            case CronSingleValueLast():
+                mask |= _mask_of({MONTHS_DOMAIN.end})
+            case CronNearestWeekday():
+                raise ValueError("Nearest Weekday not supported by month expression")
+            case CronNthWeekday():
+                raise ValueError("Nth Weekday not supported by month expression")
+            case CronLastWeekday():
+                raise ValueError("Last Weekday not supported by month expression")
+    return mask
+
+
+def _split_weekdays(
+    expr: CronExpression,
+) -> tuple[int, tuple[CronNthWeekday | CronLastWeekday, ...]]:
+    """split a weekday expression into a static mask of weekdays and the parts that depend on the month"""
+    mask = 0
+    month_dependent: list[CronNthWeekday | CronLastWeekday] = []
+    for part in _flatten(expr):
+        match part:
+            case CronAll():
+                mask |= ALL_WEEKDAYS
+            case CronSingleValueNumeric():
+                mask |= _mask_of({part.value})
+            case CronRange():
+                mask |= _mask_of(_range_to_discrete_values(part, WEEKDAYS_DOMAIN))
+            case CronSingleValueLast():
+                mask |= _mask_of({WEEKDAYS_DOMAIN.end})
+            case CronNthWeekday() | CronLastWeekday():
+                month_dependent.append(part)
+            case CronNearestWeekday():
+                raise NotImplementedError
+    return mask, tuple(month_dependent)
+
+
+def _resolve_monthdays(parts: tuple[CronExpression, ...], year: int, month: int) -> int:
+    _, days_in_month = monthrange(year, month)
+    domain = IntDomain(1, days_in_month)
+    first_of_month = date(year, month, 1)
+
+    mask = 0
+    for part in parts:
+        match part:
+            case CronAll():
+                mask |= _mask_of(set(range(1, days_in_month + 1)))
+            case CronSingleValueNumeric():
+                mask |= _mask_of({part.value})
+            case CronRange():
+                mask |= _mask_of(_range_to_discrete_values(part, domain))
+            case CronSingleValueLast():
+                mask |= _mask_of({days_in_month})
+            case CronNearestWeekday():
+                mask |= _mask_of(
+                    {
+                        resolve_nearest_weekday_as_monthday(
+                            part.value.value, first_of_month
+                        )
+                    }
+                )
+            case CronNthWeekday():
+                raise ValueError("Nth Weekday not supported by monthday expression")
+            case CronLastWeekday():
+                raise ValueError("Last Weekday not supported by monthday expression")
+    return mask
+
+
+def _resolve_weekdays(
+    static_mask: int,
+    month_dependent: tuple[CronNthWeekday | CronLastWeekday, ...],
+    year: int,
+    month: int,
+) -> int:
+    _, days_in_month = monthrange(year, month)
+    first_of_month = date(year, month, 1)
+    first_weekday = first_of_month.weekday()
+
+    mask = 0
+    if static_mask:
+        for day in range(1, days_in_month + 1):
+            if static_mask >> ((first_weekday + day - 1) % 7) & 1:
+                mask |= 1 << day
+
+    for part in month_dependent:
+        match part:
+            case CronNthWeekday():
+                monthday = resolve_nth_weekday_as_monthday(
+                    weekday=part.day.value, n=part.n, reference_date=first_of_month
+                )
+            case CronLastWeekday():
+                monthday = resolve_last_weekday_as_monthday(
+                    part.day.value, first_of_month
+                )
+        mask |= _mask_of({monthday})
+    return mask
+
+
+@dataclass
+class CompiledRecurrence:
+    """
+    a days/months recurrence expression compiled into bitmasks
+
+    use `compile_recurrence` to build an instance from the expression of each field
+    """
+
+    months_mask: int
+    """bit `m` is set if month `m` (1-12) satisfies the months field"""
+    monthday_parts: tuple[CronExpression, ...]
+    """the parts of the monthdays field, resolved per month"""
+    weekdays_mask: int
+    """bit `w` is set if weekday `w` (0-6, Monday is 0) satisfies the weekdays field in every month"""
+    month_dependent_weekdays: tuple[CronNthWeekday | CronLastWeekday, ...]
+    """the parts of the weekdays field that must be resolved per month"""
+    _month_masks: dict[tuple[int, int], int] = field(
+        default_factory=dict, repr=False, compare=False
+    )
+
+    def month_mask(self, year: int, month: int) -> int:
+        """bitmask of the days of the month that satisfy the recurrence, with bit `d` set for day `d`"""
+        key = (year, month)
+        mask = self._month_masks.get(key)
+        if mask is None:
+            mask = self._resolve_month(year, month)
+            self._month_masks[key] = mask
+        return mask
+
+    def contains(self, dt: date) -> bool:
+        """Does `dt` satisfy the recurrence"""
+        return bool(self.month_mask(dt.year, dt.month) >> dt.day & 1)
+
+    def _resolve_month(self, year: int, month: int) -> int:
+        # as with `in_period`, a date must satisfy every field of the recurrence
+        monthdays = _resolve_monthdays(self.monthday_parts, year, month)
+        if not self.months_mask >> month & 1:
+            return 0
+        return monthdays & _resolve_weekdays(
+            self.weekdays_mask, self.month_dependent_weekdays, year, month
+        )
+
+
+def compile_recurrence(
+    monthdays: CronExpression, months: CronExpression, weekdays: CronExpression
+) -> CompiledRecurrence:
+    weekdays_mask, month_dependent_weekdays = _split_weekdays(weekdays)
+    return CompiledRecurrence(
+        months_mask=_compile_months(months),
+        monthday_parts=tuple(_flatten(monthdays)),
+        weekdays_mask=weekdays_mask,
+        month_dependent_weekdays=month_dependent_weekdays,
+    )
@@ -2,12 +2,12 @@
 # SPDX-License-Identifier: Apache-2.0
 from dataclasses import dataclass
 from datetime import datetime
+from functools import cached_property, lru_cache
 from typing import Any
 
-from instance_scheduler.cron.cron_to_running_period import (
-    monthday_cron_expr_contains,
-    months_cron_expr_contains,
-    weekday_cron_expr_contains,
+from instance_scheduler.cron.compiled_recurrence import (
+    CompiledRecurrence,
+    compile_recurrence,
 )
 from instance_scheduler.cron.expression import CronAll, CronExpression
 from instance_scheduler.cron.parser import (
@@ -42,6 +42,11 @@ class CronRecurrenceExpression:
             weekdays=parse_weekdays_expr(weekdays),
         )
 
+    @cached_property
+    def compiled(self) -> CompiledRecurrence:
+        """this expression compiled into bitmasks, shared between equal expressions"""
+        return _compile(self)
+
     def contains(self, dt: datetime) -> bool:
         """Does `dt` satisfy the recurrence defined in `expr`"""
         # When both days-of-month and days-of-week are specified, the normal behavior for
@@ -52,10 +57,11 @@ class CronRecurrenceExpression:
         # days that satisfy the intersection of days-of-month and days-of-week satisfy the
         # expression. This is a departure from standard cron behavior that may surprise
         # customers.
-        return all(
-            (
-                monthday_cron_expr_contains(self.monthdays, dt),
-                months_cron_expr_contains(self.months, dt),
-                weekday_cron_expr_contains(self.weekdays, dt),
-            )
-        )
+        return self.compiled.contains(dt)
+
+
+@lru_cache(maxsize=1024)
+def _compile(expr: CronRecurrenceExpression) -> CompiledRecurrence:
+    return compile_recurrence(
+        monthdays=expr.monthdays, months=expr.months, weekdays=expr.weekdays
+    )
@@ -8,14 +8,19 @@ Use knowledge of the features supported by Instance Scheduler periods. Though ea
 supports different features, it is more convenient to allow any reasonable expression to
 be parsed, then later use a validator for the specific field to raise errors. This way
 we only have to define one set of parsers.
+
+Each comma-separated term is tokenized and parsed in a single pass. Parsed expressions are
+memoized by field and input strings, because the same period definitions are parsed on
+every scheduling request.
 """
 
 import re
-from collections.abc import Callable, Mapping
-from dataclasses import replace
-from functools import partial
+from collections.abc import Mapping
+from dataclasses import dataclass
+from enum import Enum
+from functools import lru_cache
 from itertools import chain
-from typing import Final
+from typing import Final, Iterable, NamedTuple, NoReturn, Optional
 
 from instance_scheduler.cron.expression import (
     CronAll,
@@ -51,65 +56,67 @@ def parse_period_def(
     )
 
 
+class _Field(Enum):
+    MONTHS = "months"
+    MONTHDAYS = "monthdays"
+    WEEKDAYS = "weekdays"
+
+
 def parse_months_expr(months_expr: PeriodDefnStr) -> CronExpression:
-    result: Final = _parse_multi_general(months_expr, _month_name_to_value)
-    validate_months_expression(result)
-    return result
+    return _parse_field(_Field.MONTHS, _freeze(months_expr))
 
 
 def parse_monthdays_expr(monthdays_expr: PeriodDefnStr) -> CronExpression:
-    result: Final = _parse_multi_general(monthdays_expr, {})
-    validate_monthdays_expression(result)
-    return result
+    return _parse_field(_Field.MONTHDAYS, _freeze(monthdays_expr))
 
 
 def parse_weekdays_expr(weekdays_expr: PeriodDefnStr) -> CronExpression:
-    result: Final = _parse_multi_general(weekdays_expr, _weekday_name_to_value)
-    validate_weekdays_expression(result)
+    return _parse_field(_Field.WEEKDAYS, _freeze(weekdays_expr))
+
+
+def _freeze(exprs: Optional[Iterable[str]]) -> Optional[frozenset[str]]:
+    return None if exprs is None else frozenset(exprs)
+
+
+@lru_cache(maxsize=2048)
+def _parse_field(field: _Field, exprs: Optional[frozenset[str]]) -> CronExpression:
+    """parse and validate an expression for a field. Expressions are immutable, so results can be shared"""
+    match field:
+        case _Field.MONTHS:
+            result = _parse_multi_general(exprs, _month_name_to_value)
+            validate_months_expression(result)
+        case _Field.MONTHDAYS:
+            result = _parse_multi_general(exprs, {})
+            validate_monthdays_expression(result)
+        case _Field.WEEKDAYS:
+            result = _parse_multi_general(exprs, _weekday_name_to_value)
+            validate_weekdays_expression(result)
     return result
 
 
 def _parse_multi_general(
-    exprs: PeriodDefnStr, domain: Mapping[str, int]
+    exprs: Optional[Iterable[str]], domain: Mapping[str, int]
 ) -> CronExpression:
     if exprs is None:
         return CronAll()
-    if len(exprs) == 0:
+    terms: Final = list(exprs)
+    if len(terms) == 0:
         raise ValueError("Zero-length string set is malformed")
-    if len(exprs) == 1:
-        return _parse_single_general(next(iter(exprs)), domain)
+    if len(terms) == 1:
+        return _parse_single_general(terms[0], domain)
     else:
         return CronUnion(
-            exprs=tuple(_parse_single_general(expr, domain) for expr in exprs)
+            exprs=tuple(_parse_single_general(expr, domain) for expr in terms)
         )
 
 
 def _parse_single_general(expr: str, domain: Mapping[str, int]) -> CronExpression:
-    exprs: Final = expr.split(",")
-    if len(exprs) > 1:
+    terms: Final = _split_terms(expr.lower())
+    if len(terms) > 1:
         return CronUnion(
-            exprs=tuple(_parse_single_general(sub_expr, domain) for sub_expr in exprs)
+            exprs=tuple(_TermParser(expr, term, domain).parse() for term in terms)
         )
-    return _general_parse(exprs[0].strip().lower(), domain)
-
-
-def _general_parse(expr: str, domain: Mapping[str, int]) -> CronExpression:
-    parsers: Final[list[Callable[[str], CronExpression]]] = [
-        partial(_parse_single_value_general, domain=domain),
-        _parse_all_values,
-        _parse_last_value,
-        partial(_parse_step, domain=domain),
-        partial(_parse_range, domain=domain),
-        partial(_parse_nth_weekday, domain=domain),
-        partial(_parse_last_weekday, domain=domain),
-        _parse_nearest_weekday,
-    ]
-    for parser in parsers:
-        try:
-            return parser(expr)
-        except ValueError:
-            pass
-    raise ValueError(f"Could not parse as any form of cron expression: {expr}")
+    return _TermParser(expr, terms[0], domain).parse()
 
 
 # period definitions are not localized
@@ -151,148 +158,197 @@ _weekday_name_to_value: Final = {
 }
 
 
-_single_value_re: Final = re.compile(r"^(\d+)$")
-
-
-def _parse_single_numeric_value(expr: str) -> CronSingleValueNumeric:
-    if not (match := _single_value_re.match(expr)):
-        raise ValueError(f"Could not parse as single numeric value: {expr}")
-
-    value: Final = int(match.group(1))
-    return CronSingleValueNumeric(value=value)
-
-
-def _parse_single_numeric_value_by_name(
-    expr: str, domain: Mapping[str, int]
-) -> CronSingleValueNumeric:
-    if expr.lower() not in domain:
-        raise ValueError(f"Could not parse as single name: {expr}")
-
-    value: Final = domain[expr]
-    return CronSingleValueNumeric(value=value)
-
-
-def _parse_single_value_numeric(
-    expr: str, domain: Mapping[str, int]
-) -> CronSingleValueNumeric:
-    parsers: Final[list[Callable[[str], CronSingleValueNumeric]]] = [
-        _parse_single_numeric_value,
-        partial(_parse_single_numeric_value_by_name, domain=domain),
-    ]
-    for parser in parsers:
-        try:
-            return parser(expr)
-        except ValueError:
-            pass
-    raise ValueError(f"Could not parse as single value: {expr}")
-
-
-def _parse_single_value_general(
-    expr: str, domain: Mapping[str, int]
-) -> CronSingleValueNumeric | CronSingleValueLast:
-    parsers: Final[
-        list[Callable[[str], CronSingleValueNumeric | CronSingleValueLast]]
-    ] = [
-        _parse_single_numeric_value,
-        partial(_parse_single_numeric_value_by_name, domain=domain),
-        _parse_last_value,
-    ]
-    for parser in parsers:
-        try:
-            return parser(expr)
-        except ValueError:
-            pass
-    raise ValueError(f"Could not parse as single value: {expr}")
-
-
-_last_re: Final = re.compile(r"^L$", flags=re.IGNORECASE)
-
-
-def _parse_last_value(expr: str) -> CronSingleValueLast:
-    if not _last_re.match(expr):
-        raise ValueError(f"Could not parse as last value wildcard: {expr}")
-
-    return CronSingleValueLast()
-
-
-all_values_re: Final = re.compile(r"^[*?]$")
-
-
-def _parse_all_values(expr: str) -> CronAll:
-    if not all_values_re.match(expr):
-        raise ValueError(f"Could not parse as all values wildcard: {expr}")
-
-    return CronAll()
-
-
-_step_re: Final = re.compile(r"^(.+)/.*(\d+).*$")
-
-
-def _parse_step(expr: str, domain: Mapping[str, int]) -> CronRange:
-    if not (match := _step_re.match(expr)):
-        raise ValueError(f"Could not parse as step expression: {expr}")
-
-    range_expr: Final = match.group(1)
-    interval: Final = int(match.group(2).strip())
-
-    try:
-        range_ = _parse_range(range_expr, domain=domain)
-        return replace(range_, interval=interval)
-    except ValueError:
-        pass
-
-    try:
-        start: Final = _parse_single_value_general(range_expr, domain)
-        if isinstance(start, CronSingleValueLast):
-            raise ValueError(f"Unable to parse step expression starting with L: {expr}")
-        return CronRange(start=start, interval=interval)
-    except ValueError:
-        raise ValueError(f"Could not parse range of step expression: {expr}")
-
-
-_range_re: Final = re.compile(r"^(.+)-(.+)$")
-
-
-def _parse_range(expr: str, domain: Mapping[str, int]) -> CronRange:
-    if not (match := _range_re.match(expr)):
-        raise ValueError(f"Could not parse as range expression: {expr}")
-
-    start: Final = _parse_single_value_general(match.group(1).strip(), domain)
-    end: Final = _parse_single_value_general(match.group(2).strip(), domain)
-
-    if isinstance(start, CronSingleValueLast):
-        raise ValueError(f"Unable to parse range expression starting with L: {expr}")
-
-    return CronRange(start=start, end=end)
-
-
-_nth_weekday_re: Final = re.compile(r"^(.*)#(\d+)$")
-
-
-def _parse_nth_weekday(expr: str, domain: Mapping[str, int]) -> CronExpression:
-    if not (match := _nth_weekday_re.match(expr)):
-        raise ValueError(f"Could not parse as Nth weekday expression: {expr}")
-
-    return CronNthWeekday(
-        day=_parse_single_value_numeric(match.group(1), domain), n=int(match.group(2))
-    )
-
-
-_last_weekday_re: Final = re.compile(r"^(.*)L$", flags=re.IGNORECASE)
-
-
-def _parse_last_weekday(expr: str, domain: Mapping[str, int]) -> CronExpression:
-    if not (match := _last_weekday_re.match(expr)):
-        raise ValueError(f"Could not parse as last weekday expression: {expr}")
-
-    return CronLastWeekday(day=_parse_single_value_numeric(match.group(1), domain))
-
-
-_nearest_weekday_re: Final = re.compile(r"^(\d+)W$", flags=re.IGNORECASE)
-
-
-def _parse_nearest_weekday(expr: str) -> CronExpression:
-    if not (match := _nearest_weekday_re.match(expr)):
-        raise ValueError(f"Could not parse as nearest weekday expression: {expr}")
+class _TokenKind(Enum):
+    NUMBER = "number"
+    WORD = "word"
+    SYMBOL = "symbol"
+
+
+class _Token(NamedTuple):
+    kind: _TokenKind
+    text: str
+    position: int
+    """offset of the token within the full expression string"""
+    adjacent: bool
+    """the token immediately follows the previous token, without whitespace"""
+
+
+_token_re: Final = re.compile(r"([0-9]+)|([a-z]+)|(\S)")
+# indexed by the number of the group that matched, minus one
+_token_kinds: Final = (_TokenKind.NUMBER, _TokenKind.WORD, _TokenKind.SYMBOL)
+
+
+@dataclass(frozen=True)
+class _Term:
+    tokens: list[_Token]
+    position: int
+    """offset of the end of the term within the full expression string"""
+
+
+def _split_terms(expr: str) -> list[_Term]:
+    """tokenize a (lower-cased) expression, splitting it into comma-separated terms"""
+    terms: list[_Term] = []
+    tokens: list[_Token] = []
+    previous_end = -1
+    for match in _token_re.finditer(expr):
+        text = match.group()
+        start = match.start()
+        if text == ",":
+            terms.append(_Term(tokens, start))
+            tokens = []
+        else:
+            kind = _token_kinds[(match.lastindex or 1) - 1]
+            tokens.append(_Token(kind, text, start, start == previous_end))
+        previous_end = match.end()
+    terms.append(_Term(tokens, len(expr)))
+    return terms
+
+
+class _TermParser:
+    """
+    recursive-descent parser for a single comma-separated term:
+
+        term    := "*" | "?" | value [ suffix | "#" NUMBER | "-" value ] [ "/" NUMBER ]
+        value   := NUMBER | name | "l"
+        suffix  := "w" | "l"            (must immediately follow the value)
+    """
+
+    def __init__(self, expr: str, term: _Term, domain: Mapping[str, int]) -> None:
+        self._expr = expr
+        self._tokens = term.tokens
+        self._end_position = term.position
+        self._domain = domain
+        self._index = 0
+
+    def parse(self) -> CronExpression:
+        if not self._tokens:
+            self._fail("expected a value")
+
+        if self._tokens[0].text in ("*", "?"):
+            self._index += 1
+            self._expect_end()
+            return CronAll()
+
+        value = self._parse_value()
+        if isinstance(value, (CronNearestWeekday, CronLastWeekday)):
+            return value
+
+        operator = self._peek()
+        if operator is None:
+            return value
+
+        if operator.text == "#":
+            if not isinstance(value, CronSingleValueNumeric):
+                self._fail("nth weekday requires a numeric or named day", 0)
+            self._index += 1
+            n = self._expect_number("occurrence after #")
+            self._expect_end()
+            return CronNthWeekday(day=value, n=n)
+
+        if operator.text in ("-", "/"):
+            if not isinstance(value, CronSingleValueNumeric):
+                self._fail("range cannot start with L", 0)
+            end = self._parse_range_end()
+            interval = self._parse_interval()
+            self._expect_end()
+            return CronRange(start=value, end=end, interval=interval)
+
+        self._fail(f"unexpected '{operator.text}'", self._index)
+
+    def _parse_value(
+        self,
+    ) -> (
+        CronSingleValueNumeric
+        | CronSingleValueLast
+        | CronNearestWeekday
+        | CronLastWeekday
+    ):
+        """parse a single value, including the nW and nL forms, which must end the term"""
+        token = self._next("expected a value")
+        if token.kind == _TokenKind.NUMBER:
+            value = CronSingleValueNumeric(int(token.text))
+            suffix = self._peek()
+            if (
+                suffix is not None
+                and suffix.adjacent
+                and suffix.kind == _TokenKind.WORD
+                and suffix.text in ("w", "l")
+            ):
+                self._index += 1
+                self._expect_end()
+                if suffix.text == "w":
+                    return CronNearestWeekday(value=value)
+                return CronLastWeekday(day=value)
+            return value
+        if token.kind == _TokenKind.WORD:
+            if token.text in self._domain:
+                return CronSingleValueNumeric(self._domain[token.text])
+            if token.text == "l":
+                return CronSingleValueLast()
+            if token.text.endswith("l") and token.text[:-1] in self._domain:
+                self._expect_end()
+                return CronLastWeekday(
+                    day=CronSingleValueNumeric(self._domain[token.text[:-1]])
+                )
+            self._fail(f"unrecognized name '{token.text}'", self._index - 1)
+        self._fail(f"unexpected '{token.text}'", self._index - 1)
+
+    def _parse_range_end(
+        self,
+    ) -> Optional[CronSingleValueNumeric | CronSingleValueLast]:
+        if not self._accept_symbol("-"):
+            return None
+        value_index = self._index
+        end = self._parse_value()
+        if isinstance(end, (CronNearestWeekday, CronLastWeekday)):
+            self._fail("range must end with a single value", value_index)
+        return end
+
+    def _parse_interval(self) -> int:
+        if not self._accept_symbol("/"):
+            return 1
+        return self._expect_number("step interval after /")
+
+    def _expect_number(self, description: str) -> int:
+        token = self._next(f"expected {description}")
+        if token.kind != _TokenKind.NUMBER:
+            self._fail(f"expected {description}", self._index - 1)
+        return int(token.text)
+
+    def _expect_end(self) -> None:
+        if self._index < len(self._tokens):
+            self._fail(f"unexpected '{self._tokens[self._index].text}'", self._index)
+
+    def _peek(self) -> Optional[_Token]:
+        return self._tokens[self._index] if self._index < len(self._tokens) else None
+
+    def _peek_symbol(self, symbol: str) -> bool:
+        token = self._peek()
+        return (
+            token is not None
+            and token.kind == _TokenKind.SYMBOL
+            and token.text == symbol
+        )
 
-    return CronNearestWeekday(value=CronSingleValueNumeric(int(match.group(1))))
+    def _accept_symbol(self, symbol: str) -> bool:
+        if self._peek_symbol(symbol):
+            self._index += 1
+            return True
+        return False
+
+    def _next(self, error: str) -> _Token:
+        token = self._peek()
+        if token is None:
+            self._fail(error)
+        self._index += 1
+        return token
+
+    def _fail(self, reason: str, token_index: Optional[int] = None) -> NoReturn:
+        position = (
+            self._tokens[token_index].position
+            if token_index is not None and token_index < len(self._tokens)
+            else self._end_position
+        )
+        raise ValueError(
+            f"Could not parse cron expression {self._expr!r} at position {position}: {reason}"
+        )
@@ -5,11 +5,16 @@ import json
 from collections.abc import Mapping
 from datetime import datetime, timezone
 from typing import TYPE_CHECKING, Any, Callable, TypeGuard, cast
-from zoneinfo import ZoneInfo
 
 from instance_scheduler import __version__
+from instance_scheduler.configuration.instance_schedule import InstanceSchedule
 from instance_scheduler.handler.base import MainHandler
+from instance_scheduler.handler.cli.schedule_transitions import (
+    DEFAULT_TRANSITION_COUNT,
+    get_schedule_transitions,
+)
 from instance_scheduler.handler.cli.schedule_usage import get_schedule_usage
+from instance_scheduler.handler.cli.usage_forecast import forecast_usage
 from instance_scheduler.handler.environments.main_lambda_environment import (
     MainLambdaEnv,
 )
@@ -18,21 +23,33 @@ from instance_scheduler.model.period_definition import (
     PeriodDefinition,
     validate_as_period_params,
 )
+from instance_scheduler.model.registry_counts import (
+    TargetResourceCounts,
+    count_resources_by_target,
+)
 from instance_scheduler.model.schedule_definition import (
+    InvalidScheduleDefinition,
     ScheduleDefinition,
     validate_as_schedule_params,
 )
 from instance_scheduler.model.store.dynamo_period_definition_store import (
     DynamoPeriodDefinitionStore,
 )
+from instance_scheduler.model.store.dynamo_resource_registry import (
+    DynamoResourceRegistry,
+)
 from instance_scheduler.model.store.dynamo_schedule_definition_store import (
     DynamoScheduleDefinitionStore,
 )
+from instance_scheduler.model.store.in_memory_period_definition_store import (
+    InMemoryPeriodDefinitionStore,
+)
 from instance_scheduler.model.store.period_definition_store import (
     PeriodAlreadyExistsException,
     PeriodDefinitionStore,
     UnknownPeriodException,
 )
+from instance_scheduler.model.store.registry_counter_store import RegistryCounterStore
 from instance_scheduler.model.store.schedule_definition_store import (
     ScheduleAlreadyExistsException,
     UnknownScheduleException,
@@ -41,9 +58,14 @@ from instance_scheduler.observability.powertools_logging import powertools_logge
 from instance_scheduler.ops_metrics.metric_type.cli_request_metric import (
     CliRequestMetric,
 )
-from instance_scheduler.ops_metrics.metrics import collect_metric
+from instance_scheduler.ops_metrics.metrics import collect_metric, flush_metrics
 from instance_scheduler.util import safe_json
-from instance_scheduler.util.validation import ValidationException, validate_string
+from instance_scheduler.util.time import get_timezone
+from instance_scheduler.util.validation import (
+    ValidationException,
+    validate_int,
+    validate_string,
+)
 from packaging.version import Version
 
 if TYPE_CHECKING:
@@ -90,6 +112,7 @@ class CliRequestHandler(MainHandler[AdminCliRequest]):
         self._context = context
         self._schedule_store = DynamoScheduleDefinitionStore(env.config_table_name)
         self._period_store = DynamoPeriodDefinitionStore(env.config_table_name)
+        self._registry_table = env.registry_table
 
     @property
     def action(self) -> Any:
@@ -191,6 +214,8 @@ class CliRequestHandler(MainHandler[AdminCliRequest]):
         except Exception as ex:
             logger.info(f"Call failed, error is {str(ex)}")
             return {"Error": str(ex)}
+        finally:
+            flush_metrics(logger)
 
     def handle_command(self, command: str, parameters: dict[str, Any]) -> Any:
         commands: dict[str, Callable[[dict[str, Any]], Any]] = {
@@ -203,6 +228,8 @@ class CliRequestHandler(MainHandler[AdminCliRequest]):
             "update-period": self.update_period_cmd,
             "update-schedule": self.update_schedule_cmd,
             "describe-schedule-usage": self.describe_schedule_usage_command,
+            "describe-usage-forecast": self.describe_usage_forecast_command,
+            "describe-schedule-transitions": self.describe_schedule_transitions_command,
         }
 
         command_func = commands.get(command)
@@ -408,7 +435,7 @@ class CliRequestHandler(MainHandler[AdminCliRequest]):
             raise ValueError(f"error: invalid enddate {parameters.get('enddate')}, {e}")
 
         # name, start_date, and end_date parsed
-        tz = ZoneInfo(schedule.timezone) if schedule.timezone else timezone.utc
+        tz = get_timezone(schedule.timezone) if schedule.timezone else timezone.utc
         start_date = start_date.replace(tzinfo=tz) if start_date else None
         end_date = end_date.replace(tzinfo=tz) if end_date else None
         return get_schedule_usage(
@@ -417,6 +444,69 @@ class CliRequestHandler(MainHandler[AdminCliRequest]):
             end_date,
         )
 
+    def describe_schedule_transitions_command(self, parameters: dict[str, Any]) -> Any:
+        validate_string(parameters, "name", required=True)
+        validate_string(parameters, "after", required=False)
+        validate_int(parameters, "count", required=False)
+
+        name: str = cast(str, parameters.get("name"))
+
+        schedule = self._schedule_store.find_by_name(name)
+        if schedule is None:
+            raise ValueError(f"not found: schedule {name} does not exist")
+        try:
+            after = optionally(datetime.fromisoformat, parameters.get("after"), None)
+        except ValueError as e:
+            raise ValueError(
+                f"error: invalid after {parameters.get('after')}, must be a valid ISO 8601 date and time {e}"
+            )
+
+        return get_schedule_transitions(
+            schedule.to_instance_schedule(self._period_store),
+            after,
+            cast(int, parameters.get("count", DEFAULT_TRANSITION_COUNT)),
+        )
+
+    def describe_usage_forecast_command(self, parameters: dict[str, Any]) -> Any:
+        validate_string(parameters, "startdate", required=True)
+        validate_string(parameters, "enddate", required=True)
+
+        try:
+            start_date = _parse_date(cast(str, parameters.get("startdate"))).date()
+        except ValueError as e:
+            raise ValueError(
+                f"error: invalid startdate {parameters.get('startdate')}, {e}"
+            )
+        try:
+            end_date = _parse_date(cast(str, parameters.get("enddate"))).date()
+        except ValueError as e:
+            raise ValueError(f"error: invalid enddate {parameters.get('enddate')}, {e}")
+        if start_date > end_date:
+            raise ValueError("stop_date must be equal or later than start_date")
+
+        # load every period once rather than once per schedule that references it
+        period_store = InMemoryPeriodDefinitionStore(self._period_store.find_all())
+        schedules: dict[str, InstanceSchedule] = {}
+        for name, schedule_def in self._schedule_store.find_all().items():
+            try:
+                schedules[name] = schedule_def.to_instance_schedule(period_store)
+            except InvalidScheduleDefinition as e:
+                logger.warning(f"Unable to forecast usage of schedule {name}: {e}")
+
+        return forecast_usage(
+            schedules, self._registered_resource_counts(), start_date, end_date
+        )
+
+    def _registered_resource_counts(self) -> list[TargetResourceCounts]:
+        counter_store = RegistryCounterStore(self._registry_table)
+        if counter_store.last_reconciled() is not None:
+            return counter_store.find_all()
+        # the counters have not been built yet (they are built by the heartbeat metrics reporter), so count from a
+        # full listing of the registry without storing the result
+        return count_resources_by_target(
+            DynamoResourceRegistry(self._registry_table).find_all()
+        )
+
 
 def _strip_none_values(dict_to_strip: dict[str, Any]) -> dict[str, Any]:
     return {k: v for k, v in dict_to_strip.items() if v is not None}
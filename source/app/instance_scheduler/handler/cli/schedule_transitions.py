@@ -0,0 +1,41 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+from datetime import datetime
+from typing import Any, Final, Optional
+
+from instance_scheduler.configuration.instance_schedule import InstanceSchedule
+
+DEFAULT_TRANSITION_COUNT: Final = 10
+MAX_TRANSITION_COUNT: Final = 1000
+
+
+def get_schedule_transitions(
+    schedule: InstanceSchedule,
+    after: Optional[datetime] = None,
+    count: int = DEFAULT_TRANSITION_COUNT,
+) -> Any:
+    """
+    the next times at which the desired state of a schedule changes, within a year of `after` (default now). A naive
+    `after` is in the timezone of the schedule
+    """
+    if not 0 < count <= MAX_TRANSITION_COUNT:
+        raise ValueError(f"count must be between 1 and {MAX_TRANSITION_COUNT}")
+    if after is None:
+        after = datetime.now(schedule.timezone)
+    elif after.tzinfo is None:
+        after = after.replace(tzinfo=schedule.timezone)
+
+    return {
+        "schedule": schedule.name,
+        "timezone": str(schedule.timezone),
+        "after": after.astimezone(schedule.timezone).isoformat(),
+        "transitions": [
+            {
+                "time": transition.time.isoformat(),
+                "state": transition.state.value,
+                "instance_type": transition.instance_type,
+                "period": transition.period,
+            }
+            for transition in schedule.next_transitions(after, count)
+        ],
+    }
@@ -1,12 +1,12 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
 import json
-from datetime import datetime, timedelta
+from collections.abc import Iterator
+from datetime import date, datetime, timedelta
 from typing import Any, Optional
 
-from aws_lambda_powertools import Logger
 from instance_scheduler.configuration.instance_schedule import InstanceSchedule
-from instance_scheduler.scheduling.states import InstanceState, ScheduleState
+from instance_scheduler.configuration.schedule_intervals import CompiledSchedule
 
 
 def get_schedule_usage(
@@ -25,107 +25,87 @@ def get_schedule_usage(
     start = start.replace(tzinfo=schedule.timezone)
     end = end.replace(tzinfo=schedule.timezone)
 
-    return _for_output(
-        calculate_schedule_usage_for_period(schedule, start_dt=start, stop_dt=end)
-    )
+    # each day is converted to its output form as it is computed, so only the output is held for long date ranges
+    return {
+        "schedule": schedule.name,
+        "usage": {
+            str(day): _for_output(usage)
+            for day, usage in iter_schedule_usage(schedule, start_dt=start, stop_dt=end)
+        },
+    }
 
 
-def calculate_schedule_usage_for_period(  # NOSONAR -- (cog-complexity) Deferred - requires an algorithmic rewrite,
-    # not just cleanup. preferably using simulation of actual schedule code rather than estimation
+def calculate_schedule_usage_for_period(
     schedule: InstanceSchedule,
     start_dt: datetime,
     stop_dt: Optional[datetime] = None,
-    logger: Optional[Logger] = None,
 ) -> dict[str, Any]:
-    result = {}
+    return {
+        "schedule": schedule.name,
+        "usage": {
+            str(day): usage
+            for day, usage in iter_schedule_usage(schedule, start_dt, stop_dt)
+        },
+    }
 
+
+def iter_schedule_usage(
+    schedule: InstanceSchedule,
+    start_dt: datetime,
+    stop_dt: Optional[datetime] = None,
+) -> Iterator[tuple[date, dict[str, Any]]]:
+    """
+    yields the usage of a schedule for each day from the date of `start_dt` up to `stop_dt`
+
+    billing durations are the time that elapses between the local begin and end times of each running period, so
+    they are shorter or longer than the difference between the wall-clock times on days with a daylight saving time
+    transition
+    """
     stop = stop_dt or start_dt
     if start_dt > stop:
         raise ValueError("stop_date must be equal or later than start_date")
 
-    dt = (
-        start_dt
-        if isinstance(start_dt, datetime)
-        else datetime(start_dt.year, start_dt.month, start_dt.day)
-    )
-    dt = dt.replace(tzinfo=schedule.timezone)
-
-    while dt <= stop:
-        timeline = {dt.replace(hour=0, minute=0)}
-        for p in schedule.periods:
-            begintime = p["period"].begintime
-            endtime = p["period"].endtime
-            if begintime is None and endtime is None:
-                timeline.add(dt.replace(hour=0, minute=0))
-                timeline.add(dt.replace(hour=23, minute=59))
-            else:
-                if begintime:
-                    timeline.add(
-                        dt.replace(hour=begintime.hour, minute=begintime.minute)
-                    )
-                if endtime:
-                    timeline.add(dt.replace(hour=endtime.hour, minute=endtime.minute))
-
-        running_periods = {}
-        started = None
-        starting_period = None
-        current_state: InstanceState = InstanceState.UNKNOWN
-        for tm in sorted(list(timeline)):
-            desired_state, _, period = schedule.get_desired_state(tm, logger, False)
-
-            if current_state != desired_state:  # type: ignore[comparison-overlap]
-                if desired_state == ScheduleState.RUNNING:
-                    started = tm
-                    current_state = InstanceState.RUNNING
-                    starting_period = period
-                elif desired_state == ScheduleState.STOPPED:
-                    stopped = tm
-                    (
-                        desired_state_with_adj_check,
-                        __,
-                        ___,
-                    ) = schedule.get_desired_state(tm, logger, True)
-                    if desired_state_with_adj_check == ScheduleState.RUNNING:
-                        stopped += timedelta(minutes=1)
-                    if current_state == InstanceState.RUNNING:
-                        current_state = InstanceState.STOPPED
-                        running_periods[starting_period] = _make_period(
-                            started, stopped
-                        )
-
-        if current_state == InstanceState.RUNNING:
-            stopped = dt.replace(hour=23, minute=59) + timedelta(minutes=1)
-            running_periods[starting_period] = _make_period(started, stopped)
-
-        result[str(dt.date())] = {
+    first_day = start_dt.date()
+    last_day = first_day + timedelta(days=(stop - start_dt).days)
+    compiled = CompiledSchedule(schedule)
+
+    for day, intervals in compiled.iter_running_intervals(first_day, last_day):
+        running_periods: dict[str, dict[str, Any]] = {}
+        for interval in intervals:
+            elapsed_seconds = int(compiled.elapsed_seconds(day, interval))
+            # a period skipped entirely by a daylight saving time transition never starts an instance
+            if elapsed_seconds > 0:
+                running_periods[interval.period_name] = _make_period(
+                    compiled.local_datetime(day, interval.begin),
+                    compiled.local_datetime(day, interval.end),
+                    elapsed_seconds,
+                )
+
+        yield day, {
             "running_periods": running_periods,
             "billing_seconds": sum(
-                [running_periods[ps]["billing_seconds"] for ps in running_periods]
-            ),
-            "billing_hours": sum(
-                [running_periods[ph]["billing_hours"] for ph in running_periods]
+                p["billing_seconds"] for p in running_periods.values()
             ),
+            "billing_hours": sum(p["billing_hours"] for p in running_periods.values()),
         }
 
-        dt += timedelta(days=1)
 
-    return {"schedule": schedule.name, "usage": result}
+def _running_seconds(elapsed_seconds: int) -> int:
+    return max(elapsed_seconds, 60)
 
 
-def _running_seconds(startdt: datetime, stopdt: datetime) -> int:
-    return max(int((stopdt - startdt).total_seconds()), 60)
+def _running_hours(elapsed_seconds: int) -> int:
+    return int((elapsed_seconds - 1) / 3600) + 1
 
 
-def _running_hours(startdt: datetime, stopdt: datetime) -> int:
-    return int(((stopdt - startdt).total_seconds() - 1) / 3600) + 1
-
-
-def _make_period(started_dt: Any, stopped_dt: Any) -> dict[str, Any]:
+def _make_period(
+    started_dt: datetime, stopped_dt: datetime, elapsed_seconds: int
+) -> dict[str, Any]:
     running_period = {
         "begin": started_dt,
         "end": stopped_dt,
-        "billing_hours": _running_hours(started_dt, stopped_dt),
-        "billing_seconds": _running_seconds(started_dt, stopped_dt),
+        "billing_hours": _running_hours(elapsed_seconds),
+        "billing_seconds": _running_seconds(elapsed_seconds),
     }
     return running_period
 
@@ -0,0 +1,107 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+"""
+Forecast of the running hours of every registered resource over a date range
+
+Resources on the same schedule run for the same hours, so the running hours of each schedule are computed once from
+its running intervals and multiplied by the number of resources registered to it. Resource counts are read from the
+aggregate counters of the registry, so the cost of a forecast depends on the number of schedules and days rather than
+on the number of registered resources.
+"""
+
+from collections import Counter, defaultdict
+from collections.abc import Iterable, Mapping
+from datetime import date
+from typing import Any, Final, Optional
+
+from instance_scheduler.configuration.instance_schedule import InstanceSchedule
+from instance_scheduler.configuration.schedule_intervals import CompiledSchedule
+from instance_scheduler.model.registry_counts import TargetResourceCounts
+
+CURRENT_INSTANCE_TYPE: Final = "current"
+"""resources that run without a period instance type keep the type they currently have"""
+
+# only EC2 instances are resized to the instance type of the running period
+RESIZABLE_SERVICES: Final = frozenset({"ec2"})
+
+
+def schedule_running_hours(
+    schedule: InstanceSchedule, first_day: date, last_day: date
+) -> dict[Optional[str], float]:
+    """
+    the hours a single resource runs on a schedule from `first_day` to `last_day` (inclusive, in the timezone of the
+    schedule), by the instance type of the period it runs in
+    """
+    compiled: Final = CompiledSchedule(schedule)
+    seconds: defaultdict[Optional[str], float] = defaultdict(float)
+    for day, intervals in compiled.iter_running_intervals(first_day, last_day):
+        for interval in intervals:
+            seconds[interval.instance_type] += max(
+                compiled.elapsed_seconds(day, interval), 0
+            )
+    return {instance_type: total / 3600 for instance_type, total in seconds.items()}
+
+
+def forecast_usage(
+    schedules: Mapping[str, InstanceSchedule],
+    resource_counts: Iterable[TargetResourceCounts],
+    first_day: date,
+    last_day: date,
+) -> dict[str, Any]:
+    """
+    forecast the running hours of registered resources by schedule, service, and instance type
+
+    resources registered to schedules that are not in `schedules` are not forecast, and the names of those schedules
+    are returned in "unknown_schedules"
+    """
+    resources: Counter[tuple[str, str]] = Counter()
+    for target in resource_counts:
+        for schedule_name, count in target.schedule_counts.items():
+            if count > 0:
+                resources[(schedule_name, target.service)] += count
+
+    hours_by_schedule: dict[str, dict[Optional[str], float]] = {}
+    unknown_schedules: set[str] = set()
+    forecast: list[dict[str, Any]] = []
+    total_hours = 0.0
+
+    for (schedule_name, service), num_resources in sorted(resources.items()):
+        schedule = schedules.get(schedule_name)
+        if schedule is None:
+            unknown_schedules.add(schedule_name)
+            continue
+        if schedule_name not in hours_by_schedule:
+            hours_by_schedule[schedule_name] = schedule_running_hours(
+                schedule, first_day, last_day
+            )
+
+        hours_by_type: defaultdict[str, float] = defaultdict(float)
+        for instance_type, hours in hours_by_schedule[schedule_name].items():
+            if instance_type and service in RESIZABLE_SERVICES:
+                hours_by_type[instance_type] += hours
+            else:
+                hours_by_type[CURRENT_INSTANCE_TYPE] += hours
+        if not hours_by_type:
+            # the schedule does not run at all in the date range
+            hours_by_type[CURRENT_INSTANCE_TYPE] = 0.0
+
+        for instance_type, hours in sorted(hours_by_type.items()):
+            running_hours = hours * num_resources
+            total_hours += running_hours
+            forecast.append(
+                {
+                    "schedule": schedule_name,
+                    "service": service,
+                    "instance_type": instance_type,
+                    "resources": num_resources,
+                    "running_hours": round(running_hours, 2),
+                }
+            )
+
+    return {
+        "start_date": str(first_day),
+        "end_date": str(last_day),
+        "total_running_hours": round(total_hours, 2),
+        "forecast": forecast,
+        "unknown_schedules": sorted(unknown_schedules),
+    }
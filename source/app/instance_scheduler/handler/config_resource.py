@@ -10,6 +10,7 @@ from instance_scheduler.handler.environments.main_lambda_environment import (
     MainLambdaEnv,
 )
 from instance_scheduler.model.ddb_config_item import DdbConfigItem
+from instance_scheduler.model.store.config_version import bump_config_version
 from instance_scheduler.model.store.ddb_config_item_store import DdbConfigItemStore
 from instance_scheduler.model.store.dynamo_period_definition_store import (
     DynamoPeriodDefinitionStore,
@@ -17,6 +18,9 @@ from instance_scheduler.model.store.dynamo_period_definition_store import (
 from instance_scheduler.model.store.dynamo_schedule_definition_store import (
     DynamoScheduleDefinitionStore,
 )
+from instance_scheduler.model.store.payload_signing_key import (
+    rotate_payload_signing_key,
+)
 from instance_scheduler.observability.powertools_logging import powertools_logger
 from instance_scheduler.util.custom_resource import (
     CustomResource,
@@ -85,9 +89,35 @@ class SchedulerSetupHandler(CustomResource[ServiceSetupResourceProperties]):
         except Exception as ex:
             logger.error(f"Error creating sample schedules and periods {ex}")
 
+    def _rebuild_period_index(self) -> None:
+        """rewrite the period index of the schedules, which also indexes schedules created by earlier versions"""
+        try:
+            schedule_store = DynamoScheduleDefinitionStore(self._env.config_table_name)
+            schedule_store.rebuild_period_index()
+        except Exception as ex:
+            logger.error(f"Error rebuilding the period index of the schedules {ex}")
+
+    def _bump_config_version(self) -> None:
+        """invalidate the config cached by warm lambda containers, which may have been loaded by an earlier version"""
+        try:
+            bump_config_version(self._env.config_table_name)
+        except Exception as ex:
+            logger.error(f"Error incrementing the config version {ex}")
+
+    def _rotate_payload_signing_key(self) -> None:
+        """
+        replace the key with which the orchestrator signs the config it has validated, without a key the config is
+        sent unsigned and validated again by the scheduling request handler
+        """
+        try:
+            rotate_payload_signing_key(self._env.config_table_name)
+        except Exception as ex:
+            logger.error(f"Error rotating the payload signing key {ex}")
+
     # handles Create request from CloudFormation
     def _create_request(self) -> CustomResourceResponse:
         self._create_sample_schemas()
+        self._rotate_payload_signing_key()
         if self._env.enable_aws_organizations:
             org_id = parse_as_org_id(self.resource_properties)
             self.config_item_store.put(
@@ -109,6 +139,9 @@ class SchedulerSetupHandler(CustomResource[ServiceSetupResourceProperties]):
         -when org_id does not change -- keep accounts
         -when org_id does change -- purge accounts
         """
+        self._rebuild_period_index()
+        self._bump_config_version()
+        self._rotate_payload_signing_key()
         if self._env.enable_aws_organizations:
             # using organizations
             try:
@@ -13,6 +13,7 @@ class MainLambdaEnv:
     user_agent_extra: str
     enable_aws_organizations: bool
     config_table_name: str
+    registry_table: str
 
     @classmethod
     def from_env(cls) -> "MainLambdaEnv":
@@ -25,6 +26,7 @@ class MainLambdaEnv:
                     environ["ENABLE_AWS_ORGANIZATIONS"]
                 ),
                 config_table_name=environ["CONFIG_TABLE"],
+                registry_table=environ["REGISTRY_TABLE"],
             )
         except KeyError as err:
             raise AppEnvError(
@@ -6,6 +6,8 @@ from typing import Optional
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 from instance_scheduler.configuration.scheduling_context import SchedulingEnvironment
+from instance_scheduler.observability.decision_trace import DecisionTraceTargets
+from instance_scheduler.observability.result_logging import ResultLogMode
 from instance_scheduler.util.app_env_utils import AppEnvError, env_to_bool
 
 
@@ -40,6 +42,10 @@ class SchedulingRequestEnvironment(SchedulingEnvironment):
 
     enable_informational_tagging: bool
 
+    result_log_mode: ResultLogMode
+    result_log_sample_rate: float
+    decision_trace_targets: DecisionTraceTargets
+
     @staticmethod
     def from_env() -> "SchedulingRequestEnvironment":
         try:
@@ -69,6 +75,13 @@ class SchedulingRequestEnvironment(SchedulingEnvironment):
                 enable_informational_tagging=env_to_bool(
                     environ["ENABLE_INFORMATIONAL_TAGGING"]
                 ),
+                result_log_mode=_parse_result_log_mode(environ["RESULT_LOG_MODE"]),
+                result_log_sample_rate=_parse_sample_rate(
+                    environ["RESULT_LOG_SAMPLE_RATE"]
+                ),
+                decision_trace_targets=DecisionTraceTargets.parse(
+                    environ["DECISION_TRACE_TARGETS"]
+                ),
             )
         except ZoneInfoNotFoundError as err:
             raise AppEnvError(f"Invalid timezone: {err.args[0]}") from err
@@ -76,3 +89,20 @@ class SchedulingRequestEnvironment(SchedulingEnvironment):
             raise AppEnvError(
                 f"Missing required application environment variable: {err.args[0]}"
             ) from err
+
+
+def _parse_result_log_mode(value: str) -> ResultLogMode:
+    try:
+        return ResultLogMode(value.strip().lower())
+    except ValueError as err:
+        raise AppEnvError(f"Invalid result log mode: {value}") from err
+
+
+def _parse_sample_rate(value: str) -> float:
+    try:
+        rate = float(value)
+    except ValueError as err:
+        raise AppEnvError(f"Invalid result log sample rate: {value}") from err
+    if not 0 <= rate <= 1:
+        raise AppEnvError(f"Result log sample rate must be between 0 and 1: {value}")
+    return rate
@@ -16,6 +16,7 @@ from instance_scheduler.model.store.dynamo_resource_registry import (
 from instance_scheduler.model.store.dynamo_schedule_definition_store import (
     DynamoScheduleDefinitionStore,
 )
+from instance_scheduler.model.store.registry_counter_store import RegistryCounterStore
 from instance_scheduler.observability.powertools_logging import (
     powertools_logger,
     should_log_events,
@@ -27,10 +28,12 @@ from instance_scheduler.ops_metrics.metric_type.deployment_description_metric im
 from instance_scheduler.ops_metrics.metric_type.instance_count_metric import (
     InstanceCountMetric,
 )
-from instance_scheduler.ops_metrics.metrics import collect_metric
+from instance_scheduler.ops_metrics.metrics import collect_metric, flush_metrics
 
 logger: Final = powertools_logger()
 
+HEARTBEAT_FLUSH_TIMEOUT_SECONDS: Final = 30.0
+
 
 @logger.inject_lambda_context(log_event=should_log_events(logger))
 def report_heartbeat_metric(event: Mapping[str, Any], context: LambdaContext) -> Any:
@@ -73,7 +76,14 @@ def report_heartbeat_metric(event: Mapping[str, Any], context: LambdaContext) ->
                     break
 
         # count resource metrics
-        registry = DynamoResourceRegistry(env.registry_table)
+        counter_store = RegistryCounterStore(env.registry_table)
+        if counter_store.needs_reconciliation():
+            # counters are missing or due to be corrected for any drift, rebuild them from a full scan
+            target_counts = counter_store.reconcile(
+                DynamoResourceRegistry(env.registry_table)
+            )
+        else:
+            target_counts = counter_store.find_all()
 
         total_resources = 0
         total_targets = 0
@@ -81,8 +91,8 @@ def report_heartbeat_metric(event: Mapping[str, Any], context: LambdaContext) ->
         services = set()
         regions = set()
 
-        for target in registry.list_all_by_scheduling_target():
-            total_resources += len(target.resources)
+        for target in target_counts:
+            total_resources += target.num_resources
             total_targets += 1
             accounts.add(target.account)
             services.add(target.service)
@@ -93,10 +103,8 @@ def report_heartbeat_metric(event: Mapping[str, Any], context: LambdaContext) ->
                     service=target.service,
                     region=target.region,
                     account=target.account,
-                    num_instances=len(target.resources),
-                    num_schedules=len(
-                        {resource.schedule for resource in target.resources}
-                    ),
+                    num_instances=target.num_resources,
+                    num_schedules=target.num_schedules,
                 ),
                 logger,
             )
@@ -134,3 +142,6 @@ def report_heartbeat_metric(event: Mapping[str, Any], context: LambdaContext) ->
         logger.warning(
             f"Error reporting heartbeat metrics: ({e})\n{traceback.format_exc()}"
         )
+    finally:
+        # one metric is sent per scheduling target, so allow more time for large deployments to drain
+        flush_metrics(logger, timeout_seconds=HEARTBEAT_FLUSH_TIMEOUT_SECONDS)
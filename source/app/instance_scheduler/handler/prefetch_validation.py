@@ -0,0 +1,96 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+import hashlib
+import json
+import time
+from collections.abc import Callable, Iterable
+from typing import Final, Optional
+
+from instance_scheduler.model.schedule_definition import (
+    InvalidScheduleDefinition,
+    ScheduleDefinition,
+)
+from instance_scheduler.model.store.period_definition_store import PeriodDefinitionStore
+
+ERROR_LOG_INTERVAL_SECONDS: Final = 3600.0
+
+
+class PrefetchValidationCache:
+    """
+    validation results of the schedules prefetched by the orchestrator, kept across the runs of a warm container
+
+    results are keyed by the content hash of each schedule and its period closure, so only new or changed definitions
+    are validated again. Identical errors are only logged again after `error_log_interval` seconds. Entries that are
+    not used by a run are dropped at the end of it (see end_run)
+    """
+
+    def __init__(
+        self,
+        error_log_interval: float = ERROR_LOG_INTERVAL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._error_log_interval = error_log_interval
+        self._clock = clock
+        self._results: dict[str, Optional[str]] = {}
+        self._used_results: set[str] = set()
+        self._error_log_times: dict[str, float] = {}
+        self._reported_errors: set[str] = set()
+
+    def validate_schedule(
+        self, schedule: ScheduleDefinition, period_store: PeriodDefinitionStore
+    ) -> Optional[str]:
+        """the reason that `schedule` is invalid, or None if it is valid"""
+        key = content_hash(schedule, period_store)
+        self._used_results.add(key)
+        if key not in self._results:
+            try:
+                schedule.to_instance_schedule(period_store)
+                self._results[key] = None
+            except InvalidScheduleDefinition as e:
+                self._results[key] = (
+                    f"Invalid Schedule Definition:\n{json.dumps(schedule.to_item(), indent=2)}\n{e}"
+                )
+        return self._results[key]
+
+    def errors_to_log(self, errors: Iterable[str]) -> tuple[list[str], int]:
+        """the errors that are due to be logged, and the number of errors that were logged recently"""
+        now = self._clock()
+        due: list[str] = []
+        suppressed = 0
+        for error in errors:
+            self._reported_errors.add(error)
+            logged_at = self._error_log_times.get(error)
+            if logged_at is not None and now - logged_at < self._error_log_interval:
+                suppressed += 1
+                continue
+            self._error_log_times[error] = now
+            due.append(error)
+        return due, suppressed
+
+    def end_run(self) -> None:
+        """drop the results and errors of definitions that no longer exist"""
+        self._results = {
+            key: result
+            for key, result in self._results.items()
+            if key in self._used_results
+        }
+        self._error_log_times = {
+            error: logged_at
+            for error, logged_at in self._error_log_times.items()
+            if error in self._reported_errors
+        }
+        self._used_results = set()
+        self._reported_errors = set()
+
+
+def content_hash(
+    schedule: ScheduleDefinition, period_store: PeriodDefinitionStore
+) -> str:
+    """hash of a schedule and the periods it references (a missing period is hashed as null)"""
+    periods = {}
+    for period_id in schedule.periods:
+        period = period_store.find_by_name(period_id.name)
+        periods[period_id.name] = period.to_item() if period else None
+
+    content = {"schedule": schedule.to_item(), "periods": periods}
+    return hashlib.sha256(json.dumps(content, sort_keys=True).encode()).hexdigest()
@@ -12,6 +12,7 @@ from instance_scheduler.model.managed_instance import (
 from instance_scheduler.model.store.dynamo_resource_registry import (
     DynamoResourceRegistry,
 )
+from instance_scheduler.model.store.resource_registry import RegistryLookup
 from instance_scheduler.observability.informational_tagging import (
     clear_informational_tags,
 )
@@ -114,18 +115,33 @@ def handle_tagging_event(event: ResourceRegistrationEvent) -> Dict[str, Any]:
     )
 
     failed_resources: list[str] = []
+    registered = RegistryLookup()
+    if is_schedule_tag_deletion_event(event):
+        # the records of the resources to deregister are read with one batched lookup
+        registered = registry.get_many(
+            RegistryKey.from_arn(ARN(resource_arn)) for resource_arn in event.resources
+        )
+
     for resource_arn in event.resources:
         resource_arn = ARN(resource_arn)
         logger.append_keys(instance=resource_arn)
+        registry_error = registered.errors.get(RegistryKey.from_arn(resource_arn))
+        if registry_error is not None:
+            logger.error(
+                f"Could not read registry record of {resource_arn}: {registry_error}"
+            )
+            failed_resources.append(resource_arn)
+            continue
+
         skip_resource: bool = False
         match event.detail.service:
             case "ec2":
                 skip_resource = process_ec2_instance_or_skip(
-                    event, resource_arn, failed_resources
+                    event, resource_arn, failed_resources, registered
                 )
             case "rds":
                 skip_resource = process_rds_instance_or_skip(
-                    event, resource_arn, failed_resources
+                    event, resource_arn, failed_resources, registered
                 )
             case _:
                 logger.warning(f"Unsupported service type: {event.detail.service}")
@@ -140,7 +156,10 @@ def handle_tagging_event(event: ResourceRegistrationEvent) -> Dict[str, Any]:
 
 
 def process_rds_instance_or_skip(
-    event: ResourceRegistrationEvent, resource_arn: ARN, failed_resources: list[str]
+    event: ResourceRegistrationEvent,
+    resource_arn: ARN,
+    failed_resources: list[str],
+    registered: RegistryLookup,
 ) -> bool:
     if event.detail.resource_type not in ["cluster", "db"]:
         logger.debug(
@@ -156,7 +175,7 @@ def process_rds_instance_or_skip(
 
     if is_schedule_tag_deletion_event(event):
         deregister_rds_resources(
-            filter(None, [registry.get(RegistryKey.from_arn(resource_arn))]),  # type: ignore
+            filter(None, [registered.found.get(RegistryKey.from_arn(resource_arn))]),  # type: ignore
             scheduling_role,
             env,
         )
@@ -179,7 +198,10 @@ def process_rds_instance_or_skip(
 
 
 def process_ec2_instance_or_skip(
-    event: ResourceRegistrationEvent, resource_arn: ARN, failed_resources: list[str]
+    event: ResourceRegistrationEvent,
+    resource_arn: ARN,
+    failed_resources: list[str],
+    registered: RegistryLookup,
 ) -> bool:
     if event.detail.resource_type not in ["instance"]:
         logger.debug(
@@ -199,7 +221,7 @@ def process_ec2_instance_or_skip(
 
     if is_schedule_tag_deletion_event(event):
         deregister_ec2_resources(
-            filter(None, [registry.get(RegistryKey.from_arn(resource_arn))]),  # type: ignore
+            filter(None, [registered.found.get(RegistryKey.from_arn(resource_arn))]),  # type: ignore
             scheduling_role,
             env,
         )
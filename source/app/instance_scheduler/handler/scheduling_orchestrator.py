@@ -9,6 +9,7 @@ from typing import (
     Any,
     Final,
     Literal,
+    Optional,
     TypedDict,
     TypeGuard,
     cast,
@@ -18,30 +19,29 @@ from aws_lambda_powertools import Logger
 from instance_scheduler.handler.environments.orchestrator_environment import (
     OrchestratorEnvironment,
 )
-from instance_scheduler.handler.scheduling_request import SchedulingRequest
-from instance_scheduler.model.period_definition import (
-    InvalidPeriodDefinition,
-    PeriodDefinition,
-)
-from instance_scheduler.model.schedule_definition import (
-    InvalidScheduleDefinition,
-    ScheduleDefinition,
+from instance_scheduler.handler.prefetch_validation import PrefetchValidationCache
+from instance_scheduler.handler.scheduling_payload import (
+    COMPACT_SEPARATORS,
+    encode_config,
 )
-from instance_scheduler.model.store.dynamo_period_definition_store import (
-    DynamoPeriodDefinitionStore,
+from instance_scheduler.handler.scheduling_request import SchedulingRequest
+from instance_scheduler.handler.target_config_builder import (
+    TargetConfig,
+    TargetConfigBuilder,
 )
+from instance_scheduler.model.store.config_table_loader import CONFIG_TABLE_CACHE
 from instance_scheduler.model.store.dynamo_resource_registry import (
     DynamoResourceRegistry,
 )
-from instance_scheduler.model.store.dynamo_schedule_definition_store import (
-    DynamoScheduleDefinitionStore,
-)
 from instance_scheduler.model.store.in_memory_period_definition_store import (
     InMemoryPeriodDefinitionStore,
 )
 from instance_scheduler.model.store.in_memory_schedule_definition_store import (
     InMemoryScheduleDefinitionStore,
 )
+from instance_scheduler.model.store.payload_signing_key import (
+    PAYLOAD_SIGNING_KEY_CACHE,
+)
 from instance_scheduler.model.store.resource_registry import ResourceRegistry
 from instance_scheduler.observability.powertools_logging import (
     powertools_logger,
@@ -59,6 +59,9 @@ else:
 logger: Final = powertools_logger()
 
 
+# kept across the runs of a warm container
+PREFETCH_VALIDATION_CACHE: Final = PrefetchValidationCache()
+
 LAMBDA_PAYLOAD_CAPACITY_BYTES = (
     200_000  # is actually 256_000 but this provides some overhead
 )
@@ -143,19 +146,9 @@ class SchedulingOrchestratorHandler:
         cached_schedules, cached_periods = prefetch_schedules_and_periods(
             self._env, self._logger
         )
-        for target in self.registry.list_all_by_scheduling_target():
-            target_schedules = InMemoryScheduleDefinitionStore()
-            target_periods = InMemoryPeriodDefinitionStore()
-
-            # pre-load schedules/periods for the target
-            for resource in target.resources:
-                schedule = cached_schedules.find_by_name(resource.schedule)
-                if schedule is None:
-                    continue
-
-                target_schedules.put(schedule, overwrite=True)
-                for period in schedule.fetch_period_definitions(cached_periods):
-                    target_periods.put(period, overwrite=True)
+        config_builder = TargetConfigBuilder(cached_schedules, cached_periods)
+        for target in self.registry.list_schedules_by_scheduling_target():
+            target_config = config_builder.build(target.schedules)
 
             current_dt_str = datetime.now(timezone.utc).isoformat()
             scheduler_request = SchedulingRequest(
@@ -165,10 +158,8 @@ class SchedulingOrchestratorHandler:
                 service=target.service,
                 current_dt=current_dt_str,
                 dispatch_time=datetime.now(timezone.utc).isoformat(),
-                schedules=target_schedules.serialize(),
-                periods=target_periods.serialize(),
             )
-            result.append(self._run_scheduling_lambda(scheduler_request))
+            result.append(self._run_scheduling_lambda(scheduler_request, target_config))
 
         if not result:
             self._logger.info("No resources registered to schedule")
@@ -176,22 +167,28 @@ class SchedulingOrchestratorHandler:
         return result
 
     def _run_scheduling_lambda(
-        self, scheduler_request: SchedulingRequest
+        self, scheduler_request: SchedulingRequest, target_config: TargetConfig
     ) -> dict[str, Any]:
         # runs a service/account/region subset of the configuration as a new lambda function
         self._logger.info(
             f'Starting lambda function for scheduling {scheduler_request["service"]} instances for account {scheduler_request["account"]} in region {scheduler_request["region"]}'
         )
 
-        payload = str.encode(json.dumps(scheduler_request))
+        signing_key = PAYLOAD_SIGNING_KEY_CACHE.load(self._env.config_table_name)
+        payload = encode_scheduling_payload(
+            scheduler_request,
+            target_config.schedules_json,
+            target_config.periods_json,
+            signing_key,
+        )
         if len(payload) > LAMBDA_PAYLOAD_CAPACITY_BYTES:
             # strip periods and let the request handler reload them
-            del scheduler_request["periods"]
-            payload = str.encode(json.dumps(scheduler_request))
+            payload = encode_scheduling_payload(
+                scheduler_request, target_config.schedules_json, signing_key=signing_key
+            )
         if len(payload) > LAMBDA_PAYLOAD_CAPACITY_BYTES:
             # if payload is still too large, strip schedules as well
-            del scheduler_request["schedules"]
-            payload = str.encode(json.dumps(scheduler_request))
+            payload = encode_scheduling_payload(scheduler_request)
 
         # start the lambda function
         resp = self.lambda_client.invoke(
@@ -215,52 +212,68 @@ class SchedulingOrchestratorHandler:
         return result
 
 
+def encode_scheduling_payload(
+    scheduler_request: SchedulingRequest,
+    schedules_json: Optional[str] = None,
+    periods_json: Optional[str] = None,
+    signing_key: Optional[bytes] = None,
+) -> bytes:
+    """
+    the json encoded scheduling request, with the pre-serialized schedules and periods (compact json arrays of
+    validated definitions, as built by TargetConfigBuilder) compressed into its encoded config. The config is signed
+    with `signing_key` (if any), so the request handler does not validate it again
+    """
+    if schedules_json is not None or periods_json is not None:
+        scheduler_request = scheduler_request.copy()
+        scheduler_request["encoded_config"] = encode_config(
+            schedules_json, periods_json, signing_key
+        )
+    return str.encode(json.dumps(scheduler_request, separators=COMPACT_SEPARATORS))
+
+
 def prefetch_schedules_and_periods(
-    env: OrchestratorEnvironment, logger: Logger
+    env: OrchestratorEnvironment,
+    logger: Logger,
+    validation_cache: Optional[PrefetchValidationCache] = None,
 ) -> tuple[InMemoryScheduleDefinitionStore, InMemoryPeriodDefinitionStore]:
-    schedules, schedule_errors = prefetch_schedules(env)
-    periods, period_errors = prefetch_periods(env)
+    if validation_cache is None:
+        validation_cache = PREFETCH_VALIDATION_CACHE
+
+    config = CONFIG_TABLE_CACHE.load(env.config_table_name)
+    schedules, periods = config.schedules, config.periods
 
     cached_schedule_store = InMemoryScheduleDefinitionStore(schedules)
     cached_period_store = InMemoryPeriodDefinitionStore(periods)
 
-    exceptions: list[InvalidScheduleDefinition | InvalidPeriodDefinition] = list()
-    exceptions.extend(schedule_errors)
-    exceptions.extend(period_errors)
+    errors: list[str] = list(map(str, config.schedule_errors))
+    errors.extend(map(str, config.period_errors))
 
     for schedule in list(cached_schedule_store.find_all().values()):
         # filter and warn about schedules referencing periods that do not exist
-        try:
-            schedule.to_instance_schedule(cached_period_store)
-        except InvalidScheduleDefinition as e:
+        error = validation_cache.validate_schedule(schedule, cached_period_store)
+        if error is not None:
             cached_schedule_store.delete(schedule.name)
-            exceptions.append(
-                InvalidScheduleDefinition(
-                    f"Invalid Schedule Definition:\n{json.dumps(schedule.to_item(), indent=2)}\n{e}"
-                )
-            )
+            errors.append(error)
 
-    logger.info(f"prefetched {len(schedules)} schedules and {len(periods)} periods")
-    if exceptions:
-        exception_list = "\n\n".join(map(str, exceptions))
+    if config.from_cache:
+        logger.info(
+            f"reused {len(schedules)} schedules and {len(periods)} periods cached at the current config version"
+        )
+    else:
+        logger.info(
+            f"prefetched {len(schedules)} schedules and {len(periods)} periods "
+            f"({config.consumed_read_capacity} read capacity units)"
+        )
+    errors_to_log, suppressed = validation_cache.errors_to_log(errors)
+    validation_cache.end_run()
+    if errors_to_log:
+        exception_list = "\n\n".join(errors_to_log)
         logger.error(
             f"There are incorrectly configured schedules/periods!\n{exception_list}"
         )
+    if suppressed:
+        logger.info(
+            f"{suppressed} incorrectly configured schedules/periods were reported recently and are not logged again"
+        )
 
     return cached_schedule_store, cached_period_store
-
-
-def prefetch_schedules(
-    env: OrchestratorEnvironment,
-) -> tuple[Mapping[str, ScheduleDefinition], list[InvalidScheduleDefinition]]:
-    dynamo_store = DynamoScheduleDefinitionStore(env.config_table_name)
-    schedules, exceptions = dynamo_store.find_all_with_errors()
-    return schedules, exceptions
-
-
-def prefetch_periods(
-    env: OrchestratorEnvironment,
-) -> tuple[Mapping[str, PeriodDefinition], list[InvalidPeriodDefinition]]:
-    dynamo_store = DynamoPeriodDefinitionStore(env.config_table_name)
-    periods, exceptions = dynamo_store.find_all_with_errors()
-    return periods, exceptions
@@ -0,0 +1,149 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+"""
+codec for the schedule/period config that the orchestrator sends inline with each scheduling request
+
+the config is encoded as "<version>:<data>", where the data of version z1 is a base64 wrapped, zlib compressed,
+compact json document of the form {"schedules": [...], "periods": [...]} (either list may be omitted, in which case
+the scheduling request handler loads it from the config table)
+
+version z1s is emitted by the orchestrator for config that it has already validated, and is encoded as
+"z1s:<signature>:<data>" with the same data as z1. The signature is an HMAC-SHA256 of the data, keyed by the payload
+signing key that the setup custom resource stores in the config table (see payload_signing_key). The definitions of a
+config are only trusted, and not validated again, when its signature matches the current key. Any other config
+(including a z1s config with a signature that does not match) is validated in full
+"""
+
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import zlib
+from collections.abc import Mapping
+from functools import lru_cache
+from typing import Any, Final, Optional
+
+from instance_scheduler.util.validation import ValidationException
+
+CONFIG_CODEC_VERSION: Final = "z1"
+SIGNED_CONFIG_CODEC_VERSION: Final = "z1s"
+COMPACT_SEPARATORS: Final = (",", ":")
+
+# upper bound on the size of a decompressed config, far above what fits in a (compressed) lambda payload
+MAX_CONFIG_DOCUMENT_BYTES: Final = 16 * 1024 * 1024
+
+_CONFIG_KEYS: Final = frozenset({"schedules", "periods"})
+
+
+def encode_config(
+    schedules_json: Optional[str] = None,
+    periods_json: Optional[str] = None,
+    signing_key: Optional[bytes] = None,
+) -> str:
+    """
+    encode pre-serialized (compact json array) schedules and periods. Each list is expected to be deduplicated by
+    name already, as produced by TargetConfigBuilder
+
+    the config is signed with `signing_key` if one is given, which must only be done for definitions that were built
+    (and so validated) from their stored form, such as the output of to_schedule_params and to_period_params
+    """
+    members = []
+    if schedules_json is not None:
+        members.append(f'"schedules":{schedules_json}')
+    if periods_json is not None:
+        members.append(f'"periods":{periods_json}')
+    document = f"{{{','.join(members)}}}".encode()
+
+    data = base64.b64encode(zlib.compress(document, level=9)).decode("ascii")
+    if signing_key is None:
+        return f"{CONFIG_CODEC_VERSION}:{data}"
+    return f"{SIGNED_CONFIG_CODEC_VERSION}:{_signature(data, signing_key)}:{data}"
+
+
+def decode_config(encoded: str) -> Mapping[str, Any]:
+    """
+    the schedules and periods of an encoded config
+    """
+    return _decode(encoded)[0]
+
+
+def is_validated_config(
+    untyped_dict: Mapping[str, Any], signing_key: Optional[bytes]
+) -> bool:
+    """
+    true if the request carries an encoded config of definitions that were already validated by the orchestrator, as
+    shown by a signature that matches `signing_key`
+    """
+    encoded = untyped_dict.get("encoded_config")
+    if signing_key is None or not isinstance(encoded, str):
+        return False
+    _, signature, data = _decode(encoded)
+    return signature is not None and hmac.compare_digest(
+        signature, _signature(data, signing_key)
+    )
+
+
+def _signature(data: str, signing_key: bytes) -> str:
+    return hmac.new(signing_key, data.encode("ascii"), hashlib.sha256).hexdigest()
+
+
+@lru_cache(maxsize=1)
+def _decode(encoded: str) -> tuple[Mapping[str, Any], Optional[str], str]:
+    """the config, signature (if it is signed) and data of an encoded config"""
+    # requests are validated and then scheduled from the same encoded config, so the last decoded config is cached
+    version, _, data = encoded.partition(":")
+    signature: Optional[str] = None
+    if version == SIGNED_CONFIG_CODEC_VERSION:
+        signature, _, data = data.partition(":")
+    elif version != CONFIG_CODEC_VERSION:
+        raise ValidationException(
+            f"unsupported config encoding '{version}', expected '{CONFIG_CODEC_VERSION}' "
+            f"or '{SIGNED_CONFIG_CODEC_VERSION}'"
+        )
+
+    try:
+        decompressor = zlib.decompressobj()
+        document = decompressor.decompress(
+            base64.b64decode(data, validate=True), MAX_CONFIG_DOCUMENT_BYTES
+        )
+    except (binascii.Error, zlib.error) as e:
+        raise ValidationException(f"unable to decode config: {e}") from e
+    if decompressor.unconsumed_tail:
+        raise ValidationException(
+            f"invalid config: larger than {MAX_CONFIG_DOCUMENT_BYTES} bytes when decompressed"
+        )
+    if not decompressor.eof:
+        raise ValidationException(
+            "unable to decode config: incomplete or truncated stream"
+        )
+
+    try:
+        config = json.loads(document)
+    except ValueError as e:
+        raise ValidationException(f"unable to decode config: {e}") from e
+
+    if not isinstance(config, dict) or not config.keys() <= _CONFIG_KEYS:
+        raise ValidationException(
+            f"invalid config: expected an object with the keys {sorted(_CONFIG_KEYS)}"
+        )
+    return config, signature, data
+
+
+def decode_scheduling_request(untyped_dict: Mapping[str, Any]) -> Mapping[str, Any]:
+    """
+    the request with its encoded config (if any) replaced by the plain "schedules" and "periods" it contains
+    """
+    encoded = untyped_dict.get("encoded_config")
+    if encoded is None:
+        return untyped_dict
+    if not isinstance(encoded, str):
+        raise ValidationException(
+            f"encoded_config must be a string, received: {type(encoded)}"
+        )
+
+    request = {
+        key: value for key, value in untyped_dict.items() if key != "encoded_config"
+    }
+    request.update(decode_config(encoded))
+    return request
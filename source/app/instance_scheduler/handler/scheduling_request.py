@@ -8,24 +8,29 @@ from typing import (
     TYPE_CHECKING,
     Any,
     Final,
+    Iterator,
     Literal,
     NotRequired,
+    Optional,
     TypedDict,
     TypeGuard,
     cast,
 )
 
+from instance_scheduler.configuration.instance_schedule import InstanceSchedule
 from instance_scheduler.configuration.scheduling_context import (
     SchedulingContext,
 )
 from instance_scheduler.handler.environments.scheduling_request_environment import (
     SchedulingRequestEnvironment,
 )
-from instance_scheduler.model.store.dynamo_period_definition_store import (
-    DynamoPeriodDefinitionStore,
+from instance_scheduler.handler.scheduling_payload import (
+    decode_scheduling_request,
+    is_validated_config,
 )
-from instance_scheduler.model.store.dynamo_schedule_definition_store import (
-    DynamoScheduleDefinitionStore,
+from instance_scheduler.model.store.config_table_loader import (
+    CONFIG_TABLE_CACHE,
+    ConfigTableContents,
 )
 from instance_scheduler.model.store.in_memory_period_definition_store import (
     InMemoryPeriodDefinitionStore,
@@ -35,25 +40,30 @@ from instance_scheduler.model.store.in_memory_schedule_definition_store import (
     InMemoryScheduleDefinitionStore,
     SerializedInMemoryScheduleDefinitionStore,
 )
+from instance_scheduler.model.store.payload_signing_key import (
+    PAYLOAD_SIGNING_KEY_CACHE,
+)
 from instance_scheduler.observability.cw_ops_insights import (
     CloudWatchOperationalInsights,
 )
-from instance_scheduler.observability.events import (
-    report_scheduling_results_to_eventbus,
-)
-from instance_scheduler.observability.informational_tagging import (
-    apply_informational_tags_for_results,
-)
-from instance_scheduler.observability.instance_counts import ServiceInstanceCounts
+from instance_scheduler.observability.decision_trace import DecisionTracer
+from instance_scheduler.observability.events import EventsBuffer
+from instance_scheduler.observability.informational_tagging import InfoTaggingContext
 from instance_scheduler.observability.powertools_logging import (
     powertools_logger,
     should_log_events,
 )
-from instance_scheduler.ops_metrics.metrics import collect_metric
+from instance_scheduler.observability.result_logging import SchedulingResultLogger
+from instance_scheduler.observability.side_effects import SideEffectsStage
+from instance_scheduler.ops_metrics.metrics import (
+    collect_metric,
+    flush_metrics,
+)
 from instance_scheduler.scheduling.asg.asg_service import AsgService
 from instance_scheduler.scheduling.ec2 import Ec2Service
 from instance_scheduler.scheduling.rds import RdsService
 from instance_scheduler.scheduling.scheduling_decision import ManagedInstance
+from instance_scheduler.scheduling.scheduling_result import SchedulingResult
 from instance_scheduler.scheduling.scheduling_summary import SchedulingSummary
 from instance_scheduler.util import safe_json
 from instance_scheduler.util.session_manager import assume_role
@@ -80,20 +90,28 @@ class SchedulingRequest(TypedDict):
     schedules: NotRequired[SerializedInMemoryScheduleDefinitionStore]
     periods: NotRequired[SerializedInMemoryPeriodDefinitionStore]
     schedule_names: NotRequired[list[str]]
+    encoded_config: NotRequired[str]
 
 
+SCHEDULING_REQUEST_KEYS: Final = inspect.get_annotations(SchedulingRequest).keys()
+
 # powertools logger
 logger: Final = powertools_logger()
 
+# upper bound on how long the scheduling lambda will wait for each side effect (tagging, events, etc.) to complete
+SIDE_EFFECT_BUDGET_SECONDS: Final = 30.0
+
 
 def validate_scheduler_request(
     untyped_dict: Mapping[str, Any],
+    signing_key: Optional[bytes] = None,
 ) -> TypeGuard[SchedulingRequest]:
-    valid_keys = inspect.get_annotations(SchedulingRequest).keys()
+    validated_config = is_validated_config(untyped_dict, signing_key)
+    untyped_dict = decode_scheduling_request(untyped_dict)
     for key in untyped_dict.keys():
-        if key not in valid_keys:
+        if key not in SCHEDULING_REQUEST_KEYS:
             raise ValidationException(
-                f"{key} is not a valid parameter, valid parameters are {valid_keys}"
+                f"{key} is not a valid parameter, valid parameters are {SCHEDULING_REQUEST_KEYS}"
             )
 
     validate_string(untyped_dict, "dispatch_time", required=True)
@@ -104,10 +122,11 @@ def validate_scheduler_request(
         untyped_dict, "current_dt", required=True
     )  # todo: validate as ISO string
 
-    if "schedules" in untyped_dict:
+    # a config signed with the payload signing key was already validated by the orchestrator
+    if "schedules" in untyped_dict and not validated_config:
         InMemoryScheduleDefinitionStore.validate_serial_data(untyped_dict["schedules"])
 
-    if "periods" in untyped_dict:
+    if "periods" in untyped_dict and not validated_config:
         InMemoryPeriodDefinitionStore.validate_serial_data(untyped_dict["periods"])
 
     if "schedule_names" in untyped_dict:
@@ -119,7 +138,9 @@ def validate_scheduler_request(
 @logger.inject_lambda_context(log_event=should_log_events(logger))
 def handle_scheduling_request(event: Mapping[str, Any], _context: LambdaContext) -> Any:
     env = SchedulingRequestEnvironment.from_env()
-    validate_scheduler_request(event)
+    validate_scheduler_request(
+        event, PAYLOAD_SIGNING_KEY_CACHE.load(env.config_table_name)
+    )
     event = cast(SchedulingRequest, event)
 
     with logger.append_context_keys(
@@ -129,52 +150,52 @@ def handle_scheduling_request(event: Mapping[str, Any], _context: LambdaContext)
     ):
         try:
             scheduling_context = build_scheduling_context(event, env)
-            result_summary: SchedulingSummary[ManagedInstance]
+            results: Iterator[SchedulingResult[ManagedInstance]]
             match event["service"]:
                 case "ec2":
-                    result_summary = SchedulingSummary(
-                        Ec2Service(scheduling_context, env).schedule_target()  # type: ignore[arg-type]
-                    )
+                    results = Ec2Service(scheduling_context, env).schedule_target()  # type: ignore[assignment]
                 case "rds":
-                    result_summary = SchedulingSummary(
-                        RdsService(scheduling_context, env).schedule_target()  # type: ignore[arg-type]
-                    )
+                    results = RdsService(scheduling_context, env).schedule_target()  # type: ignore[assignment]
                 case "autoscaling":
-                    result_summary = SchedulingSummary(
-                        AsgService(scheduling_context).schedule_target()  # type: ignore[arg-type]
-                    )
+                    results = AsgService(scheduling_context).schedule_target()  # type: ignore[assignment]
                 case _:
                     raise ValueError(f"Unknown service: {event['service']}")
 
-            apply_informational_tags_for_results(
-                scheduling_context.assumed_role,
-                result_summary.results,
-                env=env,
+            # results are processed as they are yielded and are not retained, so memory does not grow with
+            # the size of the target
+            result_summary: SchedulingSummary[ManagedInstance] = SchedulingSummary()
+            result_logger = SchedulingResultLogger(
+                logger,
+                mode=env.result_log_mode,
+                sample_rate=env.result_log_sample_rate,
             )
-
-            report_scheduling_results_to_eventbus(
-                result_summary.results, scheduling_context.assumed_role, env
+            decision_tracer = DecisionTracer(
+                logger,
+                targets=env.decision_trace_targets,
+                current_dt=scheduling_context.current_dt,
+                schedule_lookup=lambda name: find_instance_schedule(
+                    scheduling_context, name
+                ),
             )
+            side_effects = build_side_effects_stage(scheduling_context, env)
+            try:
+                for result in result_summary.track(results):
+                    side_effects.push(result)
+                    result_logger.log_result(result)
+                    decision_tracer.trace_result(result)
 
-            actions_taken_metric = result_summary.as_actions_taken_metric()
-            if (
-                actions_taken_metric.actions
-            ):  # only report the metric when actions were actually taken
-                collect_metric(actions_taken_metric, logger)
-
-            if env.enable_ops_monitoring:
-                CloudWatchOperationalInsights(env=env).send_metrics_to_cloudwatch(
-                    ServiceInstanceCounts.for_scheduling_results(
-                        result_summary.results
-                    ),
-                    scheduling_interval_minutes=env.scheduling_interval_minutes,
-                )
+                submit_summary_side_effects(side_effects, result_summary, env)
+            finally:
+                side_effects_report = side_effects.finish()
 
-            for result in result_summary.results:
-                logger.info(
-                    f"result for {result.instance.registry_info.arn} - {result.action_taken} ",
-                    extra=result.to_json_log(),
+            if not side_effects_report.succeeded:
+                # scheduling itself succeeded, so the lambda is not failed (which would cause the target to be
+                # rescheduled by the async invocation retry)
+                logger.error(
+                    f"Error reporting results of scheduling request {safe_json(event)}: ({side_effects_report})"
                 )
+
+            result_logger.log_summary()
             return result_summary.to_json()
 
         except Exception as e:
@@ -183,6 +204,75 @@ def handle_scheduling_request(event: Mapping[str, Any], _context: LambdaContext)
                 f"Error handling scheduling request {safe_json(event)}: ({e})\n{traceback.format_exc()}"
             )
             raise e
+        finally:
+            flush_metrics(logger)
+
+
+def build_side_effects_stage(
+    scheduling_context: SchedulingContext, env: SchedulingRequestEnvironment
+) -> SideEffectsStage[SchedulingResult[ManagedInstance]]:
+    stage: SideEffectsStage[SchedulingResult[ManagedInstance]] = SideEffectsStage()
+
+    tagging = InfoTaggingContext(scheduling_context.assumed_role, env)
+    stage.add_sink(
+        "informational_tagging",
+        consume=tagging.push_result_tags,
+        close=tagging.flush,
+        budget_seconds=SIDE_EFFECT_BUDGET_SECONDS,
+    )
+
+    events = EventsBuffer(scheduling_context.assumed_role, env)
+    stage.add_sink(
+        "events",
+        consume=events.push_result,
+        close=events.flush,
+        budget_seconds=SIDE_EFFECT_BUDGET_SECONDS,
+    )
+
+    return stage
+
+
+def submit_summary_side_effects(
+    stage: SideEffectsStage[SchedulingResult[ManagedInstance]],
+    result_summary: SchedulingSummary[ManagedInstance],
+    env: SchedulingRequestEnvironment,
+) -> None:
+    """submit the side effects that depend on the summary of all results"""
+    actions_taken_metric = result_summary.as_actions_taken_metric()
+    if (
+        actions_taken_metric.actions
+    ):  # only report the metric when actions were actually taken
+
+        def queue_actions_taken_metric() -> None:
+            # only queued here, the metric is sent by the flush_metrics at the end of the handler
+            collect_metric(actions_taken_metric, logger)
+
+        stage.submit(
+            "anonymous_metrics",
+            queue_actions_taken_metric,
+            budget_seconds=SIDE_EFFECT_BUDGET_SECONDS,
+        )
+
+    if env.enable_ops_monitoring:
+        stage.submit(
+            "cloudwatch_metrics",
+            lambda: CloudWatchOperationalInsights(env=env).send_metrics_to_cloudwatch(
+                result_summary.instance_counts,
+                scheduling_interval_minutes=env.scheduling_interval_minutes,
+            ),
+            budget_seconds=SIDE_EFFECT_BUDGET_SECONDS,
+        )
+
+
+def find_instance_schedule(
+    scheduling_context: SchedulingContext, schedule_name: str
+) -> Optional[InstanceSchedule]:
+    schedule_definition = scheduling_context.schedule_store.find_by_name(
+        schedule_name, cache_only=True
+    )
+    if schedule_definition is None:
+        return None
+    return schedule_definition.to_instance_schedule(scheduling_context.period_store)
 
 
 def build_scheduling_context(
@@ -197,24 +287,35 @@ def build_scheduling_context(
 
     context = SchedulingContext(assumed_role=role, current_dt=current_dt, env=env)
 
-    if "schedules" in event:
+    # the inline config may be encoded (see scheduling_payload), in which case it may already be validated
+    request = decode_scheduling_request(event)
+    validate = not is_validated_config(
+        event, PAYLOAD_SIGNING_KEY_CACHE.load(env.config_table_name)
+    )
+
+    # schedules and periods that were too large to include in the request are loaded from the config table (or
+    # reused from an earlier invocation if the config has not changed since)
+    if "schedules" in request and "periods" in request:
+        config = ConfigTableContents()
+    else:
+        config = CONFIG_TABLE_CACHE.load(env.config_table_name)
+
+    if "schedules" in request:
         context.schedule_store.preload_cache(
             InMemoryScheduleDefinitionStore.deserialize_to_sequence(
-                event.get("schedules", [])
+                request["schedules"], validate=validate
             )
         )
     else:
-        dynamo_schedule_store = DynamoScheduleDefinitionStore(env.config_table_name)
-        context.schedule_store.preload_cache(dynamo_schedule_store.find_all().values())
+        context.schedule_store.preload_cache(config.schedules.values())
 
-    if "periods" in event:
+    if "periods" in request:
         context.period_store.preload_cache(
             InMemoryPeriodDefinitionStore.deserialize_to_sequence(
-                event.get("periods", [])
+                request["periods"], validate=validate
             )
         )
     else:
-        dynamo_period_store = DynamoPeriodDefinitionStore(env.config_table_name)
-        context.period_store.preload_cache(dynamo_period_store.find_all().values())
+        context.period_store.preload_cache(config.periods.values())
 
     return context
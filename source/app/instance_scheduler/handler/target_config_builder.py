@@ -0,0 +1,107 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+import json
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from instance_scheduler.handler.scheduling_payload import COMPACT_SEPARATORS
+from instance_scheduler.model.schedule_definition import InvalidScheduleDefinition
+from instance_scheduler.model.store.in_memory_period_definition_store import (
+    InMemoryPeriodDefinitionStore,
+)
+from instance_scheduler.model.store.in_memory_schedule_definition_store import (
+    InMemoryScheduleDefinitionStore,
+)
+
+
+@dataclass(frozen=True)
+class TargetConfig:
+    """
+    the schedules and periods used by one scheduling target, as the compact JSON arrays of their serialized stores
+    (see InMemoryScheduleDefinitionStore.serialize and InMemoryPeriodDefinitionStore.serialize)
+    """
+
+    schedule_names: tuple[str, ...]
+    schedules_json: str
+    periods_json: str
+
+
+@dataclass(frozen=True)
+class _CompiledSchedule:
+    schedule_json: str
+    period_names: tuple[str, ...]
+
+
+class TargetConfigBuilder:
+    """
+    builds the config subset of each scheduling target from the config prefetched for an orchestrator run
+
+    the period closure and the JSON of each schedule (and of each period) are computed the first time a target
+    uses them, so targets that share schedules only pay for joining pre-serialized fragments
+    """
+
+    def __init__(
+        self,
+        schedules: InMemoryScheduleDefinitionStore,
+        periods: InMemoryPeriodDefinitionStore,
+    ) -> None:
+        self._schedules = schedules
+        self._periods = periods
+        self._compiled_schedules: dict[str, _CompiledSchedule | None] = {}
+        self._period_fragments: dict[str, str] = {}
+
+    def build(self, schedule_names: Iterable[str]) -> TargetConfig:
+        """
+        the config subset for the distinct `schedule_names` of a target. Unknown schedules are left out, as the
+        scheduling request handler reports them for each resource that uses them
+        """
+        included_schedules: list[str] = []
+        schedule_fragments: list[str] = []
+        period_names: dict[str, None] = {}
+        for schedule_name in sorted(set(schedule_names)):
+            compiled = self._compile_schedule(schedule_name)
+            if compiled is None:
+                continue
+            included_schedules.append(schedule_name)
+            schedule_fragments.append(compiled.schedule_json)
+            period_names.update(dict.fromkeys(compiled.period_names))
+
+        return TargetConfig(
+            schedule_names=tuple(included_schedules),
+            schedules_json=f"[{','.join(schedule_fragments)}]",
+            periods_json=f"[{','.join(map(self._period_fragment, period_names))}]",
+        )
+
+    def _compile_schedule(self, schedule_name: str) -> _CompiledSchedule | None:
+        if schedule_name in self._compiled_schedules:
+            return self._compiled_schedules[schedule_name]
+
+        compiled = None
+        schedule = self._schedules.find_by_name(schedule_name)
+        if schedule is not None:
+            try:
+                periods = schedule.fetch_period_definitions(self._periods)
+                compiled = _CompiledSchedule(
+                    schedule_json=json.dumps(
+                        schedule.to_schedule_params(), separators=COMPACT_SEPARATORS
+                    ),
+                    period_names=tuple(
+                        dict.fromkeys(period.name for period in periods)
+                    ),
+                )
+            except InvalidScheduleDefinition:
+                pass  # reported by the prefetch, which also drops such schedules
+
+        self._compiled_schedules[schedule_name] = compiled
+        return compiled
+
+    def _period_fragment(self, period_name: str) -> str:
+        fragment = self._period_fragments.get(period_name)
+        if fragment is None:
+            period = self._periods.find_by_name(period_name)
+            assert period is not None  # the closure only contains periods that exist
+            fragment = json.dumps(
+                period.to_period_params(), separators=COMPACT_SEPARATORS
+            )
+            self._period_fragments[period_name] = fragment
+        return fragment
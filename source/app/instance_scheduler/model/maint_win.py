@@ -19,7 +19,7 @@ from instance_scheduler.cron.cron_recurrence_expression import CronRecurrenceExp
 from instance_scheduler.cron.expression import CronSingleValueNumeric
 from instance_scheduler.model.ddb_item_utils import skip_if_none
 from instance_scheduler.scheduling.states import ScheduleState
-from instance_scheduler.util.time import is_aware
+from instance_scheduler.util.time import get_timezone, is_aware
 from instance_scheduler.util.validation import (
     validate_number_item,
     validate_string_item,
@@ -297,7 +297,7 @@ class EC2SSMMaintenanceWindow:
             region=region,
             window_id=identity["WindowId"],
             window_name=identity["Name"],
-            schedule_timezone=ZoneInfo(identity.get("ScheduleTimezone", "UTC")),
+            schedule_timezone=get_timezone(identity.get("ScheduleTimezone", "UTC")),
             next_execution_time=(
                 isoparse(identity["NextExecutionTime"])
                 if "NextExecutionTime" in identity
@@ -334,7 +334,7 @@ class EC2SSMMaintenanceWindow:
             region=region,
             window_id=window_id,
             window_name=window_name,
-            schedule_timezone=ZoneInfo(item["ScheduleTimezone"]["S"]),
+            schedule_timezone=get_timezone(item["ScheduleTimezone"]["S"]),
             next_execution_time=(
                 isoparse(item["NextExecutionTime"]["S"])
                 if "NextExecutionTime" in item
@@ -1,7 +1,7 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
 from abc import ABC
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Optional, TypedDict, cast
 
 from instance_scheduler.scheduling.asg.asg_size import AsgSize
@@ -20,7 +20,7 @@ else:
     AttributeValueTypeDef = object
 
 
-@dataclass
+@dataclass(frozen=True)
 class RegistryKey:
     account: str
     region: str
@@ -69,6 +69,7 @@ class CommonRegistryFields(TypedDict):
     schedule: str
     name: str
     stored_state: InstanceState
+    version: Optional[int]
 
 
 @dataclass
@@ -80,6 +81,9 @@ class RegisteredInstance(ABC):
     schedule: str
     name: str
     stored_state: InstanceState
+    # incremented by every attribute-level update of the registry item, used for optimistic concurrency. Not part
+    # of equality, which compares the registered resource rather than the revision it was read at
+    version: Optional[int] = field(default=None, kw_only=True, compare=False)
 
     @property
     def key(self) -> RegistryKey:
@@ -105,7 +109,7 @@ class RegisteredInstance(ABC):
         return f"{self.account}:{self.region}:{self.service}:{self.resource_id}"
 
     def to_item(self) -> dict[str, AttributeValueTypeDef]:
-        return {
+        item: dict[str, AttributeValueTypeDef] = {
             "account": {"S": self.account},
             "sk": {"S": self.key.sort_key},
             "arn": {"S": self.arn},
@@ -113,6 +117,28 @@ class RegisteredInstance(ABC):
             "name": {"S": self.name},
             "state": {"S": self.stored_state},
         }
+        if self.version is not None:
+            item["version"] = {"N": str(self.version)}
+        return item
+
+    def dirty_attributes(
+        self, previous: "RegisteredInstance"
+    ) -> dict[str, Optional[AttributeValueTypeDef]]:
+        """
+        the item attributes that changed from `previous` (the record as it was read) to this record. Attributes that
+        were removed map to None. The key and the version are never dirty
+        """
+        old_item = previous.to_item()
+        new_item = self.to_item()
+        dirty: dict[str, Optional[AttributeValueTypeDef]] = {
+            name: value
+            for name, value in new_item.items()
+            if old_item.get(name) != value
+        }
+        dirty.update({name: None for name in old_item.keys() - new_item.keys()})
+        for name in ("account", "sk", "version"):
+            dirty.pop(name, None)
+        return dirty
 
     @classmethod
     def _extract_common_fields(
@@ -124,6 +150,7 @@ class RegisteredInstance(ABC):
         validate_string_item(item, "schedule", True)
         validate_string_item(item, "name", True)
         validate_string_item(item, "state", True)
+        validate_number_item(item, "version", False)
 
         key = RegistryKey.parse_db_sort_key(item["account"]["S"], item["sk"]["S"])
 
@@ -135,6 +162,7 @@ class RegisteredInstance(ABC):
             "schedule": item["schedule"]["S"],
             "name": item["name"]["S"],
             "stored_state": cast(InstanceState, item["state"]["S"]),
+            "version": int(item["version"]["N"]) if "version" in item else None,
         }
 
     @classmethod
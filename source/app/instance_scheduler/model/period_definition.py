@@ -1,7 +1,7 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
 import inspect
-from dataclasses import dataclass
+from dataclasses import InitVar, dataclass
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -96,9 +96,12 @@ class PeriodDefinition:
     monthdays: Optional[set[str]] = None
     description: Optional[str] = None
     configured_in_stack: Optional[str] = None
+    # must only be set for the fields of an existing (and so already validated) definition
+    skip_validation: InitVar[bool] = False
 
-    def __post_init__(self) -> None:
-        self.validate()
+    def __post_init__(self, skip_validation: bool) -> None:
+        if not skip_validation:
+            self.validate()
 
     def validate(self) -> None:
         # will throw validation exceptions
@@ -196,11 +199,15 @@ class PeriodDefinition:
         return params
 
     @classmethod
-    def from_period_params(cls, params: PeriodParams) -> "PeriodDefinition":
+    def from_period_params(
+        cls, params: PeriodParams, validate: bool = True
+    ) -> "PeriodDefinition":
         """
         convert PeriodParams to a RunningPeriodDefinition
 
-        This method may raise InvalidPeriodDefinition if RunningPeriod invariants are violated
+        This method may raise InvalidPeriodDefinition if RunningPeriod invariants are violated. `validate=False` skips
+        validation (including the parsing of the cron fields), and must only be used for params produced by
+        to_period_params of an existing (and so already validated) definition
         """
         return PeriodDefinition(
             name=params["name"],
@@ -211,6 +218,7 @@ class PeriodDefinition:
             monthdays=optionally(parse_csv_as_set, params.get("monthdays"), None),
             description=params.get("description", None),
             configured_in_stack=params.get("configured_in_stack", None),
+            skip_validation=not validate,
         )
 
 
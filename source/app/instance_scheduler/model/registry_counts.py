@@ -0,0 +1,106 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Final, Iterable
+
+from instance_scheduler.model.managed_instance import RegisteredInstance
+from instance_scheduler.util.validation import (
+    validate_number_item,
+    validate_string_item,
+)
+
+if TYPE_CHECKING:
+    from mypy_boto3_dynamodb.type_defs import AttributeValueTypeDef
+else:
+    AttributeValueTypeDef = object
+
+# partition of the registry table that holds aggregate counters rather than resources.
+# "account" is the partition key of the registry, so this value must never be a valid account id
+COUNTERS_PARTITION: Final = "counters"
+TARGET_COUNTS_PREFIX: Final = "target#"
+SCHEDULE_COUNT_PREFIX: Final = "schedule#"
+NUM_RESOURCES_ATTR: Final = "num_resources"
+
+
+@dataclass
+class TargetResourceCounts:
+    """
+    aggregate counts of the resources registered to a single scheduling target (account/region/service)
+
+    one item per scheduling target is stored in the COUNTERS_PARTITION of the registry table. The item is kept
+    up to date incrementally using atomic ADD updates whenever a resource is registered/deregistered so that
+    fleet-wide metrics can be reported without scanning the registry
+    """
+
+    account: str
+    region: str
+    service: str
+    num_resources: int = 0
+    schedule_counts: Counter[str] = field(default_factory=Counter)
+
+    @property
+    def sort_key(self) -> str:
+        return counts_sort_key(self.account, self.region, self.service)
+
+    @property
+    def num_schedules(self) -> int:
+        return sum(1 for count in self.schedule_counts.values() if count > 0)
+
+    def to_item(self) -> dict[str, AttributeValueTypeDef]:
+        """Return this object as a dict suitable for a call to DynamoDB `put_item`"""
+        return {
+            "account": {"S": COUNTERS_PARTITION},
+            "sk": {"S": self.sort_key},
+            NUM_RESOURCES_ATTR: {"N": str(self.num_resources)},
+            **{
+                f"{SCHEDULE_COUNT_PREFIX}{schedule}": {"N": str(count)}
+                for schedule, count in self.schedule_counts.items()
+                if count > 0
+            },
+        }
+
+    @classmethod
+    def from_item(
+        cls, item: dict[str, AttributeValueTypeDef]
+    ) -> "TargetResourceCounts":
+        validate_string_item(item, "sk", True)
+        validate_number_item(item, NUM_RESOURCES_ATTR, False)
+
+        _, account, region, service = item["sk"]["S"].split("#", maxsplit=3)
+        schedule_counts: Counter[str] = Counter()
+        for attr_name, value in item.items():
+            if attr_name.startswith(SCHEDULE_COUNT_PREFIX) and "N" in value:
+                schedule_counts[attr_name[len(SCHEDULE_COUNT_PREFIX) :]] = int(
+                    value["N"]
+                )
+
+        return cls(
+            account=account,
+            region=region,
+            service=service,
+            num_resources=int(item.get(NUM_RESOURCES_ATTR, {}).get("N", "0")),
+            schedule_counts=schedule_counts,
+        )
+
+
+def counts_sort_key(account: str, region: str, service: str) -> str:
+    return f"{TARGET_COUNTS_PREFIX}{account}#{region}#{service}"
+
+
+def count_resources_by_target(
+    resources: Iterable[RegisteredInstance],
+) -> list[TargetResourceCounts]:
+    """compute exact per-target counts from a full listing of the registry"""
+    counts: dict[tuple[str, str, str], TargetResourceCounts] = {}
+    for resource in resources:
+        target_key = (resource.account, resource.region, resource.service)
+        target_counts = counts.get(target_key)
+        if target_counts is None:
+            target_counts = TargetResourceCounts(*target_key)
+            counts[target_key] = target_counts
+
+        target_counts.num_resources += 1
+        target_counts.schedule_counts[resource.schedule] += 1
+
+    return list(counts.values())
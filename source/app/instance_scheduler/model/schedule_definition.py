@@ -3,7 +3,7 @@
 import hashlib
 import inspect
 import json
-from dataclasses import asdict, dataclass, field
+from dataclasses import InitVar, asdict, dataclass, field
 from os import environ
 from typing import (
     TYPE_CHECKING,
@@ -30,6 +30,7 @@ from instance_scheduler.model.ddb_item_utils import (
 from instance_scheduler.model.period_definition import PeriodDefinition
 from instance_scheduler.model.period_identifier import PeriodIdentifier
 from instance_scheduler.model.store.period_definition_store import PeriodDefinitionStore
+from instance_scheduler.util.time import get_timezone
 from instance_scheduler.util.validation import (
     ValidationException,
     validate_boolean,
@@ -109,12 +110,15 @@ class ScheduleDefinition:
     hibernate: Optional[bool] = None
     retain_running: Optional[bool] = None
     configured_in_stack: Optional[str] = None
+    # must only be set for the fields of an existing (and so already validated) definition
+    skip_validation: InitVar[bool] = False
 
-    def __post_init__(self) -> None:
+    def __post_init__(self, skip_validation: bool) -> None:
         self.override_status = (
             self.override_status.lower() if self.override_status else None
         )
-        self.validate()
+        if not skip_validation:
+            self.validate()
 
     def validate(self) -> None:
         if not self.name:
@@ -122,7 +126,7 @@ class ScheduleDefinition:
 
         if self.timezone:
             try:
-                _ = ZoneInfo(self.timezone)
+                _ = get_timezone(self.timezone)
             except ZoneInfoNotFoundError:
                 raise InvalidScheduleDefinition(f"Unknown timezone {self.timezone}")
 
@@ -224,7 +228,15 @@ class ScheduleDefinition:
         return params
 
     @classmethod
-    def from_schedule_params(cls, params: ScheduleParams) -> "ScheduleDefinition":
+    def from_schedule_params(
+        cls, params: ScheduleParams, validate: bool = True
+    ) -> "ScheduleDefinition":
+        """
+        convert ScheduleParams to a ScheduleDefinition
+
+        `validate=False` skips validation, and must only be used for params produced by to_schedule_params of an
+        existing (and so already validated) definition
+        """
         return ScheduleDefinition(
             name=params["name"],
             periods=_period_ids_from_csv(params.get("periods", None)),
@@ -238,6 +250,7 @@ class ScheduleDefinition:
             hibernate=params.get("hibernate", None),
             retain_running=params.get("retain_running", None),
             configured_in_stack=params.get("configured_in_stack", None),
+            skip_validation=not validate,
         )
 
     def to_instance_schedule(
@@ -312,12 +325,7 @@ class ScheduleDefinition:
         return periods
 
     def build_timezone(self) -> ZoneInfo:
-        if self.timezone:
-            return ZoneInfo(self.timezone)
-        elif "DEFAULT_TIMEZONE" in environ:
-            return ZoneInfo(environ["DEFAULT_TIMEZONE"])
-        else:
-            return ZoneInfo("UTC")
+        return get_timezone(self.timezone or environ.get("DEFAULT_TIMEZONE", "UTC"))
 
     def to_hash(self, period_store: PeriodDefinitionStore) -> str:
         periods = self.fetch_period_definitions(period_store)
@@ -9,7 +9,10 @@ from instance_scheduler.model.store.dynamo_resource_registry import (
 from instance_scheduler.model.store.in_memory_resource_registry import (
     InMemoryResourceRegistry,
 )
-from instance_scheduler.model.store.resource_registry import ResourceRegistry
+from instance_scheduler.model.store.resource_registry import (
+    RegistryLookup,
+    ResourceRegistry,
+)
 
 
 class CachedResourceRegistry(ResourceRegistry):
@@ -21,6 +24,16 @@ class CachedResourceRegistry(ResourceRegistry):
         self._dynamo_store.put(resource, overwrite)
         self._memory_store.put(resource, overwrite=True)
 
+    def update(
+        self,
+        previous: RegisteredInstance,
+        updated: RegisteredInstance,
+        check_version: bool = False,
+    ) -> RegisteredInstance:
+        stored = self._dynamo_store.update(previous, updated, check_version)
+        self._memory_store.put(stored, overwrite=True)
+        return stored
+
     def get(
         self, key: RegistryKey, cache_only: bool = False
     ) -> RegisteredInstance | None:
@@ -31,6 +44,22 @@ class CachedResourceRegistry(ResourceRegistry):
                 self._memory_store.put(result, overwrite=True)
         return result
 
+    def get_many(
+        self, keys: Iterable[RegistryKey], cache_only: bool = False
+    ) -> RegistryLookup:
+        cached = self._memory_store.get_many(keys)
+        if cache_only or not cached.not_found:
+            return cached
+
+        fetched = self._dynamo_store.get_many(cached.not_found)
+        for resource in fetched.found.values():
+            self._memory_store.put(resource, overwrite=True)
+        return RegistryLookup(
+            found={**cached.found, **fetched.found},
+            not_found=fetched.not_found,
+            errors=fetched.errors,
+        )
+
     def delete(self, key: RegistryKey, error_if_missing: bool = False) -> None:
         self._dynamo_store.delete(key, error_if_missing)
         self._memory_store.delete(key, error_if_missing=False)
@@ -0,0 +1,145 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+import time
+from collections.abc import Callable, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from typing import Final, Optional
+
+from instance_scheduler.model.period_definition import (
+    InvalidPeriodDefinition,
+    PeriodDefinition,
+)
+from instance_scheduler.model.schedule_definition import (
+    InvalidScheduleDefinition,
+    ScheduleDefinition,
+)
+from instance_scheduler.model.store.config_version import get_config_version
+from instance_scheduler.model.store.ddb_config_partition import ReadCapacity
+from instance_scheduler.model.store.dynamo_period_definition_store import (
+    DynamoPeriodDefinitionStore,
+)
+from instance_scheduler.model.store.dynamo_schedule_definition_store import (
+    DynamoScheduleDefinitionStore,
+)
+
+
+@dataclass(frozen=True)
+class ConfigTableContents:
+    schedules: Mapping[str, ScheduleDefinition] = field(default_factory=dict)
+    periods: Mapping[str, PeriodDefinition] = field(default_factory=dict)
+    schedule_errors: list[InvalidScheduleDefinition] = field(default_factory=list)
+    period_errors: list[InvalidPeriodDefinition] = field(default_factory=list)
+    consumed_read_capacity: float = 0.0
+    from_cache: bool = False
+
+
+def load_config_table(
+    table_name: str,
+    load_schedules: bool = True,
+    load_periods: bool = True,
+    page_size: Optional[int] = None,
+) -> ConfigTableContents:
+    """
+    load every schedule and period definition from the config table
+
+    each partition is paged through in full (a single query returns at most 1 MB), and the schedule and period
+    partitions are queried concurrently. Items are parsed as each page is received
+    """
+    schedule_capacity = ReadCapacity()
+    period_capacity = ReadCapacity()
+
+    def load_schedule_partition() -> (
+        tuple[Mapping[str, ScheduleDefinition], list[InvalidScheduleDefinition]]
+    ):
+        if not load_schedules:
+            return {}, []
+        return DynamoScheduleDefinitionStore(table_name).find_all_with_errors(
+            capacity=schedule_capacity, page_size=page_size
+        )
+
+    def load_period_partition() -> (
+        tuple[Mapping[str, PeriodDefinition], list[InvalidPeriodDefinition]]
+    ):
+        if not load_periods:
+            return {}, []
+        return DynamoPeriodDefinitionStore(table_name).find_all_with_errors(
+            capacity=period_capacity, page_size=page_size
+        )
+
+    if load_schedules and load_periods:
+        with ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="config-loader"
+        ) as pool:
+            # the periods are read in the background while the schedules are read on this thread
+            periods_future = pool.submit(load_period_partition)
+            schedules, schedule_errors = load_schedule_partition()
+            periods, period_errors = periods_future.result()
+    else:
+        schedules, schedule_errors = load_schedule_partition()
+        periods, period_errors = load_period_partition()
+
+    return ConfigTableContents(
+        schedules=schedules,
+        periods=periods,
+        schedule_errors=schedule_errors,
+        period_errors=period_errors,
+        consumed_read_capacity=schedule_capacity.units + period_capacity.units,
+    )
+
+
+CONFIG_CACHE_MAX_AGE_SECONDS: Final = 3600.0
+
+
+@dataclass(frozen=True)
+class _CachedConfig:
+    table_name: str
+    version: int
+    loaded_at: float
+    contents: ConfigTableContents
+
+
+class ConfigTableCache:
+    """
+    the full contents of the config table, kept across the invocations of a warm lambda container
+
+    the config is loaded again only when the config version (see config_version) has changed, which costs a single
+    get_item per load. The config is also loaded again after `max_age_seconds`, to pick up changes that were made to
+    the table directly rather than by the solution
+    """
+
+    def __init__(
+        self,
+        max_age_seconds: float = CONFIG_CACHE_MAX_AGE_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max_age_seconds = max_age_seconds
+        self._clock = clock
+        self._cached: Optional[_CachedConfig] = None
+
+    def load(self, table_name: str) -> ConfigTableContents:
+        # the version is read first, so a change made while loading is picked up by the next load
+        version = get_config_version(table_name)
+        cached = self._cached
+        if (
+            cached is not None
+            and version is not None
+            and cached.table_name == table_name
+            and cached.version == version
+            and self._clock() - cached.loaded_at < self._max_age_seconds
+        ):
+            return replace(cached.contents, consumed_read_capacity=0.0, from_cache=True)
+
+        contents = load_config_table(table_name)
+        if version is not None:
+            self._cached = _CachedConfig(table_name, version, self._clock(), contents)
+        else:
+            self._cached = None
+        return contents
+
+    def clear(self) -> None:
+        self._cached = None
+
+
+# shared by all invocations of a warm container
+CONFIG_TABLE_CACHE: Final = ConfigTableCache()
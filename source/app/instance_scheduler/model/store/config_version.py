@@ -0,0 +1,64 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+from typing import TYPE_CHECKING, Final, Optional
+
+from instance_scheduler.util.session_manager import hub_dynamo_client
+
+if TYPE_CHECKING:
+    from mypy_boto3_dynamodb.type_defs import (
+        AttributeValueTypeDef,
+        TransactWriteItemTypeDef,
+    )
+else:
+    AttributeValueTypeDef = object
+    TransactWriteItemTypeDef = object
+
+CONFIG_VERSION_KEY: Final[dict[str, AttributeValueTypeDef]] = {
+    "type": {"S": "config"},
+    "name": {"S": "version"},
+}
+"""
+monotonic counter of the changes to the schedules and periods in the config table
+
+every write of schedules/periods increments it in the same transaction, so a reader that has already loaded the config
+at the current version does not need to load it again
+"""
+
+
+def transact_bump_config_version(table_name: str) -> TransactWriteItemTypeDef:
+    """the write that increments the config version (there can only be one such write per transaction)"""
+    return {
+        "Update": {
+            "TableName": table_name,
+            "Key": CONFIG_VERSION_KEY,
+            "UpdateExpression": "ADD #version :one",
+            "ExpressionAttributeNames": {"#version": "version"},
+            "ExpressionAttributeValues": {":one": {"N": "1"}},
+        }
+    }
+
+
+def bump_config_version(table_name: str) -> int:
+    """increment the config version outside of a transaction, returns the new version"""
+    result = hub_dynamo_client().update_item(
+        TableName=table_name,
+        Key=CONFIG_VERSION_KEY,
+        UpdateExpression="ADD #version :one",
+        ExpressionAttributeNames={"#version": "version"},
+        ExpressionAttributeValues={":one": {"N": "1"}},
+        ReturnValues="UPDATED_NEW",
+    )
+    return int(result["Attributes"]["version"]["N"])
+
+
+def get_config_version(table_name: str) -> Optional[int]:
+    """the current config version, or None if the config has not been written since the version was introduced"""
+    result = hub_dynamo_client().get_item(
+        TableName=table_name,
+        Key=CONFIG_VERSION_KEY,
+        ProjectionExpression="#version",
+        ExpressionAttributeNames={"#version": "version"},
+        ConsistentRead=True,
+    )
+    version = result.get("Item", {}).get("version")
+    return int(version["N"]) if version else None
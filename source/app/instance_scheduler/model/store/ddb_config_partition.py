@@ -0,0 +1,54 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Literal, Optional
+
+from instance_scheduler.util.session_manager import hub_dynamo_client
+
+if TYPE_CHECKING:
+    from mypy_boto3_dynamodb.type_defs import (
+        AttributeValueTypeDef,
+        PaginatorConfigTypeDef,
+    )
+else:
+    AttributeValueTypeDef = object
+    PaginatorConfigTypeDef = object
+
+ConfigItemType = Literal["schedule", "period"]
+
+
+@dataclass
+class ReadCapacity:
+    """read capacity consumed by the queries it is passed to"""
+
+    units: float = 0.0
+
+
+def query_config_partition(
+    table_name: str,
+    item_type: ConfigItemType,
+    capacity: Optional[ReadCapacity] = None,
+    page_size: Optional[int] = None,
+) -> Iterator[dict[str, AttributeValueTypeDef]]:
+    """
+    every item in the config table partition of `item_type`, following every page of the query
+
+    items are yielded as each page is received, so they can be parsed while the next page is read
+    """
+    pagination_config: PaginatorConfigTypeDef = {}
+    if page_size is not None:
+        pagination_config["PageSize"] = page_size
+
+    paginator = hub_dynamo_client().get_paginator("query")
+    for page in paginator.paginate(
+        TableName=table_name,
+        KeyConditionExpression="#part_key=:value",
+        ExpressionAttributeNames={"#part_key": "type"},
+        ExpressionAttributeValues={":value": {"S": item_type}},
+        ReturnConsumedCapacity="TOTAL",
+        PaginationConfig=pagination_config,
+    ):
+        if capacity is not None:
+            capacity.units += page.get("ConsumedCapacity", {}).get("CapacityUnits", 0.0)
+        yield from page["Items"]
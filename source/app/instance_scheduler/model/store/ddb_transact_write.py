@@ -4,6 +4,8 @@ import uuid
 from types import TracebackType
 from typing import TYPE_CHECKING, Optional, Self, Sequence
 
+from botocore.exceptions import ClientError
+
 if TYPE_CHECKING:
     from mypy_boto3_dynamodb import DynamoDBClient
     from mypy_boto3_dynamodb.type_defs import TransactWriteItemTypeDef
@@ -21,11 +23,19 @@ class WriteTransaction:
 
     refer to https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/dynamodb/client/transact_write_items.html#
     for details
+
+    `final_items` are added to the transaction when it is committed (such as the increment of a version counter that
+    must happen exactly once per transaction)
     """
 
-    def __init__(self, client: DynamoDBClient) -> None:
+    def __init__(
+        self,
+        client: DynamoDBClient,
+        final_items: Sequence[TransactWriteItemTypeDef] = (),
+    ) -> None:
         self._client = client
         self.transaction_items: list[TransactWriteItemTypeDef] = []
+        self.final_items: list[TransactWriteItemTypeDef] = list(final_items)
         self.request_token = str(uuid.uuid4())
 
     def __enter__(self) -> Self:
@@ -47,6 +57,14 @@ class WriteTransaction:
 
     def _commit(self) -> None:
         self._client.transact_write_items(
-            TransactItems=self.transaction_items,
+            TransactItems=[*self.transaction_items, *self.final_items],
             ClientRequestToken=self.request_token,
         )
+
+
+def is_condition_failure(error: ClientError) -> bool:
+    """true when a transaction was cancelled because a condition expression was not met"""
+    return error.response["Error"]["Code"] == "TransactionCanceledException" and any(
+        reason.get("Code") == "ConditionalCheckFailed"
+        for reason in error.response.get("CancellationReasons", [])
+    )
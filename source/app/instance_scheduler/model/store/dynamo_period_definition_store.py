@@ -9,6 +9,17 @@ from instance_scheduler.model.period_definition import (
     InvalidPeriodDefinition,
     PeriodDefinition,
 )
+from instance_scheduler.model.store.config_version import (
+    transact_bump_config_version,
+)
+from instance_scheduler.model.store.ddb_config_partition import (
+    ReadCapacity,
+    query_config_partition,
+)
+from instance_scheduler.model.store.ddb_transact_write import (
+    WriteTransaction,
+    is_condition_failure,
+)
 from instance_scheduler.model.store.period_definition_store import (
     PeriodAlreadyExistsException,
     PeriodDefinitionStore,
@@ -27,52 +38,26 @@ class DynamoPeriodDefinitionStore(PeriodDefinitionStore):
         self._table: Final[str] = table_name
 
     def put(self, period: PeriodDefinition, overwrite: bool = False) -> None:
-        if overwrite:
-            hub_dynamo_client().put_item(
-                TableName=self._table,
-                Item=period.to_item(),
-            )
-        else:
-            try:
-                hub_dynamo_client().put_item(
-                    TableName=self._table,
-                    Item=period.to_item(),
-                    ConditionExpression="attribute_not_exists(#key_type) AND attribute_not_exists(#key_name)",
-                    ExpressionAttributeNames={
-                        "#key_type": "type",  # NOSONAR -- this is not duplication
-                        "#key_name": "name",  # NOSONAR -- this is not duplication
-                    },
+        try:
+            with self.new_transaction() as transaction:
+                transaction.add(self.transact_put(period, overwrite))
+        except ClientError as ce:
+            if not overwrite and is_condition_failure(ce):
+                raise PeriodAlreadyExistsException(
+                    f"period {period.name} already exists"
                 )
-            except ClientError as ce:
-                if ce.response["Error"]["Code"] == "ConditionalCheckFailedException":
-                    raise PeriodAlreadyExistsException(
-                        f"period {period.name} already exists"
-                    )
-                else:
-                    raise ce
+            else:
+                raise ce
 
     def delete(self, period_name: str, error_if_missing: bool = False) -> None:
-        if error_if_missing:
-            try:
-                hub_dynamo_client().delete_item(
-                    TableName=self._table,
-                    Key={"type": {"S": "period"}, "name": {"S": period_name}},
-                    ConditionExpression="attribute_exists(#key_type) AND attribute_exists(#key_name)",
-                    ExpressionAttributeNames={
-                        "#key_type": "type",  # NOSONAR -- this is not duplication
-                        "#key_name": "name",  # NOSONAR -- this is not duplication
-                    },
-                )
-            except ClientError as ce:
-                if ce.response["Error"]["Code"] == "ConditionalCheckFailedException":
-                    raise UnknownPeriodException(f"period {period_name} does not exist")
-                else:
-                    raise ce
-        else:
-            hub_dynamo_client().delete_item(
-                TableName=self._table,
-                Key={"type": {"S": "period"}, "name": {"S": period_name}},
-            )
+        try:
+            with self.new_transaction() as transaction:
+                transaction.add(self.transact_delete(period_name, error_if_missing))
+        except ClientError as ce:
+            if error_if_missing and is_condition_failure(ce):
+                raise UnknownPeriodException(f"period {period_name} does not exist")
+            else:
+                raise ce
 
     def transact_put(
         self, period: PeriodDefinition, overwrite: bool = False
@@ -134,6 +119,13 @@ class DynamoPeriodDefinitionStore(PeriodDefinitionStore):
                 }
             ]
 
+    def new_transaction(self) -> WriteTransaction:
+        """a transaction of config writes, which increments the config version when it is committed"""
+        return WriteTransaction(
+            hub_dynamo_client(),
+            final_items=[transact_bump_config_version(self._table)],
+        )
+
     def find_by_name(self, period_name: str) -> Optional[PeriodDefinition]:
         result = hub_dynamo_client().get_item(
             TableName=self._table,
@@ -156,17 +148,14 @@ class DynamoPeriodDefinitionStore(PeriodDefinitionStore):
 
     def find_all_with_errors(
         self,
+        capacity: Optional[ReadCapacity] = None,
+        page_size: Optional[int] = None,
     ) -> tuple[Mapping[str, PeriodDefinition], list[InvalidPeriodDefinition]]:
-        result = hub_dynamo_client().query(
-            TableName=self._table,
-            KeyConditionExpression="#part_key=:value",
-            ExpressionAttributeNames={"#part_key": "type"},
-            ExpressionAttributeValues={":value": {"S": "period"}},
-        )
-
         periods: dict[str, PeriodDefinition] = {}
         exceptions: list[InvalidPeriodDefinition] = list()
-        for item in result["Items"]:
+        for item in query_config_partition(
+            self._table, "period", capacity=capacity, page_size=page_size
+        ):
             try:
                 period = PeriodDefinition.from_item(item)
                 periods[period.name] = period
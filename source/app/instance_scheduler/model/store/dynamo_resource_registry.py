@@ -1,8 +1,19 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
-from typing import Final, Iterator, Literal, overload
+from collections.abc import Iterable, Mapping
+from dataclasses import replace
+from time import sleep
+from typing import (
+    TYPE_CHECKING,
+    Final,
+    Iterator,
+    Literal,
+    Optional,
+    cast,
+    overload,
+)
 
-from botocore.exceptions import ClientError
+from botocore.exceptions import BotoCoreError, ClientError
 from instance_scheduler.model.managed_instance import (
     RegisteredAsgInstance,
     RegisteredEc2Instance,
@@ -10,26 +21,51 @@ from instance_scheduler.model.managed_instance import (
     RegisteredRdsInstance,
     RegistryKey,
 )
+from instance_scheduler.model.registry_counts import COUNTERS_PARTITION
+from instance_scheduler.model.store.registry_counter_store import RegistryCounterStore
 from instance_scheduler.model.store.resource_registry import (
+    RegistryLookup,
+    RegistryRow,
     ResourceAlreadyRegisteredException,
     ResourceRegistry,
+    StaleResourceException,
     UnknownResourceException,
 )
 from instance_scheduler.observability.powertools_logging import powertools_logger
 from instance_scheduler.util.session_manager import hub_dynamo_client
 
+if TYPE_CHECKING:
+    from mypy_boto3_dynamodb.type_defs import (
+        AttributeValueTypeDef,
+        KeysAndAttributesUnionTypeDef,
+    )
+else:
+    AttributeValueTypeDef = object
+    KeysAndAttributesUnionTypeDef = object
+
 logger = powertools_logger()
 
+BATCH_GET_SIZE: Final = 100
+BATCH_GET_MAX_ATTEMPTS: Final = 5
+BATCH_GET_BASE_DELAY_SECONDS: Final = 0.05
+
 
 class DynamoResourceRegistry(ResourceRegistry):
     def __init__(self, table_name: str):
         self._table: Final[str] = table_name
+        self._counters: Final = RegistryCounterStore(table_name)
 
     def put(self, resource: RegisteredInstance, overwrite: bool = False) -> None:
         if overwrite:
-            hub_dynamo_client().put_item(
+            response = hub_dynamo_client().put_item(
                 TableName=self._table,
                 Item=resource.to_item(),
+                ReturnValues="ALL_OLD",
+            )
+            self._update_counters(
+                resource.key,
+                old_schedule=_schedule_of(response.get("Attributes")),
+                new_schedule=resource.schedule,
             )
         else:
             try:
@@ -49,6 +85,83 @@ class DynamoResourceRegistry(ResourceRegistry):
                     )
                 else:
                     raise ce
+            self._update_counters(
+                resource.key, old_schedule=None, new_schedule=resource.schedule
+            )
+
+    def update(
+        self,
+        previous: RegisteredInstance,
+        updated: RegisteredInstance,
+        check_version: bool = False,
+    ) -> RegisteredInstance:
+        """
+        write only the attributes that changed from `previous` to `updated` with UpdateItem, rather than rewriting
+        the whole item, and increment the version of the item.
+
+        with `check_version`, the update fails with StaleResourceException when the item was updated since `previous`
+        was read. A resource that was deregistered since it was read is written in full, as put would. That fallback
+        costs a second write, so resources known not to be registered yet should be written with put instead
+        """
+        if previous.key != updated.key:
+            raise ValueError(
+                f"cannot update {previous.display_name} to a different resource {updated.display_name}"
+            )
+        dirty = updated.dirty_attributes(previous)
+        if not dirty:
+            return updated
+
+        attribute_names: dict[str, str] = {"#sk": "sk", "#version": "version"}
+        attribute_values: dict[str, AttributeValueTypeDef] = {
+            ":zero": {"N": "0"},
+            ":one": {"N": "1"},
+        }
+        set_actions = ["#version = if_not_exists(#version, :zero) + :one"]
+        remove_actions: list[str] = []
+        for index, (name, value) in enumerate(sorted(dirty.items())):
+            attribute_names[f"#attr{index}"] = name
+            if value is None:
+                remove_actions.append(f"#attr{index}")
+            else:
+                attribute_values[f":attr{index}"] = value
+                set_actions.append(f"#attr{index} = :attr{index}")
+
+        update_expression = f"SET {', '.join(set_actions)}"
+        if remove_actions:
+            update_expression += f" REMOVE {', '.join(remove_actions)}"
+
+        condition_expression = "attribute_exists(#sk)"
+        if check_version and previous.version is None:
+            condition_expression += " AND attribute_not_exists(#version)"
+        elif check_version:
+            condition_expression += " AND #version = :expected_version"
+            attribute_values[":expected_version"] = {"N": str(previous.version)}
+
+        try:
+            response = hub_dynamo_client().update_item(
+                TableName=self._table,
+                Key=updated.key.as_ddb_key(),
+                UpdateExpression=update_expression,
+                ConditionExpression=condition_expression,
+                ExpressionAttributeNames=attribute_names,
+                ExpressionAttributeValues=attribute_values,
+                ReturnValues="UPDATED_NEW",
+                ReturnValuesOnConditionCheckFailure="ALL_OLD",
+            )
+        except ClientError as ce:
+            if ce.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                raise ce
+            if "Item" in ce.response:
+                raise StaleResourceException(
+                    f"resource '{updated.display_name}' was updated since it was read"
+                )
+            self.put(updated, overwrite=True)
+            return updated
+
+        self._update_counters(
+            updated.key, old_schedule=previous.schedule, new_schedule=updated.schedule
+        )
+        return replace(updated, version=int(response["Attributes"]["version"]["N"]))
 
     def get(self, key: RegistryKey) -> RegisteredInstance | None:
         try:
@@ -62,12 +175,78 @@ class DynamoResourceRegistry(ResourceRegistry):
             logger.warning(f"Error retrieving item: {e}", extra={"key": key})
             return None
 
+    def get_many(self, keys: Iterable[RegistryKey]) -> RegistryLookup:
+        """
+        look up the registry records of several keys with BatchGetItem, 100 keys per request.
+
+        keys that DynamoDB leaves unprocessed are retried with exponential backoff. Keys that are still unprocessed
+        after the last attempt, keys of a request that failed, and keys of malformed records are reported as errors
+        rather than as not found
+        """
+        unique_keys = list(dict.fromkeys(keys))
+        found: dict[RegistryKey, RegisteredInstance] = {}
+        errors: dict[RegistryKey, str] = {}
+        for batch_start in range(0, len(unique_keys), BATCH_GET_SIZE):
+            batch = unique_keys[batch_start : batch_start + BATCH_GET_SIZE]
+            self._batch_get(batch, found, errors)
+
+        return RegistryLookup(
+            found=found,
+            not_found=[
+                key for key in unique_keys if key not in found and key not in errors
+            ],
+            errors=errors,
+        )
+
+    def _batch_get(
+        self,
+        keys: list[RegistryKey],
+        found: dict[RegistryKey, RegisteredInstance],
+        errors: dict[RegistryKey, str],
+    ) -> None:
+        keys_by_sort_key = {(key.account, key.sort_key): key for key in keys}
+        request_items: Mapping[str, KeysAndAttributesUnionTypeDef] = {
+            self._table: {"Keys": [key.as_ddb_key() for key in keys]}
+        }
+        for attempt in range(BATCH_GET_MAX_ATTEMPTS):
+            if attempt > 0:
+                sleep(BATCH_GET_BASE_DELAY_SECONDS * 2 ** (attempt - 1))
+            try:
+                response = hub_dynamo_client().batch_get_item(
+                    RequestItems=request_items
+                )
+            except (BotoCoreError, ClientError) as e:
+                for key in _requested_keys(
+                    request_items, self._table, keys_by_sort_key
+                ):
+                    errors[key] = str(e)
+                return
+
+            for item in response["Responses"].get(self._table, []):
+                key = keys_by_sort_key[(item["account"]["S"], item["sk"]["S"])]
+                try:
+                    found[key] = RegisteredInstance.from_item(item)
+                except Exception as e:
+                    errors[key] = f"malformed registry record: {e}"
+
+            unprocessed = response.get("UnprocessedKeys")
+            if not unprocessed:
+                return
+            request_items = unprocessed
+
+        for key in _requested_keys(request_items, self._table, keys_by_sort_key):
+            errors[key] = (
+                f"still unprocessed after {BATCH_GET_MAX_ATTEMPTS} batch_get_item attempts"
+            )
+
     def delete(self, key: RegistryKey, error_if_missing: bool = False) -> None:
         if not error_if_missing:
-            hub_dynamo_client().delete_item(TableName=self._table, Key=key.as_ddb_key())
+            response = hub_dynamo_client().delete_item(
+                TableName=self._table, Key=key.as_ddb_key(), ReturnValues="ALL_OLD"
+            )
         else:
             try:
-                hub_dynamo_client().delete_item(
+                response = hub_dynamo_client().delete_item(
                     TableName=self._table,
                     Key=key.as_ddb_key(),
                     ConditionExpression="attribute_exists(#pk) AND attribute_exists(#sk)",
@@ -75,6 +254,7 @@ class DynamoResourceRegistry(ResourceRegistry):
                         "#pk": "account",
                         "#sk": "sk",
                     },
+                    ReturnValues="ALL_OLD",
                 )
             except ClientError as ce:
                 if ce.response["Error"]["Code"] == "ConditionalCheckFailedException":
@@ -82,10 +262,55 @@ class DynamoResourceRegistry(ResourceRegistry):
                 else:
                     raise ce
 
+        self._update_counters(
+            key,
+            old_schedule=_schedule_of(response.get("Attributes")),
+            new_schedule=None,
+        )
+
+    def _update_counters(
+        self,
+        key: RegistryKey,
+        old_schedule: Optional[str],
+        new_schedule: Optional[str],
+    ) -> None:
+        """
+        keep the aggregate counters of the target in sync with a write to the registry.
+
+        counters only need to change when a resource enters or leaves a target or moves to a new schedule,
+        so the common case of a stored_state update does not cost an additional write.
+        Failures are logged rather than raised as drift is corrected by periodic reconciliation
+        """
+        if old_schedule == new_schedule:
+            return
+
+        schedule_deltas: dict[str, int] = {}
+        if old_schedule is not None:
+            schedule_deltas[old_schedule] = -1
+        if new_schedule is not None:
+            schedule_deltas[new_schedule] = 1
+
+        resource_delta = (new_schedule is not None) - (old_schedule is not None)
+
+        try:
+            self._counters.adjust(
+                account=key.account,
+                region=key.region,
+                service=key.service,
+                resource_delta=resource_delta,
+                schedule_deltas=schedule_deltas,
+            )
+        except Exception as e:
+            logger.warning(
+                f"Unable to update registry counters: {e}", extra={"key": key}
+            )
+
     def find_all(self) -> Iterator[RegisteredInstance]:
         paginator = hub_dynamo_client().get_paginator("scan")
         for page in paginator.paginate(TableName=self._table):
             for item in page["Items"]:
+                if item.get("account", {}).get("S") == COUNTERS_PARTITION:
+                    continue
                 try:
                     yield RegisteredInstance.from_item(item)
                 except Exception as e:
@@ -93,6 +318,33 @@ class DynamoResourceRegistry(ResourceRegistry):
                         f"Skipping malformed item: {e}", extra={"item": item}
                     )
 
+    def scan_rows(self) -> Iterator[RegistryRow]:
+        """
+        scan only the key and schedule of every registry item, which is all the orchestrator needs to dispatch
+        scheduling targets. Items are not parsed into RegisteredInstances
+        """
+        paginator = hub_dynamo_client().get_paginator("scan")
+        for page in paginator.paginate(
+            TableName=self._table,
+            ProjectionExpression="#pk, #sk, #schedule",
+            ExpressionAttributeNames={
+                "#pk": "account",
+                "#sk": "sk",
+                "#schedule": "schedule",
+            },
+        ):
+            for item in page["Items"]:
+                account = item["account"]["S"]
+                if account == COUNTERS_PARTITION:
+                    continue
+                try:
+                    _, region, service, _, _ = item["sk"]["S"].split("#")
+                    yield RegistryRow(account, region, service, item["schedule"]["S"])
+                except Exception as e:
+                    logger.warning(
+                        f"Skipping malformed item: {e}", extra={"item": item}
+                    )
+
     def find_by_account(self, account: str) -> Iterator[RegisteredInstance]:
         paginator = hub_dynamo_client().get_paginator("query")
         for page in paginator.paginate(
@@ -147,3 +399,20 @@ class DynamoResourceRegistry(ResourceRegistry):
                     logger.warning(
                         f"Skipping malformed item: {e}", extra={"item": item}
                     )
+
+
+def _requested_keys(
+    request_items: Mapping[str, KeysAndAttributesUnionTypeDef],
+    table_name: str,
+    keys_by_sort_key: Mapping[tuple[str, str], RegistryKey],
+) -> Iterator[RegistryKey]:
+    for ddb_key in request_items.get(table_name, {"Keys": []})["Keys"]:
+        account = cast(Mapping[str, str], ddb_key["account"])["S"]
+        sort_key = cast(Mapping[str, str], ddb_key["sk"])["S"]
+        yield keys_by_sort_key[(account, sort_key)]
+
+
+def _schedule_of(item: Optional[dict[str, AttributeValueTypeDef]]) -> Optional[str]:
+    if item is None:
+        return None
+    return item.get("schedule", {}).get("S", "")
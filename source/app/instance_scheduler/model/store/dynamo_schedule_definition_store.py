@@ -1,15 +1,28 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
 import json
-from collections.abc import Mapping
+from collections.abc import Iterator, Mapping
+from datetime import datetime, timezone
+from time import sleep
 from typing import TYPE_CHECKING, Final, Optional, Sequence
 
 from botocore.exceptions import ClientError
+from instance_scheduler.model.period_identifier import PeriodIdentifier
 from instance_scheduler.model.schedule_definition import (
     InvalidScheduleDefinition,
     ScheduleDefinition,
 )
-from instance_scheduler.model.store.ddb_transact_write import WriteTransaction
+from instance_scheduler.model.store.config_version import (
+    transact_bump_config_version,
+)
+from instance_scheduler.model.store.ddb_config_partition import (
+    ReadCapacity,
+    query_config_partition,
+)
+from instance_scheduler.model.store.ddb_transact_write import (
+    WriteTransaction,
+    is_condition_failure,
+)
 from instance_scheduler.model.store.schedule_definition_store import (
     ScheduleAlreadyExistsException,
     ScheduleDefinitionStore,
@@ -18,9 +31,46 @@ from instance_scheduler.model.store.schedule_definition_store import (
 from instance_scheduler.util.session_manager import hub_dynamo_client
 
 if TYPE_CHECKING:
-    from mypy_boto3_dynamodb.type_defs import TransactWriteItemTypeDef
+    from mypy_boto3_dynamodb.type_defs import (
+        AttributeValueTypeDef,
+        KeysAndAttributesUnionTypeDef,
+        TransactWriteItemTypeDef,
+        WriteRequestTypeDef,
+        WriteRequestUnionTypeDef,
+    )
 else:
+    AttributeValueTypeDef = object
+    KeysAndAttributesUnionTypeDef = object
     TransactWriteItemTypeDef = object
+    WriteRequestTypeDef = object
+    WriteRequestUnionTypeDef = object
+
+BATCH_GET_SIZE: Final = 100
+BATCH_WRITE_SIZE: Final = 25
+BATCH_MAX_ATTEMPTS: Final = 5
+BATCH_BASE_DELAY_SECONDS: Final = 0.05
+
+
+PERIOD_REFERENCE_TYPE: Final = "period_ref"
+"""
+partition of the config table that indexes schedules by the periods they reference
+
+there is one item per (period, schedule) pair, named "<period>#<schedule>". The items are written in the same
+transaction as the schedule itself, so a period's schedules can be found without loading every schedule
+"""
+
+PERIOD_INDEX_COMPLETE_KEY: Final[dict[str, AttributeValueTypeDef]] = {
+    "type": {"S": "config"},
+    "name": {"S": "period_index"},
+}
+"""
+marker written once the period index has been rebuilt from every schedule in the table (see rebuild_period_index)
+
+schedules written before the index existed are not indexed until then, so the index is not used without the marker.
+The index is rebuilt by the setup custom resource, which is only updated when the solution version changes. Schedules
+written directly to the table (e.g. from the console) are not indexed until the next rebuild, so the index is only
+used for read-only queries (see find_indexed_by_period)
+"""
 
 
 class DynamoScheduleDefinitionStore(ScheduleDefinitionStore):
@@ -31,62 +81,44 @@ class DynamoScheduleDefinitionStore(ScheduleDefinitionStore):
         self._table: Final = table_name
 
     def put(self, schedule: ScheduleDefinition, overwrite: bool = False) -> None:
-        if overwrite:
-            hub_dynamo_client().put_item(
-                TableName=self._table,
-                Item=schedule.to_item(),
-            )
-        else:
-            try:
-                hub_dynamo_client().put_item(
-                    TableName=self._table,
-                    Item=schedule.to_item(),
-                    ConditionExpression=(
-                        "attribute_exists(#key_type) AND attribute_exists(#key_name)"  # NOSONAR -- this is not duplication
-                        if overwrite
-                        else "attribute_not_exists(#key_type) AND attribute_not_exists(#key_name)"
-                    ),
-                    ExpressionAttributeNames={
-                        "#key_type": "type",  # NOSONAR -- this is not duplication
-                        "#key_name": "name",  # NOSONAR -- this is not duplication
-                    },
+        try:
+            with self.new_transaction() as transaction:
+                transaction.add(self.transact_put(schedule, overwrite))
+        except ClientError as ce:
+            if not overwrite and is_condition_failure(ce):
+                raise ScheduleAlreadyExistsException(
+                    f"schedule {schedule.name} already exists"
                 )
-            except ClientError as ce:
-                if ce.response["Error"]["Code"] == "ConditionalCheckFailedException":
-                    raise ScheduleAlreadyExistsException(
-                        f"schedule {schedule.name} already exists"
-                    )
-                else:
-                    raise ce
+            else:
+                raise ce
 
     def delete(self, schedule_name: str, error_if_missing: bool = False) -> None:
-        if error_if_missing:
-            try:
-                hub_dynamo_client().delete_item(
-                    TableName=self._table,
-                    Key={"type": {"S": "schedule"}, "name": {"S": schedule_name}},
-                    ConditionExpression="attribute_exists(#key_type) AND attribute_exists(#key_name)",
-                    ExpressionAttributeNames={
-                        "#key_type": "type",  # NOSONAR -- this is not duplication
-                        "#key_name": "name",  # NOSONAR -- this is not duplication
-                    },
+        try:
+            with self.new_transaction() as transaction:
+                transaction.add(self.transact_delete(schedule_name, error_if_missing))
+        except ClientError as ce:
+            if error_if_missing and is_condition_failure(ce):
+                raise UnknownScheduleException(
+                    f"schedule {schedule_name} does not exist"
                 )
-            except ClientError as ce:
-                if ce.response["Error"]["Code"] == "ConditionalCheckFailedException":
-                    raise UnknownScheduleException(
-                        f"schedule {schedule_name} does not exist"
-                    )
-                else:
-                    raise ce
-        else:
-            hub_dynamo_client().delete_item(
-                TableName=self._table,
-                Key={"type": {"S": "schedule"}, "name": {"S": schedule_name}},
-            )
+            else:
+                raise ce
 
     def transact_put(
         self, schedule: ScheduleDefinition, overwrite: bool = False
     ) -> Sequence[TransactWriteItemTypeDef]:
+        """
+        the writes that put the schedule and update the period index to match it. When overwriting, the periods of
+        the stored schedule are read so that the references it no longer makes can be removed
+        """
+        stored_periods = (
+            self._find_stored_period_names(schedule.name) if overwrite else set()
+        )
+        new_periods = _period_names(schedule)
+        index_items = self._transact_update_period_index(
+            schedule.name, added=new_periods, removed=stored_periods - new_periods
+        )
+
         if overwrite:
             return [
                 {
@@ -94,7 +126,8 @@ class DynamoScheduleDefinitionStore(ScheduleDefinitionStore):
                         "Item": schedule.to_item(),
                         "TableName": self._table,
                     }
-                }
+                },
+                *index_items,
             ]
         else:
             return [
@@ -108,12 +141,20 @@ class DynamoScheduleDefinitionStore(ScheduleDefinitionStore):
                             "#key_name": "name",  # NOSONAR -- this is not duplication
                         },
                     }
-                }
+                },
+                *index_items,
             ]
 
     def transact_delete(
         self, schedule_name: str, error_if_missing: bool = False
     ) -> Sequence[TransactWriteItemTypeDef]:
+        """the writes that delete the schedule and its entries in the period index"""
+        index_items = self._transact_update_period_index(
+            schedule_name,
+            added=set(),
+            removed=self._find_stored_period_names(schedule_name),
+        )
+
         if error_if_missing:
             return [
                 {
@@ -129,7 +170,8 @@ class DynamoScheduleDefinitionStore(ScheduleDefinitionStore):
                             "#key_name": "name",  # NOSONAR -- this is not duplication
                         },
                     }
-                }
+                },
+                *index_items,
             ]
         else:
             return [
@@ -141,7 +183,8 @@ class DynamoScheduleDefinitionStore(ScheduleDefinitionStore):
                         },
                         "TableName": self._table,
                     }
-                }
+                },
+                *index_items,
             ]
 
     def find_by_name(self, schedule_name: str) -> Optional[ScheduleDefinition]:
@@ -163,19 +206,37 @@ class DynamoScheduleDefinitionStore(ScheduleDefinitionStore):
     def find_by_period(self, period_name: str) -> Mapping[str, ScheduleDefinition]:
         """
         find all schedules that reference the provided period
+
+        every schedule is loaded, so schedules written directly to the table are always found. This is the query
+        to use before an action that depends on a period not being in use, such as deleting it
+        """
+        return {
+            sched_name: sched_def
+            for sched_name, sched_def in self.find_all().items()
+            if period_name in _period_names(sched_def)
+        }
+
+    def find_indexed_by_period(
+        self, period_name: str
+    ) -> Mapping[str, ScheduleDefinition]:
         """
+        find the schedules that reference the provided period according to the period index, for read-only queries
 
-        def contains_period(sched_def: ScheduleDefinition, period_name: str) -> bool:
-            for period_identifier in sched_def.periods:
-                if period_identifier.name == period_name:
-                    return True
-            return False
+        candidates are read from the period index, and each is checked against the schedule itself, so an index
+        entry left behind by a schedule edited outside of this store is never returned. A schedule written directly
+        to the table since the index was last rebuilt may be missing (see PERIOD_INDEX_COMPLETE_KEY). Until the index
+        has been rebuilt at least once, every schedule is loaded instead
+        """
+        if not self._is_period_index_complete():
+            return self.find_by_period(period_name)
 
-        schedules = self.find_all()
+        schedule_names = [
+            item["schedule"]["S"] for item in self._query_period_index(period_name)
+        ]
         return {
             sched_name: sched_def
-            for sched_name, sched_def in schedules.items()
-            if contains_period(sched_def, period_name)
+            for sched_name, sched_def in self._find_by_names(schedule_names).items()
+            if period_name in _period_names(sched_def)
         }
 
     def find_all(self) -> Mapping[str, ScheduleDefinition]:
@@ -184,17 +245,14 @@ class DynamoScheduleDefinitionStore(ScheduleDefinitionStore):
 
     def find_all_with_errors(
         self,
+        capacity: Optional[ReadCapacity] = None,
+        page_size: Optional[int] = None,
     ) -> tuple[Mapping[str, ScheduleDefinition], list[InvalidScheduleDefinition]]:
-        result = hub_dynamo_client().query(
-            TableName=self._table,
-            KeyConditionExpression="#part_key=:value",
-            ExpressionAttributeNames={"#part_key": "type"},
-            ExpressionAttributeValues={":value": {"S": "schedule"}},
-        )
-
         schedules: dict[str, ScheduleDefinition] = {}
         exceptions: list[InvalidScheduleDefinition] = list()
-        for item in result["Items"]:
+        for item in query_config_partition(
+            self._table, "schedule", capacity=capacity, page_size=page_size
+        ):
             try:
                 schedule = ScheduleDefinition.from_item(item)
                 schedules[schedule.name] = schedule
@@ -207,6 +265,197 @@ class DynamoScheduleDefinitionStore(ScheduleDefinitionStore):
 
         return schedules, exceptions
 
+    def rebuild_period_index(self) -> None:
+        """
+        rewrite the period index from the schedules in the table
+
+        this indexes schedules that were written before the index existed (or directly to the table) and removes
+        entries that no schedule makes anymore. Once every entry has been written, the index is marked as complete
+        """
+        expected = {
+            (period_name, schedule.name)
+            for schedule in self.find_all().values()
+            for period_name in _period_names(schedule)
+        }
+        indexed = {
+            (item["period"]["S"], item["schedule"]["S"])
+            for item in self._query_period_index()
+        }
+
+        requests: list[WriteRequestTypeDef] = [
+            {"PutRequest": {"Item": self._period_ref_item(period, schedule)}}
+            for period, schedule in expected - indexed
+        ]
+        requests.extend(
+            {"DeleteRequest": {"Key": _period_ref_key(period, schedule)}}
+            for period, schedule in indexed - expected
+        )
+        for batch_start in range(0, len(requests), BATCH_WRITE_SIZE):
+            self._batch_write(requests[batch_start : batch_start + BATCH_WRITE_SIZE])
+
+        hub_dynamo_client().put_item(
+            TableName=self._table,
+            Item={
+                **PERIOD_INDEX_COMPLETE_KEY,
+                "rebuilt_at": {"S": datetime.now(timezone.utc).isoformat()},
+            },
+        )
+
+    def new_transaction(self) -> WriteTransaction:
+        """a transaction of config writes, which increments the config version when it is committed"""
+        return WriteTransaction(
+            hub_dynamo_client(),
+            final_items=[transact_bump_config_version(self._table)],
+        )
+
+    def _is_period_index_complete(self) -> bool:
+        result = hub_dynamo_client().get_item(
+            TableName=self._table,
+            Key=PERIOD_INDEX_COMPLETE_KEY,
+            ProjectionExpression="#name",
+            ExpressionAttributeNames={"#name": "name"},
+        )
+        return "Item" in result
+
+    def _batch_write(self, requests: Sequence[WriteRequestUnionTypeDef]) -> None:
+        unprocessed: Mapping[str, Sequence[WriteRequestUnionTypeDef]] = {
+            self._table: requests
+        }
+        for attempt in range(BATCH_MAX_ATTEMPTS):
+            if attempt > 0:
+                sleep(BATCH_BASE_DELAY_SECONDS * 2 ** (attempt - 1))
+            result = hub_dynamo_client().batch_write_item(RequestItems=unprocessed)
+            unprocessed = result.get("UnprocessedItems", {})
+            if not unprocessed:
+                return
+        raise RuntimeError(
+            f"{len(unprocessed[self._table])} period index writes still unprocessed after {BATCH_MAX_ATTEMPTS} "
+            f"batch_write_item attempts"
+        )
+
+    def _find_stored_period_names(self, schedule_name: str) -> set[str]:
+        result = hub_dynamo_client().get_item(
+            TableName=self._table,
+            Key={"type": {"S": "schedule"}, "name": {"S": schedule_name}},
+            ProjectionExpression="periods",
+            ConsistentRead=True,
+        )
+        stored_periods = result.get("Item", {}).get("periods", {}).get("SS", [])
+        return {PeriodIdentifier(period).name for period in stored_periods}
+
+    def _transact_update_period_index(
+        self, schedule_name: str, added: set[str], removed: set[str]
+    ) -> list[TransactWriteItemTypeDef]:
+        items: list[TransactWriteItemTypeDef] = [
+            {
+                "Put": {
+                    "Item": self._period_ref_item(period_name, schedule_name),
+                    "TableName": self._table,
+                }
+            }
+            for period_name in sorted(added)
+        ]
+        items.extend(
+            {
+                "Delete": {
+                    "Key": _period_ref_key(period_name, schedule_name),
+                    "TableName": self._table,
+                }
+            }
+            for period_name in sorted(removed)
+        )
+        return items
+
     @staticmethod
-    def new_transaction() -> WriteTransaction:
-        return WriteTransaction(hub_dynamo_client())
+    def _period_ref_item(
+        period_name: str, schedule_name: str
+    ) -> dict[str, AttributeValueTypeDef]:
+        return {
+            **_period_ref_key(period_name, schedule_name),
+            "period": {"S": period_name},
+            "schedule": {"S": schedule_name},
+        }
+
+    def _query_period_index(
+        self, period_name: Optional[str] = None
+    ) -> Iterator[dict[str, AttributeValueTypeDef]]:
+        """the period index entries of one period, or of every period when no period is given"""
+        paginator = hub_dynamo_client().get_paginator("query")
+        if period_name is None:
+            pages = paginator.paginate(
+                TableName=self._table,
+                KeyConditionExpression="#part_key=:type",
+                ExpressionAttributeNames={"#part_key": "type"},
+                ExpressionAttributeValues={":type": {"S": PERIOD_REFERENCE_TYPE}},
+            )
+        else:
+            # the name prefix may also match longer period names that contain "#", those are filtered out
+            pages = paginator.paginate(
+                TableName=self._table,
+                KeyConditionExpression="#part_key=:type AND begins_with(#sort_key, :prefix)",
+                FilterExpression="#period=:period",
+                ExpressionAttributeNames={
+                    "#part_key": "type",
+                    "#sort_key": "name",
+                    "#period": "period",
+                },
+                ExpressionAttributeValues={
+                    ":type": {"S": PERIOD_REFERENCE_TYPE},
+                    ":prefix": {"S": f"{period_name}#"},
+                    ":period": {"S": period_name},
+                },
+            )
+        for page in pages:
+            yield from page["Items"]
+
+    def _find_by_names(
+        self, schedule_names: Sequence[str]
+    ) -> Mapping[str, ScheduleDefinition]:
+        """the schedules with the given names that exist and are valid, read with BatchGetItem"""
+        schedules: dict[str, ScheduleDefinition] = {}
+        for batch_start in range(0, len(schedule_names), BATCH_GET_SIZE):
+            keys: list[dict[str, AttributeValueTypeDef]] = [
+                {"type": {"S": "schedule"}, "name": {"S": schedule_name}}
+                for schedule_name in schedule_names[
+                    batch_start : batch_start + BATCH_GET_SIZE
+                ]
+            ]
+            for item in self._batch_get(keys):
+                try:
+                    schedule = ScheduleDefinition.from_item(item)
+                    schedules[schedule.name] = schedule
+                except InvalidScheduleDefinition:
+                    pass  # reported by find_all_with_errors
+        return schedules
+
+    def _batch_get(
+        self, keys: Sequence[Mapping[str, AttributeValueTypeDef]]
+    ) -> Iterator[dict[str, AttributeValueTypeDef]]:
+        unprocessed: Mapping[str, KeysAndAttributesUnionTypeDef] = {
+            self._table: {"Keys": keys}
+        }
+        for attempt in range(BATCH_MAX_ATTEMPTS):
+            if attempt > 0:
+                sleep(BATCH_BASE_DELAY_SECONDS * 2 ** (attempt - 1))
+            result = hub_dynamo_client().batch_get_item(RequestItems=unprocessed)
+            yield from result["Responses"].get(self._table, [])
+            unprocessed = result.get("UnprocessedKeys", {})
+            if not unprocessed:
+                return
+        raise RuntimeError(
+            f"{len(unprocessed[self._table]['Keys'])} schedules still unprocessed after {BATCH_MAX_ATTEMPTS} "
+            f"batch_get_item attempts"
+        )
+
+
+def _period_names(schedule: ScheduleDefinition) -> set[str]:
+    return {period_id.name for period_id in schedule.periods}
+
+
+def _period_ref_key(
+    period_name: str, schedule_name: str
+) -> dict[str, AttributeValueTypeDef]:
+    return {
+        "type": {"S": PERIOD_REFERENCE_TYPE},
+        "name": {"S": f"{period_name}#{schedule_name}"},
+    }
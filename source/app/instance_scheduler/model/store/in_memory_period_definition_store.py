@@ -56,10 +56,12 @@ class InMemoryPeriodDefinitionStore(PeriodDefinitionStore):
 
     @classmethod
     def deserialize_to_sequence(
-        cls, data: SerializedInMemoryPeriodDefinitionStore
+        cls, data: SerializedInMemoryPeriodDefinitionStore, validate: bool = True
     ) -> Iterator[PeriodDefinition]:
         for period_params in data:
-            period_def = PeriodDefinition.from_period_params(period_params)
+            period_def = PeriodDefinition.from_period_params(
+                period_params, validate=validate
+            )
             yield period_def
 
     @staticmethod
@@ -19,38 +19,49 @@ SerializedInMemoryScheduleDefinitionStore = Sequence[ScheduleParams]
 
 class InMemoryScheduleDefinitionStore(ScheduleDefinitionStore):
     _data: dict[str, ScheduleDefinition]
+    _period_index: dict[str, set[str]]
+    """the names of the schedules that reference each period"""
 
     def __init__(self, initial_data: Optional[Mapping[str, ScheduleDefinition]] = None):
-        self._data = dict(initial_data) if initial_data else {}
+        self._data = {}
+        self._period_index = {}
+        for schedule in (initial_data or {}).values():
+            self.put(schedule, overwrite=True)
 
     def put(self, schedule: ScheduleDefinition, overwrite: bool = False) -> None:
         if not overwrite and schedule.name in self._data:
             raise ScheduleAlreadyExistsException(
                 f"schedule {schedule.name} already exists"
             )
+        self._unindex(schedule.name)
         self._data[schedule.name] = schedule
+        for period_id in schedule.periods:
+            self._period_index.setdefault(period_id.name, set()).add(schedule.name)
 
     def delete(self, schedule_name: str, error_if_missing: bool = False) -> None:
         if error_if_missing and schedule_name not in self._data:
             raise UnknownScheduleException(f"schedule {schedule_name} does not exist")
 
+        self._unindex(schedule_name)
         self._data.pop(schedule_name, None)
 
+    def _unindex(self, schedule_name: str) -> None:
+        existing = self._data.get(schedule_name)
+        if existing is None:
+            return
+        for period_id in existing.periods:
+            schedule_names = self._period_index.get(period_id.name, set())
+            schedule_names.discard(schedule_name)
+            if not schedule_names:
+                self._period_index.pop(period_id.name, None)
+
     def find_by_name(self, schedule_name: str) -> Optional[ScheduleDefinition]:
         return self._data.get(schedule_name, None)
 
     def find_by_period(self, period_name: str) -> Mapping[str, ScheduleDefinition]:
-        def contains_period(sched_def: ScheduleDefinition, period_name: str) -> bool:
-            for period_identifier in sched_def.periods:
-                if period_identifier.name == period_name:
-                    return True
-            return False
-
-        schedules = self.find_all()
         return {
-            sched_name: sched_def
-            for sched_name, sched_def in schedules.items()
-            if contains_period(sched_def, period_name)
+            sched_name: self._data[sched_name]
+            for sched_name in sorted(self._period_index.get(period_name, set()))
         }
 
     def find_all(self) -> Mapping[str, ScheduleDefinition]:
@@ -73,10 +84,12 @@ class InMemoryScheduleDefinitionStore(ScheduleDefinitionStore):
 
     @classmethod
     def deserialize_to_sequence(
-        cls, data: SerializedInMemoryScheduleDefinitionStore
+        cls, data: SerializedInMemoryScheduleDefinitionStore, validate: bool = True
     ) -> Iterator[ScheduleDefinition]:
         for period_params in data:
-            schedule_def = ScheduleDefinition.from_schedule_params(period_params)
+            schedule_def = ScheduleDefinition.from_schedule_params(
+                period_params, validate=validate
+            )
             yield schedule_def
 
     @staticmethod
@@ -0,0 +1,100 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+import secrets
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Final, Optional
+
+from instance_scheduler.util.session_manager import hub_dynamo_client
+
+if TYPE_CHECKING:
+    from mypy_boto3_dynamodb.type_defs import AttributeValueTypeDef
+else:
+    AttributeValueTypeDef = object
+
+PAYLOAD_SIGNING_KEY_KEY: Final[dict[str, AttributeValueTypeDef]] = {
+    "type": {"S": "config"},
+    "name": {"S": "payload_signing_key"},
+}
+"""
+secret key of the HMAC with which the orchestrator signs the inline config of the scheduling requests it has already
+validated (see scheduling_payload)
+
+a new key is written by the setup custom resource whenever the stack is created or updated, so it can only be read by
+principals that can read the config table
+"""
+
+PAYLOAD_SIGNING_KEY_BYTES: Final = 32
+
+SIGNING_KEY_CACHE_MAX_AGE_SECONDS: Final = 15 * 60.0
+
+
+def rotate_payload_signing_key(table_name: str) -> bytes:
+    """replace the payload signing key with a new random key, returns the new key"""
+    key = secrets.token_bytes(PAYLOAD_SIGNING_KEY_BYTES)
+    hub_dynamo_client().put_item(
+        TableName=table_name,
+        Item={**PAYLOAD_SIGNING_KEY_KEY, "key": {"B": key}},
+    )
+    return key
+
+
+def get_payload_signing_key(table_name: str) -> Optional[bytes]:
+    """the current payload signing key, or None if it has not been written by the setup custom resource yet"""
+    result = hub_dynamo_client().get_item(
+        TableName=table_name,
+        Key=PAYLOAD_SIGNING_KEY_KEY,
+        ProjectionExpression="#key",
+        ExpressionAttributeNames={"#key": "key"},
+        ConsistentRead=True,
+    )
+    key = result.get("Item", {}).get("key")
+    return key["B"] if key else None
+
+
+@dataclass(frozen=True)
+class _CachedKey:
+    table_name: str
+    key: bytes
+    loaded_at: float
+
+
+class PayloadSigningKeyCache:
+    """
+    the payload signing key, kept across the invocations of a warm lambda container
+
+    the key is read again after `max_age_seconds`, so a key rotated by a stack update is picked up. Until then, configs
+    signed with a different key than the one cached are not trusted and are validated in full
+    """
+
+    def __init__(
+        self,
+        max_age_seconds: float = SIGNING_KEY_CACHE_MAX_AGE_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max_age_seconds = max_age_seconds
+        self._clock = clock
+        self._cached: Optional[_CachedKey] = None
+
+    def load(self, table_name: str) -> Optional[bytes]:
+        cached = self._cached
+        if (
+            cached is not None
+            and cached.table_name == table_name
+            and self._clock() - cached.loaded_at < self._max_age_seconds
+        ):
+            return cached.key
+
+        key = get_payload_signing_key(table_name)
+        self._cached = (
+            _CachedKey(table_name, key, self._clock()) if key is not None else None
+        )
+        return key
+
+    def clear(self) -> None:
+        self._cached = None
+
+
+# shared by all invocations of a warm container
+PAYLOAD_SIGNING_KEY_CACHE: Final = PayloadSigningKeyCache()
@@ -0,0 +1,270 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+from collections.abc import Mapping
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Final, Iterator, Optional
+
+from botocore.exceptions import ClientError
+from instance_scheduler.model.registry_counts import (
+    COUNTERS_PARTITION,
+    NUM_RESOURCES_ATTR,
+    SCHEDULE_COUNT_PREFIX,
+    TARGET_COUNTS_PREFIX,
+    TargetResourceCounts,
+    count_resources_by_target,
+    counts_sort_key,
+)
+from instance_scheduler.model.store.resource_registry import ResourceRegistry
+from instance_scheduler.util.session_manager import hub_dynamo_client
+
+if TYPE_CHECKING:
+    from mypy_boto3_dynamodb.type_defs import AttributeValueTypeDef
+else:
+    AttributeValueTypeDef = object
+
+RECONCILIATION_SORT_KEY: Final = "last_reconciled"
+RECONCILIATION_INTERVAL: Final = timedelta(days=7)
+RECONCILIATION_MAX_ATTEMPTS: Final = 3
+
+
+class RegistryCounterStore:
+    """
+    Aggregate resource counters stored alongside the resources in the registry table.
+
+    Counters are adjusted incrementally by the registry on every write that changes the membership of a
+    scheduling target. Because these adjustments are not transactional with the resource writes themselves,
+    the counters may drift over time and are periodically rebuilt from a full scan by `reconcile`.
+    """
+
+    def __init__(self, table_name: str):
+        self._table: Final = table_name
+
+    def adjust(
+        self,
+        account: str,
+        region: str,
+        service: str,
+        resource_delta: int,
+        schedule_deltas: Mapping[str, int],
+    ) -> None:
+        """atomically apply the provided deltas to the counters of a scheduling target"""
+        names: dict[str, str] = {}
+        values: dict[str, AttributeValueTypeDef] = {}
+        actions: list[str] = []
+
+        if resource_delta:
+            names["#num_resources"] = NUM_RESOURCES_ATTR
+            values[":num_resources"] = {"N": str(resource_delta)}
+            actions.append("#num_resources :num_resources")
+
+        for idx, (schedule, delta) in enumerate(schedule_deltas.items()):
+            if not delta:
+                continue
+            names[f"#s{idx}"] = f"{SCHEDULE_COUNT_PREFIX}{schedule}"
+            values[f":s{idx}"] = {"N": str(delta)}
+            actions.append(f"#s{idx} :s{idx}")
+
+        if not actions:
+            return
+
+        hub_dynamo_client().update_item(
+            TableName=self._table,
+            Key={
+                "account": {"S": COUNTERS_PARTITION},
+                "sk": {"S": counts_sort_key(account, region, service)},
+            },
+            UpdateExpression=f"ADD {', '.join(actions)}",
+            ExpressionAttributeNames=names,
+            ExpressionAttributeValues=values,
+        )
+
+    def find_all(self) -> list[TargetResourceCounts]:
+        """the counters of every scheduling target that currently has at least 1 registered resource"""
+        return [
+            counts for counts in self._query_target_counts() if counts.num_resources > 0
+        ]
+
+    def last_reconciled(self) -> Optional[datetime]:
+        response = hub_dynamo_client().get_item(
+            TableName=self._table,
+            Key={
+                "account": {"S": COUNTERS_PARTITION},
+                "sk": {"S": RECONCILIATION_SORT_KEY},
+            },
+        )
+        if "Item" not in response or "timestamp" not in response["Item"]:
+            return None
+        return datetime.fromisoformat(response["Item"]["timestamp"]["S"])
+
+    def needs_reconciliation(self, now: Optional[datetime] = None) -> bool:
+        last_reconciled = self.last_reconciled()
+        if last_reconciled is None:
+            return True
+        now = now or datetime.now(timezone.utc)
+        return now - last_reconciled >= RECONCILIATION_INTERVAL
+
+    def reconcile(self, registry: ResourceRegistry) -> list[TargetResourceCounts]:
+        """
+        correct the stored counters with counts computed from a full listing of `registry`
+
+        the counters are read before the registry is listed and each target is only written if its counters still
+        hold the values that were read, so adjustments made by concurrent registry writes are never overwritten.
+        Targets that were adjusted in the meantime are recounted on their own. Counters belonging to targets that
+        no longer have any registered resources are removed
+        """
+        stored = {
+            item["sk"]["S"]: item
+            for item in self._query_target_items(consistent_read=True)
+        }
+        actual = {
+            counts.sort_key: counts
+            for counts in count_resources_by_target(registry.find_all())
+        }
+
+        reconciled: list[TargetResourceCounts] = []
+        for sort_key in stored.keys() | actual.keys():
+            target = actual.get(sort_key) or _empty_counts(
+                TargetResourceCounts.from_item(stored[sort_key])
+            )
+            counts = self._reconcile_target(registry, target, stored.get(sort_key))
+            if counts.num_resources > 0:
+                reconciled.append(counts)
+
+        hub_dynamo_client().put_item(
+            TableName=self._table,
+            Item={
+                "account": {"S": COUNTERS_PARTITION},
+                "sk": {"S": RECONCILIATION_SORT_KEY},
+                "timestamp": {"S": datetime.now(timezone.utc).isoformat()},
+            },
+        )
+
+        return reconciled
+
+    def _reconcile_target(
+        self,
+        registry: ResourceRegistry,
+        actual: TargetResourceCounts,
+        stored_item: Optional[dict[str, AttributeValueTypeDef]],
+    ) -> TargetResourceCounts:
+        for _ in range(RECONCILIATION_MAX_ATTEMPTS):
+            try:
+                self._write_if_unchanged(actual, stored_item)
+                return actual
+            except ClientError as ce:
+                if ce.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                    raise
+
+            # the counters were adjusted after they were read, read them again before recounting the target
+            stored_item = self._get_target_item(actual.sort_key)
+            resources = registry.find_by_scheduling_target(
+                actual.account, actual.region, actual.service
+            )
+            actual = next(
+                iter(count_resources_by_target(resources)), _empty_counts(actual)
+            )
+
+        # the target is still being written to, keep its incrementally maintained counters until the next
+        # reconciliation
+        if stored_item is None:
+            return _empty_counts(actual)
+        return TargetResourceCounts.from_item(stored_item)
+
+    def _write_if_unchanged(
+        self,
+        actual: TargetResourceCounts,
+        stored_item: Optional[dict[str, AttributeValueTypeDef]],
+    ) -> None:
+        stored_attrs = _counter_attributes(stored_item or {})
+        actual_attrs = _counter_attributes(actual.to_item())
+        if stored_attrs == actual_attrs:
+            return
+
+        names: dict[str, str] = {}
+        values: dict[str, AttributeValueTypeDef] = {}
+        conditions: list[str] = []
+        sets: list[str] = []
+        removes: list[str] = []
+        for idx, attr_name in enumerate(stored_attrs.keys() | actual_attrs.keys()):
+            names[f"#c{idx}"] = attr_name
+            if attr_name in stored_attrs:
+                values[f":stored{idx}"] = stored_attrs[attr_name]
+                conditions.append(f"#c{idx} = :stored{idx}")
+            else:
+                conditions.append(f"attribute_not_exists(#c{idx})")
+
+            if attr_name not in actual_attrs:
+                removes.append(f"#c{idx}")
+            elif actual_attrs[attr_name] != stored_attrs.get(attr_name):
+                values[f":actual{idx}"] = actual_attrs[attr_name]
+                sets.append(f"#c{idx} = :actual{idx}")
+
+        key: dict[str, AttributeValueTypeDef] = {
+            "account": {"S": COUNTERS_PARTITION},
+            "sk": {"S": actual.sort_key},
+        }
+        condition = " AND ".join(conditions)
+        if not actual_attrs:
+            hub_dynamo_client().delete_item(
+                TableName=self._table,
+                Key=key,
+                ConditionExpression=condition,
+                ExpressionAttributeNames=names,
+                ExpressionAttributeValues=values,
+            )
+            return
+
+        update_expression = f"SET {', '.join(sets)}" if sets else ""
+        if removes:
+            update_expression += f" REMOVE {', '.join(removes)}"
+        hub_dynamo_client().update_item(
+            TableName=self._table,
+            Key=key,
+            UpdateExpression=update_expression.strip(),
+            ConditionExpression=condition,
+            ExpressionAttributeNames=names,
+            ExpressionAttributeValues=values,
+        )
+
+    def _get_target_item(
+        self, sort_key: str
+    ) -> Optional[dict[str, AttributeValueTypeDef]]:
+        response = hub_dynamo_client().get_item(
+            TableName=self._table,
+            Key={"account": {"S": COUNTERS_PARTITION}, "sk": {"S": sort_key}},
+            ConsistentRead=True,
+        )
+        return response.get("Item")
+
+    def _query_target_counts(self) -> Iterator[TargetResourceCounts]:
+        for item in self._query_target_items():
+            yield TargetResourceCounts.from_item(item)
+
+    def _query_target_items(
+        self, consistent_read: bool = False
+    ) -> Iterator[dict[str, AttributeValueTypeDef]]:
+        paginator = hub_dynamo_client().get_paginator("query")
+        for page in paginator.paginate(
+            TableName=self._table,
+            KeyConditionExpression="account = :account AND begins_with(sk, :prefix)",
+            ExpressionAttributeValues={
+                ":account": {"S": COUNTERS_PARTITION},
+                ":prefix": {"S": TARGET_COUNTS_PREFIX},
+            },
+            ConsistentRead=consistent_read,
+        ):
+            yield from page["Items"]
+
+
+def _empty_counts(target: TargetResourceCounts) -> TargetResourceCounts:
+    return TargetResourceCounts(target.account, target.region, target.service)
+
+
+def _counter_attributes(
+    item: Mapping[str, AttributeValueTypeDef],
+) -> dict[str, AttributeValueTypeDef]:
+    return {
+        attr_name: value
+        for attr_name, value in item.items()
+        if attr_name not in ("account", "sk")
+    }
@@ -1,8 +1,9 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from typing import Iterator, Optional
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass, field
+from typing import Iterator, NamedTuple, Optional
 
 from instance_scheduler.model.managed_instance import RegisteredInstance, RegistryKey
 
@@ -15,21 +16,37 @@ class UnknownResourceException(Exception):
     pass
 
 
-@dataclass()
-class SchedulingTarget:
+class StaleResourceException(Exception):
+    pass
+
+
+class RegistryRow(NamedTuple):
+    """the fields of a registry record that are needed to dispatch scheduling of its target"""
+
+    account: str
+    region: str
+    service: str
+    schedule: str
+
+
+@dataclass(frozen=True)
+class TargetSchedules:
+    """a scheduling target and the distinct names of the schedules used by its resources"""
+
     account: str
     region: str
     service: str
-    resources: list[RegisteredInstance]
+    schedules: frozenset[str]
+
+
+@dataclass(frozen=True)
+class RegistryLookup:
+    """the result of looking up several registry keys at once"""
 
-    def __eq__(self, other: object) -> bool:
-        if not isinstance(other, SchedulingTarget):
-            return False
-        return bool(
-            self.account == other.account
-            and self.region == other.region
-            and self.service == other.service
-        )
+    found: Mapping[RegistryKey, RegisteredInstance] = field(default_factory=dict)
+    not_found: Sequence[RegistryKey] = field(default_factory=list)
+    # keys whose records could not be read, with the reason. These may or may not be registered
+    errors: Mapping[RegistryKey, str] = field(default_factory=dict)
 
 
 class ResourceRegistry(ABC):
@@ -38,6 +55,20 @@ class ResourceRegistry(ABC):
     def put(self, resource: RegisteredInstance, overwrite: bool = False) -> None:
         raise NotImplementedError()
 
+    def update(
+        self,
+        previous: RegisteredInstance,
+        updated: RegisteredInstance,
+        check_version: bool = False,
+    ) -> RegisteredInstance:
+        """
+        store the changes from `previous` (the record as it was read) to `updated` and return the stored record.
+
+        stores that do not track versions write the record in full and ignore `check_version`
+        """
+        self.put(updated, overwrite=True)
+        return updated
+
     @abstractmethod
     def delete(self, key: RegistryKey, error_if_missing: bool = False) -> None:
         raise NotImplementedError()
@@ -61,26 +92,48 @@ class ResourceRegistry(ABC):
     def get(self, key: RegistryKey) -> RegisteredInstance | None:
         raise NotImplementedError()
 
-    def list_all_by_scheduling_target(self) -> Iterator[SchedulingTarget]:
-        # Items are returned by arbitrary Partition (accountID) in sort-key order (resource#{region}#{service}#{id})
-        # This allows us to group by target based on the return order
-        curr_target: Optional[SchedulingTarget] = None
+    def get_many(self, keys: Iterable[RegistryKey]) -> RegistryLookup:
+        found: dict[RegistryKey, RegisteredInstance] = {}
+        not_found: list[RegistryKey] = []
+        for key in dict.fromkeys(keys):
+            resource = self.get(key)
+            if resource is None:
+                not_found.append(key)
+            else:
+                found[key] = resource
+        return RegistryLookup(found=found, not_found=not_found)
+
+    def scan_rows(self) -> Iterator[RegistryRow]:
+        """the compact rows of every registered resource, in the same order as find_all"""
         for resource in self.find_all():
-            target = SchedulingTarget(
-                account=resource.account,
-                region=resource.region,
-                service=resource.service,
-                resources=[],
+            yield RegistryRow(
+                resource.account, resource.region, resource.service, resource.schedule
             )
 
-            if target == curr_target:
-                curr_target.resources.append(resource)
-            else:
+    def list_schedules_by_scheduling_target(self) -> Iterator[TargetSchedules]:
+        # Rows are returned by arbitrary Partition (accountID) in sort-key order (resource#{region}#{service}#{id})
+        # This allows us to group by target based on the return order, holding only the distinct schedule names of
+        # the current target in memory
+        curr_target: Optional[RegistryRow] = None
+        schedules: set[str] = set()
+        for row in self.scan_rows():
+            target = row._replace(schedule="")
+            if target != curr_target:
                 if curr_target:
-                    yield curr_target
+                    yield TargetSchedules(
+                        curr_target.account,
+                        curr_target.region,
+                        curr_target.service,
+                        frozenset(schedules),
+                    )
                 curr_target = target
-                target.resources = [resource]
+                schedules = set()
+            schedules.add(row.schedule)
 
-        # finally yield the last target if one exists
         if curr_target:
-            yield curr_target
+            yield TargetSchedules(
+                curr_target.account,
+                curr_target.region,
+                curr_target.service,
+                frozenset(schedules),
+            )
@@ -0,0 +1,126 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+"""
+Structured traces of why a scheduling decision was made, for selected resources or schedules
+
+Tracing is enabled for individual resource ARNs and/or schedule names, so the reasoning behind the decisions for a
+single instance can be inspected without enabling debug logging for every instance in the fleet. When a result is
+not traced, the only cost is a set lookup: the trace record (which evaluates every period of the schedule) is
+only built for the results that are traced.
+"""
+
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import datetime, time, timezone
+from typing import Any, Optional
+
+from aws_lambda_powertools import Logger
+from instance_scheduler.configuration.instance_schedule import InstanceSchedule
+from instance_scheduler.scheduling.scheduling_decision import ManagedInstance
+from instance_scheduler.scheduling.scheduling_result import SchedulingResult
+from instance_scheduler.util.time import localize
+
+ScheduleLookup = Callable[[str], Optional[InstanceSchedule]]
+
+
+@dataclass(frozen=True)
+class DecisionTraceTargets:
+    """the resources (by ARN) and schedules (by name) for which scheduling decisions are traced"""
+
+    arns: frozenset[str] = field(default_factory=frozenset)
+    schedules: frozenset[str] = field(default_factory=frozenset)
+
+    @classmethod
+    def parse(cls, value: str) -> "DecisionTraceTargets":
+        """
+        parse a comma-separated list of trace targets. Targets that start with "arn:" are resource ARNs, anything
+        else is a schedule name
+        """
+        targets = {target.strip() for target in value.split(",")} - {""}
+        return cls(
+            arns=frozenset(t for t in targets if t.startswith("arn:")),
+            schedules=frozenset(t for t in targets if not t.startswith("arn:")),
+        )
+
+    def matches(self, arn: str, schedule: str) -> bool:
+        return arn in self.arns or schedule in self.schedules
+
+
+class DecisionTracer:
+    """logs a decision_trace record for every scheduling result of a traced resource or schedule"""
+
+    def __init__(
+        self,
+        logger: Logger,
+        targets: DecisionTraceTargets,
+        current_dt: datetime,
+        schedule_lookup: ScheduleLookup,
+    ) -> None:
+        self._logger = logger
+        self._targets = targets
+        self._current_dt = current_dt
+        self._schedule_lookup = schedule_lookup
+
+    def trace_result(self, result: SchedulingResult[ManagedInstance]) -> None:
+        registry_info = result.instance.registry_info
+        if not self._targets.matches(registry_info.arn, registry_info.schedule):
+            return
+
+        self._logger.info(
+            f"decision trace for {registry_info.arn}",
+            extra=self.build_record(result),
+        )
+
+    def build_record(self, result: SchedulingResult[ManagedInstance]) -> dict[str, Any]:
+        instance = result.instance
+        record: dict[str, Any] = {
+            **result.to_json_log(),
+            "log_type": "decision_trace",
+            "current_dt": self._current_dt.astimezone(timezone.utc).isoformat(),
+            "stored_state": instance.registry_info.stored_state.value,
+            "new_stored_state": result.updated_registry_info.stored_state.value,
+            "runtime_state": (
+                "running"
+                if instance.runtime_info.is_running
+                else "stopped" if instance.runtime_info.is_stopped else "other"
+            ),
+        }
+
+        schedule = self._schedule_lookup(instance.registry_info.schedule)
+        if schedule is None:
+            record["schedule_found"] = False
+            return record
+
+        localized_time = localize(self._current_dt, schedule.timezone)
+        desired_state, desired_type, active_period = schedule.get_desired_state(
+            self._current_dt
+        )
+        record.update(
+            {
+                "schedule_found": True,
+                "timezone": str(schedule.timezone),
+                "localized_time": localized_time.isoformat(),
+                "override_status": schedule.override_status,
+                "enforced": schedule.enforced,
+                "retain_running": schedule.retain_running,
+                "stop_new_instances": schedule.stop_new_instances,
+                "desired_state": desired_state.value,
+                "desired_type": desired_type,
+                "active_period": active_period,
+                "periods": [
+                    {
+                        "name": period["period"].name,
+                        "begintime": _optional_time_str(period["period"].begintime),
+                        "endtime": _optional_time_str(period["period"].endtime),
+                        "instancetype": period["instancetype"],
+                        "state": period["state"].value,
+                    }
+                    for period in schedule.compiled.period_states(localized_time)
+                ],
+            }
+        )
+        return record
+
+
+def _optional_time_str(value: Optional[time]) -> Optional[str]:
+    return value.strftime("%H:%M") if value is not None else None
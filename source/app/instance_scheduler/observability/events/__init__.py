@@ -44,6 +44,10 @@ class EventsBuffer:
         if len(self.buffer) >= self.BUFFER_LENGTH:
             self.flush()
 
+    def push_result(self, result: SchedulingResult[ManagedInstance]) -> None:
+        if result.action_taken != SchedulingAction.DO_NOTHING:
+            self.push(SchedulingEvent.from_result(result).as_event_bus_event())
+
     def flush(self) -> None:
         if self.buffer:
             send_events_to_local_and_global_buses(
@@ -73,6 +73,8 @@ class InfoTaggingContext:
         self.assumed_role = assumed_role
         self.hub_stack_arn = env.hub_stack_arn
         self.enable_informational_tagging = env.enable_informational_tagging
+        # calculate current time once to ensure tags all use the same time for batching
+        self.current_time = format_current_time()
 
     def __enter__(self) -> Self:
         return self
@@ -141,6 +143,29 @@ class InfoTaggingContext:
                 ),
             )
 
+    def push_result_tags(self, result: SchedulingResult[ManagedInstance]) -> None:
+        if not self.enable_informational_tagging:
+            return
+
+        if result.error_code:
+            if (
+                result.error_code
+                == result.instance.runtime_info.tags.get(
+                    InformationalTagKey.ERROR.value, ""
+                ).split(" ")[0]
+            ):
+                return  # skip re-writing tags for recurring errors
+            self.push_info_tag_update(
+                [result.instance.runtime_info],
+                error_code=f"{result.error_code.value} {self.current_time}",
+                error_message=result.error_message,
+            )
+        elif result.action_taken and result.action_taken != SchedulingAction.DO_NOTHING:
+            self.push_info_tag_update(
+                [result.instance.runtime_info],
+                last_action=f"{result.action_taken.value} {self.current_time}",
+            )
+
     def push_clear_info_tags(self, resource_arn: ARN) -> None:
         tag_keys = [tag.value for tag in InformationalTagKey]
         self.push(resource_arn, TagDeleteRequest(tag_keys))
@@ -159,32 +184,8 @@ def apply_informational_tags_for_results(
         return
 
     with InfoTaggingContext(assumed_role, env) as context:
-        # calculate current time once to ensure tags all use the same time for batching
-        current_time = format_current_time()
-
         for result in results:
-            if result.error_code:
-                if (
-                    result.error_code
-                    == result.instance.runtime_info.tags.get(
-                        InformationalTagKey.ERROR.value, ""
-                    ).split(" ")[0]
-                ):
-                    continue  # skip re-writing tags for recurring errors
-                context.push_info_tag_update(
-                    [result.instance.runtime_info],
-                    error_code=f"{result.error_code.value} {current_time}",
-                    error_message=result.error_message,
-                )
-            else:
-                if (
-                    result.action_taken
-                    and result.action_taken != SchedulingAction.DO_NOTHING
-                ):
-                    context.push_info_tag_update(
-                        [result.instance.runtime_info],
-                        last_action=f"{result.action_taken.value} {current_time}",
-                    )
+            context.push_result_tags(result)
 
 
 def clear_informational_tags(
@@ -1,7 +1,7 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
 from collections import Counter
-from typing import Iterable, Literal, Self
+from typing import Iterable, Literal, Self, TypeVar
 
 from instance_scheduler.observability.error_codes import ErrorCode
 from instance_scheduler.scheduling.abstract_instance import AbstractInstance
@@ -12,6 +12,7 @@ from instance_scheduler.scheduling.scheduling_result import SchedulingResult
 
 InstanceState = Literal["running", "stopped"]
 ServiceName = str
+T = TypeVar("T", bound=ManagedInstance)
 
 
 class InstanceCounts(dict[str, Counter[InstanceState]]):
@@ -142,30 +143,27 @@ class ServiceInstanceCounts(dict[ServiceName, InstanceCountsAggregator]):
     ) -> "ServiceInstanceCounts":
         counts = ServiceInstanceCounts()
         for result in results:
-            if result.error_code in [
-                ErrorCode.UNKNOWN_SCHEDULE,
-                ErrorCode.INCOMPATIBLE_SCHEDULE,
-                ErrorCode.UNSUPPORTED_RESOURCE,
-            ]:
-                continue  # skip misconfigured resources
-
-            service_name = result.instance.registry_info.service
-            if service_name not in counts:
-                counts[service_name] = InstanceCountsAggregator()
-
-            if result.instance.runtime_info.is_running:
-                counts[service_name].by_type().increment(
-                    result.instance.runtime_info.size, "running"
-                )
-                counts[service_name].by_schedule().increment(
-                    result.instance.registry_info.schedule, "running"
-                )
-            else:
-                counts[service_name].by_type().increment(
-                    result.instance.runtime_info.size, "stopped"
-                )
-                counts[service_name].by_schedule().increment(
-                    result.instance.registry_info.schedule, "stopped"
-                )
-
+            counts.count_result(result)
         return counts
+
+    def count_result(self, result: SchedulingResult[T]) -> None:
+        if result.error_code in [
+            ErrorCode.UNKNOWN_SCHEDULE,
+            ErrorCode.INCOMPATIBLE_SCHEDULE,
+            ErrorCode.UNSUPPORTED_RESOURCE,
+        ]:
+            return  # skip misconfigured resources
+
+        service_name = result.instance.registry_info.service
+        if service_name not in self:
+            self[service_name] = InstanceCountsAggregator()
+
+        instance_state = (
+            "running" if result.instance.runtime_info.is_running else "stopped"
+        )
+        self[service_name].by_type().increment(
+            result.instance.runtime_info.size, instance_state
+        )
+        self[service_name].by_schedule().increment(
+            result.instance.registry_info.schedule, instance_state
+        )
@@ -0,0 +1,126 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+import random
+from collections import Counter
+from enum import Enum
+from typing import Any, Callable, Iterable, Optional
+
+from aws_lambda_powertools import Logger
+from instance_scheduler.scheduling.scheduling_decision import ManagedInstance
+from instance_scheduler.scheduling.scheduling_result import (
+    SchedulingAction,
+    SchedulingResult,
+)
+
+
+class ResultLogMode(str, Enum):
+    FULL = "full"
+    """one log record per scheduling result"""
+    AGGREGATED = "aggregated"
+    """
+    one summary record per scheduling request, plus full records for results that took an action or
+    encountered an error. Results that did nothing are sampled
+    """
+
+
+ResultGroupKey = tuple[
+    str, Optional[str], Optional[str]
+]  # schedule, action, error_code
+
+
+class SchedulingResultLogger:
+    """
+    writes the results of a scheduling request to the logs according to the configured ResultLogMode
+
+    in FULL mode, every result is logged individually. For large targets this produces one log record per
+    instance every scheduling interval, so AGGREGATED mode may be used to instead emit a single summary grouped by
+    schedule/action/error code. Results that took an action or errored are always logged in full so that
+    anything noteworthy remains searchable
+    """
+
+    def __init__(
+        self,
+        logger: Logger,
+        mode: ResultLogMode = ResultLogMode.FULL,
+        sample_rate: float = 0.0,
+        rng: Callable[[], float] = random.random,
+    ) -> None:
+        self._logger = logger
+        self._mode = mode
+        self._sample_rate = sample_rate
+        self._rng = rng
+        self._groups: Counter[ResultGroupKey] = Counter()
+        self._num_results = 0
+        self._num_logged = 0
+
+    def log_results(self, results: Iterable[SchedulingResult[ManagedInstance]]) -> None:
+        for result in results:
+            self.log_result(result)
+        self.log_summary()
+
+    def log_result(self, result: SchedulingResult[ManagedInstance]) -> None:
+        if self._mode == ResultLogMode.FULL:
+            self._log_result(result)
+            return
+
+        self._num_results += 1
+        self._groups[_group_key(result)] += 1
+        if _is_noteworthy(result) or self._sampled():
+            self._num_logged += 1
+            self._log_result(result)
+
+    def log_summary(self) -> None:
+        """log the summary of all results passed to log_result (AGGREGATED mode only)"""
+        if self._mode == ResultLogMode.FULL:
+            return
+
+        self._logger.info(
+            f"scheduling results summary - {self._num_results} results "
+            f"({self._num_logged} logged individually)",
+            extra=_summary_json_log(self._groups, self._num_results, self._num_logged),
+        )
+
+    def _sampled(self) -> bool:
+        return self._sample_rate > 0 and self._rng() < self._sample_rate
+
+    def _log_result(self, result: SchedulingResult[ManagedInstance]) -> None:
+        self._logger.info(
+            f"result for {result.instance.registry_info.arn} - {result.action_taken} ",
+            extra=result.to_json_log(),
+        )
+
+
+def _is_noteworthy(result: SchedulingResult[ManagedInstance]) -> bool:
+    return bool(result.error_code) or result.action_taken not in (
+        None,
+        SchedulingAction.DO_NOTHING,
+    )
+
+
+def _group_key(result: SchedulingResult[ManagedInstance]) -> ResultGroupKey:
+    return (
+        result.instance.registry_info.schedule,
+        result.action_taken.value if result.action_taken else None,
+        result.error_code.value if result.error_code else None,
+    )
+
+
+def _summary_json_log(
+    groups: Counter[ResultGroupKey], num_results: int, num_logged: int
+) -> dict[str, Any]:
+    return {
+        "log_type": "scheduling_result_summary",
+        "num_results": num_results,
+        "num_logged_individually": num_logged,
+        "groups": [
+            {
+                "schedule": schedule,
+                "action_taken": str(action) if action else "None",
+                "error_code": error_code or "",
+                "count": count,
+            }
+            for (schedule, action, error_code), count in sorted(
+                groups.items(), key=lambda group: tuple(str(k) for k in group[0])
+            )
+        ],
+    }
@@ -0,0 +1,169 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from queue import Empty, Queue
+from typing import Callable, Final, Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+# streaming sinks each occupy a worker for the duration of the stage, so every sink of a stage is given its own
+# worker (up to this limit, beyond which sinks wait for a free worker)
+MAX_SINKS_PER_STAGE: Final = 8
+
+# items waiting to be consumed by a single streaming sink. Items pushed while a sink's queue is full are dropped (and
+# counted in the report) rather than blocking the scheduling loop, so a slow sink holds at most this many items
+MAX_QUEUED_ITEMS_PER_SINK: Final = 1000
+
+_END_OF_STREAM: Final = object()
+
+
+@dataclass(frozen=True)
+class SinkFailure:
+    sink: str
+    reason: str
+
+
+@dataclass
+class SideEffectsReport:
+    failures: list[SinkFailure] = field(default_factory=list)
+
+    @property
+    def succeeded(self) -> bool:
+        return not self.failures
+
+    def __str__(self) -> str:
+        return ", ".join(f"{f.sink}: {f.reason}" for f in self.failures)
+
+
+@dataclass
+class _Sink:
+    name: str
+    budget_seconds: float
+    future: Future[None]
+    queue: Optional[Queue[object]] = None
+    dropped: int = 0
+
+
+class SideEffectsStage(Generic[T]):
+    """
+    runs independent side effects of a scheduling request (tagging, events, metrics, etc.) concurrently
+
+    streaming sinks receive every item passed to push() in order on a dedicated worker, while one-shot tasks are
+    run once when submitted. Each sink is isolated from the others: an error in one sink stops only that sink, and
+    is recorded in the report returned by finish() rather than raised.
+
+    finish() waits for each sink for at most its own time budget (measured from the call to finish), so the
+    total time spent waiting is bounded by the slowest sink rather than the sum of all sinks. Sinks that have not
+    completed within their budget are reported as timed out and are abandoned: the items still queued for them are
+    discarded, and the number discarded is included in the report.
+
+    each stage runs its sinks on its own workers, so a sink abandoned by an earlier stage (which keeps running until
+    its own I/O timeouts expire) never delays the sinks of a later stage in a warm container
+    """
+
+    def __init__(self) -> None:
+        self._sinks: list[_Sink] = []
+        self._executor = ThreadPoolExecutor(
+            max_workers=MAX_SINKS_PER_STAGE, thread_name_prefix="side-effects"
+        )
+
+    def add_sink(
+        self,
+        name: str,
+        consume: Callable[[T], None],
+        close: Callable[[], None],
+        budget_seconds: float,
+    ) -> None:
+        """add a sink that is passed every pushed item, and closed once all items have been pushed"""
+        # one slot beyond the limit is reserved for the end of stream marker, so finish() never blocks
+        queue: Queue[object] = Queue(maxsize=MAX_QUEUED_ITEMS_PER_SINK + 1)
+        self._sinks.append(
+            _Sink(
+                name=name,
+                budget_seconds=budget_seconds,
+                future=self._executor.submit(_drain, queue, consume, close),
+                queue=queue,
+            )
+        )
+
+    def submit(
+        self, name: str, task: Callable[[], None], budget_seconds: float
+    ) -> None:
+        """run a one-shot task alongside the other sinks of this stage"""
+        self._sinks.append(
+            _Sink(
+                name=name,
+                budget_seconds=budget_seconds,
+                future=self._executor.submit(task),
+            )
+        )
+
+    def push(self, item: T) -> None:
+        for sink in self._sinks:
+            # stop queueing items for sinks that have already failed
+            if sink.queue is None or sink.future.done():
+                continue
+            # push() is the only producer, so the size can only shrink between this check and the put
+            if sink.queue.qsize() < MAX_QUEUED_ITEMS_PER_SINK:
+                sink.queue.put_nowait(item)
+            else:
+                sink.dropped += 1
+
+    def finish(self) -> SideEffectsReport:
+        for sink in self._sinks:
+            if sink.queue is not None:
+                sink.queue.put_nowait(_END_OF_STREAM)
+
+        report = SideEffectsReport()
+        started = time.monotonic()
+        for sink in sorted(self._sinks, key=lambda s: s.budget_seconds):
+            remaining = max(0.0, started + sink.budget_seconds - time.monotonic())
+            done, _ = wait([sink.future], timeout=remaining)
+            reasons = []
+            if not done:
+                reason = f"timed out after {sink.budget_seconds} seconds"
+                if sink.queue is not None:
+                    reason += f", abandoning {_abandon(sink.queue)} queued items"
+                reasons.append(reason)
+            elif (error := sink.future.exception()) is not None:
+                reasons.append(repr(error))
+            if sink.dropped:
+                reasons.append(
+                    f"dropped {sink.dropped} items pushed while its queue was full"
+                )
+            if reasons:
+                report.failures.append(SinkFailure(sink.name, ", ".join(reasons)))
+
+        self._sinks.clear()
+        # release the workers without waiting for abandoned sinks
+        self._executor.shutdown(wait=False)
+        return report
+
+
+def _abandon(queue: Queue[object]) -> int:
+    """discard the items still queued for an abandoned sink, so its worker stops after the item it is consuming"""
+    abandoned = 0
+    while True:
+        try:
+            item = queue.get_nowait()
+        except Empty:
+            break
+        if item is not _END_OF_STREAM:
+            abandoned += 1
+    # the queue was just emptied and the worker only removes items, so there is always room for the marker
+    queue.put_nowait(_END_OF_STREAM)
+    return abandoned
+
+
+def _drain(
+    queue: Queue[object],
+    consume: Callable[[T], None],
+    close: Callable[[], None],
+) -> None:
+    try:
+        while (item := queue.get()) is not _END_OF_STREAM:
+            consume(item)  # type: ignore[arg-type]
+    finally:
+        close()
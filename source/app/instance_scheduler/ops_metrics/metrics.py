@@ -1,8 +1,10 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
 import dataclasses
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from datetime import datetime, timezone
 from os import environ
+from threading import Lock
 from typing import Final, Optional
 from uuid import UUID
 
@@ -13,7 +15,7 @@ from instance_scheduler.ops_metrics.anonymous_metric_wrapper import (
 from instance_scheduler.ops_metrics.metric_type.ops_metric import OpsMetric
 from instance_scheduler.util import safe_json
 from instance_scheduler.util.app_env_utils import AppEnvError, env_to_bool
-from urllib3 import BaseHTTPResponse, PoolManager
+from urllib3 import BaseHTTPResponse, PoolManager, Timeout
 
 
 @dataclasses.dataclass
@@ -62,7 +64,26 @@ class MetricsEnvironment:
             ) from err
 
 
-http = PoolManager()
+# metrics are best-effort and must never hold up scheduling, so requests fail fast rather than retrying
+METRICS_CONNECT_TIMEOUT_SECONDS: Final = 1.0
+METRICS_READ_TIMEOUT_SECONDS: Final = 2.0
+# default upper bound on how long a handler will wait for queued metrics before returning
+METRICS_FLUSH_TIMEOUT_SECONDS: Final = 3.0
+
+http = PoolManager(
+    timeout=Timeout(
+        connect=METRICS_CONNECT_TIMEOUT_SECONDS, read=METRICS_READ_TIMEOUT_SECONDS
+    ),
+    retries=False,
+)
+
+# metrics are sent from a background worker so that collecting a metric does not block the caller.
+# Lambda freezes background threads once the handler returns, so handlers must call flush_metrics() before
+# returning to give queued metrics a chance to be sent
+_sender: Final = ThreadPoolExecutor(max_workers=2, thread_name_prefix="ops-metrics")
+# metrics may be collected from the workers of a side effects stage while the handler flushes them
+_pending_lock: Final = Lock()
+_pending: list[Future[None]] = []
 
 _metrics_env: Optional[MetricsEnvironment] = None
 
@@ -100,6 +121,16 @@ def collect_metric(
         data_json = safe_json(dataclasses.asdict(metric_wrapper))
         logger.info(f"Sending anonymous metrics data: {data_json}")
 
+        with _pending_lock:
+            _pending.append(_sender.submit(_send_metric, url, data_json, logger))
+        return metric_wrapper
+    except Exception as exc:
+        logger.warning(f"Failed sending metrics data ({str(exc)})")
+        return None
+
+
+def _send_metric(url: str, data_json: str, logger: Logger) -> None:
+    try:
         headers = {
             "content-type": "application/json",
             "content-length": str(len(data_json)),
@@ -108,11 +139,40 @@ def collect_metric(
         response: BaseHTTPResponse = http.request(
             "POST", url, headers=headers, body=data_json
         )
-        logger.debug(f"Metrics data sent, status code is {response.status}")
-        return metric_wrapper
+        if response.status >= 300:
+            logger.warning(
+                f"Metrics data was not accepted, status code is {response.status}"
+            )
+        else:
+            logger.debug(f"Metrics data sent, status code is {response.status}")
     except Exception as exc:
         logger.warning(f"Failed sending metrics data ({str(exc)})")
-        return None
+
+
+def flush_metrics(
+    logger: Logger, timeout_seconds: float = METRICS_FLUSH_TIMEOUT_SECONDS
+) -> None:
+    """
+    wait for metrics queued by collect_metric() to finish sending
+
+    waits at most timeout_seconds so that a slow metrics endpoint cannot extend the duration of the calling
+    handler by more than a bounded amount. When the timeout expires, metrics that are still queued are dropped and
+    metrics that are still being sent are abandoned (and are lost if the container is frozen before they complete).
+    The number of each is logged
+    """
+    with _pending_lock:
+        pending = list(_pending)
+        _pending.clear()
+    if not pending:
+        return
+
+    _, not_done = wait(pending, timeout=timeout_seconds)
+    if not_done:
+        dropped = sum(1 for future in not_done if future.cancel())
+        logger.warning(
+            f"Anonymous metrics were not sent within {timeout_seconds} seconds: dropped {dropped} queued metrics, "
+            f"abandoned {len(not_done) - dropped} metrics still being sent"
+        )
 
 
 def should_collect_metric() -> bool:
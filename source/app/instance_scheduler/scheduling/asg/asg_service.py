@@ -119,7 +119,9 @@ class AsgService:
             )
 
             if result.instance.registry_info != result.updated_registry_info:
-                self.context.registry.put(result.updated_registry_info, overwrite=True)
+                self.context.registry.update(
+                    result.instance.registry_info, result.updated_registry_info
+                )
 
             yield result
 
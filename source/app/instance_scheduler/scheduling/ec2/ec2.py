@@ -24,7 +24,11 @@ from instance_scheduler.maint_win.maintenance_window_context import (
 )
 from instance_scheduler.model import EC2SSMMaintenanceWindow
 from instance_scheduler.model.maint_win import NoNextExecutionTimeError
-from instance_scheduler.model.managed_instance import RegisteredEc2Instance, RegistryKey
+from instance_scheduler.model.managed_instance import (
+    RegisteredEc2Instance,
+    RegisteredInstance,
+    RegistryKey,
+)
 from instance_scheduler.model.schedule_definition import ScheduleDefinition
 from instance_scheduler.model.store.dynamo_mw_store import DynamoMWStore
 from instance_scheduler.model.store.resource_registry import ResourceRegistry
@@ -37,7 +41,7 @@ from instance_scheduler.scheduling.scheduling_decision import (
     RequestedAction,
     RuntimeInfo,
     SchedulingDecision,
-    make_scheduling_decision,
+    make_scheduling_decisions,
 )
 from instance_scheduler.scheduling.scheduling_result import (
     SchedulingAction,
@@ -164,6 +168,8 @@ class Ec2Service:
             "ec2"
         )
         self.ec2_resize_request_queue_url = env.resize_request_queue_url
+        # instances described without a registry record, which are written in full rather than updated
+        self._unregistered_keys: set[RegistryKey] = set()
 
         if env.enable_ec2_ssm_maintenance_windows:
             self.mw_context = MaintenanceWindowContext(
@@ -214,20 +220,28 @@ class Ec2Service:
         resize_decisions: list[ResizeDecision] = []
         do_nothing_decisions: list[SchedulingDecision[ManagedEC2Instance]] = []
 
+        # instances that share a schedule share its evaluation
+        instances_by_schedule: dict[str, list[ManagedEC2Instance]] = {}
         for managed_instance in self.describe_schedulable_instances():
+            instances_by_schedule.setdefault(
+                managed_instance.registry_info.schedule, []
+            ).append(managed_instance)
+
+        for schedule_name, managed_instances in instances_by_schedule.items():
             schedule_definition = self.scheduling_context.schedule_store.find_by_name(
-                managed_instance.registry_info.schedule,
+                schedule_name,
                 cache_only=True,  # cache should have been preloaded by scheduling request handler
             )
 
             if schedule_definition is None:
-                logger.info(
-                    f"Schedule {managed_instance.registry_info.schedule} not found, skipping instance {managed_instance.registry_info.resource_id}"
-                )
-                yield SchedulingResult.shortcircuit_error(
-                    resource=managed_instance,
-                    error_code=ErrorCode.UNKNOWN_SCHEDULE,
-                )
+                for managed_instance in managed_instances:
+                    logger.info(
+                        f"Schedule {schedule_name} not found, skipping instance {managed_instance.registry_info.resource_id}"
+                    )
+                    yield SchedulingResult.shortcircuit_error(
+                        resource=managed_instance,
+                        error_code=ErrorCode.UNKNOWN_SCHEDULE,
+                    )
                 continue
 
             schedule = schedule_definition.to_instance_schedule(
@@ -238,43 +252,48 @@ class Ec2Service:
             desired_state, desired_type, _ = schedule.get_desired_state(
                 self.scheduling_context.current_dt
             )
-            if (
-                desired_state == ScheduleState.RUNNING
-                and desired_type
-                and desired_type != managed_instance.runtime_info.size
-            ):
-                resize_decisions.append(
-                    ResizeDecision(
-                        instance=managed_instance,
-                        action=RequestedAction.RESIZE,
-                        new_stored_state=InstanceState.RUNNING,
-                        reason=f"Instance needs resizing from {managed_instance.runtime_info.size} to {desired_type}",
-                        size_preferences=[desired_type],
+            instances_to_decide: list[ManagedEC2Instance] = []
+            for managed_instance in managed_instances:
+                if (
+                    desired_state == ScheduleState.RUNNING
+                    and desired_type
+                    and desired_type != managed_instance.runtime_info.size
+                ):
+                    resize_decisions.append(
+                        ResizeDecision(
+                            instance=managed_instance,
+                            action=RequestedAction.RESIZE,
+                            new_stored_state=InstanceState.RUNNING,
+                            reason=f"Instance needs resizing from {managed_instance.runtime_info.size} to {desired_type}",
+                            size_preferences=[desired_type],
+                        )
                     )
-                )
+                else:
+                    instances_to_decide.append(managed_instance)
+
+            if not instances_to_decide:
                 continue
 
-            decision = make_scheduling_decision(
-                instance=managed_instance,
+            for decision in make_scheduling_decisions(
+                instances=instances_to_decide,
                 schedule=schedule,
                 current_dt=self.scheduling_context.current_dt,
                 maintenance_windows=self._fetch_mw_schedules_for(schedule_definition),
-            )
-
-            match decision.action:
-                case RequestedAction.START:
-                    start_decisions.append(decision)
-                case RequestedAction.STOP:
-                    if schedule.hibernate:
-                        hibernate_decisions.append(decision)
-                    else:
-                        stop_decisions.append(decision)
-                case RequestedAction.DO_NOTHING:
-                    do_nothing_decisions.append(decision)
-                case _:
-                    logger.warning(
-                        f"EC2 scheduling resulted in unrecognized decision type: {decision}"
-                    )
+            ):
+                match decision.action:
+                    case RequestedAction.START:
+                        start_decisions.append(decision)
+                    case RequestedAction.STOP:
+                        if schedule.hibernate:
+                            hibernate_decisions.append(decision)
+                        else:
+                            stop_decisions.append(decision)
+                    case RequestedAction.DO_NOTHING:
+                        do_nothing_decisions.append(decision)
+                    case _:
+                        logger.warning(
+                            f"EC2 scheduling resulted in unrecognized decision type: {decision}"
+                        )
 
         for scheduling_result in chain(
             self.start_instances(start_decisions),
@@ -287,10 +306,24 @@ class Ec2Service:
                 scheduling_result.instance.registry_info
                 != scheduling_result.updated_registry_info
             ):
-                registry.put(scheduling_result.updated_registry_info, overwrite=True)
+                self._save_registry_info(
+                    scheduling_result.instance.registry_info,
+                    scheduling_result.updated_registry_info,
+                )
 
             yield scheduling_result
 
+    def _save_registry_info(
+        self, previous: RegisteredInstance, updated: RegisteredInstance
+    ) -> None:
+        registry = self.scheduling_context.registry
+        if previous.key in self._unregistered_keys:
+            # an update of a record that does not exist yet always fails its condition before falling back to put
+            registry.put(updated, overwrite=True)
+            self._unregistered_keys.discard(previous.key)
+        else:
+            registry.update(previous, updated)
+
     @property
     def service_name(self) -> str:
         return "ec2"
@@ -377,17 +410,22 @@ class Ec2Service:
         registry_data = cast(
             Optional[RegisteredEc2Instance], registry.get(registry_key)
         )
-        if not registry_data:
-            registry_data = RegisteredEc2Instance(
-                account=ec2_instance.account,
-                region=ec2_instance.region,
-                resource_id=ec2_instance.resource_id,
-                arn=ec2_instance.arn,
-                name=ec2_instance.tags.get("Name", ""),
-                schedule=ec2_instance.tags.get(schedule_tag_key, ""),
-                stored_state=InstanceState.UNKNOWN,
-            )
-        return registry_data
+        return registry_data or cls.new_registry_data(ec2_instance, schedule_tag_key)
+
+    @classmethod
+    def new_registry_data(
+        cls, ec2_instance: EC2RuntimeInfo, schedule_tag_key: str
+    ) -> RegisteredEc2Instance:
+        """registry data for an instance that is not registered yet"""
+        return RegisteredEc2Instance(
+            account=ec2_instance.account,
+            region=ec2_instance.region,
+            resource_id=ec2_instance.resource_id,
+            arn=ec2_instance.arn,
+            name=ec2_instance.tags.get("Name", ""),
+            schedule=ec2_instance.tags.get(schedule_tag_key, ""),
+            stored_state=InstanceState.UNKNOWN,
+        )
 
     def describe_schedulable_instances(self) -> Iterator[ManagedEC2Instance]:
         """
@@ -405,15 +443,36 @@ class Ec2Service:
             f"Fetching ec2 instances for account {self.scheduling_context.assumed_role.account} in region {self.scheduling_context.assumed_role.region}"
         )
 
-        for ec2_runtime_info in Ec2Service.describe_tagged_instances(
-            self.scheduling_context.assumed_role,
-            self.scheduling_context.schedule_tag_key,
-        ):
-            registry_info = Ec2Service.fetch_or_create_registry_data(
-                ec2_runtime_info,
-                self.scheduling_context.registry,
+        ec2_runtime_infos = list(
+            Ec2Service.describe_tagged_instances(
+                self.scheduling_context.assumed_role,
                 self.scheduling_context.schedule_tag_key,
             )
+        )
+        # instances missing from the preloaded registry cache are looked up together
+        registry_lookup = self.scheduling_context.registry.get_many(
+            RegistryKey.from_arn(ec2_runtime_info.arn)
+            for ec2_runtime_info in ec2_runtime_infos
+        )
+        for key, error in registry_lookup.errors.items():
+            # the instance may be registered, so it is not scheduled from made up registry data
+            logger.error(
+                f"Unable to read registry data, the instance will not be scheduled this run: {error}",
+                extra={"key": key},
+            )
+
+        self._unregistered_keys = set(registry_lookup.not_found)
+
+        for ec2_runtime_info in ec2_runtime_infos:
+            key = RegistryKey.from_arn(ec2_runtime_info.arn)
+            if key in registry_lookup.errors:
+                continue
+
+            registry_info = cast(
+                Optional[RegisteredEc2Instance], registry_lookup.found.get(key)
+            ) or Ec2Service.new_registry_data(
+                ec2_runtime_info, self.scheduling_context.schedule_tag_key
+            )
 
             logger.debug(
                 f'Selected EC2 instance with ID {registry_info.resource_id} in state "{ec2_runtime_info.current_state}"'
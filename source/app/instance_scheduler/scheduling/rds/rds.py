@@ -28,7 +28,11 @@ from instance_scheduler.cron.parser import parse_weekdays_expr
 from instance_scheduler.handler.environments.scheduling_request_environment import (
     SchedulingRequestEnvironment,
 )
-from instance_scheduler.model.managed_instance import RegisteredRdsInstance, RegistryKey
+from instance_scheduler.model.managed_instance import (
+    RegisteredInstance,
+    RegisteredRdsInstance,
+    RegistryKey,
+)
 from instance_scheduler.observability.error_codes import ErrorCode
 from instance_scheduler.observability.powertools_logging import powertools_logger
 from instance_scheduler.scheduling.scheduling_decision import (
@@ -136,6 +140,8 @@ class RdsService:
         self.rds_client: Final = scheduling_context.assumed_role.client("rds")
         self.stack_name: Final = env.hub_stack_name
         self.env: Final = env
+        # resources described without a registry record, which are written in full rather than updated
+        self._unregistered_keys: set[RegistryKey] = set()
 
     def schedule_target(self) -> Iterator[SchedulingResult[ManagedRdsInstance]]:
         registry = self.scheduling_context.registry
@@ -205,7 +211,9 @@ class RdsService:
 
             # Update registry if state changed
             if result.instance.registry_info != result.updated_registry_info:
-                registry.put(result.updated_registry_info, overwrite=True)
+                self._save_registry_info(
+                    result.instance.registry_info, result.updated_registry_info
+                )
 
             yield result
 
@@ -345,6 +353,17 @@ class RdsService:
                         current_size=cluster.get("DBClusterInstanceClass", "cluster"),
                     )
 
+    def _save_registry_info(
+        self, previous: RegisteredInstance, updated: RegisteredInstance
+    ) -> None:
+        registry = self.scheduling_context.registry
+        if previous.key in self._unregistered_keys:
+            # an update of a record that does not exist yet always fails its condition before falling back to put
+            registry.put(updated, overwrite=True)
+            self._unregistered_keys.discard(previous.key)
+        else:
+            registry.update(previous, updated)
+
     @property
     def service_name(self) -> str:
         return "rds"
@@ -448,6 +467,7 @@ class RdsService:
         )
 
         registry = self.scheduling_context.registry
+        self._unregistered_keys = set()
 
         # Process instances and clusters
         for runtime_info in RdsService.describe_tagged_rds_resources(
@@ -461,6 +481,7 @@ class RdsService:
 
             # create registry record if none exists
             if not registry_info:
+                self._unregistered_keys.add(runtime_info.to_registry_key())
                 registry_info = RegisteredRdsInstance(
                     account=self.scheduling_context.assumed_role.account,
                     region=self.scheduling_context.assumed_role.region,
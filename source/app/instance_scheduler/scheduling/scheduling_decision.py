@@ -77,28 +77,93 @@ class SchedulingDecision(Generic[T]):
         return self.instance.registry_info.stored_state
 
 
-def make_scheduling_decision(  # NOSONAR -- cognitive complexity
+def make_scheduling_decision(
     instance: T,
     schedule: InstanceSchedule,
     current_dt: datetime,
     maintenance_windows: Optional[Iterable[InstanceSchedule]] = None,
 ) -> SchedulingDecision[T]:
     """Standalone version of the scheduling decision logic."""
-    stored_state = instance.registry_info.stored_state
+    active_window = _active_maintenance_window(
+        schedule, current_dt, maintenance_windows
+    )
+    if active_window is not None:
+        return _maintenance_window_decision(instance, active_window)
 
-    if schedule.use_maintenance_window:
-        if maintenance_windows is None:
-            maintenance_windows = []
-        for mw in maintenance_windows:
-            if mw.get_desired_state(current_dt)[0] == ScheduleState.RUNNING:
-                return SchedulingDecision(
-                    instance=instance,
-                    action=RequestedAction.START,
-                    new_stored_state=InstanceState.RUNNING,
-                    reason=f"In active maintenance window {mw.name}",
-                )
+    schedule_state, _, _ = schedule.get_desired_state(current_dt)
+    return _apply_stored_state_rules(instance, schedule, schedule_state)
+
+
+def make_scheduling_decisions(
+    instances: Iterable[T],
+    schedule: InstanceSchedule,
+    current_dt: datetime,
+    maintenance_windows: Optional[Iterable[InstanceSchedule]] = None,
+) -> list[SchedulingDecision[T]]:
+    """
+    Batch version of `make_scheduling_decision` for instances that share a schedule and maintenance windows.
+
+    The schedule and maintenance windows are evaluated once for the batch. The decision for an instance then only
+    depends on its stored state and whether it is running, so the decision for each combination of those is made
+    once and applied to every other instance with the same combination.
+    """
+    active_window = _active_maintenance_window(
+        schedule, current_dt, maintenance_windows
+    )
+    if active_window is not None:
+        return [
+            _maintenance_window_decision(instance, active_window)
+            for instance in instances
+        ]
 
     schedule_state, _, _ = schedule.get_desired_state(current_dt)
+    decisions_by_state: dict[tuple[InstanceState, bool], SchedulingDecision[T]] = {}
+    decisions: list[SchedulingDecision[T]] = []
+    for instance in instances:
+        key = (instance.registry_info.stored_state, instance.runtime_info.is_running)
+        decision = decisions_by_state.get(key)
+        if decision is None:
+            decision = _apply_stored_state_rules(instance, schedule, schedule_state)
+            decisions_by_state[key] = decision
+        else:
+            decision = SchedulingDecision(
+                instance=instance,
+                action=decision.action,
+                new_stored_state=decision.new_stored_state,
+                reason=decision.reason,
+            )
+        decisions.append(decision)
+    return decisions
+
+
+def _active_maintenance_window(
+    schedule: InstanceSchedule,
+    current_dt: datetime,
+    maintenance_windows: Optional[Iterable[InstanceSchedule]],
+) -> Optional[InstanceSchedule]:
+    if not schedule.use_maintenance_window or maintenance_windows is None:
+        return None
+    for mw in maintenance_windows:
+        if mw.get_desired_state(current_dt)[0] == ScheduleState.RUNNING:
+            return mw
+    return None
+
+
+def _maintenance_window_decision(
+    instance: T, maintenance_window: InstanceSchedule
+) -> SchedulingDecision[T]:
+    return SchedulingDecision(
+        instance=instance,
+        action=RequestedAction.START,
+        new_stored_state=InstanceState.RUNNING,
+        reason=f"In active maintenance window {maintenance_window.name}",
+    )
+
+
+def _apply_stored_state_rules(  # NOSONAR -- cognitive complexity
+    instance: T, schedule: InstanceSchedule, schedule_state: ScheduleState
+) -> SchedulingDecision[T]:
+    stored_state = instance.registry_info.stored_state
 
     match schedule_state:
         case ScheduleState.STOPPED:
@@ -2,9 +2,9 @@
 # SPDX-License-Identifier: Apache-2.0
 import json
 from collections import Counter
-from itertools import groupby
 from typing import Generic, Iterable, Iterator, TypeVar
 
+from instance_scheduler.observability.instance_counts import ServiceInstanceCounts
 from instance_scheduler.ops_metrics.metric_type.scheduling_action_metric import (
     ActionTaken,
     SchedulingActionMetric,
@@ -16,77 +16,85 @@ from instance_scheduler.scheduling.scheduling_result import SchedulingResult
 
 T = TypeVar("T", bound=ManagedInstance)
 
+ActionKey = tuple[str, str, str]  # service, instance_type, action
+
 
 class SchedulingSummary(Generic[T]):
-    results: list[SchedulingResult[T]]
+    """
+    single-pass aggregate of the results of a scheduling request
 
-    def __init__(self, results: Iterable[SchedulingResult[T]]) -> None:
-        self.results = list(results)
+    results are counted as they are added and are not retained, so the memory used by the summary depends on the
+    number of distinct schedules/instance types/actions in the target rather than on the number of instances
+    """
 
-    def group_by_instance_type(
-        self,
-    ) -> Iterator[tuple[str, list[SchedulingResult[T]]]]:
-        sorted_results = sorted(
-            self.results, key=lambda r: r.instance.runtime_info.size
-        )
-        for instance_type, group in groupby(
-            sorted_results, key=lambda r: r.instance.runtime_info.size
-        ):
-            yield instance_type, list(group)
+    def __init__(self, results: Iterable[SchedulingResult[T]] = ()) -> None:
+        self.num_results = 0
+        self.instance_counts = ServiceInstanceCounts()
+        self._schedules: set[str] = set()
+        self._actions: Counter[ActionKey] = Counter()
+        self._errors: Counter[str] = Counter()
+        for result in results:
+            self.add(result)
 
-    def group_by_schedule(
-        self,
-    ) -> Iterator[tuple[str, list[SchedulingResult[T]]]]:
-        sorted_results = sorted(
-            self.results, key=lambda r: r.instance.registry_info.schedule
-        )
-        for schedule, group in groupby(
-            sorted_results, key=lambda r: r.instance.registry_info.schedule
-        ):
-            yield schedule, list(group)
+    def add(self, result: SchedulingResult[T]) -> None:
+        self.num_results += 1
+        self._schedules.add(result.instance.registry_info.schedule)
+        self.instance_counts.count_result(result)
 
-    def as_actions_taken_metric(self) -> SchedulingActionMetric:
-        actions = []
-        for instance_type, group in self.group_by_instance_type():
-            action_counts = Counter(result.action_taken for result in group)
-            service = group[0].instance.registry_info.service
-
-            for action, count in action_counts.items():
-                if not action or not action.value:
-                    continue
-
-                actions.append(
-                    ActionTaken(
-                        instances=count,
-                        action=action.value,
-                        service=service,
-                        instanceType=instance_type,
-                    )
+        if result.action_taken and result.action_taken.value:
+            self._actions[
+                (
+                    result.instance.registry_info.service,
+                    result.instance.runtime_info.size,
+                    result.action_taken.value,
                 )
+            ] += 1
 
-        unique_schedules = len(
-            set(result.instance.registry_info.schedule for result in self.results)
-        )
+        if result.error_code:
+            self._errors[result.error_code.value] += 1
+
+    def track(
+        self, results: Iterable[SchedulingResult[T]]
+    ) -> Iterator[SchedulingResult[T]]:
+        """add each result to the summary as it is yielded"""
+        for result in results:
+            self.add(result)
+            yield result
 
+    def as_actions_taken_metric(self) -> SchedulingActionMetric:
         return SchedulingActionMetric(
-            num_unique_schedules=unique_schedules,
-            num_instances_scanned=len(self.results),
+            num_unique_schedules=len(self._schedules),
+            num_instances_scanned=self.num_results,
             duration_seconds=0.0,
-            actions=actions,
+            actions=[
+                ActionTaken(
+                    instances=count,
+                    action=action,
+                    service=service,
+                    instanceType=instance_type,
+                )
+                for (service, instance_type, action), count in sorted(
+                    self._actions.items()
+                )
+            ],
         )
 
     def to_json(self) -> str:
         return json.dumps(
-            [
-                {
-                    "instance": result.instance.registry_info.display_name,
-                    "size": result.instance.runtime_info.size,
-                    "schedule": result.instance.registry_info.schedule,
-                    "action": (
-                        result.action_taken.value if result.action_taken else None
-                    ),
-                    "reason": result.request_reason,
-                }
-                for result in self.results
-            ]
+            {
+                "num_results": self.num_results,
+                "num_schedules": len(self._schedules),
+                "actions": [
+                    {
+                        "service": service,
+                        "size": instance_type,
+                        "action": action,
+                        "count": count,
+                    }
+                    for (service, instance_type, action), count in sorted(
+                        self._actions.items()
+                    )
+                ],
+                "errors": dict(sorted(self._errors.items())),
+            }
         )
@@ -3,6 +3,7 @@
 from dataclasses import dataclass
 from functools import cache
 from os import environ
+from threading import Lock
 from typing import TYPE_CHECKING, Any, Final, Optional
 
 import boto3
@@ -17,6 +18,9 @@ else:
     STSClient = object
     DynamoDBClient = object
 
+# boto3 sessions are not thread safe, so clients must not be created from the same session concurrently
+_client_creation_lock: Final = Lock()
+
 
 def get_boto_config() -> _Config:
     """Returns a boto3 config with standard retries and `user_agent_extra`"""
@@ -78,12 +82,15 @@ class AssumedRole:
 
     def client(self, service_name: str, region: Optional[str] = None) -> Any:
         """simple wrapper for session.client() that includes the default config from get_boto_config"""
-        if region:
-            return self.session.client(service_name, region, config=get_boto_config())
-        else:
-            return self.session.client(
-                service_name, region_name=self.region, config=get_boto_config()
-            )
+        with _client_creation_lock:
+            if region:
+                return self.session.client(
+                    service_name, region, config=get_boto_config()
+                )
+            else:
+                return self.session.client(
+                    service_name, region_name=self.region, config=get_boto_config()
+                )
 
 
 def assume_role(*, account: str, region: str, role_name: str) -> AssumedRole:
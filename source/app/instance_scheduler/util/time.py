@@ -1,6 +1,8 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from zoneinfo import ZoneInfo
 
 
 def is_aware(dt: datetime) -> bool:
@@ -10,3 +12,55 @@ def is_aware(dt: datetime) -> bool:
     [[Documentation] Determining if an Object is Aware or Naive](https://docs.python.org/3/library/datetime.html#determining-if-an-object-is-aware-or-naive)
     """
     return dt.tzinfo is not None and dt.tzinfo.utcoffset(dt) is not None
+
+
+def wall_clock_instant(local: datetime) -> datetime:
+    """
+    Returns the UTC instant at which the wall clock of a timezone-aware `datetime` first reads that local time.
+
+    Local times that are repeated when clocks are set back are reached at their first occurrence. Local times that
+    are skipped when clocks are set forward are never read by the wall clock, so they are reached at the moment of
+    the transition (e.g. 02:30 on a day when clocks jump from 02:00 to 03:00 is reached at 03:00).
+    """
+    if not is_aware(local):
+        raise ValueError(
+            "Attempted to resolve the instant of a non-timezone-aware datetime"
+        )
+    local = local.replace(fold=0)
+    wall_time = local.replace(tzinfo=None)
+    instant = local.astimezone(timezone.utc)
+    if instant.astimezone(local.tzinfo).replace(tzinfo=None) == wall_time:
+        return instant
+
+    # the transition lies between the interpretations of the local time using the offsets after and before it
+    earlier = local.replace(fold=1).astimezone(timezone.utc)
+    while instant - earlier > timedelta(seconds=1):
+        middle = earlier + (instant - earlier) / 2
+        if middle.astimezone(local.tzinfo).replace(tzinfo=None) < wall_time:
+            earlier = middle
+        else:
+            instant = middle
+    return instant - timedelta(microseconds=instant.microsecond)
+
+
+@lru_cache(maxsize=None)
+def get_timezone(name: str) -> ZoneInfo:
+    """
+    Returns the timezone with an IANA name, resolving each name once per process.
+
+    Raises `ZoneInfoNotFoundError` if there is no timezone with that name.
+    """
+    return ZoneInfo(name)
+
+
+@lru_cache(maxsize=128)
+def localize(dt: datetime, tz: ZoneInfo) -> datetime:
+    """
+    Returns a timezone-aware `datetime` converted to the local time of a timezone.
+
+    Every schedule in a scheduling run is evaluated at the same time, so the conversion is made once per timezone
+    rather than once per schedule or instance.
+    """
+    if not is_aware(dt):
+        raise ValueError("Attempted to localize non-timezone-aware datetime")
+    return dt.astimezone(tz)
@@ -13,14 +13,25 @@ from instance_scheduler.handler.cli.cli_request_handler import (
 from instance_scheduler.handler.environments.main_lambda_environment import (
     MainLambdaEnv,
 )
+from instance_scheduler.model.managed_instance import (
+    RegisteredEc2Instance,
+    RegisteredRdsInstance,
+)
 from instance_scheduler.model.period_definition import PeriodDefinition
 from instance_scheduler.model.period_identifier import PeriodIdentifier
 from instance_scheduler.model.schedule_definition import ScheduleDefinition
+from instance_scheduler.model.store.dynamo_schedule_definition_store import (
+    DynamoScheduleDefinitionStore,
+)
 from instance_scheduler.model.store.period_definition_store import PeriodDefinitionStore
+from instance_scheduler.model.store.resource_registry import ResourceRegistry
 from instance_scheduler.model.store.schedule_definition_store import (
     ScheduleDefinitionStore,
 )
+from instance_scheduler.scheduling.states import InstanceState
+from instance_scheduler.util.arn import ARN
 from instance_scheduler.util.dynamodb_utils import DynamoDBUtils
+from instance_scheduler.util.session_manager import hub_dynamo_client
 from packaging.version import Version
 from tests.context import MockLambdaContext
 from tests.test_utils.mock_environs.mock_main_lambda_env import MockMainLambdaEnv
@@ -308,6 +319,27 @@ def test_delete_period_returns_error_if_period_is_used_by_a_schedule(
     }
 
 
+def test_delete_period_returns_error_if_period_is_used_by_a_schedule_written_to_the_table(
+    config_table: str,
+) -> None:
+    create_period_with_cli(name="cli-period")
+    DynamoScheduleDefinitionStore(config_table).rebuild_period_index()
+    # written from the console after the period index was rebuilt
+    hub_dynamo_client().put_item(
+        TableName=config_table,
+        Item={
+            "type": {"S": "schedule"},
+            "name": {"S": "console-schedule"},
+            "periods": {"SS": ["cli-period"]},
+        },
+    )
+
+    result = delete_period_with_cli("cli-period")
+    assert result == {
+        "Error": "error: period cli-period can not be deleted because it is still used in schedule(s) ['console-schedule']"
+    }
+
+
 def test_delete_period_will_not_delete_cfn_managed_period(
     period_store: PeriodDefinitionStore,
 ) -> None:
@@ -537,6 +569,118 @@ def test_describe_schedule_usage(config_table: None) -> None:
     }
 
 
+def test_describe_usage_forecast(
+    config_table: None, resource_registry: ResourceRegistry
+) -> None:
+    create_period_with_cli("cli-period", begintime="09:00", endtime="17:00")
+    create_schedule_with_cli(periods=["cli-period@t3.micro"], name="cli-schedule")
+    for resource_id in ["i-1", "i-2", "i-3"]:
+        resource_registry.put(registered_ec2_instance(resource_id, "cli-schedule"))
+    resource_registry.put(registered_ec2_instance("i-4", "deleted-schedule"))
+    resource_registry.put(
+        RegisteredRdsInstance(
+            account="123456789012",
+            region="us-east-1",
+            resource_id="db-1",
+            arn=ARN("arn:aws:rds:us-east-1:123456789012:db:db-1"),
+            schedule="cli-schedule",
+            name="my-db",
+            stored_state=InstanceState.RUNNING,
+        )
+    )
+
+    event = {
+        "source": "scheduler.cli",
+        "action": "describe-usage-forecast",
+        "parameters": {"startdate": "20230720", "enddate": "20230721"},
+        "version": __version__,
+    }
+    handler = CliRequestHandler(event, MockLambdaContext(), MockMainLambdaEnv())
+    result = handler.handle_request()
+
+    assert result == {
+        "StartDate": "2023-07-20",
+        "EndDate": "2023-07-21",
+        "TotalRunningHours": 64.0,
+        "Forecast": [
+            {
+                "Schedule": "cli-schedule",
+                "Service": "ec2",
+                "InstanceType": "t3.micro",
+                "Resources": 3,
+                "RunningHours": 48.0,
+            },
+            {
+                "Schedule": "cli-schedule",
+                "Service": "rds",
+                "InstanceType": "current",
+                "Resources": 1,
+                "RunningHours": 16.0,
+            },
+        ],
+        "UnknownSchedules": ["deleted-schedule"],
+    }
+
+
+def test_describe_schedule_transitions(config_table: None) -> None:
+    create_period_with_cli("cli-period", begintime="09:00", endtime="17:00")
+    # in the default timezone (Asia/Tokyo)
+    create_schedule_with_cli(periods=["cli-period@t3.micro"], name="cli-schedule")
+
+    result = describe_schedule_transitions_with_cli(
+        "cli-schedule", after="2023-07-20T12:00", count=3
+    )
+
+    assert result == {
+        "Schedule": "cli-schedule",
+        "Timezone": "Asia/Tokyo",
+        "After": "2023-07-20T12:00:00+09:00",
+        "Transitions": [
+            {
+                "Time": "2023-07-20T17:00:00+09:00",
+                "State": "stopped",
+                "Period": None,
+                "InstanceType": None,
+            },
+            {
+                "Time": "2023-07-21T09:00:00+09:00",
+                "State": "running",
+                "Period": "cli-period",
+                "InstanceType": "t3.micro",
+            },
+            {
+                "Time": "2023-07-21T17:00:00+09:00",
+                "State": "stopped",
+                "Period": None,
+                "InstanceType": None,
+            },
+        ],
+    }
+
+
+def test_describe_schedule_transitions_returns_error_for_invalid_after(
+    config_table: None,
+) -> None:
+    create_period_with_cli("cli-period", begintime="09:00", endtime="17:00")
+    create_schedule_with_cli(periods=["cli-period"], name="cli-schedule")
+
+    result = describe_schedule_transitions_with_cli("cli-schedule", after="tomorrow")
+
+    assert "error: invalid after tomorrow" in result["Error"]
+
+
+def registered_ec2_instance(resource_id: str, schedule: str) -> RegisteredEc2Instance:
+    return RegisteredEc2Instance(
+        account="123456789012",
+        region="us-east-1",
+        resource_id=resource_id,
+        arn=ARN(f"arn:aws:ec2:us-east-1:123456789012:instance/{resource_id}"),
+        schedule=schedule,
+        name=resource_id,
+        stored_state=InstanceState.RUNNING,
+    )
+
+
 def test_update_period(config_table: None, test_suite_env: MainLambdaEnv) -> None:
     create_period_with_cli("cli-period", begintime="02:00", endtime="4:00")
     result = update_period_with_cli("cli-period", begintime="12:00", endtime="15:00")
@@ -927,6 +1071,30 @@ def describe_schedule_usage_with_cli(
     return result
 
 
+def describe_schedule_transitions_with_cli(
+    name: str,
+    after: Optional[str] = None,
+    count: Optional[int] = None,
+    version: str = __version__,
+) -> Any:
+    parameters: dict[str, Any] = {"name": name}
+    if after is not None:
+        parameters["after"] = after
+    if count is not None:
+        parameters["count"] = count
+    event = {
+        "source": "scheduler.cli",
+        "action": "describe-schedule-transitions",
+        "parameters": parameters,
+        "version": version,
+    }
+
+    handler = CliRequestHandler(event, MockLambdaContext(), MockMainLambdaEnv())
+    result = handler.handle_request()
+    assert is_valid_json(result)
+    return result
+
+
 def get_period_from_dynamo(name: str, app_env: MainLambdaEnv) -> Any:
     table = DynamoDBUtils.get_dynamodb_table_resource_ref(app_env.config_table_name)
     result = table.get_item(Key={"type": "period", "name": name}, ConsistentRead=True)
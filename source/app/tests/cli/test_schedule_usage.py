@@ -6,10 +6,14 @@ from zoneinfo import ZoneInfo
 
 from instance_scheduler.configuration.instance_schedule import InstanceSchedule
 from instance_scheduler.configuration.running_period import RunningPeriod
+from instance_scheduler.configuration.running_period_dict_element import (
+    RunningPeriodDictElement,
+)
 from instance_scheduler.cron.cron_recurrence_expression import CronRecurrenceExpression
 from instance_scheduler.handler.cli.schedule_usage import (
     CliCustomEncoder,
     get_schedule_usage,
+    iter_schedule_usage,
 )
 from pytest import raises
 
@@ -310,3 +314,199 @@ def test_describe_schedule_uses_correctly_handles_nth_weekday() -> None:
             },
         },
     }
+
+
+def test_overlapping_periods_are_merged_into_one_interval() -> None:
+    schedule = InstanceSchedule(
+        name="test-schedule",
+        timezone=ZoneInfo("UTC"),
+        periods=[
+            {"period": RunningPeriod("day", time(9, 0), time(17, 0))},
+            {"period": RunningPeriod("midday", time(12, 0), time(13, 0))},
+        ],
+    )
+
+    usage = get_schedule_usage(schedule, start=datetime(2024, 3, 1))["usage"]
+
+    assert usage["2024-03-01"]["running_periods"] == {
+        "day": {
+            "begin": "03/01/24 09:00:00",
+            "end": "03/01/24 17:00:00",
+            "billing_hours": 8,
+            "billing_seconds": 8 * 3600,
+        }
+    }
+
+
+def test_running_instance_is_held_through_a_window_of_any_state() -> None:
+    # a period with only an end time allows any state until it stops the instance
+    hold = RunningPeriod("hold", endtime=time(20, 0))
+    schedule = InstanceSchedule(
+        name="test-schedule",
+        timezone=ZoneInfo("UTC"),
+        periods=[
+            {"period": RunningPeriod("day", time(9, 0), time(12, 0))},
+            {"period": hold},
+        ],
+    )
+    hold_only = InstanceSchedule(
+        name="hold-only", timezone=ZoneInfo("UTC"), periods=[{"period": hold}]
+    )
+
+    usage = get_schedule_usage(schedule, start=datetime(2024, 3, 1))["usage"]
+    hold_only_usage = get_schedule_usage(hold_only, start=datetime(2024, 3, 1))
+
+    assert usage["2024-03-01"]["running_periods"] == {
+        "day": {
+            "begin": "03/01/24 09:00:00",
+            "end": "03/01/24 20:00:00",
+            "billing_hours": 11,
+            "billing_seconds": 11 * 3600,
+        }
+    }
+    assert hold_only_usage["usage"]["2024-03-01"]["billing_seconds"] == 0
+
+
+def test_stop_is_deferred_to_a_period_starting_at_midnight() -> None:
+    schedule = InstanceSchedule(
+        name="test-schedule",
+        timezone=ZoneInfo("UTC"),
+        periods=[
+            {"period": RunningPeriod("late", time(20, 0), time(23, 59))},
+            {"period": RunningPeriod("early", time(0, 0), time(4, 0))},
+        ],
+    )
+
+    usage = get_schedule_usage(schedule, start=datetime(2024, 3, 1))["usage"]
+
+    assert usage["2024-03-01"]["running_periods"] == {
+        "early": {
+            "begin": "03/01/24 00:00:00",
+            "end": "03/01/24 04:00:00",
+            "billing_hours": 4,
+            "billing_seconds": 4 * 3600,
+        },
+        "late": {
+            "begin": "03/01/24 20:00:00",
+            "end": "03/02/24 00:00:00",
+            "billing_hours": 4,
+            "billing_seconds": 4 * 3600,
+        },
+    }
+
+
+def test_override_status_replaces_the_periods() -> None:
+    periods: list[RunningPeriodDictElement] = [
+        {"period": RunningPeriod("day", time(9, 0), time(17, 0))}
+    ]
+    running = InstanceSchedule(
+        name="running",
+        timezone=ZoneInfo("UTC"),
+        periods=periods,
+        override_status="running",
+    )
+    stopped = InstanceSchedule(
+        name="stopped",
+        timezone=ZoneInfo("UTC"),
+        periods=periods,
+        override_status="stopped",
+    )
+
+    running_usage = get_schedule_usage(running, start=datetime(2024, 3, 1))
+    stopped_usage = get_schedule_usage(stopped, start=datetime(2024, 3, 1))
+
+    assert running_usage["usage"]["2024-03-01"]["running_periods"] == {
+        "override_status": {
+            "begin": "03/01/24 00:00:00",
+            "end": "03/02/24 00:00:00",
+            "billing_hours": 24,
+            "billing_seconds": 24 * 3600,
+        }
+    }
+    assert stopped_usage["usage"]["2024-03-01"]["billing_seconds"] == 0
+
+
+def test_adjacent_periods_are_billed_without_a_gap() -> None:
+    schedule = InstanceSchedule(
+        name="test-schedule",
+        timezone=ZoneInfo("UTC"),
+        periods=[
+            {"period": RunningPeriod("morning", time(4, 0), time(12, 0))},
+            {"period": RunningPeriod("afternoon", time(12, 1), time(17, 0))},
+        ],
+    )
+
+    output_json = get_schedule_usage(schedule, start=datetime(2024, 3, 1))
+
+    assert output_json["usage"]["2024-03-01"]["running_periods"] == {
+        "morning": {
+            "begin": "03/01/24 04:00:00",
+            "end": "03/01/24 12:01:00",
+            "billing_hours": 9,
+            "billing_seconds": 8 * 3600 + 60,
+        },
+        "afternoon": {
+            "begin": "03/01/24 12:01:00",
+            "end": "03/01/24 17:00:00",
+            "billing_hours": 5,
+            "billing_seconds": 4 * 3600 + 59 * 60,
+        },
+    }
+
+
+def test_usage_is_billed_for_elapsed_time_on_dst_transition_days() -> None:
+    schedule = InstanceSchedule(
+        name="test-schedule",
+        timezone=ZoneInfo("America/New_York"),
+        periods=[{"period": RunningPeriod("all-day")}],
+    )
+
+    usage = get_schedule_usage(
+        schedule, start=datetime(2024, 3, 9), end=datetime(2024, 3, 10)
+    )["usage"]
+    assert usage["2024-03-09"]["billing_seconds"] == 24 * 3600
+    assert usage["2024-03-10"]["billing_seconds"] == 23 * 3600
+    assert usage["2024-03-10"]["billing_hours"] == 23
+
+    usage = get_schedule_usage(schedule, start=datetime(2024, 11, 3))["usage"]
+    assert usage["2024-11-03"]["billing_seconds"] == 25 * 3600
+    assert usage["2024-11-03"]["billing_hours"] == 25
+
+
+def test_period_skipped_by_dst_transition_is_not_billed() -> None:
+    # clocks jump from 02:00 to 03:00
+    skipped = InstanceSchedule(
+        name="skipped",
+        timezone=ZoneInfo("America/New_York"),
+        periods=[{"period": RunningPeriod("skipped", time(2, 0), time(3, 0))}],
+    )
+    partial = InstanceSchedule(
+        name="partial",
+        timezone=ZoneInfo("America/New_York"),
+        periods=[{"period": RunningPeriod("partial", time(2, 30), time(4, 0))}],
+    )
+
+    skipped_usage = get_schedule_usage(skipped, start=datetime(2024, 3, 10))
+    partial_usage = get_schedule_usage(partial, start=datetime(2024, 3, 10))
+
+    assert skipped_usage["usage"]["2024-03-10"]["running_periods"] == {}
+    assert skipped_usage["usage"]["2024-03-10"]["billing_seconds"] == 0
+    # runs from 03:00 to 04:00
+    assert partial_usage["usage"]["2024-03-10"]["billing_seconds"] == 3600
+
+
+def test_usage_is_streamed_per_day() -> None:
+    schedule = InstanceSchedule(
+        name="test-schedule",
+        timezone=ZoneInfo("UTC"),
+        periods=[{"period": RunningPeriod("test-period", time(7, 0), time(15, 0))}],
+    )
+
+    days = iter_schedule_usage(
+        schedule,
+        datetime(2024, 1, 1, tzinfo=schedule.timezone),
+        datetime(2030, 12, 31, tzinfo=schedule.timezone),
+    )
+
+    assert next(days)[0] == date(2024, 1, 1)
+    assert next(days)[0] == date(2024, 1, 2)
@@ -0,0 +1,135 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+from collections import Counter
+from datetime import date, time
+from zoneinfo import ZoneInfo
+
+from instance_scheduler.configuration.instance_schedule import InstanceSchedule
+from instance_scheduler.configuration.running_period import RunningPeriod
+from instance_scheduler.cron.cron_recurrence_expression import CronRecurrenceExpression
+from instance_scheduler.handler.cli.usage_forecast import (
+    forecast_usage,
+    schedule_running_hours,
+)
+from instance_scheduler.model.registry_counts import TargetResourceCounts
+
+weekdays = CronRecurrenceExpression.parse(weekdays={"mon-fri"})
+weekends = CronRecurrenceExpression.parse(weekdays={"sat-sun"})
+
+office_hours = InstanceSchedule(
+    name="office-hours",
+    timezone=ZoneInfo("America/New_York"),
+    periods=[
+        {
+            "period": RunningPeriod("weekdays", time(9), time(17), weekdays),
+            "instancetype": "m5.large",
+        },
+        {"period": RunningPeriod("weekends", time(10), time(12), weekends)},
+    ],
+)
+
+
+def test_schedule_running_hours_by_instance_type() -> None:
+    # 2024-03-04 is a Monday
+    assert schedule_running_hours(
+        office_hours, date(2024, 3, 4), date(2024, 3, 10)
+    ) == {"m5.large": 40.0, None: 4.0}
+
+
+def test_forecast_multiplies_schedule_hours_by_registered_resources() -> None:
+    resource_counts = [
+        TargetResourceCounts(
+            "111111111111",
+            "us-east-1",
+            "ec2",
+            num_resources=3,
+            schedule_counts=Counter({"office-hours": 2, "deleted": 1}),
+        ),
+        TargetResourceCounts(
+            "222222222222",
+            "eu-west-1",
+            "ec2",
+            num_resources=5,
+            schedule_counts=Counter({"office-hours": 5}),
+        ),
+        TargetResourceCounts(
+            "111111111111",
+            "us-east-1",
+            "rds",
+            num_resources=1,
+            schedule_counts=Counter({"office-hours": 1}),
+        ),
+    ]
+
+    forecast = forecast_usage(
+        {"office-hours": office_hours},
+        resource_counts,
+        date(2024, 3, 4),
+        date(2024, 3, 10),
+    )
+
+    assert forecast == {
+        "start_date": "2024-03-04",
+        "end_date": "2024-03-10",
+        "total_running_hours": 7 * 44.0 + 44.0,
+        "forecast": [
+            {
+                "schedule": "office-hours",
+                "service": "ec2",
+                "instance_type": "current",
+                "resources": 7,
+                "running_hours": 7 * 4.0,
+            },
+            {
+                "schedule": "office-hours",
+                "service": "ec2",
+                "instance_type": "m5.large",
+                "resources": 7,
+                "running_hours": 7 * 40.0,
+            },
+            {
+                # only EC2 instances are resized
+                "schedule": "office-hours",
+                "service": "rds",
+                "instance_type": "current",
+                "resources": 1,
+                "running_hours": 44.0,
+            },
+        ],
+        "unknown_schedules": ["deleted"],
+    }
+
+
+def test_forecast_of_schedule_that_does_not_run() -> None:
+    weekdays_only = InstanceSchedule(
+        name="weekdays-only",
+        timezone=ZoneInfo("UTC"),
+        periods=[{"period": RunningPeriod("weekdays", time(9), time(17), weekdays)}],
+    )
+
+    forecast = forecast_usage(
+        {"weekdays-only": weekdays_only},
+        [
+            TargetResourceCounts(
+                "111111111111",
+                "us-east-1",
+                "ec2",
+                num_resources=1,
+                schedule_counts=Counter({"weekdays-only": 1}),
+            )
+        ],
+        # a weekend
+        date(2024, 7, 13),
+        date(2024, 7, 14),
+    )
+
+    assert forecast["total_running_hours"] == 0
+    assert forecast["forecast"] == [
+        {
+            "schedule": "weekdays-only",
+            "service": "ec2",
+            "instance_type": "current",
+            "resources": 1,
+            "running_hours": 0,
+        }
+    ]
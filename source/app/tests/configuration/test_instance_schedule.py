@@ -0,0 +1,395 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Optional
+from unittest.mock import patch
+from zoneinfo import ZoneInfo
+
+import pytest
+from instance_scheduler.configuration.instance_schedule import InstanceSchedule
+from instance_scheduler.configuration.running_period import RunningPeriod
+from instance_scheduler.configuration.running_period_dict_element import (
+    RunningPeriodDictElement,
+)
+from instance_scheduler.configuration.schedule_intervals import CompiledSchedule
+from instance_scheduler.cron.cron_recurrence_expression import CronRecurrenceExpression
+from instance_scheduler.scheduling.states import ScheduleState
+
+
+def period(
+    name: str,
+    begin: Optional[time] = None,
+    end: Optional[time] = None,
+    instance_type: Optional[str] = None,
+    **recurrence: set[str],
+) -> RunningPeriodDictElement:
+    return {
+        "period": RunningPeriod(
+            name,
+            begintime=begin,
+            endtime=end,
+            cron_recurrence=CronRecurrenceExpression.parse(**recurrence),
+        ),
+        "instancetype": instance_type,
+    }
+
+
+SCHEDULE_PERIODS: dict[str, list[RunningPeriodDictElement]] = {
+    "adjacent": [
+        period("morning", time(4, 0), time(12, 0), "t3.micro"),
+        period("afternoon", time(12, 1), time(17, 0), "t3.large"),
+    ],
+    "overlapping": [
+        period("day", time(6, 0), time(18, 0), "m5.large", weekdays={"mon-fri"}),
+        period("core", time(10, 0), time(16, 0), "m5.xlarge", weekdays={"mon-fri"}),
+        period("weekend", time(10, 0), time(11, 0), weekdays={"sat-sun"}),
+    ],
+    "across-midnight": [
+        period("evening", time(20, 0), time(23, 59), weekdays={"mon-fri"}),
+        period("night", time(0, 0), time(6, 0), "t3.nano", weekdays={"tue-sat"}),
+        period("friday", weekdays={"fri"}),
+    ],
+    "one-sided": [
+        period("start", begin=time(9, 0), weekdays={"mon-fri"}),
+        period("stop", end=time(17, 0)),
+        period("noon", time(12, 0), time(12, 1), "c5.large"),
+        period("after-stop", time(17, 1), time(18, 0), weekdays={"wed"}),
+    ],
+    "month-dependent": [
+        period("second-monday", weekdays={"mon#2"}, months={"jan-mar"}),
+        period("last-sunday", time(8, 0), time(8, 1), weekdays={"sunL"}),
+        period("last-day", time(8, 2), time(9, 0), monthdays={"L"}),
+        period("near-15th", time(7, 0), time(7, 59), monthdays={"15W"}),
+    ],
+    "empty-period": [
+        period("empty", time(10, 0), time(10, 0)),
+        period("before", time(9, 0), time(9, 59)),
+        period("after", time(10, 1), time(11, 0)),
+    ],
+    "single-period": [period("all-but-last-minute", time(0, 0), time(23, 59))],
+}
+
+
+def utc(year: int, month: int, day: int, hour: int, minute: int) -> datetime:
+    return datetime(year, month, day, hour, minute, tzinfo=timezone.utc)
+
+
+RUNNING = ScheduleState.RUNNING
+STOPPED = ScheduleState.STOPPED
+ANY = ScheduleState.ANY
+
+
+@pytest.mark.parametrize(
+    "name,dt,expected",
+    [
+        # the most recently started running period is the most authoritative
+        ("overlapping", utc(2024, 5, 1, 7, 0), (RUNNING, "m5.large", "day")),
+        ("overlapping", utc(2024, 5, 1, 13, 0), (RUNNING, "m5.xlarge", "core")),
+        ("overlapping", utc(2024, 5, 1, 16, 0), (RUNNING, "m5.large", "day")),
+        ("overlapping", utc(2024, 5, 1, 18, 0), (STOPPED, None, None)),
+        ("overlapping", utc(2024, 5, 4, 10, 30), (RUNNING, None, "weekend")),
+        ("overlapping", utc(2024, 5, 4, 13, 0), (STOPPED, None, None)),
+        # a stop at the last minute of a day is deferred to a period that starts at midnight of the next day
+        ("across-midnight", utc(2024, 4, 29, 23, 59), (RUNNING, "t3.nano", "night")),
+        ("across-midnight", utc(2024, 4, 30, 3, 0), (RUNNING, "t3.nano", "night")),
+        ("across-midnight", utc(2024, 4, 29, 3, 0), (STOPPED, None, None)),
+        ("across-midnight", utc(2024, 5, 3, 12, 0), (RUNNING, None, "friday")),
+        ("across-midnight", utc(2024, 5, 3, 23, 59), (RUNNING, None, "friday")),
+        ("across-midnight", utc(2024, 5, 4, 23, 59), (STOPPED, None, None)),
+        # one-sided periods allow any state on the side without a time
+        ("one-sided", utc(2024, 5, 1, 8, 0), (ANY, None, None)),
+        ("one-sided", utc(2024, 5, 1, 12, 0), (RUNNING, "c5.large", "noon")),
+        ("one-sided", utc(2024, 5, 1, 12, 1), (RUNNING, None, "start")),
+        ("one-sided", utc(2024, 5, 1, 17, 0), (RUNNING, None, "start")),
+        ("one-sided", utc(2024, 5, 4, 8, 0), (ANY, None, None)),
+        ("one-sided", utc(2024, 5, 4, 17, 0), (STOPPED, None, None)),
+        ("month-dependent", utc(2024, 1, 8, 12, 0), (RUNNING, None, "second-monday")),
+        ("month-dependent", utc(2024, 4, 8, 12, 0), (STOPPED, None, None)),
+        ("month-dependent", utc(2024, 3, 31, 8, 0), (RUNNING, None, "last-sunday")),
+        ("month-dependent", utc(2024, 3, 31, 8, 1), (RUNNING, None, "last-day")),
+        ("month-dependent", utc(2024, 4, 30, 8, 1), (STOPPED, None, None)),
+        # the 15th of June 2024 is a saturday
+        ("month-dependent", utc(2024, 6, 14, 7, 30), (RUNNING, None, "near-15th")),
+        ("month-dependent", utc(2024, 6, 15, 7, 30), (STOPPED, None, None)),
+        # only a single stopped minute between running periods is merged
+        ("empty-period", utc(2024, 5, 1, 9, 30), (RUNNING, None, "before")),
+        ("empty-period", utc(2024, 5, 1, 9, 59), (STOPPED, None, None)),
+        ("empty-period", utc(2024, 5, 1, 10, 0), (STOPPED, None, None)),
+        ("empty-period", utc(2024, 5, 1, 10, 1), (RUNNING, None, "after")),
+        # adjacent periods are only merged in schedules with more than one period
+        ("single-period", utc(2024, 5, 1, 23, 58), (RUNNING, None, "all-but-last-minute")),
+        ("single-period", utc(2024, 5, 1, 23, 59), (STOPPED, None, None)),
+    ],
+)  # fmt: skip
+def test_desired_state(
+    name: str,
+    dt: datetime,
+    expected: tuple[ScheduleState, Optional[str], Optional[str]],
+) -> None:
+    schedule = InstanceSchedule(
+        name=name, timezone=ZoneInfo("UTC"), periods=SCHEDULE_PERIODS[name]
+    )
+
+    assert schedule.get_desired_state(dt) == expected
+
+
+@pytest.mark.parametrize(
+    "dt,expected",
+    [
+        (utc(2024, 3, 10, 6, 59), (RUNNING, "t3.micro", "early")),
+        # 02:00 EST is 03:00 EDT, so the period that starts in the skipped hour is running
+        (utc(2024, 3, 10, 7, 0), (RUNNING, None, "late")),
+        (utc(2024, 3, 10, 7, 15), (RUNNING, None, "late")),
+        # 01:30 happens twice when clocks go back
+        (utc(2024, 11, 3, 5, 30), (RUNNING, "t3.micro", "early")),
+        (utc(2024, 11, 3, 6, 30), (RUNNING, "t3.micro", "early")),
+        (utc(2024, 11, 3, 7, 0), (RUNNING, None, "late")),
+        (utc(2024, 11, 3, 7, 15), (RUNNING, "t3.large", "skipped")),
+        (utc(2024, 11, 3, 10, 0), (STOPPED, None, None)),
+    ],
+)
+def test_desired_state_across_daylight_saving_time(
+    dt: datetime, expected: tuple[ScheduleState, Optional[str], Optional[str]]
+) -> None:
+    schedule = InstanceSchedule(
+        name="dst",
+        timezone=ZoneInfo("America/New_York"),
+        periods=[
+            period("early", time(0, 0), time(2, 0), "t3.micro"),
+            period("late", time(2, 1), time(5, 0)),
+            period("skipped", time(2, 10), time(2, 20), "t3.large"),
+        ],
+    )
+
+    assert schedule.get_desired_state(dt) == expected
+
+
+def test_period_states_are_evaluated_without_merging_adjacent_periods() -> None:
+    schedule = InstanceSchedule(
+        name="one-sided",
+        timezone=ZoneInfo("UTC"),
+        periods=SCHEDULE_PERIODS["one-sided"],
+    )
+
+    # a saturday, on which the start and after-stop periods are not active
+    assert [
+        (p["period"].name, p["instancetype"], p["state"])
+        for p in schedule.compiled.period_states(utc(2024, 5, 4, 12, 0))
+    ] == [
+        ("start", None, STOPPED),
+        ("stop", None, ANY),
+        ("noon", "c5.large", RUNNING),
+        ("after-stop", None, STOPPED),
+    ]
+
+
+def test_stop_between_adjacent_periods_takes_the_following_period() -> None:
+    schedule = InstanceSchedule(
+        name="adjacent",
+        timezone=ZoneInfo("UTC"),
+        periods=SCHEDULE_PERIODS["adjacent"],
+    )
+    noon = datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc)
+
+    assert schedule.get_desired_state(noon) == (
+        ScheduleState.RUNNING,
+        "t3.large",
+        "afternoon",
+    )
+    assert schedule.get_desired_state(noon, check_adjacent_periods=False) == (
+        ScheduleState.STOPPED,
+        None,
+        None,
+    )
+
+
+@pytest.mark.parametrize(
+    "override_status,expected_state",
+    [("running", ScheduleState.RUNNING), ("stopped", ScheduleState.STOPPED)],
+)
+def test_override_status_takes_precedence_over_periods(
+    override_status: str, expected_state: ScheduleState
+) -> None:
+    schedule = InstanceSchedule(
+        name="override",
+        timezone=ZoneInfo("UTC"),
+        periods=SCHEDULE_PERIODS["adjacent"],
+        override_status=override_status,
+    )
+    dt = datetime(2024, 5, 1, 8, 0, tzinfo=timezone.utc)
+
+    assert schedule.get_desired_state(dt) == (
+        expected_state,
+        None,
+        "override_status",
+    )
+
+
+def test_schedules_with_the_same_content_share_compiled_form() -> None:
+    first = InstanceSchedule(
+        name="shared", timezone=ZoneInfo("UTC"), periods=SCHEDULE_PERIODS["adjacent"]
+    )
+    second = InstanceSchedule(
+        name="shared", timezone=ZoneInfo("UTC"), periods=SCHEDULE_PERIODS["adjacent"]
+    )
+    other_timezone = InstanceSchedule(
+        name="shared",
+        timezone=ZoneInfo("Europe/Paris"),
+        periods=SCHEDULE_PERIODS["adjacent"],
+    )
+
+    assert first.compiled is second.compiled
+    assert first.compiled is not other_timezone.compiled
+
+
+def test_desired_state_is_reused_until_the_state_can_change() -> None:
+    schedule = InstanceSchedule(
+        name="reused", timezone=ZoneInfo("UTC"), periods=SCHEDULE_PERIODS["adjacent"]
+    )
+    morning = datetime(2024, 5, 1, 4, 0, tzinfo=timezone.utc)
+    schedule.get_desired_state(morning)
+
+    with patch.object(
+        CompiledSchedule, "_evaluate_desired_state", autospec=True
+    ) as evaluate:
+        # every scheduling run of the morning period after the first
+        for minutes in range(5, 8 * 60, 5):
+            assert schedule.get_desired_state(morning + timedelta(minutes=minutes)) == (
+                ScheduleState.RUNNING,
+                "t3.micro",
+                "morning",
+            )
+
+    evaluate.assert_not_called()
+    assert schedule.get_desired_state(morning + timedelta(hours=8)) == (
+        ScheduleState.RUNNING,
+        "t3.large",
+        "afternoon",
+    )
+
+
+def scanned_transitions(
+    schedule: InstanceSchedule, after: datetime, until: datetime
+) -> list[tuple[datetime, ScheduleState, Optional[str], Optional[str]]]:
+    """the changes of the desired state found by evaluating every minute from `after` to `until`"""
+    transitions = []
+    current = schedule.get_desired_state(after)
+    dt = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+    while dt <= until:
+        desired = schedule.get_desired_state(dt)
+        if desired != current:
+            transitions.append((dt, *desired))  # dt is in UTC
+            current = desired
+        dt += timedelta(minutes=1)
+    return transitions
+
+
+def found_transitions(
+    schedule: InstanceSchedule, after: datetime, horizon: timedelta
+) -> list[tuple[datetime, ScheduleState, Optional[str], Optional[str]]]:
+    # in UTC, because times in the hour repeated when clocks go back never compare equal to times in other timezones
+    return [
+        (t.time.astimezone(timezone.utc), t.state, t.instance_type, t.period)
+        for t in schedule.next_transitions(after, count=10_000, horizon=horizon)
+    ]
+
+
+@pytest.mark.parametrize("name", SCHEDULE_PERIODS)
+def test_next_transitions_match_evaluation_of_every_minute(name: str) -> None:
+    schedule = InstanceSchedule(
+        name=name, timezone=ZoneInfo("Europe/Paris"), periods=SCHEDULE_PERIODS[name]
+    )
+    # includes a second monday, a last sunday, the end of a month and the change to summer time
+    after = datetime(2024, 3, 8, 11, 59, 30, tzinfo=timezone.utc)
+    horizon = timedelta(days=28)
+
+    assert found_transitions(schedule, after, horizon) == scanned_transitions(
+        schedule, after, after + horizon
+    )
+
+
+@pytest.mark.parametrize(
+    "tz,first_day",
+    [
+        ("America/New_York", date(2024, 3, 9)),
+        ("America/New_York", date(2024, 11, 2)),
+        # daylight saving time is a 30 minute change
+        ("Australia/Lord_Howe", date(2024, 4, 6)),
+        ("Australia/Lord_Howe", date(2024, 10, 5)),
+    ],
+)
+def test_next_transitions_across_daylight_saving_time(tz: str, first_day: date) -> None:
+    schedule = InstanceSchedule(
+        name="dst",
+        timezone=ZoneInfo(tz),
+        periods=[
+            period("early", time(0, 0), time(1, 30), "t3.micro"),
+            period("late", time(1, 31), time(2, 15)),
+            period("skipped", time(2, 10), time(2, 20), "t3.large"),
+            period("after", time(2, 40), time(5, 0)),
+        ],
+    )
+    after = datetime.combine(first_day, time(), tzinfo=timezone.utc)
+    horizon = timedelta(days=3)
+
+    assert found_transitions(schedule, after, horizon) == scanned_transitions(
+        schedule, after, after + horizon
+    )
+
+
+def test_next_transitions_of_nth_weekday_period_over_a_year() -> None:
+    schedule = InstanceSchedule(
+        name="second-monday",
+        timezone=ZoneInfo("America/New_York"),
+        periods=[period("patching", time(22, 0), time(23, 0), weekdays={"mon#2"})],
+    )
+
+    transitions = schedule.next_transitions(
+        datetime(2024, 1, 1, tzinfo=timezone.utc), count=100
+    )
+
+    assert len(transitions) == 24
+    assert [t.time.date() for t in transitions[::2]] == [
+        date(2024, month, day)
+        for month, day in [
+            (1, 8), (2, 12), (3, 11), (4, 8), (5, 13), (6, 10),
+            (7, 8), (8, 12), (9, 9), (10, 14), (11, 11), (12, 9),
+        ]
+    ]  # fmt: skip
+    assert all(t.time.hour == 22 for t in transitions[::2])
+    assert all(t.time.hour == 23 for t in transitions[1::2])
+
+
+def test_next_transitions_are_limited_by_count_and_horizon() -> None:
+    schedule = InstanceSchedule(
+        name="adjacent", timezone=ZoneInfo("UTC"), periods=SCHEDULE_PERIODS["adjacent"]
+    )
+    after = datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc)
+
+    assert [(t.time, t.state, t.period) for t in schedule.next_transitions(after, 3)] == [
+        (datetime(2024, 5, 1, 17, 0, tzinfo=timezone.utc), ScheduleState.STOPPED, None),
+        (datetime(2024, 5, 2, 4, 0, tzinfo=timezone.utc), ScheduleState.RUNNING, "morning"),
+        (datetime(2024, 5, 2, 12, 0, tzinfo=timezone.utc), ScheduleState.RUNNING, "afternoon"),
+    ]  # fmt: skip
+    assert len(schedule.next_transitions(after, 100, horizon=timedelta(days=2))) == 6
+    assert schedule.next_transitions(after, 0) == []
+
+
+def test_override_status_has_no_transitions() -> None:
+    schedule = InstanceSchedule(
+        name="override",
+        timezone=ZoneInfo("UTC"),
+        periods=SCHEDULE_PERIODS["adjacent"],
+        override_status="running",
+    )
+
+    assert schedule.next_transitions(datetime.now(timezone.utc), 10) == []
+
+
+def test_next_transitions_require_timezone_aware_datetime() -> None:
+    schedule = InstanceSchedule(
+        name="adjacent", timezone=ZoneInfo("UTC"), periods=SCHEDULE_PERIODS["adjacent"]
+    )
+
+    with pytest.raises(ValueError):
+        schedule.next_transitions(datetime(2024, 5, 1, 12, 0), 10)
@@ -0,0 +1,66 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+from datetime import date, time
+from zoneinfo import ZoneInfo
+
+from instance_scheduler.configuration.instance_schedule import InstanceSchedule
+from instance_scheduler.configuration.running_period import RunningPeriod
+from instance_scheduler.configuration.schedule_intervals import (
+    MINUTES_PER_DAY,
+    CompiledSchedule,
+    RunningInterval,
+    merge_intervals,
+)
+from instance_scheduler.cron.cron_recurrence_expression import CronRecurrenceExpression
+
+
+def test_merge_intervals_merges_overlapping_and_touching_intervals() -> None:
+    assert merge_intervals([(50, 60), (0, 10), (10, 20), (15, 30), (40, 40)]) == [
+        (0, 30),
+        (50, 60),
+    ]
+
+
+def test_running_interval_is_held_through_periods_that_allow_any_state() -> None:
+    schedule = CompiledSchedule(
+        InstanceSchedule(
+            name="test-schedule",
+            timezone=ZoneInfo("UTC"),
+            periods=[
+                {"period": RunningPeriod("day", time(8, 0), time(12, 0))},
+                {"period": RunningPeriod("stop-only", endtime=time(18, 0))},
+            ],
+        )
+    )
+
+    assert schedule.running_intervals(date(2024, 3, 1)) == [
+        RunningInterval("day", 8 * 60, 18 * 60)
+    ]
+
+
+def test_stop_adjacent_to_a_period_starting_the_next_day_is_deferred() -> None:
+    schedule = CompiledSchedule(
+        InstanceSchedule(
+            name="test-schedule",
+            timezone=ZoneInfo("UTC"),
+            periods=[
+                {"period": RunningPeriod("late", time(20, 0), time(23, 59))},
+                {
+                    "period": RunningPeriod(
+                        "friday",
+                        cron_recurrence=CronRecurrenceExpression.parse(
+                            weekdays={"fri"}
+                        ),
+                    )
+                },
+            ],
+        )
+    )
+
+    # 2024-03-07 is a Thursday
+    assert schedule.running_intervals(date(2024, 3, 7)) == [
+        RunningInterval("late", 20 * 60, MINUTES_PER_DAY)
+    ]
+    assert schedule.running_intervals(date(2024, 3, 9)) == [
+        RunningInterval("late", 20 * 60, 23 * 60 + 59)
+    ]
@@ -11,6 +11,7 @@ from instance_scheduler.configuration.scheduling_context import (
 )
 from instance_scheduler.model import EC2SSMMaintenanceWindowStore, MWStore
 from instance_scheduler.model.ddb_config_item import DdbConfigItem
+from instance_scheduler.model.store.config_table_loader import CONFIG_TABLE_CACHE
 from instance_scheduler.model.store.ddb_config_item_store import DdbConfigItemStore
 from instance_scheduler.model.store.dynamo_mw_store import DynamoMWStore
 from instance_scheduler.model.store.dynamo_period_definition_store import (
@@ -22,6 +23,9 @@ from instance_scheduler.model.store.dynamo_resource_registry import (
 from instance_scheduler.model.store.dynamo_schedule_definition_store import (
     DynamoScheduleDefinitionStore,
 )
+from instance_scheduler.model.store.payload_signing_key import (
+    PAYLOAD_SIGNING_KEY_CACHE,
+)
 from instance_scheduler.model.store.period_definition_store import PeriodDefinitionStore
 from instance_scheduler.model.store.resource_registry import ResourceRegistry
 from instance_scheduler.model.store.schedule_definition_store import (
@@ -82,6 +86,16 @@ def metrics_environment() -> Iterator[MetricsEnvironment]:
         yield metrics_env
 
 
+@fixture(autouse=True)
+def config_table_cache() -> Iterator[None]:
+    # every test has its own config table, so config (and keys) cached by an earlier test must not be reused
+    CONFIG_TABLE_CACHE.clear()
+    PAYLOAD_SIGNING_KEY_CACHE.clear()
+    yield
+    CONFIG_TABLE_CACHE.clear()
+    PAYLOAD_SIGNING_KEY_CACHE.clear()
+
+
 @fixture
 def moto_backend() -> Iterator[None]:
     with mock_aws():
@@ -0,0 +1,50 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+"""
+Measure the period field parser, with and without memoization
+
+usage: python -m tests.cron.benchmark_parser
+"""
+
+from collections.abc import Callable
+from timeit import repeat
+
+from instance_scheduler.cron import parser
+
+FIELDS: list[tuple[set[str], set[str], set[str]]] = [
+    ({"1-15"}, {"jan-jun"}, {"mon-fri"}),
+    ({"L"}, {"*"}, {"sat#2"}),
+    ({"15W"}, {"nov-feb/2"}, {"sunL"}),
+    ({"1,15,L"}, {"3", "6", "9", "12"}, {"mon,wed,fri"}),
+]
+NUMBER: int = 2000
+
+
+def _parse_all(
+    parse_multi_general: Callable[..., object],
+) -> Callable[[], None]:
+    def parse() -> None:
+        for monthdays, months, weekdays in FIELDS:
+            parse_multi_general(monthdays, {})
+            parse_multi_general(months, parser._month_name_to_value)
+            parse_multi_general(weekdays, parser._weekday_name_to_value)
+
+    return parse
+
+
+def _memoized() -> None:
+    for monthdays, months, weekdays in FIELDS:
+        parser.parse_period_def(
+            days_of_month=monthdays, months_of_year=months, days_of_week=weekdays
+        )
+
+
+def _report(name: str, func: Callable[[], None]) -> None:
+    best = min(repeat(func, number=NUMBER, repeat=5))
+    per_call_us = best / (NUMBER * len(FIELDS) * 3) * 1e6
+    print(f"{name:<12} {per_call_us:8.2f} us per field")
+
+
+if __name__ == "__main__":
+    _report("tokenizing", _parse_all(parser._parse_multi_general))
+    _report("memoized", _memoized)
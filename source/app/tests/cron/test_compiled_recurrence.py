@@ -0,0 +1,83 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+from datetime import date, datetime, timedelta, timezone
+from itertools import product
+
+import pytest
+from instance_scheduler.cron.cron_recurrence_expression import CronRecurrenceExpression
+from instance_scheduler.cron.cron_to_running_period import (
+    monthday_cron_expr_contains,
+    months_cron_expr_contains,
+    weekday_cron_expr_contains,
+)
+
+MONTHDAYS = [
+    {"*"},
+    {"1-7"},
+    {"L"},
+    {"15W"},
+    {"1W"},
+    {"30-L"},
+    {"31"},
+    {"28-L", "1"},
+]
+MONTHS = [{"*"}, {"jan-mar"}, {"2-11/3"}, {"nov-feb"}, {"12"}]
+WEEKDAYS = [
+    {"*"},
+    {"mon-fri"},
+    {"sat-mon"},
+    {"mon#2"},
+    {"fri#5"},
+    {"sunL"},
+    {"L", "wed#1"},
+    {"Mon/2"},
+]
+
+
+def all_days(start: date, end: date) -> list[datetime]:
+    return [
+        datetime.combine(start + timedelta(days=offset), datetime.min.time()).replace(
+            tzinfo=timezone.utc
+        )
+        for offset in range((end - start).days)
+    ]
+
+
+# a leap year and a non-leap year
+DAYS = all_days(date(2024, 1, 1), date(2026, 1, 1))
+
+
+@pytest.mark.parametrize(
+    "monthdays,months,weekdays", list(product(MONTHDAYS, MONTHS, WEEKDAYS))
+)
+def test_compiled_recurrence_matches_expression_tree_evaluation(
+    monthdays: set[str], months: set[str], weekdays: set[str]
+) -> None:
+    expr = CronRecurrenceExpression.parse(
+        monthdays=monthdays, months=months, weekdays=weekdays
+    )
+
+    for dt in DAYS:
+        expected = (
+            monthday_cron_expr_contains(expr.monthdays, dt)
+            and months_cron_expr_contains(expr.months, dt)
+            and weekday_cron_expr_contains(expr.weekdays, dt)
+        )
+        assert expr.contains(dt) == expected, f"mismatch on {dt.date()}"
+
+
+def test_month_mask_lists_matching_days() -> None:
+    expr = CronRecurrenceExpression.parse(monthdays={"1-10"}, weekdays={"mon-fri"})
+
+    # February 2024 starts on a Thursday
+    mask = expr.compiled.month_mask(2024, 2)
+
+    assert [day for day in range(1, 30) if mask >> day & 1] == [1, 2, 5, 6, 7, 8, 9]
+
+
+def test_equal_expressions_share_compiled_form() -> None:
+    first = CronRecurrenceExpression.parse(weekdays={"mon#2"})
+    second = CronRecurrenceExpression.parse(weekdays={"mon#2"})
+
+    assert first is not second
+    assert first.compiled is second.compiled
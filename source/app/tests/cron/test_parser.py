@@ -0,0 +1,137 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+from collections.abc import Mapping
+
+import pytest
+from instance_scheduler.cron import parser
+from instance_scheduler.cron.expression import (
+    CronAll,
+    CronExpression,
+    CronLastWeekday,
+    CronNearestWeekday,
+    CronNthWeekday,
+    CronRange,
+    CronSingleValueLast,
+    CronSingleValueNumeric,
+    CronUnion,
+)
+from instance_scheduler.cron.parser import (
+    _month_name_to_value,
+    _parse_multi_general,
+    _weekday_name_to_value,
+    parse_weekdays_expr,
+)
+
+N = CronSingleValueNumeric
+L = CronSingleValueLast()
+
+EXPECTED_TREES: list[tuple[str, Mapping[str, int], CronExpression]] = [
+    ("?", _weekday_name_to_value, CronAll()),
+    (" 12 ", {}, N(12)),
+    ("l", {}, L),
+    ("1 - 7", {}, CronRange(start=N(1), end=N(7))),
+    ("30-L", {}, CronRange(start=N(30), end=L)),
+    ("3/2", {}, CronRange(start=N(3), interval=2)),
+    ("1-20/3", {}, CronRange(start=N(1), end=N(20), interval=3)),
+    ("1w", {}, CronNearestWeekday(N(1))),
+    ("L, 1W", {}, CronUnion((L, CronNearestWeekday(N(1))))),
+    ("January", _month_name_to_value, N(1)),
+    ("nov-feb", _month_name_to_value, CronRange(start=N(11), end=N(2))),
+    ("Mon/2", _weekday_name_to_value, CronRange(start=N(0), interval=2)),
+    ("mon-fri/2", _weekday_name_to_value, CronRange(N(0), N(4), interval=2)),
+    ("mon-l", _weekday_name_to_value, CronRange(start=N(0), end=L)),
+    ("FRI#5", _weekday_name_to_value, CronNthWeekday(day=N(4), n=5)),
+    ("sunL", _weekday_name_to_value, CronLastWeekday(N(6))),
+    ("5L", _weekday_name_to_value, CronLastWeekday(N(5))),
+    (
+        "mon,wed-fri",
+        _weekday_name_to_value,
+        CronUnion((N(0), CronRange(start=N(2), end=N(4)))),
+    ),
+    (
+        "1-5,sat#3,sunL",
+        _weekday_name_to_value,
+        CronUnion(
+            (
+                CronRange(start=N(1), end=N(5)),
+                CronNthWeekday(day=N(5), n=3),
+                CronLastWeekday(N(6)),
+            )
+        ),
+    ),
+]
+
+INVALID_EXPRESSIONS = [
+    "",
+    ",",
+    "1,",
+    "L-5",
+    "L/2",
+    "L#2",
+    "*/2",
+    "1-",
+    "-1",
+    "1--2",
+    "1-5W",
+    "1 W",
+    "mon l",
+    "mon#",
+    "mon#x",
+    "jan-feb-mar",
+    "1/",
+    "notaname",
+    "1%",
+    "mon-fri/2-3",
+]
+
+
+@pytest.mark.parametrize("expr,names,expected", EXPECTED_TREES)
+def test_expressions_parse_to_expected_tree(
+    expr: str, names: Mapping[str, int], expected: CronExpression
+) -> None:
+    assert _parse_multi_general({expr}, names) == expected
+
+
+@pytest.mark.parametrize("expr", INVALID_EXPRESSIONS)
+def test_invalid_expressions_are_rejected(expr: str) -> None:
+    with pytest.raises(ValueError):
+        _parse_multi_general({expr}, _weekday_name_to_value)
+
+
+def test_multi_digit_step_interval() -> None:
+    # the interval is read as a whole integer, not only its last digit
+    assert _parse_multi_general({"1-31/10"}, {}) == CronRange(
+        start=CronSingleValueNumeric(1), end=CronSingleValueNumeric(31), interval=10
+    )
+
+
+@pytest.mark.parametrize(
+    "expr,position,reason",
+    [
+        ("mon-fri/x", 8, "expected step interval after /"),
+        ("mon#", 4, "expected occurrence after #"),
+        ("tue,wed,thu-", 12, "expected a value"),
+        ("mon, blursday", 5, "unrecognized name 'blursday'"),
+        ("L-fri", 0, "range cannot start with L"),
+        ("mon-fri sat", 8, "unexpected 'sat'"),
+    ],
+)
+def test_error_reports_where_parsing_failed(
+    expr: str, position: int, reason: str
+) -> None:
+    with pytest.raises(ValueError) as error:
+        _parse_multi_general({expr}, _weekday_name_to_value)
+
+    assert str(error.value) == (
+        f"Could not parse cron expression {expr!r} at position {position}: {reason}"
+    )
+
+
+def test_parsed_fields_are_memoized() -> None:
+    parser._parse_field.cache_clear()
+
+    first = parse_weekdays_expr({"mon-fri", "sat#1"})
+    second = parse_weekdays_expr({"sat#1", "mon-fri"})
+
+    assert first is second
+    assert parser._parse_field.cache_info().hits == 1
@@ -0,0 +1,115 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+from unittest.mock import patch
+
+from instance_scheduler.handler.prefetch_validation import (
+    PrefetchValidationCache,
+    content_hash,
+)
+from instance_scheduler.model.period_definition import PeriodDefinition
+from instance_scheduler.model.period_identifier import PeriodIdentifier
+from instance_scheduler.model.schedule_definition import ScheduleDefinition
+from instance_scheduler.model.store.in_memory_period_definition_store import (
+    InMemoryPeriodDefinitionStore,
+)
+
+OFFICE_HOURS = PeriodDefinition(name="office-hours", begintime="09:00", endtime="17:00")
+SCHEDULE = ScheduleDefinition(
+    name="my-schedule", periods=[PeriodIdentifier.of("office-hours", "t3.large")]
+)
+
+
+def period_store(*periods: PeriodDefinition) -> InMemoryPeriodDefinitionStore:
+    return InMemoryPeriodDefinitionStore({period.name: period for period in periods})
+
+
+def test_content_hash_changes_with_the_schedule_and_its_periods() -> None:
+    periods = period_store(OFFICE_HOURS)
+    baseline = content_hash(SCHEDULE, periods)
+
+    assert content_hash(SCHEDULE, period_store(OFFICE_HOURS)) == baseline
+    assert content_hash(SCHEDULE, period_store()) != baseline
+    assert (
+        content_hash(
+            SCHEDULE,
+            period_store(
+                PeriodDefinition(
+                    name="office-hours", begintime="08:00", endtime="17:00"
+                )
+            ),
+        )
+        != baseline
+    )
+    assert (
+        content_hash(
+            ScheduleDefinition(
+                name="my-schedule",
+                periods=[PeriodIdentifier("office-hours")],
+            ),
+            periods,
+        )
+        != baseline
+    )
+    # periods that the schedule does not reference are not part of its content
+    unused = PeriodDefinition(name="unused", weekdays={"sat"})
+    assert content_hash(SCHEDULE, period_store(OFFICE_HOURS, unused)) == baseline
+
+
+def test_schedules_are_only_validated_again_when_their_content_changes() -> None:
+    cache = PrefetchValidationCache()
+    periods = period_store(OFFICE_HOURS)
+
+    with patch.object(
+        ScheduleDefinition,
+        "to_instance_schedule",
+        autospec=True,
+        side_effect=ScheduleDefinition.to_instance_schedule,
+    ) as to_instance_schedule:
+        for _ in range(3):
+            assert cache.validate_schedule(SCHEDULE, periods) is None
+            cache.end_run()
+        assert to_instance_schedule.call_count == 1
+
+        error = cache.validate_schedule(SCHEDULE, period_store())
+        assert error is not None
+        assert "Unable to find period definition for office-hours" in error
+        assert cache.validate_schedule(SCHEDULE, period_store()) == error
+        assert to_instance_schedule.call_count == 2
+
+
+def test_results_not_used_by_a_run_are_dropped() -> None:
+    cache = PrefetchValidationCache()
+    periods = period_store(OFFICE_HOURS)
+
+    with patch.object(
+        ScheduleDefinition,
+        "to_instance_schedule",
+        autospec=True,
+        side_effect=ScheduleDefinition.to_instance_schedule,
+    ) as to_instance_schedule:
+        cache.validate_schedule(SCHEDULE, periods)
+        cache.end_run()
+        cache.end_run()  # a run without the schedule
+        cache.validate_schedule(SCHEDULE, periods)
+
+        assert to_instance_schedule.call_count == 2
+
+
+def test_repeated_errors_are_rate_limited() -> None:
+    now = 0.0
+    cache = PrefetchValidationCache(error_log_interval=60, clock=lambda: now)
+
+    assert cache.errors_to_log(["error-a", "error-b"]) == (["error-a", "error-b"], 0)
+    cache.end_run()
+
+    now = 30
+    assert cache.errors_to_log(["error-a", "error-b", "error-c"]) == (["error-c"], 2)
+    cache.end_run()
+
+    now = 60
+    assert cache.errors_to_log(["error-a", "error-c"]) == (["error-a"], 1)
+    cache.end_run()
+
+    # error-b was resolved in the previous run, so it is reported as soon as it reappears
+    now = 61
+    assert cache.errors_to_log(["error-b", "error-c"]) == (["error-b"], 1)
@@ -12,7 +12,9 @@ from instance_scheduler.handler.config_resource import (
 from instance_scheduler.handler.setup_demo_data import DEMO_PERIODS, DEMO_SCHEDULES
 from instance_scheduler.model.ddb_config_item import DdbConfigItem
 from instance_scheduler.model.schedule_definition import ScheduleDefinition
+from instance_scheduler.model.store.config_version import get_config_version
 from instance_scheduler.model.store.ddb_config_item_store import DdbConfigItemStore
+from instance_scheduler.model.store.payload_signing_key import get_payload_signing_key
 from instance_scheduler.model.store.period_definition_store import PeriodDefinitionStore
 from instance_scheduler.model.store.schedule_definition_store import (
     ScheduleDefinitionStore,
@@ -259,3 +261,43 @@ def test_creates_example_schedules_on_create(
 
     assert saved_schedules == UnorderedList(demo_schedules_with_unordered_periods)
     assert saved_periods == UnorderedList(DEMO_PERIODS)
+
+
+def test_update_request_bumps_the_config_version(
+    config_item_store: DdbConfigItemStore, config_table: str
+) -> None:
+    SchedulerSetupHandler(
+        new_update_request(
+            {"timeout": 120, "log_retention_days": 7, "remote_account_ids": []},
+            {"timeout": 120, "log_retention_days": 30, "remote_account_ids": []},
+        ),
+        MockLambdaContext(),
+        MockMainLambdaEnv(),
+    ).handle_request()
+
+    assert get_config_version(config_table) == 1
+
+
+def test_create_and_update_requests_rotate_the_payload_signing_key(
+    config_item_store: DdbConfigItemStore, config_table: str
+) -> None:
+    properties: ServiceSetupResourceProperties = {
+        "timeout": 120,
+        "log_retention_days": 7,
+        "remote_account_ids": [],
+    }
+    assert get_payload_signing_key(config_table) is None
+
+    SchedulerSetupHandler(
+        new_create_request(properties), MockLambdaContext(), MockMainLambdaEnv()
+    ).handle_request()
+    created_key = get_payload_signing_key(config_table)
+    assert created_key is not None and len(created_key) == 32
+
+    SchedulerSetupHandler(
+        new_update_request(properties, properties),
+        MockLambdaContext(),
+        MockMainLambdaEnv(),
+    ).handle_request()
+    updated_key = get_payload_signing_key(config_table)
+    assert updated_key is not None and updated_key != created_key
@@ -1,21 +1,31 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
 import json
-from typing import TYPE_CHECKING, Any, Iterator
+from typing import TYPE_CHECKING, Any, Iterator, cast
 from unittest.mock import MagicMock, patch
 
 import boto3
 from _pytest.fixtures import fixture
+from instance_scheduler.handler.prefetch_validation import PrefetchValidationCache
 from instance_scheduler.handler.scheduling_orchestrator import (
     OrchestrationRequest,
     SchedulingOrchestratorHandler,
+    encode_scheduling_payload,
     prefetch_schedules_and_periods,
 )
+from instance_scheduler.handler.scheduling_payload import (
+    decode_scheduling_request,
+    is_validated_config,
+)
 from instance_scheduler.handler.scheduling_request import SchedulingRequest
 from instance_scheduler.model.managed_instance import RegisteredEc2Instance
 from instance_scheduler.model.period_definition import PeriodDefinition
 from instance_scheduler.model.period_identifier import PeriodIdentifier
 from instance_scheduler.model.schedule_definition import ScheduleDefinition
+from instance_scheduler.model.store.config_table_loader import load_config_table
+from instance_scheduler.model.store.payload_signing_key import (
+    rotate_payload_signing_key,
+)
 from instance_scheduler.model.store.period_definition_store import PeriodDefinitionStore
 from instance_scheduler.model.store.resource_registry import ResourceRegistry
 from instance_scheduler.model.store.schedule_definition_store import (
@@ -46,8 +56,8 @@ def mocked_lambda_invoke() -> Iterator[MagicMock]:
 
 def scheduling_request_from_lambda_invoke(call_args: Any) -> SchedulingRequest:
     payload = call_args.kwargs["Payload"]
-    scheduling_request: SchedulingRequest = json.loads(payload)
-    return scheduling_request
+    scheduling_request = decode_scheduling_request(json.loads(payload))
+    return cast(SchedulingRequest, scheduling_request)
 
 
 def test_prefetch_gracefully_handles_invalid_configurations(
@@ -160,6 +170,52 @@ def test_single_scheduling_target(
     assert any(p["name"] == "test-period" for p in periods)
 
 
+def test_config_is_signed_with_the_payload_signing_key(
+    mocked_lambda_invoke: MagicMock,
+    resource_registry: ResourceRegistry,
+    schedule_store: ScheduleDefinitionStore,
+    period_store: PeriodDefinitionStore,
+    config_table: str,
+    registry_table: str,
+) -> None:
+    period_store.put(
+        PeriodDefinition(name="test-period", begintime="09:00", endtime="17:00")
+    )
+    schedule_store.put(
+        ScheduleDefinition(
+            name="test-schedule", periods=[PeriodIdentifier("test-period")]
+        )
+    )
+    resource_registry.put(
+        RegisteredEc2Instance(
+            account="111111111111",
+            region="us-east-1",
+            resource_id="i-1",
+            arn=ARN("arn:aws:ec2:us-east-1:111111111111:instance/i-1"),
+            schedule="test-schedule",
+            name="test-instance",
+            stored_state=InstanceState.RUNNING,
+        )
+    )
+    env = MockOrchestratorEnvironment(registry_table=registry_table)
+
+    def dispatched_payload() -> Any:
+        mocked_lambda_invoke.reset_mock()
+        SchedulingOrchestratorHandler(
+            event=mockEvent, context=MockLambdaContext(), env=env, logger=MockLogger()
+        ).handle_request()
+        return json.loads(mocked_lambda_invoke.call_args.kwargs["Payload"])
+
+    # without a key (the setup custom resource has not run yet) the config is sent unsigned
+    payload = dispatched_payload()
+    assert payload["encoded_config"].startswith("z1:")
+
+    key = rotate_payload_signing_key(config_table)
+    payload = dispatched_payload()
+    assert payload["encoded_config"].startswith("z1s:")
+    assert is_validated_config(payload, key)
+
+
 def test_multiple_scheduling_targets(
     mocked_lambda_invoke: MagicMock,
     resource_registry: ResourceRegistry,
@@ -232,3 +288,93 @@ def test_multiple_scheduling_targets(
         elif request["account"] == "222222222222":
             assert any(s["name"] == "schedule2" for s in schedules)
             assert any(p["name"] == "period2" for p in periods)
+
+
+def test_encode_scheduling_payload_compresses_serialized_config() -> None:
+    request = SchedulingRequest(
+        action="scheduler:run",
+        account="111111111111",
+        region="us-east-1",
+        service="ec2",
+        current_dt="2024-05-01T12:00:00+00:00",
+        dispatch_time="2024-05-01T12:00:00+00:00",
+    )
+    schedules = [{"name": "test-schedule", "periods": ["test-period"]}]
+    periods = [{"name": "test-period", "begintime": "09:00"}]
+
+    payload = json.loads(
+        encode_scheduling_payload(
+            request, json.dumps(schedules), json.dumps(periods), signing_key=b"k" * 32
+        )
+    )
+    assert payload["encoded_config"].startswith("z1s:")
+    assert decode_scheduling_request(payload) == {
+        **request,
+        "schedules": schedules,
+        "periods": periods,
+    }
+
+    payload = json.loads(encode_scheduling_payload(request, json.dumps(schedules)))
+    assert decode_scheduling_request(payload) == {**request, "schedules": schedules}
+
+    assert json.loads(encode_scheduling_payload(request)) == request
+
+
+def test_prefetch_does_not_repeat_recently_logged_configuration_errors(
+    config_table: str,
+    period_store: PeriodDefinitionStore,
+    schedule_store: ScheduleDefinitionStore,
+) -> None:
+    schedule_store.put(
+        ScheduleDefinition(
+            name="schedule-with-missing-periods", periods=[PeriodIdentifier("unknown")]
+        )
+    )
+    validation_cache = PrefetchValidationCache()
+    logger = MagicMock()
+
+    for _ in range(3):
+        schedules, _ = prefetch_schedules_and_periods(
+            MockOrchestratorEnvironment(), logger, validation_cache
+        )
+        assert not schedules.find_all()
+
+    logger.error.assert_called_once()
+    assert "schedule-with-missing-periods" in logger.error.call_args.args[0]
+    assert any(
+        "1 incorrectly configured schedules/periods were reported recently"
+        in call.args[0]
+        for call in logger.info.call_args_list
+    )
+
+
+def test_prefetch_reuses_config_until_the_config_version_changes(
+    config_table: str,
+    period_store: PeriodDefinitionStore,
+    schedule_store: ScheduleDefinitionStore,
+) -> None:
+    period_store.put(
+        PeriodDefinition(name="test-period", begintime="09:00", endtime="17:00")
+    )
+    schedule_store.put(
+        ScheduleDefinition(name="schedule1", periods=[PeriodIdentifier("test-period")])
+    )
+
+    with patch(
+        "instance_scheduler.model.store.config_table_loader.load_config_table",
+        wraps=load_config_table,
+    ) as load:
+        for _ in range(3):
+            prefetch_schedules_and_periods(MockOrchestratorEnvironment(), MockLogger())
+        assert load.call_count == 1
+
+        schedule_store.put(
+            ScheduleDefinition(
+                name="schedule2", periods=[PeriodIdentifier("test-period")]
+            )
+        )
+        schedules, _ = prefetch_schedules_and_periods(
+            MockOrchestratorEnvironment(), MockLogger()
+        )
+        assert load.call_count == 2
+        assert sorted(schedules.find_all()) == ["schedule1", "schedule2"]
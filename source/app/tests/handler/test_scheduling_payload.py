@@ -0,0 +1,197 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+import base64
+import json
+import zlib
+from unittest.mock import patch
+
+from instance_scheduler.handler.scheduling_payload import (
+    MAX_CONFIG_DOCUMENT_BYTES,
+    decode_config,
+    decode_scheduling_request,
+    encode_config,
+    is_validated_config,
+)
+from instance_scheduler.handler.scheduling_request import (
+    SchedulingRequest,
+    validate_scheduler_request,
+)
+from instance_scheduler.model.period_definition import PeriodDefinition
+from instance_scheduler.model.period_identifier import PeriodIdentifier
+from instance_scheduler.model.schedule_definition import ScheduleDefinition
+from instance_scheduler.model.store.in_memory_period_definition_store import (
+    InMemoryPeriodDefinitionStore,
+)
+from instance_scheduler.model.store.in_memory_schedule_definition_store import (
+    InMemoryScheduleDefinitionStore,
+)
+from instance_scheduler.util.validation import ValidationException
+from pytest import raises
+
+REQUEST = SchedulingRequest(
+    action="scheduler:run",
+    account="123456789012",
+    region="us-east-1",
+    service="ec2",
+    current_dt="2024-05-01T12:00:00+00:00",
+    dispatch_time="2024-05-01T12:00:00+00:00",
+)
+
+KEY = bytes(range(32))
+
+
+def test_config_round_trips_and_is_smaller_than_plain_json() -> None:
+    schedules = [
+        ScheduleDefinition(
+            name=f"schedule-{i}",
+            periods=[PeriodIdentifier.of("office-hours", "t3.large")],
+            timezone="Europe/Paris",
+        ).to_schedule_params()
+        for i in range(200)
+    ]
+    periods = [
+        PeriodDefinition(
+            name="office-hours", begintime="09:00", endtime="17:00"
+        ).to_period_params()
+    ]
+
+    encoded = encode_config(json.dumps(schedules), json.dumps(periods))
+
+    assert decode_config(encoded) == {"schedules": schedules, "periods": periods}
+    assert len(encoded) < len(json.dumps(schedules)) / 5
+    assert decode_config(encode_config(periods_json="[]")) == {"periods": []}
+
+
+def test_decode_rejects_unknown_versions_and_corrupt_data() -> None:
+    data = encode_config(schedules_json="[]").partition(":")[2]
+
+    with raises(ValidationException, match="unsupported config encoding 'z0'"):
+        decode_config(f"z0:{data}")
+    with raises(ValidationException, match="unable to decode config"):
+        decode_config(f"z1:{data[:-8]}")
+    with raises(ValidationException, match="unable to decode config"):
+        decode_config("z1:not base64!")
+
+    unexpected = base64.b64encode(zlib.compress(b'{"instances":[]}')).decode()
+    with raises(ValidationException, match="invalid config"):
+        decode_config(f"z1:{unexpected}")
+
+
+def test_decode_rejects_configs_that_expand_beyond_the_size_limit() -> None:
+    document = b'{"periods":[' + b" " * MAX_CONFIG_DOCUMENT_BYTES + b"]}"
+    data = base64.b64encode(zlib.compress(document, level=9)).decode()
+    assert len(data) < 64 * 1024
+
+    with raises(ValidationException, match="larger than"):
+        decode_config(f"z1:{data}")
+
+
+def test_decode_scheduling_request_expands_encoded_config() -> None:
+    schedules = [{"name": "my-schedule", "periods": ["my-period"]}]
+    request = {
+        **REQUEST,
+        "encoded_config": encode_config(schedules_json=json.dumps(schedules)),
+    }
+
+    assert decode_scheduling_request(request) == {**REQUEST, "schedules": schedules}
+    assert decode_scheduling_request(REQUEST) is REQUEST
+
+
+def test_validate_scheduler_request_validates_the_encoded_config() -> None:
+    periods = [{"name": "my-period", "begintime": "09:00"}]
+    assert validate_scheduler_request(
+        {**REQUEST, "encoded_config": encode_config(periods_json=json.dumps(periods))}
+    )
+
+    with raises(ValidationException):
+        validate_scheduler_request(
+            {**REQUEST, "encoded_config": encode_config(periods_json='{"a":1}')}
+        )
+    with raises(ValidationException, match="encoded_config must be a string"):
+        validate_scheduler_request({**REQUEST, "encoded_config": 1})
+
+
+def test_validated_config_is_marked_by_its_signature() -> None:
+    periods = [{"name": "my-period", "begintime": "09:00"}]
+    encoded = encode_config(periods_json=json.dumps(periods), signing_key=KEY)
+    request = {**REQUEST, "encoded_config": encoded}
+
+    assert encoded.startswith("z1s:")
+    assert decode_config(encoded) == {"periods": periods}
+    assert is_validated_config(request, KEY)
+    assert not is_validated_config(request, b"k" * 32)
+    assert not is_validated_config(request, None)
+    assert not is_validated_config(
+        {**REQUEST, "encoded_config": encode_config(periods_json=json.dumps(periods))},
+        KEY,
+    )
+    assert not is_validated_config(REQUEST, KEY)
+
+    # the signature covers the data, so it cannot be moved to another config
+    version, signature, _ = encoded.split(":")
+    other_data = encode_config(periods_json="[]").partition(":")[2]
+    assert not is_validated_config(
+        {**REQUEST, "encoded_config": f"{version}:{signature}:{other_data}"}, KEY
+    )
+
+
+def test_validated_config_skips_validation_of_definitions() -> None:
+    period = PeriodDefinition(
+        name="my-period", begintime="09:00", endtime="17:00", weekdays={"mon-fri"}
+    )
+    schedule = ScheduleDefinition(
+        name="my-schedule",
+        periods=[PeriodIdentifier.of("my-period", "t3.large")],
+        timezone="Europe/Paris",
+        override_status="running",
+    )
+    validated = {
+        **REQUEST,
+        "encoded_config": encode_config(
+            json.dumps([schedule.to_schedule_params()]),
+            json.dumps([period.to_period_params()]),
+            signing_key=KEY,
+        ),
+    }
+
+    with patch.object(
+        InMemoryScheduleDefinitionStore, "validate_serial_data"
+    ) as validate_schedules, patch.object(
+        InMemoryPeriodDefinitionStore, "validate_serial_data"
+    ) as validate_periods:
+        assert validate_scheduler_request(validated, KEY)
+        validate_schedules.assert_not_called()
+        validate_periods.assert_not_called()
+
+        # a signature that does not match the key is validated in full
+        assert validate_scheduler_request(validated, b"k" * 32)
+        validate_schedules.assert_called_once()
+        validate_periods.assert_called_once()
+
+    with patch.object(
+        ScheduleDefinition, "validate"
+    ) as validate_schedule, patch.object(
+        PeriodDefinition, "validate"
+    ) as validate_period:
+        assert (
+            ScheduleDefinition.from_schedule_params(
+                schedule.to_schedule_params(), validate=False
+            )
+            == schedule
+        )
+        assert (
+            PeriodDefinition.from_period_params(
+                period.to_period_params(), validate=False
+            )
+            == period
+        )
+        validate_schedule.assert_not_called()
+        validate_period.assert_not_called()
+
+    # the definitions are still normalized when they are not validated
+    params = schedule.to_schedule_params()
+    params["override_status"] = "RUNNING"
+    assert (
+        ScheduleDefinition.from_schedule_params(params, validate=False).override_status
+        == "running"
+    )
@@ -0,0 +1,90 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+import json
+from unittest.mock import patch
+
+from instance_scheduler.handler.target_config_builder import TargetConfigBuilder
+from instance_scheduler.model.period_definition import PeriodDefinition
+from instance_scheduler.model.period_identifier import PeriodIdentifier
+from instance_scheduler.model.schedule_definition import ScheduleDefinition
+from instance_scheduler.model.store.in_memory_period_definition_store import (
+    InMemoryPeriodDefinitionStore,
+)
+from instance_scheduler.model.store.in_memory_schedule_definition_store import (
+    InMemoryScheduleDefinitionStore,
+)
+
+PERIODS = [
+    PeriodDefinition(name="morning", begintime="06:00", endtime="12:00"),
+    PeriodDefinition(name="office-hours", begintime="09:00", endtime="17:00"),
+    PeriodDefinition(name="weekends", weekdays={"sat-sun"}),
+]
+SCHEDULES = [
+    ScheduleDefinition(
+        name="schedule-b",
+        periods=[PeriodIdentifier("office-hours"), PeriodIdentifier("morning")],
+    ),
+    ScheduleDefinition(
+        name="schedule-a",
+        periods=[
+            PeriodIdentifier.of("office-hours", "t3.large"),
+            PeriodIdentifier("weekends"),
+        ],
+    ),
+]
+
+
+def builder() -> TargetConfigBuilder:
+    return TargetConfigBuilder(
+        InMemoryScheduleDefinitionStore({s.name: s for s in SCHEDULES}),
+        InMemoryPeriodDefinitionStore({p.name: p for p in PERIODS}),
+    )
+
+
+def test_build_matches_the_serialized_stores_of_the_target() -> None:
+    config = builder().build(["schedule-b", "schedule-a", "schedule-b"])
+
+    assert config.schedule_names == ("schedule-a", "schedule-b")
+    assert json.loads(config.schedules_json) == [
+        SCHEDULES[1].to_schedule_params(),
+        SCHEDULES[0].to_schedule_params(),
+    ]
+    # each period of the closure once, in order of first use
+    assert json.loads(config.periods_json) == [
+        PERIODS[1].to_period_params(),
+        PERIODS[2].to_period_params(),
+        PERIODS[0].to_period_params(),
+    ]
+
+
+def test_build_leaves_out_unknown_schedules() -> None:
+    config = builder().build(["deleted-schedule", "schedule-b"])
+
+    assert config.schedule_names == ("schedule-b",)
+    assert [s["name"] for s in json.loads(config.schedules_json)] == ["schedule-b"]
+
+    empty = builder().build(["deleted-schedule"])
+    assert json.loads(empty.schedules_json) == []
+    assert json.loads(empty.periods_json) == []
+
+
+def test_schedules_and_periods_are_serialized_once_across_targets() -> None:
+    config_builder = builder()
+    with patch.object(
+        ScheduleDefinition,
+        "to_schedule_params",
+        autospec=True,
+        side_effect=ScheduleDefinition.to_schedule_params,
+    ) as to_schedule_params, patch.object(
+        PeriodDefinition,
+        "to_period_params",
+        autospec=True,
+        side_effect=PeriodDefinition.to_period_params,
+    ) as to_period_params:
+        first = config_builder.build(["schedule-a", "schedule-b"])
+        for _ in range(10):
+            assert config_builder.build(["schedule-b", "schedule-a"]) == first
+            config_builder.build(["schedule-a"])
+
+    assert to_schedule_params.call_count == 2
+    assert to_period_params.call_count == 3
@@ -2,7 +2,7 @@
 # SPDX-License-Identifier: Apache-2.0
 import json
 from datetime import datetime
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 from zoneinfo import ZoneInfo
 
 from freezegun import freeze_time
@@ -17,6 +17,13 @@ from instance_scheduler.model.managed_instance import (
 from instance_scheduler.model.period_definition import PeriodDefinition
 from instance_scheduler.model.period_identifier import PeriodIdentifier
 from instance_scheduler.model.schedule_definition import ScheduleDefinition
+from instance_scheduler.model.store.dynamo_resource_registry import (
+    DynamoResourceRegistry,
+)
+from instance_scheduler.model.store.in_memory_resource_registry import (
+    InMemoryResourceRegistry,
+)
+from instance_scheduler.model.store.registry_counter_store import RegistryCounterStore
 from instance_scheduler.scheduling.states import InstanceState
 from instance_scheduler.util.arn import ARN
 from tests.context import MockLambdaContext
@@ -136,11 +143,11 @@ def test_heartbeat_reporter_sends_expected_metric(
         )
     )
 
-    with MockMetricsEnviron(
-        send_anonymous_metrics=True
-    ) as metrics_environ, override_should_send_metric(
-        True
-    ), MockHeartbeatMetricsEnvironment().patch_env():
+    with (
+        MockMetricsEnviron(send_anonymous_metrics=True) as metrics_environ,
+        override_should_send_metric(True),
+        MockHeartbeatMetricsEnvironment().patch_env(),
+    ):
         report_heartbeat_metric({}, MockLambdaContext())
 
         expected_metric = {
@@ -254,3 +261,60 @@ def test_heartbeat_reporter_sends_expected_metric(
         assert UnorderedList(instance_count_metrics) == UnorderedList(
             expected_instance_metrics
         )
+
+
+@freeze_time(datetime(2023, 6, 12, 12, 0, 0, tzinfo=ZoneInfo("UTC")))
+def test_heartbeat_reporter_reads_counters_without_scanning_registry(
+    mock_metrics_endpoint: MagicMock,
+    scheduling_context: SchedulingContext,
+) -> None:
+    registry = scheduling_context.registry
+    for resource_id in ["i-1234567890abcdef0", "i-1234567890abcdef1"]:
+        registry.put(
+            RegisteredEc2Instance(
+                account="111122223333",
+                region="us-east-1",
+                resource_id=resource_id,
+                arn=ARN(f"arn:aws:ec2:us-east-1:111122223333:instance/{resource_id}"),
+                schedule="some-schedule",
+                name="test-instance",
+                stored_state=InstanceState.RUNNING,
+            )
+        )
+
+    env = MockHeartbeatMetricsEnvironment()
+    # mark the counters as freshly reconciled with no targets. Only writes made after this point
+    # are reflected in the counters, proving the heartbeat reads them rather than scanning the registry
+    RegistryCounterStore(env.registry_table).reconcile(InMemoryResourceRegistry())
+    registry.put(
+        RegisteredEc2Instance(
+            account="111122223333",
+            region="us-east-1",
+            resource_id="i-1234567890abcdef2",
+            arn=ARN("arn:aws:ec2:us-east-1:111122223333:instance/i-1234567890abcdef2"),
+            schedule="other-schedule",
+            name="test-instance",
+            stored_state=InstanceState.RUNNING,
+        )
+    )
+
+    with (
+        MockMetricsEnviron(send_anonymous_metrics=True),
+        override_should_send_metric(True),
+        env.patch_env(),
+        patch.object(DynamoResourceRegistry, "find_all") as find_all,
+    ):
+        report_heartbeat_metric({}, MockLambdaContext())
+
+        find_all.assert_not_called()
+        sent_metrics = [
+            json.loads(call_args[1]["body"])
+            for call_args in mock_metrics_endpoint.call_args_list
+        ]
+        [instance_count_metric] = [
+            metric
+            for metric in sent_metrics
+            if metric["event_name"] == "instance_count"
+        ]
+        assert instance_count_metric["context"]["num_instances"] == 1
+        assert instance_count_metric["context"]["num_schedules"] == 1
@@ -4,15 +4,21 @@ import json
 from dataclasses import dataclass
 from datetime import datetime
 from os import environ
+from threading import Event
 from typing import Any, Callable, ClassVar, TypeVar
 from unittest.mock import MagicMock, patch
 from zoneinfo import ZoneInfo
 
 from freezegun import freeze_time
 from instance_scheduler.ops_metrics.metric_type.ops_metric import OpsMetric
-from instance_scheduler.ops_metrics.metrics import collect_metric, should_collect_metric
+from instance_scheduler.ops_metrics.metrics import (
+    collect_metric,
+    flush_metrics,
+    should_collect_metric,
+)
 from tests.logger import MockLogger
 from tests.test_utils.mock_environs.mock_metrics_environment import MockMetricsEnviron
+from urllib3 import HTTPResponse
 
 
 @dataclass(frozen=True)
@@ -58,6 +64,7 @@ def test_collect_metric_sends_metric_when_environ_is_valid_and_metrics_are_enabl
 ) -> None:
     with MockMetricsEnviron(send_anonymous_metrics=True) as metrics_environ:
         collect_metric(metric=TestMetric(), logger=MockLogger())
+        flush_metrics(MockLogger())
 
         expected_data = json.dumps(
             {
@@ -84,3 +91,82 @@ def test_collect_metric_sends_metric_when_environ_is_valid_and_metrics_are_enabl
             body=expected_data,
             headers=expected_headers,
         )
+
+
+def test_collect_metric_does_not_wait_for_metric_to_be_sent(
+    mock_metrics_endpoint: MagicMock,
+) -> None:
+    release_request = Event()
+    mock_metrics_endpoint.side_effect = lambda *args, **kwargs: release_request.wait(5)
+
+    with MockMetricsEnviron(send_anonymous_metrics=True):
+        assert collect_metric(metric=TestMetric(), logger=MockLogger()) is not None
+        assert not release_request.is_set()
+
+        release_request.set()
+        flush_metrics(MockLogger())
+        assert mock_metrics_endpoint.call_count == 1
+
+
+def test_flush_metrics_gives_up_on_slow_endpoint_after_timeout(
+    mock_metrics_endpoint: MagicMock,
+) -> None:
+    release_request = Event()
+    mock_metrics_endpoint.side_effect = lambda *args, **kwargs: release_request.wait(5)
+
+    with MockMetricsEnviron(send_anonymous_metrics=True):
+        collect_metric(metric=TestMetric(), logger=MockLogger())
+        with patch.object(MockLogger, "warning") as warning:
+            flush_metrics(MockLogger(), timeout_seconds=0.1)
+            warning.assert_called_once()
+
+        release_request.set()
+        # abandoned metrics are not waited on again by later flushes
+        flush_metrics(MockLogger(), timeout_seconds=0)
+
+
+def test_flush_metrics_logs_how_many_metrics_were_dropped_and_abandoned(
+    mock_metrics_endpoint: MagicMock,
+) -> None:
+    release_request = Event()
+    mock_metrics_endpoint.side_effect = lambda *args, **kwargs: release_request.wait(5)
+
+    with MockMetricsEnviron(send_anonymous_metrics=True):
+        # both workers are busy with the first two metrics, so the other three are still queued
+        for _ in range(5):
+            collect_metric(metric=TestMetric(), logger=MockLogger())
+        with patch.object(MockLogger, "warning") as warning:
+            flush_metrics(MockLogger(), timeout_seconds=0.1)
+            warning.assert_called_once_with(
+                "Anonymous metrics were not sent within 0.1 seconds: dropped 3 queued metrics, "
+                "abandoned 2 metrics still being sent"
+            )
+
+        release_request.set()
+        flush_metrics(MockLogger(), timeout_seconds=0)
+        assert mock_metrics_endpoint.call_count == 2
+
+
+def test_metric_rejected_by_the_endpoint_is_logged(
+    mock_metrics_endpoint: MagicMock,
+) -> None:
+    mock_metrics_endpoint.return_value = HTTPResponse(status=400)
+
+    with MockMetricsEnviron(send_anonymous_metrics=True):
+        collect_metric(metric=TestMetric(), logger=MockLogger())
+        with patch.object(MockLogger, "warning") as warning:
+            flush_metrics(MockLogger())
+            warning.assert_called_once_with(
+                "Metrics data was not accepted, status code is 400"
+            )
+
+
+def test_failure_to_send_metric_does_not_raise(
+    mock_metrics_endpoint: MagicMock,
+) -> None:
+    mock_metrics_endpoint.side_effect = TimeoutError("endpoint unreachable")
+
+    with MockMetricsEnviron(send_anonymous_metrics=True):
+        collect_metric(metric=TestMetric(), logger=MockLogger())
+        flush_metrics(MockLogger())
+        assert mock_metrics_endpoint.call_count == 1
@@ -13,12 +13,14 @@ import json
 from typing import Iterator
 from unittest.mock import MagicMock, patch
 
+import pytest
 from _pytest.fixtures import fixture
 from instance_scheduler.handler import scheduling_orchestrator
 from instance_scheduler.handler.scheduling_orchestrator import (
     OrchestrationRequest,
     SchedulingOrchestratorHandler,
 )
+from instance_scheduler.handler.scheduling_payload import encode_config
 from instance_scheduler.handler.scheduling_request import (
     SchedulingRequest,
     validate_scheduler_request,
@@ -27,12 +29,16 @@ from instance_scheduler.model.managed_instance import RegisteredEc2Instance
 from instance_scheduler.model.period_definition import PeriodDefinition
 from instance_scheduler.model.period_identifier import PeriodIdentifier
 from instance_scheduler.model.schedule_definition import ScheduleDefinition
+from instance_scheduler.model.store.config_table_loader import CONFIG_TABLE_CACHE
 from instance_scheduler.model.store.in_memory_period_definition_store import (
     InMemoryPeriodDefinitionStore,
 )
 from instance_scheduler.model.store.in_memory_schedule_definition_store import (
     InMemoryScheduleDefinitionStore,
 )
+from instance_scheduler.model.store.payload_signing_key import (
+    rotate_payload_signing_key,
+)
 from instance_scheduler.model.store.period_definition_store import PeriodDefinitionStore
 from instance_scheduler.model.store.resource_registry import ResourceRegistry
 from instance_scheduler.model.store.schedule_definition_store import (
@@ -192,6 +198,7 @@ def test_strips_schedules_when_payload_is_too_large(
 
         scheduling_request: SchedulingRequest = json.loads(payload)
         validate_scheduler_request(scheduling_request)
+        assert "encoded_config" not in scheduling_request
         assert "schedules" not in scheduling_request
         assert "periods" not in scheduling_request
 
@@ -231,3 +238,44 @@ def test_scheduling_request_handler_reloads_schedules_when_not_provided(
     assert fetched_schedule.name == "fetched_schedule"
     assert fetched_schedule is not None
     assert fetched_schedule.name == "fetched_schedule"
+
+
+@pytest.mark.parametrize("signed", [False, True])
+def test_scheduling_request_handler_decodes_encoded_config(
+    config_table: str, signed: bool
+) -> None:
+    from instance_scheduler.handler.scheduling_request import build_scheduling_context
+
+    signing_key = rotate_payload_signing_key(config_table) if signed else None
+    schedule = ScheduleDefinition(
+        name="encoded_schedule", periods=[PeriodIdentifier.of("encoded_period")]
+    )
+    period = PeriodDefinition(name="encoded_period", begintime="10:00")
+    request = SchedulingRequest(
+        action="scheduler:run",
+        account="123456789012",
+        region="us-east-1",
+        service="ec2",
+        current_dt=quick_time(10, 0, 0).isoformat(),
+        dispatch_time=quick_time(10, 0, 0).isoformat(),
+        encoded_config=encode_config(
+            json.dumps([schedule.to_schedule_params()]),
+            json.dumps([period.to_period_params()]),
+            signing_key=signing_key,
+        ),
+    )
+    assert validate_scheduler_request(request, signing_key)
+
+    with MockSchedulingRequestEnvironment().patch_env(), patch.object(
+        CONFIG_TABLE_CACHE, "load"
+    ) as load_config, patch.object(
+        ScheduleDefinition, "validate", autospec=True
+    ) as validate_schedule:
+        context = build_scheduling_context(request, MockSchedulingRequestEnvironment())
+
+    # the config table is not read when the full config is encoded into the request
+    load_config.assert_not_called()
+    # and a signed config is not validated again
+    assert validate_schedule.call_count == (0 if signed else 1)
+    assert context.schedule_store.find_by_name("encoded_schedule") == schedule
+    assert context.period_store.find_by_name("encoded_period") == period
@@ -0,0 +1,202 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import boto3
+from instance_scheduler.model.period_definition import PeriodDefinition
+from instance_scheduler.model.period_identifier import PeriodIdentifier
+from instance_scheduler.model.schedule_definition import ScheduleDefinition
+from instance_scheduler.model.store.config_table_loader import (
+    ConfigTableCache,
+    load_config_table,
+)
+from instance_scheduler.model.store.config_version import bump_config_version
+from instance_scheduler.model.store.ddb_config_partition import ReadCapacity
+from instance_scheduler.model.store.dynamo_period_definition_store import (
+    DynamoPeriodDefinitionStore,
+)
+from instance_scheduler.model.store.dynamo_schedule_definition_store import (
+    DynamoScheduleDefinitionStore,
+)
+from instance_scheduler.model.store.period_definition_store import PeriodDefinitionStore
+from instance_scheduler.model.store.schedule_definition_store import (
+    ScheduleDefinitionStore,
+)
+
+if TYPE_CHECKING:
+    from mypy_boto3_dynamodb.client import DynamoDBClient
+else:
+    DynamoDBClient = object
+
+
+def put_config(
+    schedule_store: ScheduleDefinitionStore,
+    period_store: PeriodDefinitionStore,
+    count: int,
+) -> None:
+    for index in range(count):
+        period_store.put(
+            PeriodDefinition(name=f"period-{index}", begintime="09:00", endtime="17:00")
+        )
+        schedule_store.put(
+            ScheduleDefinition(
+                name=f"schedule-{index}", periods=[PeriodIdentifier(f"period-{index}")]
+            )
+        )
+
+
+def test_load_follows_every_page_of_both_partitions(
+    config_table: str,
+    schedule_store: ScheduleDefinitionStore,
+    period_store: PeriodDefinitionStore,
+) -> None:
+    put_config(schedule_store, period_store, 7)
+
+    config = load_config_table(config_table, page_size=2)
+
+    assert sorted(config.schedules) == [f"schedule-{i}" for i in range(7)]
+    assert sorted(config.periods) == [f"period-{i}" for i in range(7)]
+    assert config.schedule_errors == []
+    assert config.period_errors == []
+
+
+def test_find_all_with_errors_follows_every_page(
+    config_table: str,
+    schedule_store: ScheduleDefinitionStore,
+    period_store: PeriodDefinitionStore,
+) -> None:
+    put_config(schedule_store, period_store, 5)
+
+    schedules, _ = DynamoScheduleDefinitionStore(config_table).find_all_with_errors(
+        page_size=2
+    )
+    periods, _ = DynamoPeriodDefinitionStore(config_table).find_all_with_errors(
+        page_size=2
+    )
+
+    assert len(schedules) == 5
+    assert len(periods) == 5
+
+
+def test_load_reports_invalid_items_and_consumed_read_capacity(
+    config_table: str,
+    schedule_store: ScheduleDefinitionStore,
+    period_store: PeriodDefinitionStore,
+) -> None:
+    put_config(schedule_store, period_store, 2)
+    ddb_client: DynamoDBClient = boto3.client("dynamodb")
+    ddb_client.put_item(
+        TableName=config_table,
+        Item={"type": {"S": "schedule"}, "name": {"S": "invalid-schedule"}},
+    )
+    ddb_client.put_item(
+        TableName=config_table,
+        Item={
+            "type": {"S": "period"},
+            "name": {"S": "invalid-period"},
+            "begintime": {"S": "20:00"},
+            "endtime": {"S": "15:00"},
+        },
+    )
+
+    config = load_config_table(config_table)
+
+    assert len(config.schedules) == 2
+    assert len(config.periods) == 2
+    assert len(config.schedule_errors) == 1
+    assert len(config.period_errors) == 1
+    assert config.consumed_read_capacity > 0
+
+
+def test_load_only_queries_requested_partitions(
+    config_table: str,
+    schedule_store: ScheduleDefinitionStore,
+    period_store: PeriodDefinitionStore,
+) -> None:
+    put_config(schedule_store, period_store, 2)
+
+    with patch.object(
+        DynamoScheduleDefinitionStore,
+        "find_all_with_errors",
+        autospec=True,
+        side_effect=DynamoScheduleDefinitionStore.find_all_with_errors,
+    ) as find_schedules:
+        config = load_config_table(config_table, load_schedules=False)
+
+    find_schedules.assert_not_called()
+    assert config.schedules == {}
+    assert len(config.periods) == 2
+
+
+def test_read_capacity_accumulates_over_pages(
+    config_table: str,
+    schedule_store: ScheduleDefinitionStore,
+    period_store: PeriodDefinitionStore,
+) -> None:
+    put_config(schedule_store, period_store, 4)
+    single_page, many_pages = ReadCapacity(), ReadCapacity()
+
+    DynamoScheduleDefinitionStore(config_table).find_all_with_errors(
+        capacity=single_page
+    )
+    DynamoScheduleDefinitionStore(config_table).find_all_with_errors(
+        capacity=many_pages, page_size=1
+    )
+
+    assert 0 < single_page.units < many_pages.units
+
+
+def test_cache_only_reloads_when_the_config_version_changes(
+    config_table: str,
+    schedule_store: ScheduleDefinitionStore,
+    period_store: PeriodDefinitionStore,
+) -> None:
+    put_config(schedule_store, period_store, 2)
+    cache = ConfigTableCache()
+
+    with patch(
+        "instance_scheduler.model.store.config_table_loader.load_config_table",
+        wraps=load_config_table,
+    ) as load:
+        first = cache.load(config_table)
+        second = cache.load(config_table)
+        assert load.call_count == 1
+        assert not first.from_cache
+        assert second.from_cache
+        assert second.schedules == first.schedules
+        assert second.consumed_read_capacity == 0
+
+        schedule_store.put(
+            ScheduleDefinition(
+                name="schedule-2", periods=[PeriodIdentifier("period-0")]
+            )
+        )
+        third = cache.load(config_table)
+        assert load.call_count == 2
+        assert not third.from_cache
+        assert len(third.schedules) == 3
+
+
+def test_cache_reloads_without_a_config_version_or_when_expired(
+    config_table: str,
+) -> None:
+    now = 0.0
+    cache = ConfigTableCache(max_age_seconds=60, clock=lambda: now)
+
+    with patch(
+        "instance_scheduler.model.store.config_table_loader.load_config_table",
+        wraps=load_config_table,
+    ) as load:
+        # the config was never written through the solution, so there is no version to compare
+        cache.load(config_table)
+        cache.load(config_table)
+        assert load.call_count == 2
+
+        bump_config_version(config_table)
+        cache.load(config_table)
+        now = 59
+        assert cache.load(config_table).from_cache
+        now = 60
+        assert not cache.load(config_table).from_cache
+        assert load.call_count == 4
@@ -0,0 +1,73 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+from instance_scheduler.model.period_definition import PeriodDefinition
+from instance_scheduler.model.period_identifier import PeriodIdentifier
+from instance_scheduler.model.schedule_definition import ScheduleDefinition
+from instance_scheduler.model.store.config_version import (
+    bump_config_version,
+    get_config_version,
+)
+from instance_scheduler.model.store.dynamo_period_definition_store import (
+    DynamoPeriodDefinitionStore,
+)
+from instance_scheduler.model.store.dynamo_schedule_definition_store import (
+    DynamoScheduleDefinitionStore,
+)
+from instance_scheduler.model.store.period_definition_store import (
+    PeriodAlreadyExistsException,
+)
+from pytest import raises
+
+PERIOD = PeriodDefinition(name="office-hours", begintime="09:00", endtime="17:00")
+SCHEDULE = ScheduleDefinition(
+    name="my-schedule", periods=[PeriodIdentifier("office-hours")]
+)
+
+
+def test_config_version_is_none_until_first_bumped(config_table: str) -> None:
+    assert get_config_version(config_table) is None
+
+    assert bump_config_version(config_table) == 1
+    assert bump_config_version(config_table) == 2
+    assert get_config_version(config_table) == 2
+
+
+def test_every_config_write_bumps_the_version(config_table: str) -> None:
+    period_store = DynamoPeriodDefinitionStore(config_table)
+    schedule_store = DynamoScheduleDefinitionStore(config_table)
+
+    period_store.put(PERIOD)
+    assert get_config_version(config_table) == 1
+    schedule_store.put(SCHEDULE)
+    assert get_config_version(config_table) == 2
+    schedule_store.put(SCHEDULE, overwrite=True)
+    assert get_config_version(config_table) == 3
+    schedule_store.delete(SCHEDULE.name)
+    assert get_config_version(config_table) == 4
+    period_store.delete(PERIOD.name, error_if_missing=True)
+    assert get_config_version(config_table) == 5
+
+
+def test_a_transaction_bumps_the_version_once(config_table: str) -> None:
+    period_store = DynamoPeriodDefinitionStore(config_table)
+    schedule_store = DynamoScheduleDefinitionStore(config_table)
+
+    with schedule_store.new_transaction() as transaction:
+        transaction.add(schedule_store.transact_put(SCHEDULE))
+        transaction.add(period_store.transact_put(PERIOD))
+        transaction.add(
+            period_store.transact_put(PeriodDefinition(name="other", weekdays={"sat"}))
+        )
+
+    assert get_config_version(config_table) == 1
+    assert schedule_store.find_by_name(SCHEDULE.name) == SCHEDULE
+
+
+def test_a_failed_write_does_not_bump_the_version(config_table: str) -> None:
+    period_store = DynamoPeriodDefinitionStore(config_table)
+    period_store.put(PERIOD)
+
+    with raises(PeriodAlreadyExistsException):
+        period_store.put(PERIOD)
+
+    assert get_config_version(config_table) == 1
@@ -1,6 +1,7 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
+from unittest.mock import patch
 
 import boto3
 import pytest
@@ -9,8 +10,11 @@ from botocore.exceptions import ClientError
 from instance_scheduler.model.period_identifier import PeriodIdentifier
 from instance_scheduler.model.schedule_definition import ScheduleDefinition
 from instance_scheduler.model.store.dynamo_schedule_definition_store import (
+    BATCH_BASE_DELAY_SECONDS,
+    BATCH_MAX_ATTEMPTS,
     DynamoScheduleDefinitionStore,
 )
+from instance_scheduler.util.session_manager import hub_dynamo_client
 from tests.test_utils.unordered_list import UnorderedList
 
 if TYPE_CHECKING:
@@ -24,6 +28,15 @@ def schedule_store(config_table: str) -> DynamoScheduleDefinitionStore:
     return DynamoScheduleDefinitionStore(config_table)
 
 
+@fixture
+def indexed_schedule_store(
+    schedule_store: DynamoScheduleDefinitionStore,
+) -> DynamoScheduleDefinitionStore:
+    # the index of the (still empty) table is complete once it has been rebuilt
+    schedule_store.rebuild_period_index()
+    return schedule_store
+
+
 def test_read_invalid_schedule_returns_exception_gracefully(
     config_table: str,
     schedule_store: DynamoScheduleDefinitionStore,
@@ -171,3 +184,199 @@ def test_transact_delete_deletes_correctly(
             schedule_store.transact_delete(schedule.name, error_if_missing=True)
         )
     assert len(schedule_store.find_all()) == 0
+
+
+def test_transact_put_maintains_period_index(
+    config_table: str,
+    indexed_schedule_store: DynamoScheduleDefinitionStore,
+) -> None:
+    schedule = ScheduleDefinition(
+        name="test-schedule", periods=[PeriodIdentifier.of("period1")]
+    )
+    with indexed_schedule_store.new_transaction() as transaction:
+        transaction.add(indexed_schedule_store.transact_put(schedule))
+
+    assert indexed_schedule_store.find_indexed_by_period("period1") == {
+        "test-schedule": schedule
+    }
+
+    updated = ScheduleDefinition(
+        name="test-schedule", periods=[PeriodIdentifier.of("period2")]
+    )
+    with indexed_schedule_store.new_transaction() as transaction:
+        transaction.add(indexed_schedule_store.transact_put(updated, overwrite=True))
+
+    assert indexed_schedule_store.find_indexed_by_period("period1") == {}
+    assert indexed_schedule_store.find_indexed_by_period("period2") == {
+        "test-schedule": updated
+    }
+
+    with indexed_schedule_store.new_transaction() as transaction:
+        transaction.add(indexed_schedule_store.transact_delete("test-schedule"))
+
+    assert indexed_schedule_store.find_indexed_by_period("period2") == {}
+    assert period_index_entries(config_table) == set()
+
+
+def test_find_indexed_by_period_does_not_match_longer_period_names(
+    indexed_schedule_store: DynamoScheduleDefinitionStore,
+) -> None:
+    schedule1 = ScheduleDefinition(name="b", periods=[PeriodIdentifier.of("a")])
+    schedule2 = ScheduleDefinition(name="c", periods=[PeriodIdentifier.of("a#b")])
+    indexed_schedule_store.put(schedule1)
+    indexed_schedule_store.put(schedule2)
+
+    assert indexed_schedule_store.find_indexed_by_period("a") == {"b": schedule1}
+    assert indexed_schedule_store.find_indexed_by_period("a#b") == {"c": schedule2}
+
+
+def test_find_indexed_by_period_ignores_stale_index_entries(
+    config_table: str,
+    indexed_schedule_store: DynamoScheduleDefinitionStore,
+) -> None:
+    indexed_schedule_store.put(
+        ScheduleDefinition(name="test-schedule", periods=[PeriodIdentifier.of("p1")])
+    )
+    # edited directly in the table, so the index still references p1
+    ddb_client: DynamoDBClient = boto3.client("dynamodb")
+    ddb_client.put_item(
+        TableName=config_table,
+        Item={
+            "type": {"S": "schedule"},
+            "name": {"S": "test-schedule"},
+            "periods": {"SS": ["p2"]},
+        },
+    )
+
+    assert indexed_schedule_store.find_indexed_by_period("p1") == {}
+
+
+def test_find_by_period_finds_schedules_written_to_the_table_after_the_index(
+    config_table: str,
+    indexed_schedule_store: DynamoScheduleDefinitionStore,
+) -> None:
+    # written directly to the table (e.g. from the console) after the index was rebuilt
+    ddb_client: DynamoDBClient = boto3.client("dynamodb")
+    ddb_client.put_item(
+        TableName=config_table,
+        Item={
+            "type": {"S": "schedule"},
+            "name": {"S": "console-schedule"},
+            "periods": {"SS": ["p1"]},
+        },
+    )
+
+    assert indexed_schedule_store.find_by_period("p1").keys() == {"console-schedule"}
+    assert indexed_schedule_store.find_indexed_by_period("p1") == {}
+
+
+def test_rebuild_period_index_indexes_schedules_written_to_the_table(
+    config_table: str,
+    schedule_store: DynamoScheduleDefinitionStore,
+) -> None:
+    schedule_store.put(
+        ScheduleDefinition(name="stale-schedule", periods=[PeriodIdentifier.of("p1")])
+    )
+    ddb_client: DynamoDBClient = boto3.client("dynamodb")
+    ddb_client.delete_item(
+        TableName=config_table,
+        Key={"type": {"S": "schedule"}, "name": {"S": "stale-schedule"}},
+    )
+    for index in range(30):
+        ddb_client.put_item(
+            TableName=config_table,
+            Item={
+                "type": {"S": "schedule"},
+                "name": {"S": f"schedule-{index}"},
+                "periods": {"SS": ["p1", "p2@m4.large"]},
+            },
+        )
+
+    schedule_store.rebuild_period_index()
+
+    assert period_index_entries(config_table) == {
+        (period, f"schedule-{index}") for index in range(30) for period in ["p1", "p2"]
+    }
+    assert len(schedule_store.find_indexed_by_period("p2")) == 30
+
+
+def test_find_indexed_by_period_loads_every_schedule_until_the_index_is_complete(
+    config_table: str,
+    schedule_store: DynamoScheduleDefinitionStore,
+) -> None:
+    # written by an earlier version, which did not index schedules
+    ddb_client: DynamoDBClient = boto3.client("dynamodb")
+    ddb_client.put_item(
+        TableName=config_table,
+        Item={
+            "type": {"S": "schedule"},
+            "name": {"S": "old-schedule"},
+            "periods": {"SS": ["p1"]},
+        },
+    )
+    schedule_store.put(
+        ScheduleDefinition(name="new-schedule", periods=[PeriodIdentifier.of("p1")])
+    )
+
+    assert schedule_store.find_indexed_by_period("p1").keys() == {
+        "old-schedule",
+        "new-schedule",
+    }
+
+    schedule_store.rebuild_period_index()
+    with patch.object(
+        schedule_store, "find_all", wraps=schedule_store.find_all
+    ) as find_all:
+        assert schedule_store.find_indexed_by_period("p1").keys() == {
+            "old-schedule",
+            "new-schedule",
+        }
+        find_all.assert_not_called()
+
+
+def test_rebuild_period_index_retries_unprocessed_writes_before_marking_it_complete(
+    config_table: str,
+    schedule_store: DynamoScheduleDefinitionStore,
+) -> None:
+    ddb_client = hub_dynamo_client()
+    ddb_client.put_item(
+        TableName=config_table,
+        Item={
+            "type": {"S": "schedule"},
+            "name": {"S": "test-schedule"},
+            "periods": {"SS": ["p1"]},
+        },
+    )
+
+    def unprocessed(**kwargs: Any) -> Any:
+        return {"UnprocessedItems": kwargs["RequestItems"]}
+
+    with patch(
+        "instance_scheduler.model.store.dynamo_schedule_definition_store.sleep"
+    ) as sleep, patch.object(
+        ddb_client, "batch_write_item", side_effect=unprocessed
+    ) as batch_write_item:
+        with pytest.raises(RuntimeError, match="still unprocessed"):
+            schedule_store.rebuild_period_index()
+
+    assert batch_write_item.call_count == BATCH_MAX_ATTEMPTS
+    assert [call.args[0] for call in sleep.call_args_list] == [
+        BATCH_BASE_DELAY_SECONDS * 2**attempt
+        for attempt in range(BATCH_MAX_ATTEMPTS - 1)
+    ]
+    with patch.object(
+        schedule_store, "find_all", wraps=schedule_store.find_all
+    ) as find_all:
+        assert schedule_store.find_indexed_by_period("p1").keys() == {"test-schedule"}
+        find_all.assert_called_once()
+
+
+def period_index_entries(config_table: str) -> set[tuple[str, str]]:
+    ddb_client: DynamoDBClient = boto3.client("dynamodb")
+    result = ddb_client.query(
+        TableName=config_table,
+        KeyConditionExpression="#part_key=:value",
+        ExpressionAttributeNames={"#part_key": "type"},
+        ExpressionAttributeValues={":value": {"S": "period_ref"}},
+    )
+    return {(item["period"]["S"], item["schedule"]["S"]) for item in result["Items"]}
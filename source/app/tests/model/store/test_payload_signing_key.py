@@ -0,0 +1,34 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+from instance_scheduler.model.store.payload_signing_key import (
+    PayloadSigningKeyCache,
+    get_payload_signing_key,
+    rotate_payload_signing_key,
+)
+
+
+def test_payload_signing_key_is_none_until_first_rotated(config_table: str) -> None:
+    assert get_payload_signing_key(config_table) is None
+
+    first = rotate_payload_signing_key(config_table)
+    assert get_payload_signing_key(config_table) == first
+
+    second = rotate_payload_signing_key(config_table)
+    assert second != first
+    assert get_payload_signing_key(config_table) == second
+
+
+def test_cached_key_is_read_again_after_max_age(config_table: str) -> None:
+    now = 0.0
+    cache = PayloadSigningKeyCache(max_age_seconds=60, clock=lambda: now)
+
+    # a missing key is not cached, so it is picked up as soon as it is written
+    assert cache.load(config_table) is None
+    first = rotate_payload_signing_key(config_table)
+    assert cache.load(config_table) == first
+
+    rotate_payload_signing_key(config_table)
+    now = 59
+    assert cache.load(config_table) == first
+    now = 60
+    assert cache.load(config_table) == get_payload_signing_key(config_table)
@@ -0,0 +1,224 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Iterator
+from unittest.mock import patch
+
+from _pytest.fixtures import fixture
+from instance_scheduler.model.managed_instance import (
+    RegisteredEc2Instance,
+    RegisteredInstance,
+    RegisteredRdsInstance,
+)
+from instance_scheduler.model.registry_counts import TargetResourceCounts
+from instance_scheduler.model.store.dynamo_resource_registry import (
+    DynamoResourceRegistry,
+)
+from instance_scheduler.model.store.in_memory_resource_registry import (
+    InMemoryResourceRegistry,
+)
+from instance_scheduler.model.store.registry_counter_store import RegistryCounterStore
+from instance_scheduler.scheduling.states import InstanceState
+from instance_scheduler.util.arn import ARN
+from tests.test_utils.unordered_list import UnorderedList
+
+
+@fixture
+def counter_store(registry_table: str) -> RegistryCounterStore:
+    return RegistryCounterStore(registry_table)
+
+
+def ec2_instance(
+    resource_id: str, schedule: str = "schedule-a", account: str = "123456789012"
+) -> RegisteredEc2Instance:
+    return RegisteredEc2Instance(
+        account=account,
+        region="us-east-1",
+        resource_id=resource_id,
+        arn=ARN(f"arn:aws:ec2:us-east-1:{account}:instance/{resource_id}"),
+        schedule=schedule,
+        name="my-instance",
+        stored_state=InstanceState.UNKNOWN,
+    )
+
+
+def rds_instance(
+    resource_id: str, schedule: str = "schedule-a"
+) -> RegisteredRdsInstance:
+    return RegisteredRdsInstance(
+        account="123456789012",
+        region="us-east-1",
+        resource_id=resource_id,
+        arn=ARN(f"arn:aws:rds:us-east-1:123456789012:db:{resource_id}"),
+        schedule=schedule,
+        name="my-db",
+        stored_state=InstanceState.UNKNOWN,
+    )
+
+
+def test_registering_resources_increments_target_counters(
+    registry_table: str, counter_store: RegistryCounterStore
+) -> None:
+    registry = DynamoResourceRegistry(registry_table)
+    registry.put(ec2_instance("i-1"), overwrite=True)
+    registry.put(ec2_instance("i-2", schedule="schedule-b"), overwrite=False)
+    registry.put(rds_instance("db-1"), overwrite=True)
+
+    assert counter_store.find_all() == UnorderedList(
+        [
+            TargetResourceCounts(
+                account="123456789012",
+                region="us-east-1",
+                service="ec2",
+                num_resources=2,
+                schedule_counts=Counter({"schedule-a": 1, "schedule-b": 1}),
+            ),
+            TargetResourceCounts(
+                account="123456789012",
+                region="us-east-1",
+                service="rds",
+                num_resources=1,
+                schedule_counts=Counter({"schedule-a": 1}),
+            ),
+        ]
+    )
+
+
+def test_state_updates_and_reregistration_do_not_change_counters(
+    registry_table: str, counter_store: RegistryCounterStore
+) -> None:
+    registry = DynamoResourceRegistry(registry_table)
+    instance = ec2_instance("i-1")
+    registry.put(instance, overwrite=True)
+    registry.put(instance, overwrite=True)
+    instance.stored_state = InstanceState.RUNNING
+    registry.put(instance, overwrite=True)
+
+    [counts] = counter_store.find_all()
+    assert counts.num_resources == 1
+    assert counts.num_schedules == 1
+
+
+def test_schedule_change_moves_count_between_schedules(
+    registry_table: str, counter_store: RegistryCounterStore
+) -> None:
+    registry = DynamoResourceRegistry(registry_table)
+    registry.put(ec2_instance("i-1", schedule="schedule-a"), overwrite=True)
+    registry.put(ec2_instance("i-1", schedule="schedule-b"), overwrite=True)
+
+    [counts] = counter_store.find_all()
+    assert counts.num_resources == 1
+    assert counts.num_schedules == 1
+    assert counts.schedule_counts["schedule-b"] == 1
+
+
+def test_deregistering_resources_decrements_target_counters(
+    registry_table: str, counter_store: RegistryCounterStore
+) -> None:
+    registry = DynamoResourceRegistry(registry_table)
+    registry.put(ec2_instance("i-1"), overwrite=True)
+    registry.put(ec2_instance("i-2"), overwrite=True)
+    registry.put(rds_instance("db-1"), overwrite=True)
+
+    registry.delete(ec2_instance("i-1").key)
+    registry.delete(rds_instance("db-1").key, error_if_missing=True)
+    # deleting a resource that was never registered must not change the counts
+    registry.delete(ec2_instance("i-3").key)
+
+    [counts] = counter_store.find_all()
+    assert counts.service == "ec2"
+    assert counts.num_resources == 1
+
+
+def test_counters_are_not_returned_as_registered_resources(
+    registry_table: str,
+) -> None:
+    registry = DynamoResourceRegistry(registry_table)
+    instance = ec2_instance("i-1")
+    registry.put(instance, overwrite=True)
+
+    assert list(registry.find_all()) == [instance]
+
+
+def test_reconcile_corrects_drift_and_removes_empty_targets(
+    registry_table: str, counter_store: RegistryCounterStore
+) -> None:
+    registry = DynamoResourceRegistry(registry_table)
+    registry.put(ec2_instance("i-1"), overwrite=True)
+    registry.put(ec2_instance("i-2", account="222233334444"), overwrite=True)
+
+    # simulate drift from lost counter updates
+    counter_store.adjust(
+        "123456789012", "us-east-1", "ec2", 5, {"schedule-a": 3, "schedule-c": 2}
+    )
+    counter_store.adjust("333344445555", "us-east-1", "rds", 1, {"schedule-a": 1})
+
+    reconciled = counter_store.reconcile(registry)
+
+    expected = [
+        TargetResourceCounts(
+            account="123456789012",
+            region="us-east-1",
+            service="ec2",
+            num_resources=1,
+            schedule_counts=Counter({"schedule-a": 1}),
+        ),
+        TargetResourceCounts(
+            account="222233334444",
+            region="us-east-1",
+            service="ec2",
+            num_resources=1,
+            schedule_counts=Counter({"schedule-a": 1}),
+        ),
+    ]
+    assert reconciled == UnorderedList(expected)
+    assert counter_store.find_all() == UnorderedList(expected)
+
+
+def test_reconcile_keeps_adjustments_made_while_listing_the_registry(
+    registry_table: str, counter_store: RegistryCounterStore
+) -> None:
+    registry = DynamoResourceRegistry(registry_table)
+    registry.put(ec2_instance("i-1"), overwrite=True)
+    registry.put(rds_instance("db-1"), overwrite=True)
+    counter_store.adjust("123456789012", "us-east-1", "ec2", 5, {"schedule-a": 5})
+
+    def find_all_then_register() -> Iterator[RegisteredInstance]:
+        yield from DynamoResourceRegistry.find_all(registry)
+        # registered after the listing, but before the reconciled counters are written
+        registry.put(ec2_instance("i-2", schedule="schedule-b"), overwrite=True)
+
+    with patch.object(registry, "find_all", side_effect=find_all_then_register):
+        reconciled = counter_store.reconcile(registry)
+
+    expected = [
+        TargetResourceCounts(
+            account="123456789012",
+            region="us-east-1",
+            service="ec2",
+            num_resources=2,
+            schedule_counts=Counter({"schedule-a": 1, "schedule-b": 1}),
+        ),
+        TargetResourceCounts(
+            account="123456789012",
+            region="us-east-1",
+            service="rds",
+            num_resources=1,
+            schedule_counts=Counter({"schedule-a": 1}),
+        ),
+    ]
+    assert reconciled == UnorderedList(expected)
+    assert counter_store.find_all() == UnorderedList(expected)
+
+
+def test_needs_reconciliation_until_reconciled_within_interval(
+    counter_store: RegistryCounterStore,
+) -> None:
+    assert counter_store.needs_reconciliation()
+
+    counter_store.reconcile(InMemoryResourceRegistry())
+
+    now = datetime.now(timezone.utc)
+    assert not counter_store.needs_reconciliation(now)
+    assert counter_store.needs_reconciliation(now + timedelta(days=8))
@@ -1,5 +1,8 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
+from dataclasses import replace
+from unittest.mock import patch
+
 import pytest
 from instance_scheduler.model.managed_instance import (
     AsgConfiguration,
@@ -8,6 +11,7 @@ from instance_scheduler.model.managed_instance import (
     RegisteredRdsInstance,
     RegistryKey,
 )
+from instance_scheduler.model.registry_counts import COUNTERS_PARTITION
 from instance_scheduler.model.store.dynamo_resource_registry import (
     DynamoResourceRegistry,
 )
@@ -15,12 +19,16 @@ from instance_scheduler.model.store.in_memory_resource_registry import (
     InMemoryResourceRegistry,
 )
 from instance_scheduler.model.store.resource_registry import (
+    RegistryRow,
     ResourceAlreadyRegisteredException,
     ResourceRegistry,
+    StaleResourceException,
+    TargetSchedules,
     UnknownResourceException,
 )
 from instance_scheduler.scheduling.states import InstanceState
 from instance_scheduler.util.arn import ARN
+from instance_scheduler.util.session_manager import hub_dynamo_client
 from tests.test_utils.unordered_list import UnorderedList
 
 
@@ -346,3 +354,268 @@ def test_get_after_delete(resource_registry: ResourceRegistry) -> None:
 
     resource_registry.delete(instance.key)
     assert resource_registry.get(instance.key) is None
+
+
+def test_update_stores_changed_record(resource_registry: ResourceRegistry) -> None:
+    instance = RegisteredEc2Instance(
+        account="123456789012",
+        region="eu-west-1",
+        resource_id="XXXXXXXXXXXX",
+        arn=ARN("arn:aws:ec2:eu-west-1:123456789012:instance/XXXXXXXXXXXX"),
+        schedule="schedule-name",
+        name="my-instance",
+        stored_state=InstanceState.STOPPED,
+    )
+    resource_registry.put(instance)
+    previous = resource_registry.get(instance.key)
+    assert previous is not None
+
+    updated = replace(previous, stored_state=InstanceState.RUNNING)
+    resource_registry.update(previous, updated)
+
+    assert resource_registry.get(instance.key) == updated
+
+
+def asg_instance(last_configured: AsgConfiguration | None) -> RegisteredAsgInstance:
+    return RegisteredAsgInstance(
+        account="111122223333",
+        region="eu-west-1",
+        resource_id="my-asg",
+        arn=ARN(
+            "arn:aws:autoscaling:eu-west-1:111122223333:autoScalingGroup:uuid:autoScalingGroupName/my-asg"
+        ),
+        schedule="schedule-name",
+        name="my-asg",
+        stored_state=InstanceState.STOPPED,
+        last_configured=last_configured,
+    )
+
+
+LAST_CONFIGURED = AsgConfiguration(
+    last_updated="2024-01-01T00:00:00+00:00",
+    min=1,
+    desired=2,
+    max=3,
+    schedule_hash="hash",
+    valid_until="2024-01-02T00:00:00+00:00",
+)
+
+
+def test_dirty_attributes_are_the_changed_and_removed_item_attributes() -> None:
+    previous = asg_instance(LAST_CONFIGURED)
+
+    assert previous.dirty_attributes(replace(previous, version=3)) == {}
+    assert replace(previous, stored_state=InstanceState.RUNNING).dirty_attributes(
+        previous
+    ) == {"state": {"S": "running"}}
+    assert asg_instance(None).dirty_attributes(previous) == {"last_configured": None}
+
+
+def test_dynamo_update_only_writes_dirty_attributes(registry_table: str) -> None:
+    registry = DynamoResourceRegistry(registry_table)
+    previous = asg_instance(LAST_CONFIGURED)
+    registry.put(previous)
+
+    with patch.object(
+        hub_dynamo_client(), "update_item", wraps=hub_dynamo_client().update_item
+    ) as update_item:
+        stored = registry.update(
+            previous, replace(previous, stored_state=InstanceState.RUNNING)
+        )
+
+    assert update_item.call_args.kwargs["UpdateExpression"] == (
+        "SET #version = if_not_exists(#version, :zero) + :one, #attr0 = :attr0"
+    )
+    assert update_item.call_args.kwargs["ExpressionAttributeNames"]["#attr0"] == "state"
+    assert stored.version == 1
+    assert registry.get(previous.key) == replace(
+        previous, stored_state=InstanceState.RUNNING
+    )
+
+    registry.update(stored, asg_instance(None))
+    fetched = registry.get(previous.key)
+    assert fetched == asg_instance(None)
+    assert fetched is not None and fetched.version == 2
+
+
+def test_dynamo_update_with_check_version_rejects_stale_record(
+    registry_table: str,
+) -> None:
+    registry = DynamoResourceRegistry(registry_table)
+    registry.put(asg_instance(LAST_CONFIGURED))
+    previous = registry.get(asg_instance(LAST_CONFIGURED).key)
+    assert previous is not None
+
+    stored = registry.update(
+        previous, replace(previous, stored_state=InstanceState.RUNNING)
+    )
+
+    with pytest.raises(StaleResourceException):
+        registry.update(previous, asg_instance(None), check_version=True)
+
+    registry.update(stored, asg_instance(None), check_version=True)
+    assert registry.get(previous.key) == asg_instance(None)
+
+
+def test_dynamo_update_of_deregistered_resource_writes_it_in_full(
+    registry_table: str,
+) -> None:
+    registry = DynamoResourceRegistry(registry_table)
+    previous = asg_instance(LAST_CONFIGURED)
+    registry.put(previous)
+    registry.delete(previous.key)
+
+    updated = replace(previous, stored_state=InstanceState.RUNNING)
+    registry.update(previous, updated)
+
+    assert registry.get(previous.key) == updated
+
+
+def ec2_instance(resource_id: str) -> RegisteredEc2Instance:
+    return RegisteredEc2Instance(
+        account="123456789012",
+        region="eu-west-1",
+        resource_id=resource_id,
+        arn=ARN(f"arn:aws:ec2:eu-west-1:123456789012:instance/{resource_id}"),
+        schedule="schedule-name",
+        name="my-instance",
+        stored_state=InstanceState.RUNNING,
+    )
+
+
+def test_get_many_separates_found_from_not_found(
+    resource_registry: ResourceRegistry,
+) -> None:
+    registered = ec2_instance("i-registered")
+    resource_registry.put(registered)
+    unregistered_key = ec2_instance("i-unregistered").key
+
+    lookup = resource_registry.get_many(
+        [registered.key, unregistered_key, registered.key]
+    )
+
+    assert lookup.found == {registered.key: registered}
+    assert lookup.not_found == [unregistered_key]
+    assert lookup.errors == {}
+
+
+def test_dynamo_get_many_reads_more_keys_than_fit_in_one_batch(
+    registry_table: str,
+) -> None:
+    registry = DynamoResourceRegistry(registry_table)
+    instances = [ec2_instance(f"i-{index:03}") for index in range(150)]
+    for instance in instances[:120]:
+        registry.put(instance)
+
+    with patch.object(
+        hub_dynamo_client(), "batch_get_item", wraps=hub_dynamo_client().batch_get_item
+    ) as batch_get_item:
+        lookup = registry.get_many(instance.key for instance in instances)
+
+    assert batch_get_item.call_count == 2
+    assert lookup.found == {instance.key: instance for instance in instances[:120]}
+    assert lookup.not_found == [instance.key for instance in instances[120:]]
+
+
+def test_dynamo_get_many_retries_unprocessed_keys_then_reports_them_as_errors(
+    registry_table: str,
+) -> None:
+    registry = DynamoResourceRegistry(registry_table)
+    processed, unprocessed = ec2_instance("i-processed"), ec2_instance("i-unprocessed")
+    registry.put(processed)
+    registry.put(unprocessed)
+    responses = [
+        {
+            "Responses": {
+                registry_table: [
+                    hub_dynamo_client().get_item(
+                        TableName=registry_table, Key=processed.key.as_ddb_key()
+                    )["Item"]
+                ]
+            },
+            "UnprocessedKeys": {
+                registry_table: {"Keys": [unprocessed.key.as_ddb_key()]}
+            },
+        }
+    ] + [
+        {
+            "Responses": {registry_table: []},
+            "UnprocessedKeys": {
+                registry_table: {"Keys": [unprocessed.key.as_ddb_key()]}
+            },
+        }
+    ] * 4
+
+    with (
+        patch.object(hub_dynamo_client(), "batch_get_item", side_effect=responses),
+        patch("instance_scheduler.model.store.dynamo_resource_registry.sleep") as sleep,
+    ):
+        lookup = registry.get_many([processed.key, unprocessed.key])
+
+    assert [call.args[0] for call in sleep.call_args_list] == [0.05, 0.1, 0.2, 0.4]
+    assert lookup.found == {processed.key: processed}
+    assert lookup.not_found == []
+    assert list(lookup.errors) == [unprocessed.key]
+
+
+def test_dynamo_get_many_reports_malformed_records_as_errors(
+    registry_table: str,
+) -> None:
+    registry = DynamoResourceRegistry(registry_table)
+    instance = ec2_instance("i-malformed")
+    hub_dynamo_client().put_item(
+        TableName=registry_table, Item=instance.key.as_ddb_key()
+    )
+
+    lookup = registry.get_many([instance.key])
+
+    assert lookup.found == {}
+    assert lookup.not_found == []
+    assert list(lookup.errors) == [instance.key]
+
+
+def test_list_schedules_by_scheduling_target_groups_distinct_schedule_names(
+    resource_registry: ResourceRegistry,
+) -> None:
+    for resource_id, schedule in [
+        ("i-1", "schedule-a"),
+        ("i-2", "schedule-b"),
+        ("i-3", "schedule-a"),
+    ]:
+        resource_registry.put(replace(ec2_instance(resource_id), schedule=schedule))
+    resource_registry.put(asg_instance(None))
+
+    assert list(
+        resource_registry.list_schedules_by_scheduling_target()
+    ) == UnorderedList(
+        [
+            TargetSchedules(
+                "123456789012",
+                "eu-west-1",
+                "ec2",
+                frozenset({"schedule-a", "schedule-b"}),
+            ),
+            TargetSchedules(
+                "111122223333", "eu-west-1", "autoscaling", frozenset({"schedule-name"})
+            ),
+        ]
+    )
+
+
+def test_dynamo_scan_rows_skips_counters(registry_table: str) -> None:
+    registry = DynamoResourceRegistry(registry_table)
+    registry.put(ec2_instance("i-1"))
+    registry.put(asg_instance(LAST_CONFIGURED))
+    hub_dynamo_client().put_item(
+        TableName=registry_table,
+        Item={"account": {"S": COUNTERS_PARTITION}, "sk": {"S": "counter"}},
+    )
+
+    rows = list(registry.scan_rows())
+
+    assert rows == UnorderedList(
+        [
+            RegistryRow("123456789012", "eu-west-1", "ec2", "schedule-name"),
+            RegistryRow("111122223333", "eu-west-1", "autoscaling", "schedule-name"),
+        ]
+    )
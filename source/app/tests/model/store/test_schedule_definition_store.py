@@ -188,6 +188,30 @@ def test_find_by_period_returns_expected(
     }
 
 
+def test_find_by_period_follows_overwrites_and_deletes(
+    schedule_store: ScheduleDefinitionStore,
+) -> None:
+    schedule1 = ScheduleDefinition(
+        name="schedule1",
+        periods=[PeriodIdentifier.of("period1"), PeriodIdentifier.of("period2")],
+    )
+    schedule2 = ScheduleDefinition(
+        name="schedule2", periods=[PeriodIdentifier.of("period2")]
+    )
+    schedule_store.put(schedule1)
+    schedule_store.put(schedule2)
+
+    updated_schedule1 = ScheduleDefinition(
+        name="schedule1", periods=[PeriodIdentifier.of("period3", "m4.large")]
+    )
+    schedule_store.put(updated_schedule1, overwrite=True)
+    schedule_store.delete("schedule2")
+
+    assert schedule_store.find_by_period("period1") == {}
+    assert schedule_store.find_by_period("period2") == {}
+    assert schedule_store.find_by_period("period3") == {"schedule1": updated_schedule1}
+
+
 def test_delete_errors_when_missing_if_enabled(
     schedule_store: ScheduleDefinitionStore,
 ) -> None:
@@ -0,0 +1,146 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+from datetime import datetime, time, timezone
+from typing import Any, Optional
+from unittest.mock import MagicMock
+from zoneinfo import ZoneInfo
+
+from instance_scheduler.configuration.instance_schedule import InstanceSchedule
+from instance_scheduler.configuration.running_period import RunningPeriod
+from instance_scheduler.observability.decision_trace import (
+    DecisionTracer,
+    DecisionTraceTargets,
+)
+from tests.test_utils.scheduling_results import scheduling_result
+
+CURRENT_DT = datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc)
+
+SCHEDULE = InstanceSchedule(
+    name="schedule-a",
+    timezone=ZoneInfo("Europe/Paris"),
+    periods=[
+        {
+            "period": RunningPeriod("office-hours", time(9, 0), time(17, 0)),
+            "instancetype": "t3.large",
+        },
+        {"period": RunningPeriod("evening", time(18, 0), time(22, 0))},
+    ],
+)
+
+
+def lookup(name: str) -> Optional[InstanceSchedule]:
+    return SCHEDULE if name == SCHEDULE.name else None
+
+
+def traced_records(logger: MagicMock) -> list[dict[str, Any]]:
+    return [call.kwargs["extra"] for call in logger.info.call_args_list]
+
+
+def test_parse_splits_arns_from_schedule_names() -> None:
+    targets = DecisionTraceTargets.parse(
+        " schedule-a, arn:aws:ec2:us-east-1:123456789012:instance/i-1,,schedule-b "
+    )
+
+    assert targets == DecisionTraceTargets(
+        arns=frozenset({"arn:aws:ec2:us-east-1:123456789012:instance/i-1"}),
+        schedules=frozenset({"schedule-a", "schedule-b"}),
+    )
+    assert DecisionTraceTargets.parse("") == DecisionTraceTargets()
+
+
+def test_nothing_is_traced_without_targets() -> None:
+    logger = MagicMock()
+    schedule_lookup = MagicMock(side_effect=lookup)
+    tracer = DecisionTracer(logger, DecisionTraceTargets(), CURRENT_DT, schedule_lookup)
+
+    tracer.trace_result(scheduling_result("i-1"))
+
+    logger.info.assert_not_called()
+    schedule_lookup.assert_not_called()
+
+
+def test_only_results_of_targeted_resources_and_schedules_are_traced() -> None:
+    logger = MagicMock()
+    targets = DecisionTraceTargets.parse(
+        "schedule-a,arn:aws:ec2:us-east-1:123456789012:instance/i-2"
+    )
+    tracer = DecisionTracer(logger, targets, CURRENT_DT, lookup)
+
+    for result in [
+        scheduling_result("i-1"),
+        scheduling_result("i-2", schedule="schedule-b"),
+        scheduling_result("i-3", schedule="schedule-b"),
+    ]:
+        tracer.trace_result(result)
+
+    assert [record["resource"] for record in traced_records(logger)] == [
+        "arn:aws:ec2:us-east-1:123456789012:instance/i-1",
+        "arn:aws:ec2:us-east-1:123456789012:instance/i-2",
+    ]
+
+
+def test_trace_explains_the_evaluation_of_the_schedule() -> None:
+    result = scheduling_result("i-1", running=False)
+    tracer = DecisionTracer(MagicMock(), DecisionTraceTargets(), CURRENT_DT, lookup)
+
+    record = tracer.build_record(result)
+
+    assert record == {
+        **result.to_json_log(),
+        "log_type": "decision_trace",
+        "current_dt": "2024-05-01T12:00:00+00:00",
+        "stored_state": "running",
+        "new_stored_state": "running",
+        "runtime_state": "stopped",
+        "schedule_found": True,
+        "timezone": "Europe/Paris",
+        "localized_time": "2024-05-01T14:00:00+02:00",
+        "override_status": None,
+        "enforced": False,
+        "retain_running": False,
+        "stop_new_instances": True,
+        "desired_state": "running",
+        "desired_type": "t3.large",
+        "active_period": "office-hours",
+        "periods": [
+            {
+                "name": "office-hours",
+                "begintime": "09:00",
+                "endtime": "17:00",
+                "instancetype": "t3.large",
+                "state": "running",
+            },
+            {
+                "name": "evening",
+                "begintime": "18:00",
+                "endtime": "22:00",
+                "instancetype": None,
+                "state": "stopped",
+            },
+        ],
+    }
+
+
+def test_trace_of_unknown_schedule_records_that_it_was_not_found() -> None:
+    result = scheduling_result("i-1", schedule="deleted-schedule")
+    tracer = DecisionTracer(MagicMock(), DecisionTraceTargets(), CURRENT_DT, lookup)
+
+    record = tracer.build_record(result)
+
+    assert record["schedule_found"] is False
+    assert "periods" not in record
+
+
+def test_period_evaluation_only_formats_debug_messages_for_a_logger() -> None:
+    period = RunningPeriod("office-hours", time(9, 0), time(17, 0))
+    dt = MagicMock(wraps=CURRENT_DT)
+    dt.hour, dt.minute, dt.second = 12, 0, 0
+
+    period.check_time(dt)
+    dt.isoformat.assert_not_called()
+
+    logger = MagicMock()
+    period.get_desired_state(logger, CURRENT_DT)
+    period.check_time(dt)
+    dt.isoformat.assert_called_once()
+    assert "range (09:00:00-17:00:00)" in logger.debug.call_args.args[0]
@@ -0,0 +1,88 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+from typing import Any
+from unittest.mock import MagicMock
+
+from instance_scheduler.observability.error_codes import ErrorCode
+from instance_scheduler.observability.result_logging import (
+    ResultLogMode,
+    SchedulingResultLogger,
+)
+from instance_scheduler.scheduling.scheduling_result import SchedulingAction
+from tests.test_utils.scheduling_results import scheduling_result
+
+
+def logged_records(logger: MagicMock) -> list[dict[str, Any]]:
+    return [call.kwargs["extra"] for call in logger.info.call_args_list]
+
+
+def test_full_mode_logs_every_result() -> None:
+    logger = MagicMock()
+    results = [
+        scheduling_result("i-1"),
+        scheduling_result("i-2"),
+        scheduling_result("i-3", action_taken=None),
+    ]
+
+    SchedulingResultLogger(logger, mode=ResultLogMode.FULL).log_results(results)
+
+    assert logged_records(logger) == [r.to_json_log() for r in results]
+
+
+def test_aggregated_mode_logs_summary_and_only_noteworthy_results() -> None:
+    logger = MagicMock()
+    started = scheduling_result("i-2", action_taken=SchedulingAction.START)
+    errored = scheduling_result(
+        "i-3",
+        schedule="schedule-b",
+        action_taken=None,
+        error_code=ErrorCode.UNSUPPORTED_RESOURCE,
+    )
+    results = [scheduling_result("i-1"), started, errored, scheduling_result("i-4")]
+
+    SchedulingResultLogger(logger, mode=ResultLogMode.AGGREGATED).log_results(results)
+
+    *individual_records, summary = logged_records(logger)
+    assert individual_records == [started.to_json_log(), errored.to_json_log()]
+    assert summary == {
+        "log_type": "scheduling_result_summary",
+        "num_results": 4,
+        "num_logged_individually": 2,
+        "groups": [
+            {
+                "schedule": "schedule-a",
+                "action_taken": "None",
+                "error_code": "",
+                "count": 2,
+            },
+            {
+                "schedule": "schedule-a",
+                "action_taken": "Started",
+                "error_code": "",
+                "count": 1,
+            },
+            {
+                "schedule": "schedule-b",
+                "action_taken": "None",
+                "error_code": ErrorCode.UNSUPPORTED_RESOURCE.value,
+                "count": 1,
+            },
+        ],
+    }
+
+
+def test_aggregated_mode_samples_do_nothing_results() -> None:
+    logger = MagicMock()
+    results = [scheduling_result(f"i-{idx}") for idx in range(10)]
+    rolls = iter([0.5, 0.05, 0.9, 0.01, 0.2, 0.3, 0.4, 0.6, 0.7, 0.8])
+
+    SchedulingResultLogger(
+        logger,
+        mode=ResultLogMode.AGGREGATED,
+        sample_rate=0.1,
+        rng=lambda: next(rolls),
+    ).log_results(results)
+
+    *individual_records, summary = logged_records(logger)
+    assert individual_records == [results[1].to_json_log(), results[3].to_json_log()]
+    assert summary["num_logged_individually"] == 2
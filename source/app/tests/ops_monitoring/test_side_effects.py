@@ -0,0 +1,151 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+from functools import partial
+from threading import Event
+
+from instance_scheduler.observability.side_effects import (
+    MAX_QUEUED_ITEMS_PER_SINK,
+    MAX_SINKS_PER_STAGE,
+    SideEffectsStage,
+    SinkFailure,
+)
+
+
+def test_every_sink_receives_all_items_in_order_and_is_closed() -> None:
+    stage: SideEffectsStage[int] = SideEffectsStage()
+    received: dict[str, list[int]] = {"a": [], "b": []}
+    closed: list[str] = []
+
+    for name in received:
+        stage.add_sink(
+            name,
+            consume=received[name].append,
+            close=partial(closed.append, name),
+            budget_seconds=5,
+        )
+
+    for item in range(100):
+        stage.push(item)
+
+    report = stage.finish()
+
+    assert report.succeeded
+    assert received == {"a": list(range(100)), "b": list(range(100))}
+    assert sorted(closed) == ["a", "b"]
+
+
+def test_failing_sink_does_not_affect_other_sinks() -> None:
+    stage: SideEffectsStage[int] = SideEffectsStage()
+    received: list[int] = []
+    task_ran = Event()
+
+    def fail_on_third_item(item: int) -> None:
+        if item == 3:
+            raise ValueError("sink failed")
+
+    stage.add_sink(
+        "failing", consume=fail_on_third_item, close=lambda: None, budget_seconds=5
+    )
+    stage.add_sink(
+        "working", consume=received.append, close=lambda: None, budget_seconds=5
+    )
+    stage.submit("task", task_ran.set, budget_seconds=5)
+
+    for item in range(10):
+        stage.push(item)
+
+    report = stage.finish()
+
+    assert report.failures == [SinkFailure("failing", "ValueError('sink failed')")]
+    assert received == list(range(10))
+    assert task_ran.is_set()
+
+
+def test_sinks_exceeding_budget_are_reported_without_waiting_for_them() -> None:
+    stage: SideEffectsStage[int] = SideEffectsStage()
+    release = Event()
+
+    def slow_task() -> None:
+        release.wait(5)
+
+    stage.submit("slow", slow_task, budget_seconds=0.1)
+    stage.submit("fast", lambda: None, budget_seconds=5)
+
+    report = stage.finish()
+    release.set()
+
+    assert report.failures == [SinkFailure("slow", "timed out after 0.1 seconds")]
+
+
+def test_sinks_abandoned_by_an_earlier_stage_do_not_delay_later_stages() -> None:
+    release = Event()
+
+    def slow_task() -> None:
+        release.wait(5)
+
+    abandoned: SideEffectsStage[int] = SideEffectsStage()
+    for idx in range(MAX_SINKS_PER_STAGE):
+        abandoned.submit(f"slow-{idx}", slow_task, budget_seconds=0)
+    assert len(abandoned.finish().failures) == MAX_SINKS_PER_STAGE
+
+    stage: SideEffectsStage[int] = SideEffectsStage()
+    task_ran = Event()
+    stage.submit("task", task_ran.set, budget_seconds=1)
+    report = stage.finish()
+    release.set()
+
+    assert report.succeeded
+    assert task_ran.is_set()
+
+
+def test_items_pushed_to_a_full_sink_are_dropped_and_reported() -> None:
+    stage: SideEffectsStage[int] = SideEffectsStage()
+    release = Event()
+    consuming = Event()
+    received: list[int] = []
+
+    def slow_consume(item: int) -> None:
+        consuming.set()
+        release.wait(5)
+        received.append(item)
+
+    stage.add_sink("slow", consume=slow_consume, close=lambda: None, budget_seconds=5)
+
+    stage.push(0)
+    assert consuming.wait(5)
+    extra = 10
+    for item in range(1, MAX_QUEUED_ITEMS_PER_SINK + 1 + extra):
+        stage.push(item)
+    release.set()
+
+    report = stage.finish()
+
+    # the first item is being consumed while the queue fills up, so one more item than the limit is accepted
+    assert report.failures == [
+        SinkFailure("slow", f"dropped {extra} items pushed while its queue was full")
+    ]
+    assert received == list(range(MAX_QUEUED_ITEMS_PER_SINK + 1))
+
+
+def test_items_queued_for_a_sink_exceeding_its_budget_are_abandoned() -> None:
+    stage: SideEffectsStage[int] = SideEffectsStage()
+    release = Event()
+    consuming = Event()
+    received: list[int] = []
+
+    def slow_consume(item: int) -> None:
+        consuming.set()
+        release.wait(5)
+        received.append(item)
+
+    stage.add_sink("slow", consume=slow_consume, close=lambda: None, budget_seconds=0.1)
+    for item in range(10):
+        stage.push(item)
+    assert consuming.wait(5)
+
+    report = stage.finish()
+    release.set()
+
+    assert report.failures == [
+        SinkFailure("slow", "timed out after 0.1 seconds, abandoning 9 queued items")
+    ]
@@ -2,7 +2,11 @@
 # SPDX-License-Identifier: Apache-2.0
 from typing import TYPE_CHECKING, Final
 
-from instance_scheduler.model.managed_instance import RegisteredEc2Instance
+from instance_scheduler.model.managed_instance import (
+    RegisteredEc2Instance,
+    RegistryKey,
+)
+from instance_scheduler.model.store.resource_registry import RegistryLookup
 from instance_scheduler.observability.tag_keys import ControlTagKey
 from instance_scheduler.scheduling.ec2.ec2 import (
     EC2RuntimeInfo,
@@ -609,3 +613,88 @@ def test_send_ice_retry_request_empty_preferred_types() -> None:
             )
         )
         mock_send.assert_not_called()
+
+
+def test_instances_whose_registry_data_could_not_be_read_are_not_scheduled() -> None:
+    from unittest.mock import MagicMock, patch
+
+    def runtime_info(resource_id: str) -> EC2RuntimeInfo:
+        return EC2RuntimeInfo(
+            account="123456789012",
+            region="us-east-1",
+            resource_id=resource_id,
+            arn=ARN(f"arn:aws:ec2:us-east-1:123456789012:instance/{resource_id}"),
+            tags={"Schedule": "test-schedule"},
+            current_state="running",
+            current_size="t3.micro",
+        )
+
+    unregistered = runtime_info("i-unregistered")
+    unreadable = runtime_info("i-unreadable")
+
+    mock_context = MagicMock()
+    mock_context.schedule_tag_key = "Schedule"
+    mock_context.registry.get_many.return_value = RegistryLookup(
+        not_found=[RegistryKey.from_arn(unregistered.arn)],
+        errors={RegistryKey.from_arn(unreadable.arn): "ProvisionedThroughputExceeded"},
+    )
+    service = Ec2Service(mock_context, MockSchedulingRequestEnvironment())
+
+    with patch.object(
+        Ec2Service,
+        "describe_tagged_instances",
+        return_value=iter([unregistered, unreadable]),
+    ):
+        instances = list(service.describe_schedulable_instances())
+
+    assert [instance.runtime_info for instance in instances] == [unregistered]
+    assert instances[0].registry_info.stored_state == InstanceState.UNKNOWN
+
+
+def test_registry_records_of_unregistered_instances_are_put_rather_than_updated() -> (
+    None
+):
+    from dataclasses import replace
+    from unittest.mock import MagicMock, patch
+
+    def runtime_info(resource_id: str) -> EC2RuntimeInfo:
+        return EC2RuntimeInfo(
+            account="123456789012",
+            region="us-east-1",
+            resource_id=resource_id,
+            arn=ARN(f"arn:aws:ec2:us-east-1:123456789012:instance/{resource_id}"),
+            tags={"Schedule": "test-schedule"},
+            current_state="running",
+            current_size="t3.micro",
+        )
+
+    unregistered = runtime_info("i-unregistered")
+    registered = runtime_info("i-registered")
+    stored = Ec2Service.new_registry_data(registered, "Schedule")
+
+    mock_context = MagicMock()
+    mock_context.schedule_tag_key = "Schedule"
+    mock_context.registry.get_many.return_value = RegistryLookup(
+        found={stored.key: stored},
+        not_found=[RegistryKey.from_arn(unregistered.arn)],
+    )
+    service = Ec2Service(mock_context, MockSchedulingRequestEnvironment())
+
+    with patch.object(
+        Ec2Service,
+        "describe_tagged_instances",
+        return_value=iter([unregistered, registered]),
+    ):
+        instances = list(service.describe_schedulable_instances())
+
+    for instance in instances:
+        service._save_registry_info(
+            instance.registry_info,
+            replace(instance.registry_info, stored_state=InstanceState.RUNNING),
+        )
+
+    new_record = replace(instances[0].registry_info, stored_state=InstanceState.RUNNING)
+    mock_context.registry.put.assert_called_once_with(new_record, overwrite=True)
+    mock_context.registry.update.assert_called_once_with(
+        stored, replace(stored, stored_state=InstanceState.RUNNING)
+    )
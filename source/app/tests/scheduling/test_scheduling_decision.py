@@ -0,0 +1,238 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+from datetime import datetime, time, timezone
+from itertools import product
+from typing import Literal
+from unittest.mock import patch
+from zoneinfo import ZoneInfo
+
+import pytest
+from instance_scheduler.configuration.instance_schedule import InstanceSchedule
+from instance_scheduler.configuration.running_period import RunningPeriod
+from instance_scheduler.model.managed_instance import RegisteredEc2Instance
+from instance_scheduler.scheduling.ec2.ec2 import EC2RuntimeInfo, ManagedEC2Instance
+from instance_scheduler.scheduling.scheduling_decision import (
+    RequestedAction,
+    make_scheduling_decision,
+    make_scheduling_decisions,
+)
+from instance_scheduler.scheduling.states import InstanceState
+from instance_scheduler.util.arn import ARN
+
+CURRENT_DT = datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def managed_instance(
+    index: int,
+    stored_state: InstanceState,
+    current_state: Literal["running", "stopped"],
+) -> ManagedEC2Instance:
+    resource_id = f"i-{index:017x}"
+    arn = ARN(f"arn:aws:ec2:us-east-1:123456789012:instance/{resource_id}")
+    return ManagedEC2Instance(
+        registry_info=RegisteredEc2Instance(
+            account="123456789012",
+            region="us-east-1",
+            resource_id=resource_id,
+            arn=arn,
+            schedule="test-schedule",
+            name=resource_id,
+            stored_state=stored_state,
+        ),
+        runtime_info=EC2RuntimeInfo(
+            account="123456789012",
+            region="us-east-1",
+            resource_id=resource_id,
+            arn=arn,
+            tags={},
+            current_state=current_state,
+            current_size="t3.micro",
+        ),
+    )
+
+
+CURRENT_STATES: list[Literal["running", "stopped"]] = ["running", "stopped"]
+
+# every combination of stored state and runtime state, twice
+INSTANCES = [
+    managed_instance(index, stored_state, current_state)
+    for index, (stored_state, current_state, _) in enumerate(
+        product(InstanceState, CURRENT_STATES, range(2))
+    )
+]
+
+
+def schedule_in_state(
+    state: Literal["running", "stopped", "any"],
+    enforced: bool,
+    retain_running: bool,
+    stop_new_instances: bool,
+    use_maintenance_window: bool = True,
+) -> InstanceSchedule:
+    # at 12:00 UTC, the period is running, stopped, or only has a stop time that has not passed
+    periods = {
+        "running": RunningPeriod("period", time(9, 0), time(17, 0)),
+        "stopped": RunningPeriod("period", time(13, 0), time(17, 0)),
+        "any": RunningPeriod("period", endtime=time(17, 0)),
+    }
+    return InstanceSchedule(
+        name="test-schedule",
+        timezone=ZoneInfo("UTC"),
+        periods=[{"period": periods[state]}],
+        enforced=enforced,
+        retain_running=retain_running,
+        stop_new_instances=stop_new_instances,
+        use_maintenance_window=use_maintenance_window,
+    )
+
+
+def maintenance_window(active: bool) -> InstanceSchedule:
+    return InstanceSchedule(
+        name="maintenance-window",
+        timezone=ZoneInfo("UTC"),
+        periods=[
+            {
+                "period": RunningPeriod(
+                    "window", time(11 if active else 14, 0), time(15, 0)
+                )
+            }
+        ],
+    )
+
+
+@pytest.mark.parametrize(
+    "state,enforced,retain_running,stop_new_instances,stored_state,current_state,expected",
+    [
+        ("stopped", False, False, False, InstanceState.UNKNOWN, "running", (RequestedAction.DO_NOTHING, InstanceState.STOPPED)),
+        ("stopped", False, False, True, InstanceState.UNKNOWN, "running", (RequestedAction.STOP, InstanceState.STOPPED)),
+        ("stopped", True, False, True, InstanceState.STOPPED, "running", (RequestedAction.STOP, InstanceState.STOPPED)),
+        ("stopped", False, True, True, InstanceState.RETAIN_RUNNING, "running", (RequestedAction.DO_NOTHING, InstanceState.STOPPED)),
+        ("stopped", False, False, True, InstanceState.RETAIN_RUNNING, "running", (RequestedAction.STOP, InstanceState.STOPPED)),
+        ("stopped", False, False, True, InstanceState.RUNNING, "running", (RequestedAction.STOP, InstanceState.STOPPED)),
+        ("stopped", False, False, True, InstanceState.STOPPED, "running", (RequestedAction.DO_NOTHING, InstanceState.STOPPED)),
+        ("running", True, False, True, InstanceState.RUNNING, "stopped", (RequestedAction.START, InstanceState.RUNNING)),
+        ("running", False, True, True, InstanceState.STOPPED, "running", (RequestedAction.DO_NOTHING, InstanceState.RETAIN_RUNNING)),
+        ("running", False, True, True, InstanceState.STOPPED, "stopped", (RequestedAction.START, InstanceState.RUNNING)),
+        ("running", False, False, True, InstanceState.RETAIN_RUNNING, "running", (RequestedAction.DO_NOTHING, InstanceState.RETAIN_RUNNING)),
+        ("running", False, False, True, InstanceState.START_FAILED, "stopped", (RequestedAction.START, InstanceState.RUNNING)),
+        ("running", False, False, True, InstanceState.UNKNOWN, "stopped", (RequestedAction.START, InstanceState.RUNNING)),
+        ("running", False, False, True, InstanceState.RUNNING, "stopped", (RequestedAction.DO_NOTHING, InstanceState.RUNNING)),
+        ("any", True, True, False, InstanceState.STOPPED, "running", (RequestedAction.DO_NOTHING, InstanceState.ANY)),
+    ],
+)  # fmt: skip
+def test_decision_of_stored_and_runtime_state(
+    state: Literal["running", "stopped", "any"],
+    enforced: bool,
+    retain_running: bool,
+    stop_new_instances: bool,
+    stored_state: InstanceState,
+    current_state: Literal["running", "stopped"],
+    expected: tuple[RequestedAction, InstanceState],
+) -> None:
+    schedule = schedule_in_state(state, enforced, retain_running, stop_new_instances)
+    instances = [
+        managed_instance(index, stored_state, current_state) for index in range(2)
+    ]
+
+    decisions = [make_scheduling_decision(instances[0], schedule, CURRENT_DT)]
+    decisions += make_scheduling_decisions(instances, schedule, CURRENT_DT)
+
+    assert [(d.action, d.new_stored_state) for d in decisions] == [expected] * 3
+    assert [d.instance for d in decisions] == [instances[0], *instances]
+
+
+@pytest.mark.parametrize(
+    "state,enforced,retain_running,stop_new_instances",
+    list(product(["running", "stopped", "any"], *[[True, False]] * 3)),
+)
+def test_batch_decisions_match_per_instance_decisions(
+    state: Literal["running", "stopped", "any"],
+    enforced: bool,
+    retain_running: bool,
+    stop_new_instances: bool,
+) -> None:
+    schedule = schedule_in_state(state, enforced, retain_running, stop_new_instances)
+
+    assert make_scheduling_decisions(INSTANCES, schedule, CURRENT_DT) == [
+        make_scheduling_decision(instance, schedule, CURRENT_DT)
+        for instance in INSTANCES
+    ]
+
+
+def test_active_maintenance_window_starts_every_instance() -> None:
+    schedule = schedule_in_state(
+        "stopped", enforced=True, retain_running=False, stop_new_instances=True
+    )
+    maintenance_windows = [
+        maintenance_window(active=False),
+        maintenance_window(active=True),
+    ]
+
+    decisions = make_scheduling_decisions(
+        INSTANCES, schedule, CURRENT_DT, maintenance_windows
+    )
+
+    assert decisions == [
+        make_scheduling_decision(instance, schedule, CURRENT_DT, maintenance_windows)
+        for instance in INSTANCES
+    ]
+    assert {(d.action, d.new_stored_state, d.reason) for d in decisions} == {
+        (
+            RequestedAction.START,
+            InstanceState.RUNNING,
+            "In active maintenance window maintenance-window",
+        )
+    }
+
+
+@pytest.mark.parametrize(
+    "use_maintenance_window,active", [(True, False), (False, True)]
+)
+def test_maintenance_windows_that_do_not_apply_leave_the_schedule_state(
+    use_maintenance_window: bool, active: bool
+) -> None:
+    schedule = schedule_in_state(
+        "stopped",
+        enforced=True,
+        retain_running=False,
+        stop_new_instances=True,
+        use_maintenance_window=use_maintenance_window,
+    )
+    maintenance_windows = [maintenance_window(active)]
+
+    decisions = make_scheduling_decisions(
+        INSTANCES, schedule, CURRENT_DT, maintenance_windows
+    )
+
+    assert decisions == [
+        make_scheduling_decision(instance, schedule, CURRENT_DT, maintenance_windows)
+        for instance in INSTANCES
+    ]
+    assert {(d.action, d.reason) for d in decisions} == {
+        (RequestedAction.STOP, "enforced is enabled")
+    }
+
+
+def test_batch_evaluates_schedule_and_maintenance_windows_once() -> None:
+    schedule = schedule_in_state(
+        "running", enforced=False, retain_running=True, stop_new_instances=True
+    )
+    maintenance_windows = [maintenance_window(active=False)]
+
+    with patch.object(
+        InstanceSchedule,
+        "get_desired_state",
+        autospec=True,
+        side_effect=InstanceSchedule.get_desired_state,
+    ) as get_desired_state:
+        make_scheduling_decisions(INSTANCES, schedule, CURRENT_DT, maintenance_windows)
+
+    assert get_desired_state.call_count == 2
+
+
+def test_batch_of_no_instances_has_no_decisions() -> None:
+    schedule = schedule_in_state(
+        "running", enforced=False, retain_running=False, stop_new_instances=True
+    )
+
+    assert make_scheduling_decisions([], schedule, CURRENT_DT) == []
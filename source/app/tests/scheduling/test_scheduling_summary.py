@@ -0,0 +1,74 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+import json
+
+from instance_scheduler.observability.error_codes import ErrorCode
+from instance_scheduler.ops_metrics.metric_type.scheduling_action_metric import (
+    ActionTaken,
+    SchedulingActionMetric,
+)
+from instance_scheduler.scheduling.scheduling_decision import ManagedInstance
+from instance_scheduler.scheduling.scheduling_result import SchedulingAction
+from instance_scheduler.scheduling.scheduling_summary import SchedulingSummary
+from tests.test_utils.scheduling_results import scheduling_result
+
+
+def test_summary_aggregates_results_as_they_are_tracked() -> None:
+    results = [
+        scheduling_result("i-1", action_taken=SchedulingAction.START),
+        scheduling_result(
+            "i-2", action_taken=SchedulingAction.STOP, size="t3.large", running=False
+        ),
+        scheduling_result(
+            "i-3",
+            schedule="schedule-b",
+            action_taken=SchedulingAction.START,
+        ),
+        scheduling_result("i-4", schedule="schedule-b"),
+        scheduling_result(
+            "i-5",
+            schedule="unknown",
+            action_taken=None,
+            error_code=ErrorCode.UNKNOWN_SCHEDULE,
+        ),
+    ]
+    summary: SchedulingSummary[ManagedInstance] = SchedulingSummary()
+
+    tracked = summary.track(iter(results))
+    assert summary.num_results == 0
+    assert list(tracked) == results
+
+    assert summary.as_actions_taken_metric() == SchedulingActionMetric(
+        num_unique_schedules=3,
+        num_instances_scanned=5,
+        duration_seconds=0.0,
+        actions=[
+            ActionTaken(
+                instances=2, action="Started", service="ec2", instanceType="t2.micro"
+            ),
+            ActionTaken(
+                instances=1, action="Stopped", service="ec2", instanceType="t3.large"
+            ),
+        ],
+    )
+    assert summary.instance_counts == {
+        "ec2": {
+            "by_type": {
+                "t2.micro": {"running": 3},
+                "t3.large": {"stopped": 1},
+            },
+            "by_schedule": {
+                "schedule-a": {"running": 1, "stopped": 1},
+                "schedule-b": {"running": 2},
+            },
+        }
+    }
+    assert json.loads(summary.to_json()) == {
+        "num_results": 5,
+        "num_schedules": 3,
+        "actions": [
+            {"service": "ec2", "size": "t2.micro", "action": "Started", "count": 2},
+            {"service": "ec2", "size": "t3.large", "action": "Stopped", "count": 1},
+        ],
+        "errors": {ErrorCode.UNKNOWN_SCHEDULE.value: 1},
+    }
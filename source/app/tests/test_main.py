@@ -23,6 +23,7 @@ def test_correct_handler_called() -> None:
             "USER_AGENT_EXTRA": "my-agent-extra",
             "ENABLE_AWS_ORGANIZATIONS": "False",
             "CONFIG_TABLE": "config-table-name",
+            "REGISTRY_TABLE": "registry-table-name",
         },
     ):
         with patch.object(main, "handlers", (mock_handler,)):
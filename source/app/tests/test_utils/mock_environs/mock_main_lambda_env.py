@@ -14,3 +14,4 @@ class MockMainLambdaEnv(MainLambdaEnv):
     user_agent_extra: str = "my-user-agent-extra"
     enable_aws_organizations: bool = False
     config_table_name: str = "my-config-table-name"
+    registry_table: str = "my-registry-table-name"
@@ -10,6 +10,8 @@ from zoneinfo import ZoneInfo
 from instance_scheduler.handler.environments.scheduling_request_environment import (
     SchedulingRequestEnvironment,
 )
+from instance_scheduler.observability.decision_trace import DecisionTraceTargets
+from instance_scheduler.observability.result_logging import ResultLogMode
 
 
 @dataclass(frozen=True)
@@ -43,6 +45,9 @@ class MockSchedulingRequestEnvironment(SchedulingRequestEnvironment):
     local_event_bus_name: str = "local-events"
     global_event_bus_name: str = "global-events"
     enable_informational_tagging: bool = True
+    result_log_mode: ResultLogMode = ResultLogMode.FULL
+    result_log_sample_rate: float = 0.0
+    decision_trace_targets: DecisionTraceTargets = DecisionTraceTargets()
 
     @contextmanager
     def patch_env(self, clear: bool = True) -> Iterator[None]:
@@ -74,6 +79,14 @@ class MockSchedulingRequestEnvironment(SchedulingRequestEnvironment):
             "ENABLE_INFORMATIONAL_TAGGING": str(
                 self.enable_informational_tagging
             ).lower(),
+            "RESULT_LOG_MODE": self.result_log_mode.value,
+            "RESULT_LOG_SAMPLE_RATE": str(self.result_log_sample_rate),
+            "DECISION_TRACE_TARGETS": ",".join(
+                sorted(
+                    self.decision_trace_targets.arns
+                    | self.decision_trace_targets.schedules
+                )
+            ),
         }
         with patch.dict(environ, {**environ, **env_vars}, clear=clear):
             yield
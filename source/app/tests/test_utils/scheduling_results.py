@@ -0,0 +1,69 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+from typing import Optional
+
+from instance_scheduler.model.managed_instance import RegisteredEc2Instance
+from instance_scheduler.observability.error_codes import ErrorCode
+from instance_scheduler.scheduling.scheduling_decision import (
+    ManagedInstance,
+    RuntimeInfo,
+)
+from instance_scheduler.scheduling.scheduling_result import (
+    SchedulingAction,
+    SchedulingResult,
+)
+from instance_scheduler.scheduling.states import InstanceState
+from instance_scheduler.util.arn import ARN
+
+
+class StubRuntimeInfo(RuntimeInfo):
+    def __init__(self, arn: ARN, size: str = "t2.micro", running: bool = True) -> None:
+        self.arn = arn
+        self.tags = {}
+        self._size = size
+        self._running = running
+
+    @property
+    def is_in_schedulable_state(self) -> bool:
+        return True
+
+    @property
+    def is_running(self) -> bool:
+        return self._running
+
+    @property
+    def is_stopped(self) -> bool:
+        return not self._running
+
+    @property
+    def size(self) -> str:
+        return self._size
+
+
+def scheduling_result(
+    resource_id: str,
+    schedule: str = "schedule-a",
+    action_taken: Optional[SchedulingAction] = SchedulingAction.DO_NOTHING,
+    error_code: Optional[ErrorCode] = None,
+    size: str = "t2.micro",
+    running: bool = True,
+) -> SchedulingResult[ManagedInstance]:
+    registry_info = RegisteredEc2Instance(
+        account="123456789012",
+        region="us-east-1",
+        resource_id=resource_id,
+        arn=ARN(f"arn:aws:ec2:us-east-1:123456789012:instance/{resource_id}"),
+        schedule=schedule,
+        name="my-instance",
+        stored_state=InstanceState.RUNNING,
+    )
+    return SchedulingResult(
+        instance=ManagedInstance(
+            registry_info, StubRuntimeInfo(registry_info.arn, size, running)
+        ),
+        updated_registry_info=registry_info,
+        requested_action=None,
+        request_reason=None,
+        action_taken=action_taken,
+        error_code=error_code,
+    )
@@ -1,9 +1,15 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
 from datetime import datetime, timezone
-from zoneinfo import ZoneInfo
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
-from instance_scheduler.util.time import is_aware
+from instance_scheduler.util.time import (
+    get_timezone,
+    is_aware,
+    localize,
+    wall_clock_instant,
+)
+from pytest import raises
 
 
 def test_is_aware() -> None:
@@ -11,3 +17,59 @@ def test_is_aware() -> None:
     assert is_aware(datetime(year=2023, month=6, day=23, tzinfo=ZoneInfo("Asia/Tokyo")))
 
     assert not is_aware(datetime(year=2023, month=6, day=23))
+
+
+def test_wall_clock_instant_of_unambiguous_time() -> None:
+    local = datetime(2024, 6, 1, 12, 30, tzinfo=ZoneInfo("America/New_York"))
+
+    assert wall_clock_instant(local) == datetime(
+        2024, 6, 1, 16, 30, tzinfo=timezone.utc
+    )
+
+
+def test_wall_clock_instant_of_skipped_time_is_the_transition() -> None:
+    # clocks jump from 02:00 EST to 03:00 EDT at 07:00 UTC
+    local = datetime(2024, 3, 10, 2, 30, tzinfo=ZoneInfo("America/New_York"))
+
+    assert wall_clock_instant(local) == datetime(2024, 3, 10, 7, tzinfo=timezone.utc)
+
+
+def test_wall_clock_instant_of_repeated_time_is_the_first_occurrence() -> None:
+    # clocks are set back from 02:00 EDT to 01:00 EST at 06:00 UTC
+    local = datetime(2024, 11, 3, 1, 30, fold=1, tzinfo=ZoneInfo("America/New_York"))
+
+    assert wall_clock_instant(local) == datetime(
+        2024, 11, 3, 5, 30, tzinfo=timezone.utc
+    )
+
+
+def test_wall_clock_instant_requires_aware_datetime() -> None:
+    with raises(ValueError):
+        wall_clock_instant(datetime(2024, 1, 1))
+
+
+def test_get_timezone_resolves_each_name_once() -> None:
+    assert get_timezone("Europe/Paris") is get_timezone("Europe/Paris")
+    assert get_timezone("Europe/Paris") == ZoneInfo("Europe/Paris")
+
+
+def test_get_timezone_of_unknown_name_raises() -> None:
+    with raises(ZoneInfoNotFoundError):
+        get_timezone("Not/A_Timezone")
+
+
+def test_localize_converts_to_local_time_once_per_timezone() -> None:
+    tz = ZoneInfo("Asia/Tokyo")
+    dt = datetime(2024, 6, 1, 12, 0, tzinfo=timezone.utc)
+
+    localized = localize(dt, tz)
+
+    assert localized == dt
+    assert localized.tzinfo is tz
+    assert (localized.hour, localized.minute) == (21, 0)
+    assert localize(dt, tz) is localized
+
+
+def test_localize_naive_datetime_raises() -> None:
+    with raises(ValueError):
+        localize(datetime(2024, 6, 1, 12, 0), ZoneInfo("Asia/Tokyo"))
@@ -20,10 +20,23 @@ HELP_CMD_DESCRIBE_SCHEDULES = "Describes configured schedules"
 HELP_CMD_SCHEDULE_DESCRIBE_USAGE = (
     "Calculates periods and billing hours in which instances are running"
 )
+HELP_CMD_DESCRIBE_USAGE_FORECAST = (
+    "Forecasts the running hours of registered resources by schedule and instance type"
+)
+HELP_CMD_DESCRIBE_SCHEDULE_TRANSITIONS = (
+    "Lists the next times at which a schedule starts, stops, or changes instance type"
+)
 HELP_CMD_UPDATE_PERIOD = "Updates a period"
 HELP_CMD_UPDATE_SCHEDULE = "Updates a schedule"
 
+HELP_AFTER = (
+    "Time after which to list transitions, as an ISO 8601 date and time that is in the timezone of the schedule "
+    "unless it includes an offset, default is now"
+)
+HELP_COUNT = "Maximum number of transitions to list, default is 10"
 HELP_ENDDATE = "End time of the period in format yyyymmdd, default is today"
+HELP_FORECAST_ENDDATE = "Last day of the forecast in format yyyymmdd"
+HELP_FORECAST_STARTDATE = "First day of the forecast in format yyyymmdd"
 HELP_NAME_SCHEDULE = "Name of the schedule"
 HELP_PERIOD_BEGINTIME = "Begin time of the period in format hh:mm"
 HELP_PERIOD_DESCRIPTION = "Description for the period"
@@ -66,7 +79,9 @@ HELP_VALID_COMMANDS = "Valid subcommands"
 PROG_NAME = "scheduler-cli"
 VALUES_OVERRIDE_STATUS = ["stopped", "running"]
 
+PARAM_AFTER = "--after"
 PARAM_BEGINTIME = "--begintime"
+PARAM_COUNT = "--count"
 PARAM_DESCRIPTION = "--description"
 PARAM_ENDDATE = "--enddate"
 PARAM_ENDTIME = "--endtime"
@@ -98,8 +113,10 @@ CMD_CREATE_SCHEDULE = "create-schedule"
 CMD_DELETE_PERIOD = "delete-period"
 CMD_DELETE_SCHEDULE = "delete-schedule"
 CMD_DESCRIBE_PERIODS = "describe-periods"
+CMD_DESCRIBE_SCHEDULE_TRANSITIONS = "describe-schedule-transitions"
 CMD_DESCRIBE_SCHEDULE_USAGE = "describe-schedule-usage"
 CMD_DESCRIBE_SCHEDULES = "describe-schedules"
+CMD_DESCRIBE_USAGE_FORECAST = "describe-usage-forecast"
 CMD_UPDATE_PERIOD = "update-period"
 CMD_UPDATE_SCHEDULE = "update-schedule"
 CMD_VERSION = "--version"
@@ -346,6 +363,34 @@ def build_parser() -> ArgumentParser:
             func=handle_command, command=CMD_DESCRIBE_SCHEDULE_USAGE
         )
 
+    def build_describe_schedule_transitions_parser() -> None:
+        sub_parser = subparsers.add_parser(
+            CMD_DESCRIBE_SCHEDULE_TRANSITIONS,
+            help=HELP_CMD_DESCRIBE_SCHEDULE_TRANSITIONS,
+        )
+        sub_parser.add_argument(PARAM_AFTER, help=HELP_AFTER)
+        sub_parser.add_argument(PARAM_COUNT, type=int, help=HELP_COUNT)
+        sub_parser.add_argument(PARAM_NAME, required=True, help=HELP_SCHEDULE_NAME)
+        add_common_arguments(sub_parser)
+        sub_parser.set_defaults(
+            func=handle_command, command=CMD_DESCRIBE_SCHEDULE_TRANSITIONS
+        )
+
+    def build_describe_usage_forecast_parser() -> None:
+        sub_parser = subparsers.add_parser(
+            CMD_DESCRIBE_USAGE_FORECAST, help=HELP_CMD_DESCRIBE_USAGE_FORECAST
+        )
+        sub_parser.add_argument(
+            PARAM_ENDDATE, required=True, help=HELP_FORECAST_ENDDATE
+        )
+        sub_parser.add_argument(
+            PARAM_STARTDATE, required=True, help=HELP_FORECAST_STARTDATE
+        )
+        add_common_arguments(sub_parser)
+        sub_parser.set_defaults(
+            func=handle_command, command=CMD_DESCRIBE_USAGE_FORECAST
+        )
+
     new_parser = argparse.ArgumentParser(prog=PROG_NAME)
     new_parser.add_argument(
         CMD_VERSION, action="version", version=f"'%(prog)s {__version__}'"
@@ -359,8 +404,10 @@ def build_parser() -> ArgumentParser:
     build_delete_period_parser()
     build_delete_schedule_parser()
     build_describe_periods_parser()
+    build_describe_schedule_transitions_parser()
     build_describe_schedule_usage_parser()
     build_describe_schedules_parser()
+    build_describe_usage_forecast_parser()
     build_update_period_parser()
     build_update_schedule_parser()
 
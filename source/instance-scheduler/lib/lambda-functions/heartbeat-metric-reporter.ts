@@ -71,7 +71,8 @@ export class HeartbeatMetricReporter {
     });
 
     props.dataLayer.configTable.grantReadData(metricsPolicy);
-    props.dataLayer.registry.grantReadData(metricsPolicy);
+    // periodic reconciliation of the aggregate resource counters stored in the registry
+    props.dataLayer.registry.grantReadWriteData(metricsPolicy);
     ISLogGroups.adminLogGroup(scope).grantWrite(metricsPolicy);
 
     metricsPolicy.addStatements(
@@ -110,5 +111,13 @@ export class HeartbeatMetricReporter {
         reason: "required for xray",
       },
     ]);
+
+    NagSuppressions.addResourceSuppressions(metricsPolicy, [
+      {
+        id: "AwsSolutions-IAM5",
+        appliesTo: ["Action::kms:GenerateDataKey*", "Action::kms:ReEncrypt*"],
+        reason: "Permission to use solution CMK with dynamo/sns",
+      },
+    ]);
   }
 }
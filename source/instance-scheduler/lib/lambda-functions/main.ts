@@ -49,6 +49,7 @@ export class MainLambda {
         DEFAULT_TIMEZONE: props.DEFAULT_TIMEZONE,
         ENABLE_AWS_ORGANIZATIONS: cfnConditionToTrueFalse(props.enableAwsOrganizations),
         CONFIG_TABLE: props.dataLayer.configTable.tableName,
+        REGISTRY_TABLE: props.dataLayer.registry.tableName,
         ...props.metricsEnv,
       },
     });
@@ -62,6 +63,8 @@ export class MainLambda {
       properties: {
         timeout: 120,
         remote_account_ids: props.principals,
+        // changes with every release so that upgrades send an Update event, which rebuilds the period index
+        solution_version: props.metricsEnv.SOLUTION_VERSION,
       },
     });
     overrideLogicalId(customService, "SchedulerConfigHelper");
@@ -71,6 +74,7 @@ export class MainLambda {
     }
 
     props.dataLayer.configTable.grantReadWriteData(this.lambdaFunction.role);
+    props.dataLayer.registry.grantReadData(this.lambdaFunction.role);
     ISLogGroups.adminLogGroup(scope).grantWrite(this.lambdaFunction.role);
     props.snsErrorReportingTopic.grantPublish(this.lambdaFunction.role);
 
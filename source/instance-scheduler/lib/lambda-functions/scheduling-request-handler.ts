@@ -82,6 +82,13 @@ export class SchedulingRequestHandlerLambda {
         ASG_SCHEDULED_RULES_PREFIX: props.asgScheduledRulesPrefix,
         ASG_METADATA_TAG_KEY: props.asgMetadataTagKey,
         ENABLE_INFORMATIONAL_TAGGING: cfnConditionToTrueFalse(props.enableInformationalTagging),
+        // "full" logs every scheduling result, "aggregated" logs a per-schedule summary plus results that took an
+        // action or errored, with do-nothing results sampled at RESULT_LOG_SAMPLE_RATE
+        RESULT_LOG_MODE: "full",
+        RESULT_LOG_SAMPLE_RATE: "0.01",
+        // comma-separated resource ARNs and/or schedule names for which a structured trace of every scheduling
+        // decision is logged
+        DECISION_TRACE_TARGETS: "",
         ...props.metricsEnv,
       },
     });
@@ -7,6 +7,7 @@ import {
   principals,
   schedulingIntervalMinutes,
   namespace,
+  solutionVersion,
   stackName,
 } from "../test_utils/stack-factories";
 
@@ -355,6 +356,7 @@ describe("core scheduler", function () {
       expect(setupResourceId).toEqual("SchedulerConfigHelper");
       expect(setupResource.Properties).toHaveProperty("remote_account_ids", principals);
       expect(setupResource.Properties).toHaveProperty("timeout", 120);
+      expect(setupResource.Properties).toHaveProperty("solution_version", solutionVersion);
     });
 
     it("is not retained", function () {
@@ -409,6 +411,31 @@ describe("core scheduler", function () {
     });
   });
 
+  describe("heartbeat metrics reporter policy", function () {
+    const policies = coreScheduler.findResources("AWS::IAM::Policy");
+    const policyName = Object.keys(policies).find((policy) => policy.includes("MetricsGathererPermissionsPolicy"));
+    const metricsPolicy = policyName ? policies[policyName] : null;
+
+    if (!metricsPolicy) {
+      throw new Error("Could not find heartbeat metrics reporter policy");
+    }
+
+    it("can reconcile the resource counters in the registry", function () {
+      expect(metricsPolicy.Properties.PolicyDocument.Statement).toEqual(
+        expect.arrayContaining([
+          expect.objectContaining({
+            Action: expect.arrayContaining(["dynamodb:PutItem", "dynamodb:UpdateItem", "dynamodb:DeleteItem"]),
+            Resource: [{ "Fn::GetAtt": [expect.stringContaining("ResourceRegistry"), "Arn"] }],
+          }),
+          expect.objectContaining({
+            Action: expect.arrayContaining(["kms:Decrypt", "kms:Encrypt", "kms:GenerateDataKey*"]),
+            Resource: { "Fn::GetAtt": [keyId, "Arn"] },
+          }),
+        ]),
+      );
+    });
+  });
+
   const topics = coreScheduler.findResources("AWS::SNS::Topic");
   const topicIds = Object.getOwnPropertyNames(topics);
   expect(topicIds).toHaveLength(1);